@@ -0,0 +1,316 @@
+"""
+Agent Server
+------------
+Shared ASGI serving layer for the ADK sub-agents (FastAPI + uvicorn).
+
+Each uvicorn worker runs one long-lived event loop, so loop-bound resources
+- warmed App/Runner pairs (common/runner_cache.py), MCP processes, aiohttp
+sessions, the shared BigQuery analytics sink (common/analytics_sink.py) -
+live for the whole worker instead of one ``asyncio.run`` per request. Many
+prompts are served concurrently per container, bounded by
+``AGENT_MAX_CONCURRENCY``; up to ``AGENT_MAX_QUEUED`` more wait for a slot
+and the rest get ``503`` with ``Retry-After``.
+
+Every request carries an ``X-Request-ID`` (taken from the header or
+generated). It is echoed on the response and set in ``structured_logging``'s
+request-ID context, so the agent's log records are tagged with it.
+
+Endpoints:
+    GET  /health   liveness + load (in flight, queued, runner cache, analytics sink)
+    GET  /info     static agent description (if provided)
+    POST /execute  JSON in, JSON out; the handler decides the response shape.
+                   Send ``"stream": true`` (or ``Accept: application/x-ndjson``)
+                   to get newline-delimited JSON instead: one
+                   ``{"type": "event", ...}`` line per progress event the
+                   agent publishes, ``{"type": "heartbeat"}`` while idle and a
+                   final ``{"type": "result", "status": ..., "body": ...}``.
+    POST /<route>  Extra JSON endpoints an agent registers with ``routes``
+                   (e.g. structured queries that skip the LLM loop). They
+                   share the error handling and counters but not the
+                   concurrency slots, which are sized for agent runs.
+
+Usage (sub_agents/<agent>/main.py)::
+
+    async def execute(data, headers):
+        response = await send_message_async(data["prompt"], data.get("user_email"))
+        return {"success": True, "response": response}, 200
+
+    app = create_agent_server("gcloud_agent_adk", execute, health={"model": ...})
+"""
+import os
+import sys
+import json
+import uuid
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, Mapping, Optional, Tuple
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+from common.runner_cache import adopt_current_loop, aclose_cached_runners, runner_cache_stats
+from common.analytics_sink import analytics_sink_stats, shutdown_analytics_sinks
+
+# Progress events come from the agents' RedisEventPublisher (same import
+# paths as the agents' context.py).
+try:
+    from redis_common.redis_publisher import listen_events, stop_listening
+except ImportError:
+    sys.path.append(str(Path(__file__).parent.parent / "redis-sessions" / "common"))
+    try:
+        from redis_publisher import listen_events, stop_listening
+    except ImportError:
+        listen_events = stop_listening = None
+
+logger = logging.getLogger(__name__)
+
+MAX_CONCURRENCY = int(os.getenv("AGENT_MAX_CONCURRENCY", "8"))
+MAX_QUEUED = int(os.getenv("AGENT_MAX_QUEUED", "32"))
+STREAM_HEARTBEAT_SECONDS = float(os.getenv("AGENT_STREAM_HEARTBEAT_SECONDS", "15"))
+
+_request_id_setter = None
+
+
+def _set_request_id(request_id: str):
+    """Set the request ID for structured_logging (the copy main.py imported), if there is one."""
+    global _request_id_setter
+    if _request_id_setter is None:
+        try:
+            from structured_logging import set_request_id as _request_id_setter
+        except ImportError:
+            _request_id_setter = lambda request_id: None
+    _request_id_setter(request_id)
+
+
+Handler = Callable[[Dict[str, Any], Mapping[str, str]], Awaitable[Tuple[Dict[str, Any], int]]]
+
+
+class AgentBusy(Exception):
+    """Every slot is taken and the wait queue is full."""
+
+
+class _Limiter:
+    """Concurrency slots plus a bounded wait queue."""
+
+    def __init__(self, max_concurrency: int, max_queued: int):
+        self.max_concurrency = max_concurrency
+        self.max_queued = max_queued
+        self._sem: Optional[asyncio.Semaphore] = None
+        self.in_flight = 0
+        self.queued = 0
+        self.counts = {"served": 0, "rejected": 0, "failed": 0}
+
+    def full(self) -> bool:
+        return self._sem is not None and self._sem.locked() and self.queued >= self.max_queued
+
+    async def acquire(self):
+        if self._sem is None:
+            self._sem = asyncio.Semaphore(self.max_concurrency)
+        if self.full():
+            self.counts["rejected"] += 1
+            raise AgentBusy()
+        self.queued += 1
+        try:
+            await self._sem.acquire()
+        finally:
+            self.queued -= 1
+        self.in_flight += 1
+
+    def release(self):
+        self.in_flight -= 1
+        self._sem.release()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            **self.counts,
+            "in_flight": self.in_flight,
+            "queued": self.queued,
+            "max_concurrency": self.max_concurrency,
+        }
+
+
+def _json_line(obj: Dict[str, Any]) -> bytes:
+    return (json.dumps(obj, default=str) + "\n").encode()
+
+
+def create_agent_server(
+    service: str,
+    handler: Handler,
+    *,
+    health: Dict[str, Any] = None,
+    info: Dict[str, Any] = None,
+    routes: Dict[str, Handler] = None,
+    max_concurrency: int = MAX_CONCURRENCY,
+    max_queued: int = MAX_QUEUED,
+) -> FastAPI:
+    """
+    Build the ASGI app for one sub-agent.
+
+    Args:
+        service: Service name reported by /health and used in logs.
+        handler: ``async (data, headers) -> (body, status)`` for /execute.
+        health: Extra static fields for /health (e.g. model).
+        info: Body for /info; the route is omitted when None.
+        routes: Extra POST endpoints, path -> handler with the /execute signature.
+        max_concurrency: Requests handled at once per worker.
+        max_queued: Requests allowed to wait for a slot before 503s.
+    """
+    limiter = _Limiter(max_concurrency, max_queued)
+    log = logging.getLogger(service)
+
+    @asynccontextmanager
+    async def lifespan(app: FastAPI):
+        adopt_current_loop()
+        log.info(f"{service} serving on a shared event loop (max_concurrency={max_concurrency})")
+        yield
+        await aclose_cached_runners()
+        await shutdown_analytics_sinks()
+
+    app = FastAPI(title=service, lifespan=lifespan)
+
+    def _busy(request_id: str) -> JSONResponse:
+        return JSONResponse(
+            {"error": True, "message": f"{service} is at capacity, retry later"},
+            status_code=503, headers={"Retry-After": "5", "X-Request-ID": request_id},
+        )
+
+    async def _call(data: Dict[str, Any], headers: Mapping[str, str], request_id: str) -> Tuple[Dict[str, Any], int]:
+        # Tags this request's log records (StructuredLogger reads the context variable)
+        _set_request_id(request_id)
+        try:
+            body, status = await handler(data, headers)
+            limiter.counts["served"] += 1
+            return body, status
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            limiter.counts["failed"] += 1
+            log.error(f"Error processing request: {e}", exc_info=True)
+            return {"error": True, "message": f"Error processing request: {e}"}, 500
+
+    async def _stream(data: Dict[str, Any], headers: Mapping[str, str], request_id: str):
+        # The slot is taken here, not in /execute: if the client leaves before
+        # the body is iterated, this generator never runs and nothing leaks.
+        try:
+            await limiter.acquire()
+        except AgentBusy:
+            body = {"error": True, "message": f"{service} is at capacity, retry later"}
+            yield _json_line({"type": "result", "status": 503, "body": body})
+            return
+
+        loop = asyncio.get_running_loop()
+        events: asyncio.Queue = asyncio.Queue()
+
+        def on_event(channel: str, payload: str):
+            loop.call_soon_threadsafe(events.put_nowait, payload)
+
+        async def run():
+            token = listen_events(on_event) if listen_events else None
+            try:
+                return await _call(data, headers, request_id)
+            finally:
+                if token is not None:
+                    stop_listening(token)
+
+        task = asyncio.create_task(run())
+        try:
+            while True:
+                getter = asyncio.ensure_future(events.get())
+                done, _ = await asyncio.wait(
+                    {getter, task}, timeout=STREAM_HEARTBEAT_SECONDS, return_when=asyncio.FIRST_COMPLETED
+                )
+                if getter in done:
+                    yield _json_line({"type": "event", "event": json.loads(getter.result())})
+                    continue
+                getter.cancel()
+                if task in done:
+                    while not events.empty():
+                        yield _json_line({"type": "event", "event": json.loads(events.get_nowait())})
+                    break
+                yield _json_line({"type": "heartbeat"})
+            body, status = task.result()
+            yield _json_line({"type": "result", "status": status, "body": body})
+        finally:
+            # Client went away mid-stream: stop the agent run too
+            if not task.done():
+                task.cancel()
+            limiter.release()
+
+    @app.get("/health")
+    async def health_check():
+        return {
+            "status": "healthy",
+            "service": service,
+            **(health or {}),
+            "load": limiter.stats(),
+            "runner_cache": runner_cache_stats(),
+            "analytics": analytics_sink_stats(),
+        }
+
+    if info is not None:
+        @app.get("/info")
+        async def agent_info():
+            return info
+
+    @app.post("/execute")
+    async def execute(request: Request):
+        request_id = request.headers.get("X-Request-ID") or str(uuid.uuid4())
+        try:
+            data = await request.json()
+        except ValueError:
+            data = None
+        if not isinstance(data, dict):
+            return JSONResponse({"error": True, "message": "Request body must be a JSON object"}, status_code=400)
+
+        headers = dict(request.headers)
+        if data.get("stream") or "application/x-ndjson" in headers.get("accept", ""):
+            if limiter.full():
+                limiter.counts["rejected"] += 1
+                return _busy(request_id)
+            return StreamingResponse(
+                _stream(data, headers, request_id), media_type="application/x-ndjson",
+                headers={"X-Request-ID": request_id},
+            )
+
+        try:
+            await limiter.acquire()
+        except AgentBusy:
+            return _busy(request_id)
+        try:
+            body, status = await _call(data, headers, request_id)
+        finally:
+            limiter.release()
+        return JSONResponse(body, status_code=status, headers={"X-Request-ID": request_id})
+
+    def _add_route(path: str, route_handler: Handler):
+        @app.post(path)
+        async def route(request: Request):
+            request_id = request.headers.get("X-Request-ID") or str(uuid.uuid4())
+            try:
+                data = await request.json()
+            except ValueError:
+                data = None
+            if not isinstance(data, dict):
+                return JSONResponse({"error": True, "message": "Request body must be a JSON object"}, status_code=400)
+            _set_request_id(request_id)
+            try:
+                body, status = await route_handler(data, dict(request.headers))
+                limiter.counts["served"] += 1
+            except Exception as e:
+                limiter.counts["failed"] += 1
+                log.error(f"Error processing {path} request: {e}", exc_info=True)
+                body, status = {"error": True, "message": f"Error processing request: {e}"}, 500
+            return JSONResponse(body, status_code=status, headers={"X-Request-ID": request_id})
+
+    for path, route_handler in (routes or {}).items():
+        _add_route(path, route_handler)
+
+    return app
+
+
+def serve(app: FastAPI, port: int, host: str = "0.0.0.0"):
+    """Run ``app`` under uvicorn (for ``python main.py``)."""
+    import uvicorn
+    uvicorn.run(app, host=host, port=port, log_level=os.getenv("LOG_LEVEL", "info").lower())
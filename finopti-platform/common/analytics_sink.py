@@ -0,0 +1,686 @@
+"""
+Shared BigQuery Analytics Sink
+------------------------------
+One BigQuery agent-analytics writer per process and per table, shared by
+every ``BigQueryAgentAnalyticsPlugin`` instance the agent builds.
+
+Agents used to configure ``BigQueryLoggerConfig(batch_size=1)`` and build a
+new plugin per App, so every callback event became its own Storage Write
+API append and each plugin ran its own batch writer task. With
+``SharedBigQueryAnalyticsPlugin`` the plugins only format rows; the sink
+owns the BigQuery clients, the ``_default`` write stream and a single batch
+writer that flushes every ``BQ_ANALYTICS_BATCH_SIZE`` rows or
+``BQ_ANALYTICS_FLUSH_INTERVAL_SECONDS``, whichever comes first.
+
+If BigQuery is unreachable after the configured retries, the batch is
+spilled to a local SQLite file (``BQ_ANALYTICS_SPILL_PATH``) instead of
+being dropped, and replayed after the next successful write. Rows still
+queued at shutdown are flushed, or spilled if the flush times out.
+
+The sink reuses private parts of google-adk's BigQuery plugin (events
+schema, BatchProcessor queue and Arrow encoding, client setup). They are
+checked at import; if an ADK release lacks any of them, plugins log a
+warning and use the stock per-plugin writer instead.
+
+Counters (rows written / dropped / spilled / replayed, batch sizes,
+rows/sec) are reported through the global OpenTelemetry meter and
+``analytics_sink_stats()``.
+
+Usage (sub_agents/<agent>/agent.py)::
+
+    from common.analytics_sink import SharedBigQueryAnalyticsPlugin
+
+    bq_plugin = SharedBigQueryAnalyticsPlugin(
+        project_id=..., dataset_id=..., table_id=..., config=BigQueryLoggerConfig(...)
+    )
+"""
+import os
+import json
+import time
+import atexit
+import sqlite3
+import asyncio
+import inspect
+import logging
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import google.auth
+from google.api_core import exceptions as api_exceptions
+from google.cloud import bigquery
+from google.cloud import exceptions as cloud_exceptions
+from google.cloud.bigquery_storage_v1 import types as bq_storage_types
+from google.cloud.bigquery_storage_v1.services.big_query_write.async_client import BigQueryWriteAsyncClient
+
+import google.adk.plugins.bigquery_agent_analytics_plugin as bq_analytics
+from google.adk.plugins.bigquery_agent_analytics_plugin import (
+    BatchProcessor,
+    BigQueryAgentAnalyticsPlugin,
+    BigQueryLoggerConfig,
+    GCSOffloader,
+)
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = int(os.getenv("BQ_ANALYTICS_BATCH_SIZE", "100"))
+FLUSH_INTERVAL_SECONDS = float(os.getenv("BQ_ANALYTICS_FLUSH_INTERVAL_SECONDS", "2.0"))
+SPILL_PATH = os.getenv("BQ_ANALYTICS_SPILL_PATH", "/tmp/bq_analytics_spill.sqlite")
+SPILL_MAX_ROWS = int(os.getenv("BQ_ANALYTICS_SPILL_MAX_ROWS", "100000"))
+# Spilled batches replayed after each successful write, so a backlog drains
+# without starving fresh rows.
+REPLAY_BATCHES_PER_WRITE = int(os.getenv("BQ_ANALYTICS_REPLAY_BATCHES", "5"))
+
+# -------------------------------------------------------------------------
+# ADK INTERNALS
+# -------------------------------------------------------------------------
+# The sink reuses private parts of google-adk's BigQuery plugin. If an ADK
+# release drops or renames any of them, plugins fall back to the stock
+# per-plugin writer instead of failing to log.
+_ADK_INTERNALS = {
+    bq_analytics: ("_get_events_schema", "to_arrow_schema", "gapic_client_info", "client_options", "__version__"),
+    BigQueryAgentAnalyticsPlugin: ("_lazy_setup", "_log_event", "_ensure_schema_exists", "shutdown"),
+    BatchProcessor: ("start", "shutdown", "_prepare_arrow_batch", "_write_rows_with_retry"),
+}
+_BATCH_PROCESSOR_PARAMS = (
+    "write_client", "arrow_schema", "write_stream", "batch_size", "flush_interval",
+    "retry_config", "queue_max_size", "shutdown_timeout",
+)
+
+
+class AdkInternalsChanged(RuntimeError):
+    """The installed google-adk lacks a private attribute the shared sink relies on."""
+
+
+def _missing_adk_internals() -> List[str]:
+    missing = [
+        f"{getattr(owner, '__name__', owner)}.{name}"
+        for owner, names in _ADK_INTERNALS.items() for name in names if not hasattr(owner, name)
+    ]
+    try:
+        params = inspect.signature(BatchProcessor.__init__).parameters
+        missing += [f"BatchProcessor({name}=...)" for name in _BATCH_PROCESSOR_PARAMS if name not in params]
+    except (TypeError, ValueError):
+        missing.append("BatchProcessor.__init__ signature")
+    return missing
+
+
+_missing = _missing_adk_internals()
+SHARED_SINK_SUPPORTED = not _missing
+if _missing:
+    logger.warning(
+        f"google-adk {getattr(bq_analytics, '__version__', '?')} lacks {', '.join(_missing)}; "
+        "BigQuery analytics falls back to the stock per-plugin writer"
+    )
+
+
+def _disable_shared_sink(reason: Exception):
+    global SHARED_SINK_SUPPORTED
+    if SHARED_SINK_SUPPORTED:
+        SHARED_SINK_SUPPORTED = False
+        logger.warning(f"{reason}; BigQuery analytics falls back to the stock per-plugin writer")
+
+
+_RETRYABLE_CODES = {4, 13, 14}  # DEADLINE_EXCEEDED, INTERNAL, UNAVAILABLE
+
+# Outcomes of one append attempt (after retries)
+_WRITTEN = "written"
+_REJECTED = "rejected"        # BigQuery said no (schema, permissions): spilling would not help
+_UNREACHABLE = "unreachable"  # transport / availability errors: spill and replay later
+
+
+# -------------------------------------------------------------------------
+# METRICS
+# -------------------------------------------------------------------------
+class _SinkMetrics:
+    """Counters for one sink, mirrored to OTel when available."""
+
+    RATE_WINDOW_SECONDS = 60.0
+
+    def __init__(self, table: str):
+        self.table = table
+        self.counts: Dict[str, int] = {
+            "rows_appended": 0, "rows_written": 0, "batches": 0,
+            "rows_dropped": 0, "rows_spilled": 0, "rows_replayed": 0,
+        }
+        self.last_batch_size = 0
+        self.max_batch_size = 0
+        self._recent: deque = deque()  # (monotonic, rows) per written batch
+        self._counters = {}
+        self._batch_histogram = None
+        try:
+            from opentelemetry import metrics
+            meter = metrics.get_meter("finopti.analytics_sink")
+            self._counters = {
+                name: meter.create_counter(f"finopti.bq_analytics.{name}", description=desc)
+                for name, desc in (
+                    ("rows_appended", "Analytics rows handed to the sink"),
+                    ("rows_written", "Analytics rows written to BigQuery"),
+                    ("rows_dropped", "Analytics rows dropped (queue full or rejected by BigQuery)"),
+                    ("rows_spilled", "Analytics rows spilled to local storage while BigQuery was unreachable"),
+                    ("rows_replayed", "Spilled analytics rows written on replay"),
+                )
+            }
+            self._batch_histogram = meter.create_histogram(
+                "finopti.bq_analytics.batch_size", unit="rows", description="Rows per Storage Write API append"
+            )
+        except ImportError:
+            pass
+
+    def add(self, name: str, value: int = 1):
+        self.counts[name] += value
+        counter = self._counters.get(name)
+        if counter is not None:
+            counter.add(value, {"table": self.table})
+
+    def record_batch(self, rows: int):
+        self.add("rows_written", rows)
+        self.counts["batches"] += 1
+        self.last_batch_size = rows
+        self.max_batch_size = max(self.max_batch_size, rows)
+        now = time.monotonic()
+        self._recent.append((now, rows))
+        while self._recent and now - self._recent[0][0] > self.RATE_WINDOW_SECONDS:
+            self._recent.popleft()
+        if self._batch_histogram is not None:
+            self._batch_histogram.record(rows, {"table": self.table})
+
+    def rows_per_second(self) -> float:
+        now = time.monotonic()
+        rows = sum(n for t, n in self._recent if now - t <= self.RATE_WINDOW_SECONDS)
+        return rows / self.RATE_WINDOW_SECONDS
+
+    def stats(self) -> Dict[str, Any]:
+        batches = self.counts["batches"]
+        return {
+            **self.counts,
+            "avg_batch_size": round(self.counts["rows_written"] / batches, 1) if batches else 0,
+            "last_batch_size": self.last_batch_size,
+            "max_batch_size": self.max_batch_size,
+            "rows_per_sec_1m": round(self.rows_per_second(), 2),
+        }
+
+
+# -------------------------------------------------------------------------
+# SPILL BUFFER
+# -------------------------------------------------------------------------
+def _encode(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return {"__datetime__": value.isoformat()}
+    return str(value)
+
+
+def _decode(obj: Dict[str, Any]) -> Any:
+    if len(obj) == 1 and "__datetime__" in obj:
+        return datetime.fromisoformat(obj["__datetime__"])
+    return obj
+
+
+class _SpillBuffer:
+    """SQLite file holding rows BigQuery could not take. Calls are blocking; run them off-loop."""
+
+    def __init__(self, path: str, max_rows: int = SPILL_MAX_ROWS):
+        self.path = path
+        self.max_rows = max_rows
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+
+    def _db(self) -> sqlite3.Connection:
+        if self._conn is None:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            self._conn = sqlite3.connect(self.path, timeout=5.0, check_same_thread=False)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS spilled_rows ("
+                " id INTEGER PRIMARY KEY AUTOINCREMENT, stream TEXT NOT NULL, row TEXT NOT NULL)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_spilled_stream ON spilled_rows (stream, id)")
+            self._conn.commit()
+        return self._conn
+
+    def add(self, stream: str, rows: Sequence[Dict[str, Any]]) -> int:
+        """Store rows; the oldest are discarded past ``max_rows``. Returns how many were discarded."""
+        with self._lock:
+            db = self._db()
+            db.executemany(
+                "INSERT INTO spilled_rows (stream, row) VALUES (?, ?)",
+                [(stream, json.dumps(r, default=_encode)) for r in rows],
+            )
+            (total,) = db.execute("SELECT COUNT(*) FROM spilled_rows WHERE stream = ?", (stream,)).fetchone()
+            overflow = max(total - self.max_rows, 0)
+            if overflow:
+                db.execute(
+                    "DELETE FROM spilled_rows WHERE id IN"
+                    " (SELECT id FROM spilled_rows WHERE stream = ? ORDER BY id LIMIT ?)",
+                    (stream, overflow),
+                )
+            db.commit()
+            return overflow
+
+    def take(self, stream: str, limit: int) -> List[Tuple[int, Dict[str, Any]]]:
+        with self._lock:
+            cur = self._db().execute(
+                "SELECT id, row FROM spilled_rows WHERE stream = ? ORDER BY id LIMIT ?", (stream, limit)
+            )
+            return [(row_id, json.loads(raw, object_hook=_decode)) for row_id, raw in cur.fetchall()]
+
+    def delete(self, ids: Sequence[int]):
+        with self._lock:
+            db = self._db()
+            db.executemany("DELETE FROM spilled_rows WHERE id = ?", [(i,) for i in ids])
+            db.commit()
+
+    def count(self, stream: str) -> int:
+        with self._lock:
+            if self._conn is None and not os.path.exists(self.path):
+                return 0
+            (n,) = self._db().execute("SELECT COUNT(*) FROM spilled_rows WHERE stream = ?", (stream,)).fetchone()
+            return n
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+# -------------------------------------------------------------------------
+# BATCH WRITER
+# -------------------------------------------------------------------------
+class _SharedBatchProcessor(BatchProcessor):
+    """The ADK BatchProcessor with outcome-aware writes, spill/replay and metrics."""
+
+    def __init__(self, *args, metrics: _SinkMetrics, spill: Optional[_SpillBuffer], trace_id: str, **kwargs):
+        super().__init__(*args, **kwargs)
+        if not isinstance(getattr(self, "_queue", None), asyncio.Queue):
+            raise AdkInternalsChanged("google-adk BatchProcessor has no _queue")
+        self.metrics = metrics
+        self.spill = spill
+        self.trace_id = trace_id
+        self._serialized_schema = self.arrow_schema.serialize().to_pybytes()
+        self._replaying = False
+
+    async def append(self, row: Dict[str, Any]) -> None:
+        try:
+            self._queue.put_nowait(row)
+            self.metrics.add("rows_appended")
+        except asyncio.QueueFull:
+            self.metrics.add("rows_dropped")
+            if self.metrics.counts["rows_dropped"] % 100 == 1:
+                logger.warning(f"BigQuery analytics queue full; dropped {self.metrics.counts['rows_dropped']} rows so far")
+
+    def _build_request(self, rows: List[Dict[str, Any]]):
+        req = bq_storage_types.AppendRowsRequest(write_stream=self.write_stream, trace_id=self.trace_id)
+        req.arrow_rows.writer_schema.serialized_schema = self._serialized_schema
+        req.arrow_rows.rows.serialized_record_batch = self._prepare_arrow_batch(rows).serialize().to_pybytes()
+        return req
+
+    async def _append_rows(self, rows: List[Dict[str, Any]]) -> str:
+        """One logical append with retries. Returns _WRITTEN, _REJECTED or _UNREACHABLE."""
+        try:
+            req = self._build_request(rows)
+        except Exception as e:
+            logger.error(f"Failed to prepare Arrow batch of {len(rows)} rows (dropping): {e}", exc_info=True)
+            return _REJECTED
+
+        async def requests_iter():
+            yield req
+
+        delay = self.retry_config.initial_delay
+        last_error: Optional[BaseException] = None
+        for attempt in range(self.retry_config.max_retries + 1):
+            if attempt:
+                await asyncio.sleep(min(delay, self.retry_config.max_delay))
+                delay *= self.retry_config.multiplier
+            try:
+                responses = await self.write_client.append_rows(requests_iter())
+                async for response in responses:
+                    code = getattr(getattr(response, "error", None), "code", None)
+                    if code:
+                        message = getattr(response.error, "message", "Unknown error")
+                        if code in _RETRYABLE_CODES:
+                            raise api_exceptions.ServiceUnavailable(message)
+                        logger.error(f"BigQuery rejected {len(rows)} analytics rows (code {code}): {message}")
+                        return _REJECTED
+                return _WRITTEN
+            except api_exceptions.ClientError as e:
+                logger.error(f"BigQuery rejected {len(rows)} analytics rows: {e}")
+                return _REJECTED
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # Unavailable / 429 / deadline, plus transport failures (DNS, connection refused)
+                last_error = e
+                logger.warning(f"BigQuery analytics write failed (attempt {attempt + 1}): {e}")
+        logger.error(f"BigQuery unreachable after {self.retry_config.max_retries + 1} attempts: {last_error}")
+        return _UNREACHABLE
+
+    async def _write_rows_with_retry(self, rows: List[Dict[str, Any]]) -> None:
+        outcome = await self._append_rows(rows)
+        if outcome == _WRITTEN:
+            self.metrics.record_batch(len(rows))
+            await self._replay_spill()
+        elif outcome == _UNREACHABLE and self.spill is not None:
+            await self._spill_rows(rows)
+        else:
+            self.metrics.add("rows_dropped", len(rows))
+
+    async def _spill_rows(self, rows: List[Dict[str, Any]]):
+        try:
+            discarded = await asyncio.to_thread(self.spill.add, self.write_stream, rows)
+            self.metrics.add("rows_spilled", len(rows))
+            if discarded:
+                self.metrics.add("rows_dropped", discarded)
+        except Exception as e:
+            self.metrics.add("rows_dropped", len(rows))
+            logger.error(f"Failed to spill {len(rows)} analytics rows to {self.spill.path}: {e}")
+
+    async def _replay_spill(self):
+        if self.spill is None or self._replaying:
+            return
+        self._replaying = True
+        try:
+            for _ in range(REPLAY_BATCHES_PER_WRITE):
+                spilled = await asyncio.to_thread(self.spill.take, self.write_stream, self.batch_size)
+                if not spilled:
+                    return
+                ids = [row_id for row_id, _ in spilled]
+                outcome = await self._append_rows([row for _, row in spilled])
+                if outcome == _UNREACHABLE:
+                    return
+                await asyncio.to_thread(self.spill.delete, ids)
+                if outcome == _WRITTEN:
+                    self.metrics.record_batch(len(ids))
+                    self.metrics.add("rows_replayed", len(ids))
+                else:
+                    self.metrics.add("rows_dropped", len(ids))
+        except Exception as e:
+            logger.warning(f"Replaying spilled analytics rows failed: {e}")
+        finally:
+            self._replaying = False
+
+    def drain_to_spill(self) -> int:
+        """Move whatever is still queued into the spill file (sync; used at shutdown)."""
+        rows = []
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except asyncio.QueueEmpty:
+                break
+            if isinstance(item, dict):
+                rows.append(item)
+        if rows and self.spill is not None:
+            self.spill.add(self.write_stream, rows)
+            self.metrics.add("rows_spilled", len(rows))
+        elif rows:
+            self.metrics.add("rows_dropped", len(rows))
+        return len(rows)
+
+
+# -------------------------------------------------------------------------
+# SINK
+# -------------------------------------------------------------------------
+class AnalyticsSink:
+    """BigQuery clients, write stream and batch writer for one table, bound to one event loop."""
+
+    def __init__(self, project_id: str, dataset_id: str, table_id: str, location: str, config: BigQueryLoggerConfig,
+                 events_schema: Optional[List[bigquery.SchemaField]] = None):
+        self.project_id = project_id
+        self.dataset_id = dataset_id
+        self.table_id = table_id
+        self.location = location
+        self.config = config
+        self.events_schema = events_schema
+        self.full_table_id = f"{project_id}.{dataset_id}.{table_id}"
+        self.write_stream = f"projects/{project_id}/datasets/{dataset_id}/tables/{table_id}/_default"
+        self.metrics = _SinkMetrics(self.full_table_id)
+        self.spill = _SpillBuffer(SPILL_PATH) if SPILL_PATH else None
+
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self.client: Optional[bigquery.Client] = None
+        self.write_client: Optional[BigQueryWriteAsyncClient] = None
+        self.schema = None
+        self.arrow_schema = None
+        self.offloader: Optional[GCSOffloader] = None
+        self.processor: Optional[_SharedBatchProcessor] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._start_lock: Optional[asyncio.Lock] = None
+
+    def serves_current_loop(self) -> bool:
+        """True if the sink is (or can become) bound to the running loop."""
+        loop = asyncio.get_running_loop()
+        return self.loop is None or self.loop is loop or self.loop.is_closed()
+
+    async def start(self):
+        loop = asyncio.get_running_loop()
+        if self.loop is not None and self.loop.is_closed():
+            # The loop the writer lived on is gone (e.g. asyncio.run per job); start over on this one.
+            self.processor = None
+            self.write_client = None
+            self._start_lock = None
+        if self.processor is not None:
+            return
+        if self._start_lock is None:
+            self._start_lock = asyncio.Lock()
+        async with self._start_lock:
+            if self.processor is None:
+                await self._setup(loop)
+
+    async def _setup(self, loop: asyncio.AbstractEventLoop):
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="bq-analytics")
+        if self.client is None:
+            self.client = await loop.run_in_executor(
+                self._executor, lambda: bigquery.Client(project=self.project_id, location=self.location)
+            )
+            # A plugin-supplied schema (e.g. FixedBigQueryPlugin) wins over the ADK default,
+            # both for creating the table and for the Arrow rows
+            self.schema = self.events_schema or bq_analytics._get_events_schema()
+            await loop.run_in_executor(self._executor, self._ensure_table)
+            self.arrow_schema = bq_analytics.to_arrow_schema(self.schema)
+            if not self.arrow_schema:
+                raise RuntimeError("Failed to convert BigQuery schema to Arrow schema.")
+
+        creds, project = await loop.run_in_executor(
+            self._executor, lambda: google.auth.default(scopes=["https://www.googleapis.com/auth/cloud-platform"])
+        )
+        quota_project = getattr(creds, "quota_project_id", None) or project
+        self.write_client = BigQueryWriteAsyncClient(
+            credentials=creds,
+            client_info=bq_analytics.gapic_client_info.ClientInfo(user_agent=f"google-adk-bq-logger/{bq_analytics.__version__}"),
+            client_options=bq_analytics.client_options.ClientOptions(quota_project_id=quota_project) if quota_project else None,
+        )
+        if self.config.gcs_bucket_name and self.offloader is None:
+            self.offloader = GCSOffloader(self.project_id, self.config.gcs_bucket_name, self._executor)
+
+        self.processor = _SharedBatchProcessor(
+            write_client=self.write_client,
+            arrow_schema=self.arrow_schema,
+            write_stream=self.write_stream,
+            batch_size=max(BATCH_SIZE, self.config.batch_size),
+            flush_interval=FLUSH_INTERVAL_SECONDS,
+            retry_config=self.config.retry_config,
+            queue_max_size=self.config.queue_max_size,
+            shutdown_timeout=self.config.shutdown_timeout,
+            metrics=self.metrics,
+            spill=self.spill,
+            trace_id=f"google-adk-bq-logger/{bq_analytics.__version__}",
+        )
+        await self.processor.start()
+        self.loop = loop
+        logger.info(
+            f"BigQuery analytics sink started for {self.full_table_id} "
+            f"(batch_size={self.processor.batch_size}, flush_interval={FLUSH_INTERVAL_SECONDS}s)"
+        )
+        # Rows spilled by an earlier run (or another worker) go out once we can write again.
+        if self.spill is not None and await asyncio.to_thread(self.spill.count, self.write_stream):
+            loop.create_task(self.processor._replay_spill())
+
+    def _ensure_table(self):
+        try:
+            self.client.get_table(self.full_table_id)
+        except cloud_exceptions.NotFound:
+            logger.info(f"Table {self.full_table_id} not found, creating table.")
+            table = bigquery.Table(self.full_table_id, schema=self.schema)
+            table.time_partitioning = bigquery.TimePartitioning(type_=bigquery.TimePartitioningType.DAY, field="timestamp")
+            table.clustering_fields = self.config.clustering_fields
+            try:
+                self.client.create_table(table)
+            except cloud_exceptions.Conflict:
+                pass
+        except Exception as e:
+            logger.error(f"Error checking for table {self.full_table_id}: {e}")
+
+    async def shutdown(self, timeout: Optional[float] = None):
+        """Flush queued rows; whatever does not make it within ``timeout`` is spilled."""
+        processor, self.processor = self.processor, None
+        if processor is None:
+            return
+        await processor.shutdown(timeout=timeout if timeout is not None else self.config.shutdown_timeout)
+        spilled = processor.drain_to_spill()
+        if spilled:
+            logger.warning(f"Spilled {spilled} unflushed analytics rows for {self.full_table_id} at shutdown")
+        if self.write_client is not None and getattr(self.write_client, "transport", None):
+            try:
+                await self.write_client.transport.close()
+            except Exception:
+                pass
+        self.write_client = None
+
+    def stats(self) -> Dict[str, Any]:
+        queued = self.processor._queue.qsize() if self.processor is not None else 0
+        try:
+            spilled_pending = self.spill.count(self.write_stream) if self.spill is not None else 0
+        except Exception:
+            spilled_pending = None
+        return {**self.metrics.stats(), "queued": queued, "spill_pending": spilled_pending}
+
+
+_sinks: Dict[Tuple[str, ...], AnalyticsSink] = {}
+_sinks_lock = threading.Lock()
+
+
+def _schema_key(schema: Optional[List[bigquery.SchemaField]]) -> str:
+    return json.dumps([field.to_api_repr() for field in schema], sort_keys=True) if schema else ""
+
+
+def get_analytics_sink(
+    project_id: str, dataset_id: str, table_id: str, location: str = "US", config: BigQueryLoggerConfig = None,
+    events_schema: Optional[List[bigquery.SchemaField]] = None,
+) -> AnalyticsSink:
+    """
+    Process-wide sink for a table and schema; the first caller's config wins.
+
+    ``events_schema`` overrides the ADK's default events schema; plugins with
+    different schemas get separate sinks.
+    """
+    key = (project_id, dataset_id, table_id, location, _schema_key(events_schema))
+    with _sinks_lock:
+        sink = _sinks.get(key)
+        if sink is None:
+            sink = _sinks[key] = AnalyticsSink(
+                project_id, dataset_id, table_id, location, config or BigQueryLoggerConfig(), events_schema
+            )
+        return sink
+
+
+def analytics_sink_stats() -> Dict[str, Any]:
+    return {sink.full_table_id: sink.stats() for sink in list(_sinks.values())}
+
+
+async def shutdown_analytics_sinks(timeout: Optional[float] = None):
+    """Flush every sink bound to the running loop (e.g. from an ASGI lifespan)."""
+    loop = asyncio.get_running_loop()
+    for sink in list(_sinks.values()):
+        if sink.loop is loop:
+            await sink.shutdown(timeout)
+
+
+@atexit.register
+def _flush_on_exit():
+    for sink in list(_sinks.values()):
+        loop = sink.loop
+        try:
+            if loop is not None and loop.is_running() and sink.processor is not None:
+                # Writer lives on a background loop thread: let it flush there.
+                asyncio.run_coroutine_threadsafe(sink.shutdown(), loop).result(timeout=sink.config.shutdown_timeout + 2)
+            elif sink.processor is not None:
+                sink.processor.drain_to_spill()
+        except Exception as e:
+            logger.warning(f"Failed to flush analytics sink {sink.full_table_id} at exit: {e}")
+        finally:
+            if sink.spill is not None:
+                sink.spill.close()
+
+
+# -------------------------------------------------------------------------
+# PLUGIN
+# -------------------------------------------------------------------------
+class SharedBigQueryAnalyticsPlugin(BigQueryAgentAnalyticsPlugin):
+    """
+    BigQueryAgentAnalyticsPlugin that writes through the process-wide sink.
+
+    Cheap to build per App: no clients, no writer task of its own. The
+    ``batch_size`` in the plugin config is a lower bound; the sink batches
+    by ``BQ_ANALYTICS_BATCH_SIZE``. On a loop other than the sink's (a
+    one-off ``asyncio.run``) it falls back to the stock per-plugin writer.
+
+    Subclasses can set ``events_schema`` to replace the ADK's events schema;
+    it is used for the table and the Arrow rows on both paths.
+    """
+
+    events_schema: Optional[List[bigquery.SchemaField]] = None
+    _sink: Optional[AnalyticsSink] = None
+
+    async def _lazy_setup(self, **kwargs) -> None:
+        sink = get_analytics_sink(
+            self.project_id, self.dataset_id, self.table_id, self.location, self.config, self.events_schema
+        )
+        if not SHARED_SINK_SUPPORTED or not hasattr(self, "_started") or not sink.serves_current_loop():
+            await super()._lazy_setup(**kwargs)
+            return
+        try:
+            await sink.start()
+        except AdkInternalsChanged as e:
+            _disable_shared_sink(e)
+            await super()._lazy_setup(**kwargs)
+            return
+        self._sink = sink
+        self.client = sink.client
+        self.full_table_id = sink.full_table_id
+        self._schema = sink.schema
+        self.arrow_schema = sink.arrow_schema
+        self.write_client = sink.write_client
+        self.write_stream = sink.write_stream
+        self.offloader = sink.offloader
+        self.batch_processor = sink.processor
+
+    def _ensure_schema_exists(self) -> None:
+        # Stock path: runs right after _lazy_setup sets the default schema and
+        # before it builds the Arrow schema from self._schema.
+        if self.events_schema is not None:
+            self._schema = self.events_schema
+        super()._ensure_schema_exists()
+
+    async def _log_event(self, *args, **kwargs) -> None:
+        if self._sink is not None and self.batch_processor is not self._sink.processor:
+            # The sink was shut down or restarted on a new loop since we attached.
+            self._started = False
+        await super()._log_event(*args, **kwargs)
+
+    async def shutdown(self, timeout: float | None = None) -> None:
+        """Detach from the shared sink; the sink itself keeps running until process shutdown."""
+        if self._sink is None:
+            await super().shutdown(timeout)
+            return
+        self._sink = None
+        self.batch_processor = None
+        self.write_client = None
+        self.client = None
+        self._started = False
+
+    def __getstate__(self):
+        state = super().__getstate__()
+        state["_sink"] = None
+        return state
@@ -0,0 +1,282 @@
+"""
+Shared HTTP Client
+------------------
+One keep-alive ``aiohttp.ClientSession`` per process for agent-to-agent
+calls (orchestrator routing, MATS delegation to SRE / Investigator /
+Architect / operational agents).
+
+The Flask handlers run every request or job in its own ``asyncio.run`` loop, and an
+aiohttp session is bound to the loop that created it. So the session lives
+on a small background loop thread and callers on any loop hand requests to
+it; TCP connections (and DNS lookups) are reused across hops and jobs.
+
+aiohttp does not pipeline HTTP/1.1 requests; concurrency to one host comes
+from keep-alive connection reuse, bounded per host by
+``HTTP_POOL_LIMIT_PER_HOST``.
+
+Pool settings: ``HTTP_POOL_LIMIT`` (total connections, default 100),
+``HTTP_POOL_LIMIT_PER_HOST`` (16), ``HTTP_POOL_KEEPALIVE_SECONDS`` (60) and
+``HTTP_POOL_DNS_TTL_SECONDS`` (300). The older ``MATS_HTTP_*`` names (e.g.
+``MATS_HTTP_LIMIT_PER_HOST``) are still read when the new ones are unset.
+
+Connection metrics (pool hits, new connections, queue waits, open sockets)
+are reported through the global OpenTelemetry meter and ``http_stats()``.
+
+Usage::
+
+    from common.http_client import post_json
+
+    resp = await post_json(f"{url}/chat", payload, timeout=900)
+    if resp.status >= 400: ...
+    data = resp.json()
+"""
+import os
+import json
+import time
+import atexit
+import asyncio
+import logging
+import threading
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+import aiohttp
+
+logger = logging.getLogger(__name__)
+
+
+def _pool_env(name: str, default: str) -> str:
+    """``HTTP_POOL_<name>``, falling back to the ``MATS_HTTP_<name>`` name this module first shipped with."""
+    return os.getenv(f"HTTP_POOL_{name}", os.getenv(f"MATS_HTTP_{name}", default))
+
+
+HTTP_LIMIT = int(_pool_env("LIMIT", "100"))
+HTTP_LIMIT_PER_HOST = int(_pool_env("LIMIT_PER_HOST", "16"))
+HTTP_KEEPALIVE_SECONDS = float(_pool_env("KEEPALIVE_SECONDS", "60"))
+HTTP_DNS_TTL_SECONDS = int(_pool_env("DNS_TTL_SECONDS", "300"))
+
+
+@dataclass
+class HttpResponse:
+    """Fully-read response; safe to use after the connection went back to the pool."""
+    status: int
+    text: str
+    headers: Dict[str, str]
+
+    def json(self) -> Any:
+        return json.loads(self.text) if self.text else None
+
+
+# -------------------------------------------------------------------------
+# METRICS
+# -------------------------------------------------------------------------
+class _ConnectionMetrics:
+    """Counters fed by aiohttp trace hooks, mirrored to OTel when available."""
+
+    def __init__(self):
+        self.counts: Dict[str, int] = {
+            "requests": 0, "pool_hits": 0, "connections_created": 0,
+            "queued": 0, "errors": 0,
+        }
+        self.queue_wait_seconds = 0.0
+        self._connector: Optional[aiohttp.TCPConnector] = None
+        self._counters = {}
+        self._wait_histogram = None
+        try:
+            from opentelemetry import metrics
+            meter = metrics.get_meter("finopti.http_client")
+            self._counters = {
+                "requests": meter.create_counter("finopti.http.client.requests", description="Outgoing agent-to-agent requests"),
+                "pool_hits": meter.create_counter("finopti.http.client.pool_hits", description="Requests served on a reused keep-alive connection"),
+                "connections_created": meter.create_counter("finopti.http.client.connections_created", description="New TCP connections opened"),
+                "queued": meter.create_counter("finopti.http.client.queued", description="Requests that waited for a free connection"),
+                "errors": meter.create_counter("finopti.http.client.errors", description="Requests that raised before a response"),
+            }
+            self._wait_histogram = meter.create_histogram(
+                "finopti.http.client.queue_wait", unit="s", description="Time spent waiting for a pooled connection"
+            )
+            meter.create_observable_gauge(
+                "finopti.http.client.open_connections", callbacks=[self._observe_open], description="Open sockets (in use + idle)"
+            )
+        except ImportError:
+            pass
+
+    def add(self, name: str, value: int = 1, host: str = ""):
+        self.counts[name] += value
+        counter = self._counters.get(name)
+        if counter is not None:
+            counter.add(value, {"host": host})
+
+    def record_wait(self, seconds: float, host: str = ""):
+        self.queue_wait_seconds += seconds
+        if self._wait_histogram is not None:
+            self._wait_histogram.record(seconds, {"host": host})
+
+    def open_connections(self) -> Dict[str, int]:
+        connector = self._connector
+        if connector is None or connector.closed:
+            return {"in_use": 0, "idle": 0}
+        # aiohttp keeps these private; tolerate layout changes between versions.
+        in_use = len(getattr(connector, "_acquired", ()))
+        idle = sum(len(v) for v in getattr(connector, "_conns", {}).values())
+        return {"in_use": in_use, "idle": idle}
+
+    def _observe_open(self, options):
+        from opentelemetry.metrics import Observation
+        conns = self.open_connections()
+        return [
+            Observation(conns["in_use"], {"state": "in_use"}),
+            Observation(conns["idle"], {"state": "idle"}),
+        ]
+
+    def trace_config(self) -> aiohttp.TraceConfig:
+        tc = aiohttp.TraceConfig()
+
+        def _host(params) -> str:
+            url = getattr(params, "url", None)
+            return url.host if url is not None else ""
+
+        async def on_request_start(session, ctx, params):
+            ctx.host = _host(params)
+            self.add("requests", host=ctx.host)
+
+        async def on_reuse(session, ctx, params):
+            self.add("pool_hits", host=getattr(ctx, "host", ""))
+
+        async def on_create_end(session, ctx, params):
+            self.add("connections_created", host=getattr(ctx, "host", ""))
+
+        async def on_queued_start(session, ctx, params):
+            ctx.queued_at = time.monotonic()
+            self.add("queued", host=getattr(ctx, "host", ""))
+
+        async def on_queued_end(session, ctx, params):
+            self.record_wait(time.monotonic() - ctx.queued_at, host=getattr(ctx, "host", ""))
+
+        async def on_request_exception(session, ctx, params):
+            self.add("errors", host=getattr(ctx, "host", ""))
+
+        tc.on_request_start.append(on_request_start)
+        tc.on_connection_reuseconn.append(on_reuse)
+        tc.on_connection_create_end.append(on_create_end)
+        tc.on_connection_queued_start.append(on_queued_start)
+        tc.on_connection_queued_end.append(on_queued_end)
+        tc.on_request_exception.append(on_request_exception)
+        return tc
+
+
+# -------------------------------------------------------------------------
+# CLIENT RUNTIME (background loop thread)
+# -------------------------------------------------------------------------
+class _HttpRuntime:
+    """Owns the background loop and the one ClientSession living on it."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._pid: Optional[int] = None
+        self._session: Optional[aiohttp.ClientSession] = None
+        self.metrics = _ConnectionMetrics()
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            # A forked gunicorn worker inherits the object but not the thread.
+            if self._pid != os.getpid() or self._thread is None or not self._thread.is_alive():
+                self._pid = os.getpid()
+                self._session = None
+                self._loop = asyncio.new_event_loop()
+                self._thread = threading.Thread(target=self._loop.run_forever, name="http-pool", daemon=True)
+                self._thread.start()
+            return self._loop
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        """Must be called on the background loop."""
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=HTTP_LIMIT,
+                limit_per_host=HTTP_LIMIT_PER_HOST,
+                keepalive_timeout=HTTP_KEEPALIVE_SECONDS,
+                ttl_dns_cache=HTTP_DNS_TTL_SECONDS,
+            )
+            self.metrics._connector = connector
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                trace_configs=[self.metrics.trace_config()],
+            )
+        return self._session
+
+    async def run(self, coro):
+        """Await ``coro`` on the background loop from whatever loop the caller is on."""
+        loop = self._ensure_loop()
+        try:
+            current = asyncio.get_running_loop()
+        except RuntimeError:
+            current = None
+        if current is loop:
+            return await coro
+        return await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(coro, loop))
+
+    def shutdown(self, timeout: float = 5.0):
+        with self._lock:
+            loop, thread, session = self._loop, self._thread, self._session
+            if loop is None or thread is None or not thread.is_alive() or self._pid != os.getpid():
+                return
+            self._session = None
+
+        if session is not None:
+            try:
+                asyncio.run_coroutine_threadsafe(session.close(), loop).result(timeout=timeout)
+            except Exception as e:
+                logger.warning(f"HTTP client shutdown incomplete: {e}")
+        loop.call_soon_threadsafe(loop.stop)
+
+
+_runtime = _HttpRuntime()
+atexit.register(_runtime.shutdown)
+
+
+async def request(
+    method: str,
+    url: str,
+    json_body: Any = None,
+    headers: Optional[Dict[str, str]] = None,
+    timeout: float = 300,
+) -> HttpResponse:
+    """Send a request over the shared pool and return the fully-read response.
+
+    Raises:
+        asyncio.TimeoutError: No complete response within ``timeout`` seconds.
+        aiohttp.ClientError: Connection-level failures.
+    """
+    async def _do():
+        session = _runtime._get_session()
+        async with session.request(
+            method,
+            url,
+            json=json_body,
+            headers=headers,
+            timeout=aiohttp.ClientTimeout(total=timeout),
+        ) as resp:
+            text = await resp.text()
+            return HttpResponse(status=resp.status, text=text, headers=dict(resp.headers))
+    return await _runtime.run(_do())
+
+
+async def post_json(url: str, payload: Dict[str, Any], timeout: float = 300, headers: Optional[Dict[str, str]] = None) -> HttpResponse:
+    return await request("POST", url, json_body=payload, headers=headers, timeout=timeout)
+
+
+async def get(url: str, timeout: float = 30, headers: Optional[Dict[str, str]] = None) -> HttpResponse:
+    return await request("GET", url, headers=headers, timeout=timeout)
+
+
+def http_stats() -> Dict[str, Any]:
+    """Connection pool counters for health endpoints and logs."""
+    m = _runtime.metrics
+    return {
+        **m.counts,
+        "queue_wait_seconds": round(m.queue_wait_seconds, 3),
+        "open_connections": m.open_connections(),
+        "limit_per_host": HTTP_LIMIT_PER_HOST,
+    }
@@ -0,0 +1,663 @@
+"""
+MCP Process Pool
+----------------
+Keeps warm, already-initialized MCP stdio servers (``docker run -i ...``) per
+server spec so agents lease a handshaken process instead of cold-starting a
+container and re-running ``initialize`` on every request.
+
+All pooled processes are owned by a single background event loop thread.
+Agents still create a fresh event loop per request (``asyncio.run`` in the
+Flask handlers), so a process tied to the caller's loop would die with it;
+the pool loop outlives those loops and callers reach it through
+``asyncio.run_coroutine_threadsafe``.
+
+Each process has one stdout reader task that routes JSON-RPC responses to
+callers by request id, so a leased process can serve many concurrent tool
+calls (e.g. ADK running parallel function calls) with per-call timeouts.
+
+Typical use from an agent's ``mcp_client.py``::
+
+    SPEC = docker_stdio_spec("monitoring", image, volumes=[mount])
+
+    class MonitoringMCPClient(PooledMCPClient):
+        def __init__(self):
+            super().__init__(SPEC)
+
+``connect()`` leases a process, ``call_tool_raw()`` talks to it and
+``close()`` hands it back to the pool.
+"""
+import os
+import json
+import time
+import atexit
+import asyncio
+import hashlib
+import logging
+import threading
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+MCP_PROTOCOL_VERSION = "2024-11-05"
+
+# Idle processes older than this are pinged before being handed out.
+HEALTH_CHECK_AFTER_SECONDS = float(os.getenv("MCP_POOL_HEALTH_CHECK_AFTER", "30"))
+STDERR_TAIL_LINES = 50
+
+
+def _env_int(name: str, default: int) -> int:
+    return int(os.getenv(name, str(default)))
+
+
+def _env_float(name: str, default: float) -> float:
+    return float(os.getenv(name, str(default)))
+
+
+class MCPError(RuntimeError):
+    """Base error for pooled MCP servers."""
+
+
+class MCPTransportError(MCPError):
+    """The server process died, closed stdout or stopped answering."""
+
+
+class MCPCallTimeout(MCPTransportError):
+    """One call got no answer in time; the process itself is still usable."""
+
+
+class MCPToolError(MCPError):
+    """The server answered with a JSON-RPC error object."""
+
+    def __init__(self, error: Any):
+        self.error = error
+        super().__init__(f"MCP tool error: {error}")
+
+
+class MCPPoolTimeout(MCPError):
+    """No process became available within the lease timeout."""
+
+
+@dataclass(frozen=True)
+class MCPServerSpec:
+    """How to launch one kind of MCP stdio server, and how to pool it.
+
+    Two specs with the same ``name`` and ``command`` share a pool, so
+    per-user credentials passed on the command line get their own pool.
+    """
+    name: str
+    command: Tuple[str, ...]
+    client_name: str = "finopti-agent"
+    min_size: int = field(default_factory=lambda: _env_int("MCP_POOL_MIN_SIZE", 1))
+    max_size: int = field(default_factory=lambda: _env_int("MCP_POOL_MAX_SIZE", 4))
+    max_calls: int = field(default_factory=lambda: _env_int("MCP_POOL_MAX_CALLS", 500))
+    idle_timeout: float = field(default_factory=lambda: _env_float("MCP_POOL_IDLE_SECONDS", 600.0))
+    acquire_timeout: float = field(default_factory=lambda: _env_float("MCP_POOL_ACQUIRE_TIMEOUT", 120.0))
+    init_timeout: float = 60.0
+    call_timeout: float = 300.0
+    stdout_limit: int = 10 * 1024 * 1024
+
+    @property
+    def key(self) -> str:
+        """Stable pool key. Hashed so tokens in the command never hit logs."""
+        digest = hashlib.sha256("\0".join(self.command).encode()).hexdigest()[:12]
+        return f"{self.name}:{digest}"
+
+
+def docker_stdio_spec(
+    name: str,
+    image: str,
+    volumes: Iterable[str] = (),
+    env: Optional[Dict[str, str]] = None,
+    docker_args: Iterable[str] = (),
+    image_args: Iterable[str] = (),
+    **pool_options,
+) -> MCPServerSpec:
+    """Build a spec for an MCP server started with ``docker run -i --rm``.
+
+    Args:
+        name: Logical server name used in logs and stats (e.g. "gcloud").
+        image: Docker image to run.
+        volumes: ``-v`` mount strings.
+        env: Environment variables passed with ``-e``.
+        docker_args: Extra ``docker run`` flags (e.g. ``["--init"]``).
+        image_args: Arguments appended after the image name.
+        **pool_options: Overrides for MCPServerSpec pool settings.
+    """
+    cmd: List[str] = ["docker", "run", "-i", "--rm", *docker_args]
+    for volume in volumes:
+        cmd.extend(["-v", volume])
+    for k, v in (env or {}).items():
+        cmd.extend(["-e", f"{k}={v}"])
+    cmd.append(image)
+    cmd.extend(image_args)
+    return MCPServerSpec(name=name, command=tuple(cmd), **pool_options)
+
+
+def result_text(result: Dict[str, Any]) -> str:
+    """Concatenate the text parts of an MCP ``tools/call`` result."""
+    return "".join(
+        c.get("text", "") for c in (result or {}).get("content", []) if c.get("type") == "text"
+    )
+
+
+# -------------------------------------------------------------------------
+# SINGLE SERVER PROCESS
+# -------------------------------------------------------------------------
+class MCPProcess:
+    """One running MCP stdio server that has completed the handshake."""
+
+    def __init__(self, spec: MCPServerSpec):
+        self.spec = spec
+        self.process: Optional[asyncio.subprocess.Process] = None
+        self.created_at = time.monotonic()
+        self.last_used = self.created_at
+        self.calls = 0
+        self.broken = False
+        self._request_id = 0
+        # In-flight requests by JSON-RPC id; resolved by the reader task.
+        self._pending: Dict[int, asyncio.Future] = {}
+        self._write_lock = asyncio.Lock()
+        self._reader_task: Optional[asyncio.Task] = None
+        self._stderr_tail: deque = deque(maxlen=STDERR_TAIL_LINES)
+        self._stderr_task: Optional[asyncio.Task] = None
+
+    @property
+    def alive(self) -> bool:
+        return (
+            not self.broken
+            and self.process is not None
+            and self.process.returncode is None
+        )
+
+    @property
+    def in_flight(self) -> int:
+        return len(self._pending)
+
+    @property
+    def stderr_tail(self) -> str:
+        return "\n".join(self._stderr_tail)
+
+    async def start(self):
+        """Spawn the server and run the MCP initialize handshake."""
+        self.process = await asyncio.create_subprocess_exec(
+            *self.spec.command,
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            limit=self.spec.stdout_limit,
+        )
+        # Long-lived servers would block once the stderr pipe fills up.
+        self._stderr_task = asyncio.create_task(self._drain_stderr())
+        self._reader_task = asyncio.create_task(self._read_forever())
+        try:
+            await self.request("initialize", {
+                "protocolVersion": MCP_PROTOCOL_VERSION,
+                "capabilities": {},
+                "clientInfo": {"name": self.spec.client_name, "version": "1.0"},
+            }, timeout=self.spec.init_timeout)
+            await self.notify("notifications/initialized", {})
+        except Exception:
+            await self.close()
+            raise
+
+    async def _drain_stderr(self):
+        try:
+            while True:
+                line = await self.process.stderr.readline()
+                if not line:
+                    return
+                self._stderr_tail.append(line.decode(errors="replace").rstrip())
+        except asyncio.CancelledError:
+            pass
+        except Exception as e:
+            logger.debug(f"[{self.spec.name}] stderr drain stopped: {e}")
+
+    async def _write(self, payload: Dict[str, Any]):
+        data = (json.dumps(payload) + "\n").encode()
+        try:
+            # One writer at a time so concurrent drain() calls don't interleave.
+            async with self._write_lock:
+                self.process.stdin.write(data)
+                await self.process.stdin.drain()
+        except (BrokenPipeError, ConnectionResetError) as e:
+            self.broken = True
+            raise MCPTransportError(f"[{self.spec.name}] MCP stdin closed: {e}") from e
+
+    async def _read_forever(self):
+        """Single stdout reader: route each response to the caller waiting on its id."""
+        error: Optional[Exception] = None
+        try:
+            while True:
+                line = await self.process.stdout.readline()
+                if not line:
+                    error = MCPTransportError(
+                        f"[{self.spec.name}] MCP server closed stdout. Stderr: {self.stderr_tail}"
+                    )
+                    return
+                text = line.decode(errors="replace").strip()
+                if not text:
+                    continue
+                try:
+                    msg = json.loads(text)
+                except json.JSONDecodeError:
+                    logger.debug(f"[{self.spec.name}] Skipping non-JSON line: {text[:100]}")
+                    continue
+                if not isinstance(msg, dict) or "method" in msg:
+                    # Server-initiated notifications/requests are not used by our tools.
+                    continue
+                future = self._pending.pop(msg.get("id"), None)
+                if future is not None and not future.done():
+                    future.set_result(msg)
+        except asyncio.CancelledError:
+            error = MCPTransportError(f"[{self.spec.name}] MCP process closed")
+        except Exception as e:
+            # e.g. a line longer than stdout_limit; the stream can't be resynced.
+            error = MCPTransportError(f"[{self.spec.name}] MCP stdout reader failed: {e}")
+        finally:
+            self.broken = True
+            pending, self._pending = self._pending, {}
+            for future in pending.values():
+                if not future.done():
+                    future.set_exception(error or MCPTransportError(f"[{self.spec.name}] MCP process closed"))
+
+    async def _cancel_request(self, request_id: int, reason: str):
+        """Tell the server to stop working on an abandoned request."""
+        try:
+            await self.notify("notifications/cancelled", {"requestId": request_id, "reason": reason})
+        except MCPError:
+            pass
+
+    async def request(self, method: str, params: Dict[str, Any], timeout: Optional[float] = None) -> Dict[str, Any]:
+        """Send a JSON-RPC request and return its ``result``.
+
+        Safe to call concurrently: every request gets its own id and future,
+        so many tool calls can be in flight on one process. A timed-out or
+        cancelled call sends ``notifications/cancelled`` and its late answer
+        is dropped by the reader; the process stays usable.
+
+        Raises:
+            MCPToolError: The server returned a JSON-RPC error.
+            MCPCallTimeout: No answer within ``timeout``.
+            MCPTransportError: The process died or closed its pipes.
+        """
+        if not self.alive:
+            raise MCPTransportError(f"[{self.spec.name}] MCP process is not running")
+
+        timeout = timeout or self.spec.call_timeout
+        self._request_id += 1
+        request_id = self._request_id
+        future = asyncio.get_running_loop().create_future()
+        self._pending[request_id] = future
+        try:
+            await self._write({"jsonrpc": "2.0", "method": method, "params": params, "id": request_id})
+            msg = await asyncio.wait_for(future, timeout=timeout)
+        except asyncio.TimeoutError as e:
+            self._pending.pop(request_id, None)
+            await self._cancel_request(request_id, f"timed out after {timeout}s")
+            raise MCPCallTimeout(f"[{self.spec.name}] {method} timed out after {timeout}s") from e
+        except asyncio.CancelledError:
+            if self._pending.pop(request_id, None) is not None:
+                asyncio.create_task(self._cancel_request(request_id, "cancelled by client"))
+            raise
+        except BaseException:
+            self._pending.pop(request_id, None)
+            raise
+
+        if "error" in msg:
+            raise MCPToolError(msg["error"])
+        return msg.get("result", {})
+
+    async def notify(self, method: str, params: Dict[str, Any]):
+        await self._write({"jsonrpc": "2.0", "method": method, "params": params})
+
+    async def call_tool(self, tool_name: str, arguments: Dict[str, Any], timeout: Optional[float] = None) -> Dict[str, Any]:
+        self.calls += 1
+        self.last_used = time.monotonic()
+        return await self.request("tools/call", {"name": tool_name, "arguments": arguments}, timeout=timeout)
+
+    async def ping(self, timeout: float = 5.0) -> bool:
+        """Liveness probe. Any JSON-RPC answer (even "method not found") counts."""
+        try:
+            await self.request("ping", {}, timeout=timeout)
+        except MCPToolError:
+            return True
+        except MCPError:
+            return False
+        return True
+
+    async def close(self):
+        if self._stderr_task:
+            self._stderr_task.cancel()
+        if self._reader_task:
+            self._reader_task.cancel()
+        if not self.process:
+            return
+        try:
+            if self.process.returncode is None:
+                self.process.stdin.close()
+                self.process.terminate()
+                try:
+                    await asyncio.wait_for(self.process.wait(), timeout=5.0)
+                except asyncio.TimeoutError:
+                    logger.warning(f"[{self.spec.name}] MCP process did not exit gracefully, killing")
+                    self.process.kill()
+                    await self.process.wait()
+        except ProcessLookupError:
+            pass
+        except Exception as e:
+            logger.warning(f"[{self.spec.name}] Error closing MCP process: {e}")
+
+
+# -------------------------------------------------------------------------
+# POOL (runs on the pool loop only)
+# -------------------------------------------------------------------------
+class MCPProcessPool:
+    """Size-bounded pool of MCPProcess instances for one server spec."""
+
+    def __init__(self, spec: MCPServerSpec):
+        self.spec = spec
+        self._idle: deque = deque()
+        self._leased: set = set()
+        self._slots = asyncio.Semaphore(spec.max_size)
+        self._closed = False
+        self._warming = False
+        self._reaper: Optional[asyncio.Task] = None
+        self.stats: Dict[str, int] = {
+            "spawned": 0, "reused": 0, "recycled": 0, "evicted": 0,
+            "unhealthy": 0, "spawn_failures": 0, "lease_timeouts": 0,
+        }
+
+    @property
+    def size(self) -> int:
+        return len(self._idle) + len(self._leased)
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "name": self.spec.name,
+            "idle": len(self._idle),
+            "leased": len(self._leased),
+            "max_size": self.spec.max_size,
+            **self.stats,
+        }
+
+    async def _spawn(self) -> MCPProcess:
+        proc = MCPProcess(self.spec)
+        started = time.monotonic()
+        try:
+            await proc.start()
+        except Exception:
+            self.stats["spawn_failures"] += 1
+            raise
+        self.stats["spawned"] += 1
+        logger.info(f"[mcp-pool:{self.spec.name}] Spawned MCP process in {time.monotonic() - started:.2f}s")
+        return proc
+
+    async def _is_healthy(self, proc: MCPProcess) -> bool:
+        if not proc.alive:
+            return False
+        if time.monotonic() - proc.last_used > HEALTH_CHECK_AFTER_SECONDS:
+            return await proc.ping()
+        return True
+
+    async def acquire(self) -> MCPProcess:
+        if self._closed:
+            raise MCPError(f"[mcp-pool:{self.spec.name}] Pool is closed")
+        self._ensure_reaper()
+
+        try:
+            await asyncio.wait_for(self._slots.acquire(), timeout=self.spec.acquire_timeout)
+        except asyncio.TimeoutError as e:
+            self.stats["lease_timeouts"] += 1
+            raise MCPPoolTimeout(
+                f"[mcp-pool:{self.spec.name}] No MCP process free after {self.spec.acquire_timeout}s"
+            ) from e
+
+        try:
+            while self._idle:
+                # LIFO: hot processes stay hot, cold ones age out via the reaper.
+                proc = self._idle.pop()
+                if await self._is_healthy(proc):
+                    self.stats["reused"] += 1
+                    self._leased.add(proc)
+                    return proc
+                self.stats["unhealthy"] += 1
+                asyncio.create_task(proc.close())
+
+            proc = await self._spawn()
+            self._leased.add(proc)
+            return proc
+        except BaseException:
+            self._slots.release()
+            raise
+        finally:
+            self._schedule_warm()
+
+    def release(self, proc: MCPProcess, discard: bool = False):
+        self._leased.discard(proc)
+        try:
+            if self._closed or discard or not proc.alive:
+                asyncio.create_task(proc.close())
+            elif proc.calls >= self.spec.max_calls:
+                self.stats["recycled"] += 1
+                asyncio.create_task(proc.close())
+            else:
+                proc.last_used = time.monotonic()
+                self._idle.append(proc)
+        finally:
+            self._slots.release()
+
+    def _schedule_warm(self):
+        if self._warming or self._closed or self.size >= self.spec.min_size:
+            return
+        self._warming = True
+        asyncio.create_task(self._warm())
+
+    async def _warm(self):
+        """Top the pool up to ``min_size`` idle processes in the background."""
+        try:
+            while not self._closed and self.size < min(self.spec.min_size, self.spec.max_size):
+                try:
+                    self._idle.appendleft(await self._spawn())
+                except Exception as e:
+                    logger.warning(f"[mcp-pool:{self.spec.name}] Pre-warm failed: {e}")
+                    return
+        finally:
+            self._warming = False
+
+    def _ensure_reaper(self):
+        if self._reaper is None or self._reaper.done():
+            self._reaper = asyncio.create_task(self._reap_forever())
+
+    async def _reap_forever(self):
+        interval = max(1.0, min(self.spec.idle_timeout / 2, 30.0))
+        while not self._closed:
+            await asyncio.sleep(interval)
+            now = time.monotonic()
+            keep: deque = deque()
+            evict: List[MCPProcess] = []
+            # Oldest idle processes sit at the left end.
+            while self._idle:
+                proc = self._idle.popleft()
+                expired = now - proc.last_used > self.spec.idle_timeout
+                if not proc.alive or (expired and self.size + len(keep) >= self.spec.min_size):
+                    evict.append(proc)
+                else:
+                    keep.append(proc)
+            self._idle = keep
+            self.stats["evicted"] += len(evict)
+            await asyncio.gather(*(p.close() for p in evict), return_exceptions=True)
+
+    async def close(self):
+        self._closed = True
+        if self._reaper:
+            self._reaper.cancel()
+        procs = list(self._idle) + list(self._leased)
+        self._idle.clear()
+        self._leased.clear()
+        await asyncio.gather(*(p.close() for p in procs), return_exceptions=True)
+
+
+# -------------------------------------------------------------------------
+# POOL RUNTIME (background loop thread)
+# -------------------------------------------------------------------------
+class _PoolRuntime:
+    """Owns the background event loop and every pool living on it."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._pid: Optional[int] = None
+        self._pools: Dict[str, MCPProcessPool] = {}
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            # A forked worker inherits the dict but not the thread or processes.
+            if self._pid != os.getpid() or self._thread is None or not self._thread.is_alive():
+                self._pid = os.getpid()
+                self._pools = {}
+                self._loop = asyncio.new_event_loop()
+                self._thread = threading.Thread(target=self._loop.run_forever, name="mcp-pool", daemon=True)
+                self._thread.start()
+            return self._loop
+
+    async def run(self, coro):
+        """Await ``coro`` on the pool loop from whatever loop the caller is on."""
+        loop = self._ensure_loop()
+        try:
+            current = asyncio.get_running_loop()
+        except RuntimeError:
+            current = None
+        if current is loop:
+            return await coro
+        return await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(coro, loop))
+
+    def pool_for(self, spec: MCPServerSpec) -> MCPProcessPool:
+        """Must be called on the pool loop."""
+        pool = self._pools.get(spec.key)
+        if pool is None:
+            pool = MCPProcessPool(spec)
+            self._pools[spec.key] = pool
+        return pool
+
+    def stats(self) -> List[Dict[str, Any]]:
+        return [p.snapshot() for p in list(self._pools.values())]
+
+    def shutdown(self, timeout: float = 10.0):
+        with self._lock:
+            loop, thread = self._loop, self._thread
+            if loop is None or thread is None or not thread.is_alive() or self._pid != os.getpid():
+                return
+            pools = list(self._pools.values())
+            self._pools = {}
+
+        async def _close_all():
+            await asyncio.gather(*(p.close() for p in pools), return_exceptions=True)
+
+        try:
+            asyncio.run_coroutine_threadsafe(_close_all(), loop).result(timeout=timeout)
+        except Exception as e:
+            logger.warning(f"MCP pool shutdown incomplete: {e}")
+        loop.call_soon_threadsafe(loop.stop)
+
+
+_runtime = _PoolRuntime()
+atexit.register(_runtime.shutdown)
+
+
+def pool_stats() -> List[Dict[str, Any]]:
+    """Per-pool counters (idle/leased sizes, spawns, reuses, evictions...)."""
+    return _runtime.stats()
+
+
+async def warm_pool(spec: MCPServerSpec):
+    """Start ``spec.min_size`` processes ahead of the first request."""
+    async def _warm():
+        pool = _runtime.pool_for(spec)
+        pool._ensure_reaper()
+        pool._schedule_warm()
+    await _runtime.run(_warm())
+
+
+class MCPLease:
+    """A pooled process checked out by one caller until ``release()``."""
+
+    def __init__(self, pool: MCPProcessPool, proc: MCPProcess):
+        self._pool = pool
+        self._proc = proc
+        self._released = False
+
+    async def call_tool(self, tool_name: str, arguments: Dict[str, Any], timeout: Optional[float] = None) -> Dict[str, Any]:
+        if self._released:
+            raise MCPError("MCP lease already released")
+        return await _runtime.run(self._proc.call_tool(tool_name, arguments, timeout))
+
+    async def release(self, discard: bool = False):
+        if self._released:
+            return
+        self._released = True
+
+        async def _release():
+            self._pool.release(self._proc, discard=discard)
+        await _runtime.run(_release())
+
+
+async def lease(spec: MCPServerSpec) -> MCPLease:
+    """Check out a warm process for ``spec``, spawning one if the pool has room."""
+    async def _acquire():
+        pool = _runtime.pool_for(spec)
+        return MCPLease(pool, await pool.acquire())
+    return await _runtime.run(_acquire())
+
+
+# -------------------------------------------------------------------------
+# COMMON CLIENT
+# -------------------------------------------------------------------------
+class PooledMCPClient:
+    """Base for the per-agent MCP clients.
+
+    Keeps the ``connect()`` / ``call_tool()`` / ``close()`` shape the agents
+    already use, but ``connect()`` leases from the shared pool and ``close()``
+    returns the process instead of killing the container. Subclasses decide
+    how to shape results; ``call_tool_raw()`` returns the JSON-RPC result.
+    """
+
+    def __init__(self, spec: MCPServerSpec):
+        self.spec = spec
+        self._lease: Optional[MCPLease] = None
+        self._broken = False
+
+    @property
+    def connected(self) -> bool:
+        return self._lease is not None
+
+    async def connect(self):
+        if self._lease is None:
+            self._lease = await lease(self.spec)
+            self._broken = False
+
+    async def call_tool_raw(self, tool_name: str, arguments: Dict[str, Any], timeout: Optional[float] = None) -> Dict[str, Any]:
+        if self._lease is None:
+            await self.connect()
+        try:
+            return await self._lease.call_tool(tool_name, arguments, timeout)
+        except MCPCallTimeout:
+            # Other calls on the same process are unaffected.
+            raise
+        except MCPTransportError:
+            self._broken = True
+            raise
+
+    async def close(self):
+        if self._lease is not None:
+            lease_, self._lease = self._lease, None
+            await lease_.release(discard=self._broken)
+
+    async def __aenter__(self):
+        await self.connect()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
@@ -7,6 +7,7 @@ import logging
 import asyncio
 from typing import Callable, Any, Awaitable
 from config import config
+from common.runner_cache import lease_app
 
 logger = logging.getLogger(__name__)
 
@@ -20,6 +21,8 @@ async def run_with_model_fallback(
     
     Args:
         create_app_func: Function that takes `model_name` (str) and returns an `App`.
+                         Apps are leased from common/runner_cache.py, so this is
+                         only called when no warmed App exists for the model.
         run_func: Async function that takes the `App` and executes the run, returning the result.
                   Must raise exception on failure for retry to work, or return error dict.
         context_name: Name for logging.
@@ -40,11 +43,9 @@ async def run_with_model_fallback(
         try:
             logger.info(f"[{context_name}] Attempting execution with model: {model_name}")
             
-            # 1. Create App with specific model
-            app = create_app_func(model_name)
-            
-            # 2. Execute Run
-            result = await run_func(app)
+            # 1. Lease (or create) App with specific model, 2. Execute Run
+            async with lease_app(create_app_func, model_name) as app:
+                result = await run_func(app)
             
             # 3. Check for soft-failures (if run_func catches exceptions and returns dict)
             # This depends on agent implementation, but looking for "429" in text response is a heuristic
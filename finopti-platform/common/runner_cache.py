@@ -0,0 +1,249 @@
+"""
+ADK App / Runner Cache
+----------------------
+Keeps warmed ``App`` + ``InMemoryRunner`` pairs per process and per model so
+a request does not rebuild the Agent, its plugins (ReflectAndRetry, BigQuery
+analytics), the LLM client and the tool declarations every time - nor again
+for each fallback model in ``run_with_model_fallback``.
+
+Plugins and the Gemini client hold loop-bound state (async BigQuery writer,
+httpx/aiohttp sessions), so entries are only reused on the process-wide
+agent loop. ``run_on_agent_loop()`` is the sync entry point the Flask
+handlers use instead of ``asyncio.run``; code running on any other loop gets
+a fresh App/Runner that is closed after the request, exactly as before.
+
+Isolation: an entry is leased to one request at a time, and every lease gets
+fresh in-memory session / artifact / memory services, so no conversation
+state leaks between requests.
+
+Usage::
+
+    async with lease_app(create_app, model_name) as app:
+        async with leased_runner(app) as runner:
+            await runner.session_service.create_session(...)
+            async for event in runner.run_async(...): ...
+"""
+import os
+import time
+import atexit
+import asyncio
+import logging
+import threading
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from google.adk.runners import InMemoryRunner
+from google.adk.sessions import InMemorySessionService
+from google.adk.artifacts import InMemoryArtifactService
+from google.adk.memory import InMemoryMemoryService
+
+logger = logging.getLogger(__name__)
+
+MAX_IDLE_PER_MODEL = int(os.getenv("RUNNER_CACHE_MAX_IDLE", "4"))
+
+
+@dataclass
+class _Entry:
+    app: Any
+    runner: Optional[InMemoryRunner] = None
+    created_at: float = field(default_factory=time.monotonic)
+    uses: int = 0
+
+
+class _AgentLoop:
+    """Process-wide background loop the sync request handlers run agents on."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._pid: Optional[int] = None
+
+    def ensure(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            # A forked worker inherits the object but not the thread.
+            if self._pid != os.getpid() or self._thread is None or not self._thread.is_alive():
+                self._pid = os.getpid()
+                self._loop = asyncio.new_event_loop()
+                self._thread = threading.Thread(target=self._loop.run_forever, name="adk-agent-loop", daemon=True)
+                self._thread.start()
+                _cache.reset()
+            return self._loop
+
+    def adopt(self, loop: asyncio.AbstractEventLoop):
+        """Use an existing long-lived loop (e.g. the ASGI server's) as the agent loop."""
+        with self._lock:
+            if loop is not self._loop:
+                self._pid = os.getpid()
+                self._loop = loop
+                self._thread = threading.current_thread()
+                _cache.reset()
+
+    @property
+    def loop(self) -> Optional[asyncio.AbstractEventLoop]:
+        return self._loop if self._pid == os.getpid() else None
+
+
+class _RunnerCache:
+    def __init__(self):
+        self._idle: Dict[Tuple[Callable, str], List[_Entry]] = {}
+        self._leased: Dict[int, _Entry] = {}
+        self.counts = {"hits": 0, "misses": 0, "uncached": 0, "evicted": 0}
+        self.build_seconds = 0.0
+
+    def reset(self):
+        self._idle.clear()
+        self._leased.clear()
+
+    def take(self, create_app_func: Callable[[str], Any], model_name: str) -> _Entry:
+        idle = self._idle.get((create_app_func, model_name))
+        if idle:
+            self.counts["hits"] += 1
+            entry = idle.pop()
+        else:
+            self.counts["misses"] += 1
+            started = time.perf_counter()
+            entry = _Entry(app=create_app_func(model_name))
+            self.build_seconds += time.perf_counter() - started
+        entry.uses += 1
+        self._leased[id(entry.app)] = entry
+        return entry
+
+    def give_back(self, key: Tuple[Callable, str], entry: _Entry, healthy: bool) -> Optional[_Entry]:
+        """Return an entry to the idle list; returns it back if it must be closed instead."""
+        self._leased.pop(id(entry.app), None)
+        idle = self._idle.setdefault(key, [])
+        if healthy and len(idle) < MAX_IDLE_PER_MODEL:
+            idle.append(entry)
+            return None
+        self.counts["evicted"] += 1
+        return entry
+
+    def entry_for(self, app: Any) -> Optional[_Entry]:
+        return self._leased.get(id(app))
+
+    def all_entries(self) -> List[_Entry]:
+        return [e for idle in self._idle.values() for e in idle] + list(self._leased.values())
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            **self.counts,
+            "idle": sum(len(v) for v in self._idle.values()),
+            "leased": len(self._leased),
+            "build_seconds_total": round(self.build_seconds, 3),
+        }
+
+
+_cache = _RunnerCache()
+_agent_loop = _AgentLoop()
+
+
+def _on_agent_loop() -> bool:
+    try:
+        return asyncio.get_running_loop() is _agent_loop.loop
+    except RuntimeError:
+        return False
+
+
+def adopt_current_loop():
+    """Make the running loop the agent loop, so leases on it reuse warmed entries.
+
+    Called by common/agent_server.py at startup; after that, do not call
+    ``run_on_agent_loop`` from the loop's own thread.
+    """
+    _agent_loop.adopt(asyncio.get_running_loop())
+
+
+def run_on_agent_loop(coro):
+    """Run ``coro`` on the shared agent loop and block until it finishes.
+
+    Drop-in replacement for ``asyncio.run`` in sync request handlers.
+    """
+    loop = _agent_loop.ensure()
+    return asyncio.run_coroutine_threadsafe(coro, loop).result()
+
+
+@asynccontextmanager
+async def lease_app(create_app_func: Callable[[str], Any], model_name: str):
+    """Lease an App built by ``create_app_func(model_name)`` for one request."""
+    if not _on_agent_loop():
+        _cache.counts["uncached"] += 1
+        yield create_app_func(model_name)
+        return
+
+    key = (create_app_func, model_name)
+    entry = _cache.take(create_app_func, model_name)
+    # Ordinary run failures (e.g. 429s) keep the warmed entry; only
+    # cancellation mid-run leaves it in an unknown state.
+    cancelled = False
+    try:
+        yield entry.app
+    except asyncio.CancelledError:
+        cancelled = True
+        raise
+    finally:
+        stale = _cache.give_back(key, entry, healthy=not cancelled)
+        if stale is not None and stale.runner is not None:
+            await _close_quietly(stale.runner)
+
+
+@asynccontextmanager
+async def leased_runner(app: Any):
+    """Runner for a leased App, with fresh per-request session state.
+
+    Apps that were not leased from the cache (e.g. outside the agent loop)
+    get a throwaway InMemoryRunner that is closed on exit.
+    """
+    entry = _cache.entry_for(app)
+    if entry is None:
+        async with InMemoryRunner(app=app) as runner:
+            yield runner
+        return
+
+    if entry.runner is None:
+        entry.runner = InMemoryRunner(app=app)
+    runner = entry.runner
+    runner.session_service = InMemorySessionService()
+    runner.artifact_service = InMemoryArtifactService()
+    runner.memory_service = InMemoryMemoryService()
+    yield runner
+
+
+async def _close_quietly(runner: InMemoryRunner):
+    try:
+        await runner.close()
+    except Exception as e:
+        logger.warning(f"Error closing cached runner: {e}")
+
+
+def runner_cache_stats() -> Dict[str, Any]:
+    return _cache.stats()
+
+
+async def aclose_cached_runners():
+    """Close every cached runner (flushes plugins). Must run on the agent loop."""
+    entries = _cache.all_entries()
+    _cache.reset()
+    for entry in entries:
+        if entry.runner is not None:
+            await _close_quietly(entry.runner)
+
+
+@atexit.register
+def _close_all():
+    loop = _agent_loop.loop
+    if loop is None or not loop.is_running():
+        return
+    runners = [e.runner for e in _cache.all_entries() if e.runner is not None]
+    if not runners:
+        return
+
+    async def _close():
+        for runner in runners:
+            await _close_quietly(runner)
+
+    try:
+        asyncio.run_coroutine_threadsafe(_close(), loop).result(timeout=10)
+    except Exception as e:
+        logger.warning(f"Failed to close cached runners at exit: {e}")
@@ -0,0 +1,339 @@
+"""
+Tool Result Cache
+-----------------
+Caches the results of read-only tool calls (Cloud Logging / Monitoring
+queries, ``gcloud ... list|describe``) so the near-identical calls an
+investigation repeats - across ADK retries, fallback models and consecutive
+runs on the same incident - are answered locally instead of going through
+an MCP container and the Cloud APIs again.
+
+Two tiers:
+
+* an in-process LRU (``TOOL_CACHE_MAX_ENTRIES`` entries), always on;
+* an optional Redis tier shared by every worker and replica, enabled by
+  ``TOOL_CACHE_REDIS_URL``. Redis errors never fail a tool call; the tier is
+  skipped for ``TOOL_CACHE_REDIS_RETRY_SECONDS`` and the call goes through.
+
+Keys are the tool name, its normalized arguments (bound to the function's
+signature, defaults applied, strings stripped) and a time bucket: relative
+queries such as "the last 2 minutes of logs" only match within the same
+``bucket_seconds`` window. Entries expire after the tool's TTL, which
+``TOOL_CACHE_TTL_<TOOL_NAME>`` overrides per deployment.
+
+Only successful results are stored (no ``error`` key, ``success`` not
+False), and a ``cacheable`` predicate lets a tool exclude calls that must
+never be replayed, e.g. mutating gcloud commands. A cached result comes back
+with a ``cache_info`` entry (source, age, fetch time) so the model knows
+how old the data is.
+
+Usage (sub_agents/<agent>/tools.py)::
+
+    from common.tool_cache import cached_tool
+
+    @cached_tool("list_metrics", ttl_seconds=3600)
+    async def list_metrics(project_id: str, filter: str = "") -> Dict[str, Any]:
+        ...
+
+Set ``TOOL_CACHE_ENABLED=false`` to bypass the cache entirely.
+"""
+import os
+import json
+import time
+import asyncio
+import hashlib
+import inspect
+import logging
+import threading
+import functools
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+TOOL_CACHE_ENABLED = os.getenv("TOOL_CACHE_ENABLED", "true").lower() == "true"
+TOOL_CACHE_MAX_ENTRIES = int(os.getenv("TOOL_CACHE_MAX_ENTRIES", "512"))
+TOOL_CACHE_REDIS_URL = os.getenv("TOOL_CACHE_REDIS_URL", "")
+TOOL_CACHE_REDIS_PREFIX = os.getenv("TOOL_CACHE_REDIS_PREFIX", "finopti:tool_cache:")
+TOOL_CACHE_REDIS_RETRY_SECONDS = float(os.getenv("TOOL_CACHE_REDIS_RETRY_SECONDS", "30"))
+
+
+def _normalize(value: Any) -> Any:
+    if isinstance(value, str):
+        return value.strip()
+    if isinstance(value, dict):
+        return {str(k): _normalize(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_normalize(v) for v in value]
+    return value
+
+
+def make_cache_key(tool_name: str, arguments: Dict[str, Any], bucket_seconds: Optional[float] = None,
+                   now: Optional[float] = None) -> str:
+    """Stable key for a tool call: name + normalized arguments + time bucket."""
+    bucket = 0
+    if bucket_seconds:
+        bucket = int((time.time() if now is None else now) // bucket_seconds)
+    payload = json.dumps(_normalize(arguments), sort_keys=True, separators=(",", ":"), default=str)
+    digest = hashlib.sha256(f"{tool_name.strip().lower()}|{bucket}|{payload}".encode()).hexdigest()
+    return f"{tool_name.strip().lower()}:{digest[:32]}"
+
+
+def is_cacheable_result(result: Any) -> bool:
+    """Only successful tool results are worth replaying; errors must not stick."""
+    if isinstance(result, dict):
+        return "error" not in result and result.get("success") is not False and not result.get("isError")
+    return result is not None
+
+
+class ToolResultCache:
+    """In-process LRU with an optional shared Redis tier behind it."""
+
+    def __init__(self, max_entries: int = TOOL_CACHE_MAX_ENTRIES, redis_url: str = TOOL_CACHE_REDIS_URL,
+                 redis_prefix: str = TOOL_CACHE_REDIS_PREFIX):
+        self.max_entries = max_entries
+        self.redis_url = redis_url
+        self.redis_prefix = redis_prefix
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, Tuple[float, float, Any]]" = OrderedDict()  # key -> (stored_at, expires_at, value)
+        # redis.asyncio clients are bound to the loop they were created on.
+        self._redis: Dict[int, Tuple[asyncio.AbstractEventLoop, Any]] = {}
+        self._redis_down_until = 0.0
+        self.counts: Dict[str, int] = {
+            "hits": 0, "redis_hits": 0, "misses": 0, "stores": 0,
+            "evictions": 0, "uncacheable": 0, "redis_errors": 0,
+        }
+
+    # --- local tier -------------------------------------------------------
+    def _get_local(self, key: str, now: float) -> Optional[Tuple[float, Any]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            stored_at, expires_at, value = entry
+            if expires_at <= now:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return stored_at, value
+
+    def _set_local(self, key: str, value: Any, stored_at: float, expires_at: float):
+        with self._lock:
+            self._entries[key] = (stored_at, expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.counts["evictions"] += 1
+
+    # --- redis tier -------------------------------------------------------
+    def _redis_client(self):
+        if not self.redis_url or time.monotonic() < self._redis_down_until:
+            return None
+        loop = asyncio.get_running_loop()
+        entry = self._redis.get(id(loop))
+        if entry is not None and entry[0] is loop:
+            return entry[1]
+        try:
+            import redis.asyncio as redis_asyncio
+        except ImportError:
+            logger.warning("TOOL_CACHE_REDIS_URL is set but the redis package is not installed; using the local cache only")
+            self.redis_url = ""
+            return None
+        # Drop clients of loops that are gone (per-request asyncio.run loops).
+        for loop_id, (old_loop, _) in list(self._redis.items()):
+            if old_loop.is_closed():
+                del self._redis[loop_id]
+        client = redis_asyncio.from_url(self.redis_url, socket_timeout=1.0, socket_connect_timeout=1.0)
+        self._redis[id(loop)] = (loop, client)
+        return client
+
+    def _redis_failed(self, op: str, error: Exception):
+        self.counts["redis_errors"] += 1
+        self._redis_down_until = time.monotonic() + TOOL_CACHE_REDIS_RETRY_SECONDS
+        logger.warning(f"Tool cache Redis {op} failed, local cache only for {TOOL_CACHE_REDIS_RETRY_SECONDS:.0f}s: {error}")
+
+    async def _get_redis(self, key: str) -> Optional[Tuple[float, float, Any]]:
+        client = self._redis_client()
+        if client is None:
+            return None
+        try:
+            raw = await client.get(self.redis_prefix + key)
+        except Exception as e:
+            self._redis_failed("read", e)
+            return None
+        if raw is None:
+            return None
+        try:
+            stored = json.loads(raw)
+            return stored["stored_at"], stored["expires_at"], stored["value"]
+        except (ValueError, KeyError, TypeError):
+            return None
+
+    async def _set_redis(self, key: str, value: Any, stored_at: float, ttl_seconds: float):
+        client = self._redis_client()
+        if client is None:
+            return
+        try:
+            payload = json.dumps({"stored_at": stored_at, "expires_at": stored_at + ttl_seconds, "value": value},
+                                 default=str)
+        except (TypeError, ValueError):
+            return
+        try:
+            await client.set(self.redis_prefix + key, payload, ex=max(1, int(ttl_seconds)))
+        except Exception as e:
+            self._redis_failed("write", e)
+
+    # --- public API -------------------------------------------------------
+    async def get(self, key: str) -> Optional[Tuple[str, float, Any]]:
+        """Returns ``(source, stored_at, value)`` or None. ``stored_at`` is wall-clock time."""
+        now = time.time()
+        local = self._get_local(key, now)
+        if local is not None:
+            self.counts["hits"] += 1
+            return "memory", local[0], local[1]
+        remote = await self._get_redis(key)
+        if remote is not None and remote[1] > now:
+            stored_at, expires_at, value = remote
+            self._set_local(key, value, stored_at, expires_at)
+            self.counts["redis_hits"] += 1
+            return "redis", stored_at, value
+        self.counts["misses"] += 1
+        return None
+
+    async def set(self, key: str, value: Any, ttl_seconds: float):
+        stored_at = time.time()
+        self._set_local(key, value, stored_at, stored_at + ttl_seconds)
+        self.counts["stores"] += 1
+        await self._set_redis(key, value, stored_at, ttl_seconds)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            size = len(self._entries)
+        return {**self.counts, "entries": size, "redis": bool(self.redis_url)}
+
+
+_cache = ToolResultCache()
+
+
+def tool_cache_stats() -> Dict[str, Any]:
+    """Hit / miss / store counters of this process's tool cache."""
+    return _cache.stats()
+
+
+def clear_tool_cache():
+    _cache.clear()
+
+
+def _annotate(value: Any, source: str, stored_at: float) -> Any:
+    if not isinstance(value, dict):
+        return value
+    return {
+        **value,
+        "cache_info": {
+            "cached": True,
+            "source": source,
+            "age_seconds": round(max(0.0, time.time() - stored_at), 1),
+            "fetched_at": datetime.fromtimestamp(stored_at, timezone.utc).isoformat(),
+        },
+    }
+
+
+def cached_tool(name: str, ttl_seconds: float, bucket_seconds: Optional[float] = None,
+                cacheable: Optional[Callable[[Dict[str, Any]], bool]] = None,
+                cache: Optional[ToolResultCache] = None):
+    """
+    Decorator caching the results of an async, read-only ADK tool function.
+
+    Args:
+        name: Tool name used in cache keys and for the ``TOOL_CACHE_TTL_<NAME>`` override.
+        ttl_seconds: How long a result may be replayed.
+        bucket_seconds: Time bucket folded into the key, for tools whose arguments are
+            relative to "now" (``minutes_ago``). None for time-independent tools.
+        cacheable: Predicate over the bound arguments; calls it rejects always run.
+        cache: Cache instance (defaults to the process-wide one).
+
+    The wrapper keeps the function's signature, so ADK builds the same declaration.
+    """
+    ttl = float(os.getenv(f"TOOL_CACHE_TTL_{name.upper()}", str(ttl_seconds)))
+
+    def decorator(func):
+        signature = inspect.signature(func)
+
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            store = cache or _cache
+            if not TOOL_CACHE_ENABLED or ttl <= 0:
+                return await func(*args, **kwargs)
+            try:
+                bound = signature.bind(*args, **kwargs)
+            except TypeError:
+                return await func(*args, **kwargs)
+            bound.apply_defaults()
+            arguments = dict(bound.arguments)
+            if cacheable is not None and not cacheable(arguments):
+                store.counts["uncacheable"] += 1
+                return await func(*args, **kwargs)
+
+            key = make_cache_key(name, arguments, bucket_seconds)
+            cached = await store.get(key)
+            if cached is not None:
+                source, stored_at, value = cached
+                logger.info(f"[tool_cache] {name} served from {source} cache ({time.time() - stored_at:.0f}s old)")
+                return _annotate(value, source, stored_at)
+
+            result = await func(*args, **kwargs)
+            if is_cacheable_result(result):
+                await store.set(key, result, ttl)
+            return result
+
+        return wrapper
+
+    return decorator
+
+
+# --- gcloud -----------------------------------------------------------------
+# Command words that only read state, and the ones that change it. The first
+# such word in the command path decides; a command with no read-only verb
+# (ssh, cp, tail, ...) is never cached. The first path word is a group, which
+# may share a name with a verb (``gcloud run``, ``gcloud deploy``).
+GCLOUD_READ_ONLY_VERBS = frozenset({
+    "list", "describe", "get", "get-iam-policy", "read", "show", "get-value",
+    "list-grantable-roles", "list-testable-permissions", "list-tags", "info", "version",
+})
+GCLOUD_MUTATING_VERBS = frozenset({
+    "create", "delete", "update", "set", "add", "remove", "patch", "deploy",
+    "start", "stop", "reset", "resize", "restart", "enable", "disable", "attach",
+    "detach", "import", "export", "move", "cp", "mv", "rm", "ssh", "scp", "run",
+    "execute", "submit", "cancel", "apply", "rollback", "undelete", "restore",
+    "write",
+})
+GCLOUD_MUTATING_PREFIXES = ("add-", "remove-", "set-", "update-", "create-", "delete-", "reset-")
+# Groups whose output is credentials or local client state.
+GCLOUD_UNCACHEABLE_GROUPS = frozenset({"auth", "config", "init"})
+
+
+def is_read_only_gcloud(args: Sequence[str]) -> bool:
+    """
+    Whether a gcloud argument list (without the ``gcloud`` prefix) only reads state.
+
+    The command path is the positional arguments before the first flag; its first
+    known verb must be read-only, and credential / config groups are excluded.
+    """
+    path: List[str] = []
+    for arg in args or []:
+        if str(arg).startswith("-"):
+            break
+        path.append(str(arg).strip().lower())
+    path = [p for p in path if p not in ("alpha", "beta")]
+    if not path or path[0] in GCLOUD_UNCACHEABLE_GROUPS:
+        return False
+    for i, word in enumerate(path):
+        if i and (word in GCLOUD_MUTATING_VERBS or word.startswith(GCLOUD_MUTATING_PREFIXES)):
+            return False
+        if word in GCLOUD_READ_ONLY_VERBS:
+            return True
+    return False
@@ -725,6 +725,7 @@ class AdkWebServer:
         tear_down_observer(observer, self)
         # Create tasks for all runner closures to run concurrently
         await cleanup.close_runners(list(self.runner_dict.values()))
+        await cleanup.close_session_service(self.session_service)
 
     memory_exporter = InMemoryExporter(session_trace_dict)
 
@@ -34,6 +34,7 @@ from ..sessions.session import Session
 from ..utils.context_utils import Aclosing
 from ..utils.env_utils import is_env_enabled
 from .service_registry import load_services_module
+from .utils import cleanup
 from .utils import envs
 from .utils.agent_loader import AgentLoader
 from .utils.service_factory import create_artifact_service_from_options
@@ -201,67 +202,70 @@ async def run_cli(
     author = event.author or 'system'
     click.echo(f'[{author}]: {"".join(text_parts)}')
 
-  if input_file:
-    session = await run_input_file(
-        app_name=session_app_name,
-        user_id=user_id,
-        agent_or_app=agent_or_app,
-        artifact_service=artifact_service,
-        session_service=session_service,
-        credential_service=credential_service,
-        input_path=input_file,
-    )
-  elif saved_session_file:
-    # Load the saved session from file
-    with open(saved_session_file, 'r', encoding='utf-8') as f:
-      loaded_session = Session.model_validate_json(f.read())
+  try:
+    if input_file:
+      session = await run_input_file(
+          app_name=session_app_name,
+          user_id=user_id,
+          agent_or_app=agent_or_app,
+          artifact_service=artifact_service,
+          session_service=session_service,
+          credential_service=credential_service,
+          input_path=input_file,
+      )
+    elif saved_session_file:
+      # Load the saved session from file
+      with open(saved_session_file, 'r', encoding='utf-8') as f:
+        loaded_session = Session.model_validate_json(f.read())
 
-    # Create a new session in the service, copying state from the file
-    session = await session_service.create_session(
-        app_name=session_app_name,
-        user_id=user_id,
-        state=loaded_session.state if loaded_session else None,
-    )
+      # Create a new session in the service, copying state from the file
+      session = await session_service.create_session(
+          app_name=session_app_name,
+          user_id=user_id,
+          state=loaded_session.state if loaded_session else None,
+      )
 
-    # Append events from the file to the new session and display them
-    if loaded_session:
-      for event in loaded_session.events:
-        await session_service.append_event(session, event)
-        _print_event(event)
+      # Append events from the file to the new session and display them
+      if loaded_session:
+        for event in loaded_session.events:
+          await session_service.append_event(session, event)
+          _print_event(event)
 
-    await run_interactively(
-        agent_or_app,
-        artifact_service,
-        session,
-        session_service,
-        credential_service,
-    )
-  else:
-    session = await session_service.create_session(
-        app_name=session_app_name, user_id=user_id
-    )
-    click.echo(f'Running agent {agent_or_app.name}, type exit to exit.')
-    await run_interactively(
-        agent_or_app,
-        artifact_service,
-        session,
-        session_service,
-        credential_service,
-    )
+      await run_interactively(
+          agent_or_app,
+          artifact_service,
+          session,
+          session_service,
+          credential_service,
+      )
+    else:
+      session = await session_service.create_session(
+          app_name=session_app_name, user_id=user_id
+      )
+      click.echo(f'Running agent {agent_or_app.name}, type exit to exit.')
+      await run_interactively(
+          agent_or_app,
+          artifact_service,
+          session,
+          session_service,
+          credential_service,
+      )
 
-  if save_session:
-    session_id = session_id or input('Session ID to save: ')
-    session_path = agent_root / f'{session_id}.session.json'
+    if save_session:
+      session_id = session_id or input('Session ID to save: ')
+      session_path = agent_root / f'{session_id}.session.json'
 
-    # Fetch the session again to get all the details.
-    session = await session_service.get_session(
-        app_name=session.app_name,
-        user_id=session.user_id,
-        session_id=session.id,
-    )
-    session_path.write_text(
-        session.model_dump_json(indent=2, exclude_none=True, by_alias=True),
-        encoding='utf-8',
-    )
+      # Fetch the session again to get all the details.
+      session = await session_service.get_session(
+          app_name=session.app_name,
+          user_id=session.user_id,
+          session_id=session.id,
+      )
+      session_path.write_text(
+          session.model_dump_json(indent=2, exclude_none=True, by_alias=True),
+          encoding='utf-8',
+      )
 
-    print('Session saved to', session_path)
+      print('Session saved to', session_path)
+  finally:
+    await cleanup.close_session_service(session_service)
@@ -251,15 +251,22 @@ def _register_builtin_services(registry: ServiceRegistry) -> None:
     elif db_path.startswith("/"):
       db_path = db_path[1:]
 
-    # SqliteSessionService only accepts db_path, warn if extra kwargs provided
-    ignored_kwargs = {k: v for k, v in kwargs.items() if k != "agents_dir"}
+    # Pass through the pool options SqliteSessionService accepts, warn about
+    # anything else.
+    supported = ("read_pool_size", "max_write_batch", "events_page_size")
+    options = {k: v for k, v in kwargs.items() if k in supported}
+    ignored_kwargs = {
+        k: v
+        for k, v in kwargs.items()
+        if k != "agents_dir" and k not in supported
+    }
     if ignored_kwargs:
       logger.warning(
-          "SqliteSessionService does not support additional kwargs. "
+          "SqliteSessionService does not support these kwargs. "
           "The following parameters will be ignored: %s",
           list(ignored_kwargs.keys()),
       )
-    return SqliteSessionService(db_path=db_path)
+    return SqliteSessionService(db_path=db_path, **options)
 
   registry.register_session_service("memory", memory_session_factory)
   registry.register_session_service("agentengine", agentengine_session_factory)
@@ -19,6 +19,7 @@ import logging
 from typing import List
 
 from ...runners import Runner
+from ...sessions.base_session_service import BaseSessionService
 
 logger = logging.getLogger("google_adk." + __name__)
 
@@ -40,3 +41,10 @@ async def close_runners(runners: List[Runner]) -> None:
       )
       for task in pending:
         task.cancel()
+
+
+async def close_session_service(session_service: BaseSessionService) -> None:
+  """Closes `session_service` if it holds connections (SQLite, database)."""
+  close = getattr(session_service, "close", None)
+  if close is not None:
+    await close()
@@ -210,3 +210,10 @@ class PerAgentDatabaseSessionService(BaseSessionService):
   async def append_event(self, session: Session, event: Event) -> Event:
     service = await self._get_service(session.app_name)
     return await service.append_event(session, event)
+
+  async def close(self) -> None:
+    """Closes the session services opened so far."""
+    async with self._service_lock:
+      services, self._services = list(self._services.values()), {}
+    for service in services:
+      await service.close()
@@ -14,9 +14,13 @@
 
 from __future__ import annotations
 
+from collections import OrderedDict
 import copy
 import logging
+import os
+import threading
 from typing import AsyncGenerator
+from typing import Hashable
 from typing import Optional
 
 from google.genai import types
@@ -51,10 +55,18 @@ class _ContentLlmRequestProcessor(BaseLlmRequestProcessor):
 
     if agent.include_contents == 'default':
       # Include full conversation history
+      session = invocation_context.session
       llm_request.contents = _get_contents(
           invocation_context.branch,
-          invocation_context.session.events,
+          session.events,
           agent.name,
+          cache_key=(
+              session.app_name,
+              session.user_id,
+              session.id,
+              invocation_context.branch,
+              agent.name,
+          ),
       )
     else:
       # Include current turn context only (no conversation history)
@@ -360,7 +372,11 @@ def _process_compaction_events(events: list[Event]) -> list[Event]:
 
 
 def _get_contents(
-    current_branch: Optional[str], events: list[Event], agent_name: str = ''
+    current_branch: Optional[str],
+    events: list[Event],
+    agent_name: str = '',
+    *,
+    cache_key: Optional[Hashable] = None,
 ) -> list[types.Content]:
   """Get the contents for the LLM request.
 
@@ -370,10 +386,20 @@ def _get_contents(
     current_branch: The current branch of the agent.
     events: Events to process.
     agent_name: The name of the agent.
+    cache_key: Identifies (session, branch, agent). When given, per-event
+      work is reused from earlier calls and only newly appended events are
+      processed; see `_IncrementalContents`.
 
   Returns:
     A list of processed contents.
   """
+  if cache_key is not None and _CONTENTS_CACHE_MAX_ENTRIES > 0:
+    contents = _get_contents_incremental(
+        cache_key, current_branch, events, agent_name
+    )
+    if contents is not None:
+      return contents
+
   accumulated_input_transcription = ''
   accumulated_output_transcription = ''
 
@@ -474,6 +500,150 @@ def _get_contents(
   return contents
 
 
+# Number of (session, branch, agent) prefixes kept by _get_contents.
+# Set ADK_CONTENTS_CACHE_SIZE=0 to always rebuild from the full event list.
+_CONTENTS_CACHE_MAX_ENTRIES = int(os.getenv('ADK_CONTENTS_CACHE_SIZE', '256'))
+
+
+class _IncrementalContents:
+  """Processed prefix of one session's events for one (branch, agent).
+
+  Session events are append-only, so whether an event is included, how
+  another agent's event is presented, and the id-stripped copy of its content
+  never change once computed. Each call only processes events appended since
+  the previous one. The function call/response rearrangement still runs over
+  the filtered list, since a late response can attach to an earlier call.
+
+  Histories containing rewinds, compaction or transcription-only events need
+  look-behind/look-ahead across the whole list and use the full path instead.
+  """
+
+  def __init__(self):
+    self.first_event: Optional[Event] = None
+    self.last_event: Optional[Event] = None
+    self.processed = 0
+    self.supported = True
+    self.filtered: list[Event] = []
+    # id(event) -> (event, processed content or None if not built yet)
+    self._contents: dict[int, tuple[Event, Optional[types.Content]]] = {}
+
+  def matches(self, events: list[Event]) -> bool:
+    """Whether `events` still starts with the prefix processed so far."""
+    if self.processed == 0:
+      return True
+    return (
+        len(events) >= self.processed
+        and events[0] is self.first_event
+        and events[self.processed - 1] is self.last_event
+    )
+
+  def extend(
+      self,
+      current_branch: Optional[str],
+      events: list[Event],
+      agent_name: str,
+  ) -> bool:
+    """Processes new events. Returns False if the history is unsupported."""
+    for event in events[self.processed :]:
+      if event.actions and (
+          event.actions.rewind_before_invocation_id
+          or event.actions.compaction
+      ):
+        self.supported = False
+        return False
+      if not _should_include_event_in_context(current_branch, event):
+        continue
+      if not event.content:
+        # Transcription-only event; merged with its neighbours on the full path
+        self.supported = False
+        return False
+      if _is_other_agent_reply(agent_name, event):
+        event = _present_other_agent_message(event)
+        if event is None:
+          continue
+      self.filtered.append(event)
+      self._contents[id(event)] = (event, None)
+    if events:
+      self.first_event = events[0]
+      self.last_event = events[-1]
+    self.processed = len(events)
+    return True
+
+  def content_for(self, event: Event) -> Optional[types.Content]:
+    """Processed content for an event, memoized for events in the prefix."""
+    entry = self._contents.get(id(event))
+    if entry is None or entry[0] is not event:
+      # Produced by rearrangement for this call only (e.g. merged responses)
+      return _to_llm_content(event)
+    if entry[1] is None:
+      entry = (event, _to_llm_content(event))
+      self._contents[id(event)] = entry
+    return entry[1]
+
+
+_contents_cache: OrderedDict[Hashable, _IncrementalContents] = OrderedDict()
+_contents_cache_lock = threading.Lock()
+
+
+def _to_llm_content(event: Event) -> Optional[types.Content]:
+  content = copy.deepcopy(event.content)
+  if content:
+    remove_client_function_call_id(content)
+  return content
+
+
+def _copy_for_request(content: types.Content) -> types.Content:
+  """Copies a memoized content down to its parts.
+
+  Request processors edit parts in place (e.g. clearing `thought`), so each
+  request gets its own Content and Part objects; the payloads under them
+  (function calls/responses, inline data) are shared, as the session's own
+  events are never modified.
+  """
+  if content.parts is None:
+    return content.model_copy()
+  return content.model_copy(
+      update={'parts': [part.model_copy() for part in content.parts]}
+  )
+
+
+def _get_contents_incremental(
+    cache_key: Hashable,
+    current_branch: Optional[str],
+    events: list[Event],
+    agent_name: str,
+) -> Optional[list[types.Content]]:
+  """`_get_contents` over a cached prefix; None if the full path is needed."""
+  with _contents_cache_lock:
+    state = _contents_cache.get(cache_key)
+    if state is None or not state.matches(events):
+      state = _IncrementalContents()
+      _contents_cache[cache_key] = state
+    _contents_cache.move_to_end(cache_key)
+    while len(_contents_cache) > _CONTENTS_CACHE_MAX_ENTRIES:
+      _contents_cache.popitem(last=False)
+
+  if not state.supported or not state.extend(
+      current_branch, events, agent_name
+  ):
+    return None
+
+  # Rearrange events for proper function call/response pairing
+  result_events = _rearrange_events_for_latest_function_response(
+      state.filtered
+  )
+  result_events = _rearrange_events_for_async_function_responses_in_history(
+      result_events
+  )
+
+  contents = []
+  for event in result_events:
+    content = state.content_for(event)
+    if content:
+      contents.append(_copy_for_request(content))
+  return contents
+
+
 def _get_current_turn_contents(
     current_branch: Optional[str], events: list[Event], agent_name: str = ''
 ) -> list[types.Content]:
@@ -13,8 +13,13 @@
 # limitations under the License.
 from __future__ import annotations
 
+import collections
+import heapq
+import itertools
+import math
 import re
 import threading
+from typing import Optional
 from typing import TYPE_CHECKING
 
 from typing_extensions import override
@@ -28,74 +33,190 @@ if TYPE_CHECKING:
   from ..events.event import Event
   from ..sessions.session import Session
 
+# BM25 parameters: term frequency saturation and document length
+# normalization.
+_BM25_K1 = 1.2
+_BM25_B = 0.75
+
 
 def _user_key(app_name: str, user_id: str):
   return f'{app_name}/{user_id}'
 
 
-def _extract_words_lower(text: str) -> set[str]:
+def _extract_words_lower(text: str) -> list[str]:
   """Extracts words from a string and converts them to lowercase."""
-  return set([word.lower() for word in re.findall(r'[A-Za-z]+', text)])
+  return [word.lower() for word in re.findall(r'[A-Za-z]+', text)]
+
+
+def _event_text(event: Event) -> str:
+  return ' '.join([part.text for part in event.content.parts if part.text])
+
+
+class _Document:
+  """An indexed event."""
+
+  __slots__ = ('event', 'session_id', 'term_counts', 'length')
+
+  def __init__(self, event: Event, session_id: str, words: list[str]):
+    self.event = event
+    self.session_id = session_id
+    self.term_counts = collections.Counter(words)
+    self.length = len(words)
+
+
+class _UserIndex:
+  """Inverted index (word -> document postings) over one user's sessions."""
+
+  def __init__(self):
+    self.sessions: dict[str, list[int]] = {}
+    """Session ID to the IDs of its indexed documents."""
+    self._documents: dict[int, _Document] = {}
+    self._postings: dict[str, dict[int, int]] = {}
+    """Word to {document ID: occurrences of the word in that document}."""
+    self._total_length = 0
+    self._next_id = itertools.count()
+
+  def add_session(self, session_id: str, events: list[Event]) -> None:
+    self.remove_session(session_id)
+    doc_ids = []
+    for event in events:
+      words = _extract_words_lower(_event_text(event))
+      if not words:
+        continue
+      doc_id = next(self._next_id)
+      document = _Document(event, session_id, words)
+      self._documents[doc_id] = document
+      self._total_length += document.length
+      for word, count in document.term_counts.items():
+        self._postings.setdefault(word, {})[doc_id] = count
+      doc_ids.append(doc_id)
+    self.sessions[session_id] = doc_ids
+
+  def remove_session(self, session_id: str) -> None:
+    for doc_id in self.sessions.pop(session_id, ()):
+      document = self._documents.pop(doc_id)
+      self._total_length -= document.length
+      for word in document.term_counts:
+        postings = self._postings[word]
+        del postings[doc_id]
+        if not postings:
+          del self._postings[word]
+
+  def search(
+      self, words: set[str], top_k: Optional[int]
+  ) -> list[_Document]:
+    """Returns the documents containing any of `words`, best BM25 first."""
+    if not self._documents:
+      return []
+    num_documents = len(self._documents)
+    average_length = self._total_length / num_documents
+    scores: dict[int, float] = collections.defaultdict(float)
+    for word in words:
+      postings = self._postings.get(word)
+      if not postings:
+        continue
+      idf = math.log(
+          1 + (num_documents - len(postings) + 0.5) / (len(postings) + 0.5)
+      )
+      for doc_id, count in postings.items():
+        length_norm = 1 - _BM25_B + _BM25_B * (
+            self._documents[doc_id].length / average_length
+        )
+        scores[doc_id] += (
+            idf * count * (_BM25_K1 + 1) / (count + _BM25_K1 * length_norm)
+        )
+    # Ties keep insertion order (older documents first).
+    rank = lambda item: (-item[1], item[0])
+    if top_k is None:
+      ranked = sorted(scores.items(), key=rank)
+    else:
+      ranked = heapq.nsmallest(top_k, scores.items(), key=rank)
+    return [self._documents[doc_id] for doc_id, _ in ranked]
 
 
 class InMemoryMemoryService(BaseMemoryService):
   """An in-memory memory service for prototyping purpose only.
 
-  Uses keyword matching instead of semantic search.
+  Uses keyword matching instead of semantic search: events are kept in a
+  per-user inverted index and results are ranked with BM25.
 
   This class is thread-safe, however, it should be used for testing and
   development only.
   """
 
-  def __init__(self):
+  def __init__(
+      self,
+      *,
+      top_k: Optional[int] = None,
+      max_sessions: Optional[int] = None,
+  ):
+    """Initializes the memory service.
+
+    Args:
+      top_k: Return at most this many memories per search (all matches if
+        None).
+      max_sessions: Keep at most this many sessions across all users; the
+        least recently added or recalled sessions are evicted first.
+    """
     self._lock = threading.Lock()
+    self._top_k = top_k
+    self._max_sessions = max_sessions
 
-    self._session_events: dict[str, dict[str, list[Event]]] = {}
-    """Keys are "{app_name}/{user_id}". Values are dicts of session_id to
-    session event lists.
-    """
+    self._indexes: dict[str, _UserIndex] = {}
+    """Keys are "{app_name}/{user_id}"."""
+    self._session_lru: collections.OrderedDict[tuple[str, str], None] = (
+        collections.OrderedDict()
+    )
+    """(user key, session ID) pairs, least recently used first."""
 
   @override
   async def add_session_to_memory(self, session: Session):
     user_key = _user_key(session.app_name, session.user_id)
+    events = [
+        event
+        for event in session.events
+        if event.content and event.content.parts
+    ]
 
     with self._lock:
-      self._session_events[user_key] = self._session_events.get(user_key, {})
-      self._session_events[user_key][session.id] = [
-          event
-          for event in session.events
-          if event.content and event.content.parts
-      ]
+      self._indexes.setdefault(user_key, _UserIndex()).add_session(
+          session.id, events
+      )
+      self._touch(user_key, session.id)
+      if self._max_sessions is not None:
+        while len(self._session_lru) > self._max_sessions:
+          (old_user_key, old_session_id), _ = self._session_lru.popitem(
+              last=False
+          )
+          index = self._indexes[old_user_key]
+          index.remove_session(old_session_id)
+          if not index.sessions:
+            del self._indexes[old_user_key]
 
   @override
   async def search_memory(
       self, *, app_name: str, user_id: str, query: str
   ) -> SearchMemoryResponse:
     user_key = _user_key(app_name, user_id)
+    words_in_query = set(_extract_words_lower(query))
 
     with self._lock:
-      session_event_lists = self._session_events.get(user_key, {})
+      index = self._indexes.get(user_key)
+      documents = index.search(words_in_query, self._top_k) if index else []
+      for session_id in {document.session_id for document in documents}:
+        self._touch(user_key, session_id)
 
-    words_in_query = _extract_words_lower(query)
     response = SearchMemoryResponse()
-
-    for session_events in session_event_lists.values():
-      for event in session_events:
-        if not event.content or not event.content.parts:
-          continue
-        words_in_event = _extract_words_lower(
-            ' '.join([part.text for part in event.content.parts if part.text])
-        )
-        if not words_in_event:
-          continue
-
-        if any(query_word in words_in_event for query_word in words_in_query):
-          response.memories.append(
-              MemoryEntry(
-                  content=event.content,
-                  author=event.author,
-                  timestamp=_utils.format_timestamp(event.timestamp),
-              )
+    for document in documents:
+      response.memories.append(
+          MemoryEntry(
+              content=document.event.content,
+              author=document.event.author,
+              timestamp=_utils.format_timestamp(document.event.timestamp),
           )
-
+      )
     return response
+
+  def _touch(self, user_key: str, session_id: str) -> None:
+    self._session_lru[(user_key, session_id)] = None
+    self._session_lru.move_to_end((user_key, session_id))
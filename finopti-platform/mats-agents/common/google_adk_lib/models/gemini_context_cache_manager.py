@@ -16,14 +16,18 @@
 
 from __future__ import annotations
 
+import collections
 import hashlib
 import json
 import logging
 import time
+from typing import Any
 from typing import Optional
 from typing import TYPE_CHECKING
+import weakref
 
 from google.genai import types
+import pydantic
 
 from ..utils.feature_decorator import experimental
 from .cache_metadata import CacheMetadata
@@ -36,6 +40,118 @@ if TYPE_CHECKING:
   from google.genai import Client
 
 
+# Process-wide counters of cache operations (a manager is created per LLM
+# call). Read them with `get_context_cache_counters()`.
+_cache_counters: collections.Counter[str] = collections.Counter()
+
+
+def get_context_cache_counters() -> dict[str, int]:
+  """Returns the context cache operation counts of this process.
+
+  Keys: `hits` (an existing cache was reused), `misses` (no reusable cache),
+  `creates`, `create_failures`, `cleanups` and `cleanup_failures`.
+  """
+  return {
+      key: _cache_counters[key]
+      for key in (
+          "hits",
+          "misses",
+          "creates",
+          "create_failures",
+          "cleanups",
+          "cleanup_failures",
+      )
+  }
+
+
+class _DigestMemo:
+  """SHA-256 digests of pydantic models, memoized per object while it lives.
+
+  Request contents, tools and configs are not modified once they reach the
+  model, so an object's digest is computed once however many fingerprints
+  include it.
+  """
+
+  def __init__(self):
+    self._digests: dict[int, tuple[weakref.ref, bytes]] = {}
+
+  def digest(self, value: Any) -> bytes:
+    if not isinstance(value, pydantic.BaseModel):
+      return hashlib.sha256(str(value).encode()).digest()
+    key = id(value)
+    entry = self._digests.get(key)
+    if entry is not None and entry[0]() is value:
+      return entry[1]
+    digest = hashlib.sha256(
+        value.model_dump_json(exclude_none=True).encode()
+    ).digest()
+    self._digests[key] = (
+        weakref.ref(value, lambda _, key=key: self._digests.pop(key, None)),
+        digest,
+    )
+    return digest
+
+
+_digest_memo = _DigestMemo()
+
+
+class _FingerprintChain:
+  """Chained fingerprints of a request's cacheable prefixes.
+
+  The chain starts from a digest of the system instruction, tools and tool
+  config; link i hashes link i-1 with the digest of content i. Once built up
+  to N contents, the fingerprint of any prefix up to N is a lookup, and
+  extending it costs one hash per new content.
+  """
+
+  def __init__(self, llm_request: LlmRequest):
+    config = llm_request.config
+    self._sources = (
+        llm_request.contents,
+        config,
+        config.system_instruction if config else None,
+        config.tools if config else None,
+        config.tool_config if config else None,
+    )
+    head = hashlib.sha256()
+    if config and config.system_instruction:
+      head.update(b"system_instruction")
+      head.update(_digest_memo.digest(config.system_instruction))
+    if config and config.tools:
+      head.update(b"tools")
+      for tool in config.tools:
+        if isinstance(tool, types.Tool):
+          head.update(_digest_memo.digest(tool))
+    if config and config.tool_config:
+      head.update(b"tool_config")
+      head.update(_digest_memo.digest(config.tool_config))
+    self._links = [head.digest()]
+
+  def matches(self, llm_request: LlmRequest) -> bool:
+    """Whether the request still has the contents and config it was built on."""
+    config = llm_request.config
+    current = (
+        llm_request.contents,
+        config,
+        config.system_instruction if config else None,
+        config.tools if config else None,
+        config.tool_config if config else None,
+    )
+    return all(a is b for a, b in zip(current, self._sources))
+
+  def fingerprint(self, contents_count: int) -> str:
+    contents = self._sources[0] or []
+    count = max(0, min(contents_count, len(contents)))
+    while len(self._links) <= count:
+      i = len(self._links) - 1
+      self._links.append(
+          hashlib.sha256(
+              self._links[i] + _digest_memo.digest(contents[i])
+          ).digest()
+      )
+    return self._links[count].hex()[:16]
+
+
 @experimental
 class GeminiContextCacheManager:
   """Manages context cache lifecycle for Gemini models.
@@ -52,6 +168,7 @@ class GeminiContextCacheManager:
         genai_client: The GenAI client to use for cache operations.
     """
     self.genai_client = genai_client
+    self._fingerprint_chain: Optional[_FingerprintChain] = None
 
   async def handle_context_caching(
       self, llm_request: LlmRequest
@@ -81,6 +198,7 @@ class GeminiContextCacheManager:
             "Cache is valid, reusing cache: %s",
             llm_request.cache_metadata.cache_name,
         )
+        _cache_counters["hits"] += 1
         cache_name = llm_request.cache_metadata.cache_name
         cache_contents_count = llm_request.cache_metadata.contents_count
         self._apply_cache_to_request(
@@ -89,6 +207,7 @@ class GeminiContextCacheManager:
         return llm_request.cache_metadata.model_copy()
       else:
         # Invalid cache - clean it up and check if we should create new one
+        _cache_counters["misses"] += 1
         old_cache_metadata = llm_request.cache_metadata
 
         # Only cleanup if there's an active cache
@@ -134,6 +253,7 @@ class GeminiContextCacheManager:
 
     # No existing cache metadata - return fingerprint-only metadata
     # We don't create cache without previous fingerprint to match
+    _cache_counters["misses"] += 1
     logger.debug(
         "No existing cache metadata, creating fingerprint-only metadata"
     )
@@ -240,38 +360,12 @@ class GeminiContextCacheManager:
     Returns:
         16-character hexadecimal fingerprint representing the cached state
     """
-    # Create fingerprint from system instruction, tools, tool_config, and first N contents
-    fingerprint_data = {}
-
-    if llm_request.config and llm_request.config.system_instruction:
-      fingerprint_data["system_instruction"] = (
-          llm_request.config.system_instruction
-      )
-
-    if llm_request.config and llm_request.config.tools:
-      # Simplified: just dump types.Tool instances to JSON
-      tools_data = []
-      for tool in llm_request.config.tools:
-        if isinstance(tool, types.Tool):
-          tools_data.append(tool.model_dump())
-      fingerprint_data["tools"] = tools_data
-
-    if llm_request.config and llm_request.config.tool_config:
-      fingerprint_data["tool_config"] = (
-          llm_request.config.tool_config.model_dump()
-      )
-
-    # Include first N contents in fingerprint
-    if cache_contents_count > 0 and llm_request.contents:
-      contents_data = []
-      for i in range(min(cache_contents_count, len(llm_request.contents))):
-        content = llm_request.contents[i]
-        contents_data.append(content.model_dump())
-      fingerprint_data["cached_contents"] = contents_data
-
-    # Generate hash using str() instead of json.dumps() to handle bytes
-    fingerprint_str = str(fingerprint_data)
-    return hashlib.sha256(fingerprint_str.encode()).hexdigest()[:16]
+    # The same request is fingerprinted for several prefix lengths (cached
+    # count, total count, new cache); build its chain once and extend it.
+    chain = self._fingerprint_chain
+    if chain is None or not chain.matches(llm_request):
+      chain = self._fingerprint_chain = _FingerprintChain(llm_request)
+    return chain.fingerprint(cache_contents_count)
 
   async def _create_new_cache_with_contents(
       self, llm_request: LlmRequest, cache_contents_count: int
@@ -306,10 +400,15 @@ class GeminiContextCacheManager:
 
     try:
       # Create cache using Gemini API directly
-      return await self._create_gemini_cache(llm_request, cache_contents_count)
+      cache_metadata = await self._create_gemini_cache(
+          llm_request, cache_contents_count
+      )
     except Exception as e:
+      _cache_counters["create_failures"] += 1
       logger.warning("Failed to create cache: %s", e)
       return None
+    _cache_counters["creates"] += 1
+    return cache_metadata
 
   def _estimate_request_tokens(self, llm_request: LlmRequest) -> int:
     """Estimate token count for the request.
@@ -426,8 +525,10 @@ class GeminiContextCacheManager:
     logger.debug("Attempting to delete cache: %s", cache_name)
     try:
       await self.genai_client.aio.caches.delete(name=cache_name)
+      _cache_counters["cleanups"] += 1
       logger.info("Cache cleaned up: %s", cache_name)
     except Exception as e:
+      _cache_counters["cleanup_failures"] += 1
       logger.warning("Failed to cleanup cache %s: %s", cache_name, e)
 
   def _apply_cache_to_request(
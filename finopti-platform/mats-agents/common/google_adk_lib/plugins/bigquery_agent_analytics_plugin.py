@@ -662,6 +662,82 @@ class TraceManager:
 # ==============================================================================
 _SHUTDOWN_SENTINEL = object()
 
+# Batches smaller than this are serialized inline: the thread hop costs more
+# than the serialization it moves off the event loop.
+_INLINE_SERIALIZE_MAX_ROWS = 16
+
+
+def _json_dumps_or_str(value: Any) -> str:
+  try:
+    return json.dumps(value)
+  except (TypeError, ValueError):
+    return str(value)
+
+
+def _encode_json_cell(value: Any) -> Any:
+  """Encodes one value for a JSON column (JSON travels as a string in Arrow)."""
+  if value is None:
+    return None
+  if isinstance(value, (str, bytes)):
+    if isinstance(value, bytes):
+      try:
+        value = value.decode("utf-8")
+      except UnicodeDecodeError:
+        value = str(value)
+    # Already a JSON object or array: keep as-is to avoid double-encoding
+    stripped = value.strip()
+    if stripped.startswith(("{", "[")) and stripped.endswith(("}", "]")):
+      try:
+        json.loads(value)
+        return value
+      except (ValueError, TypeError):
+        pass
+  return _json_dumps_or_str(value)
+
+
+class _ArrowBatchEncoder:
+  """Builds RecordBatches column by column for one Arrow schema.
+
+  Per-field decisions (JSON column, struct/list passthrough, plain scalar)
+  are made once here instead of once per cell, and the serialized writer
+  schema is computed once instead of once per batch.
+  """
+
+  _JSON = "json"
+  _NESTED = "nested"
+  _PLAIN = "plain"
+
+  def __init__(self, arrow_schema: pa.Schema):
+    self.arrow_schema = arrow_schema
+    self.serialized_schema = arrow_schema.serialize().to_pybytes()
+    self._columns: list[tuple[str, pa.DataType, str]] = []
+    for arrow_field in arrow_schema:
+      metadata = arrow_field.metadata or {}
+      if metadata.get(b"ARROW:extension:name") == b"google:sqlType:json":
+        kind = self._JSON
+      elif pa.types.is_struct(arrow_field.type) or pa.types.is_list(
+          arrow_field.type
+      ):
+        kind = self._NESTED
+      else:
+        kind = self._PLAIN
+      self._columns.append((arrow_field.name, arrow_field.type, kind))
+
+  def encode(self, rows: list[dict[str, Any]]) -> pa.RecordBatch:
+    """Encodes rows into a RecordBatch matching the schema."""
+    arrays = []
+    for name, arrow_type, kind in self._columns:
+      values = [row.get(name) for row in rows]
+      if kind == self._JSON:
+        values = [_encode_json_cell(v) for v in values]
+      elif kind == self._PLAIN:
+        # Dicts/lists in a scalar column are stored as their JSON text
+        for i, v in enumerate(values):
+          if isinstance(v, (dict, list)):
+            values[i] = _json_dumps_or_str(v)
+      arrays.append(pa.array(values, type=arrow_type))
+    return pa.RecordBatch.from_arrays(arrays, schema=self.arrow_schema)
+
 
 class BatchProcessor:
   """Handles asynchronous batching and writing of events to BigQuery."""
@@ -699,6 +775,7 @@ class BatchProcessor:
     self._queue: asyncio.Queue[dict[str, Any]] = asyncio.Queue(
         maxsize=queue_max_size
     )
+    self._encoder = _ArrowBatchEncoder(arrow_schema)
     self._batch_processor_task: Optional[asyncio.Task] = None
     self._shutdown = False
 
@@ -734,68 +811,23 @@ class BatchProcessor:
     Returns:
         pa.RecordBatch for writing.
     """
-    data = {field.name: [] for field in self.arrow_schema}
-    for row in rows:
-      for field in self.arrow_schema:
-        value = row.get(field.name)
-        # JSON fields must be serialized to strings for the Arrow layer
-        field_metadata = self.arrow_schema.field(field.name).metadata
-        is_json = False
-        if field_metadata and b"ARROW:extension:name" in field_metadata:
-          if field_metadata[b"ARROW:extension:name"] == b"google:sqlType:json":
-            is_json = True
-
-        arrow_field_type = self.arrow_schema.field(field.name).type
-        is_struct = pa.types.is_struct(arrow_field_type)
-        is_list = pa.types.is_list(arrow_field_type)
-
-        if is_json:
-          if value is not None:
-            if isinstance(value, (dict, list)):
-              try:
-                value = json.dumps(value)
-              except (TypeError, ValueError):
-                value = str(value)
-            elif isinstance(value, (str, bytes)):
-              if isinstance(value, bytes):
-                try:
-                  value = value.decode("utf-8")
-                except UnicodeDecodeError:
-                  value = str(value)
-
-              # Check if it's already a valid JSON object or array to avoid double-encoding
-              is_already_json = False
-              if isinstance(value, str):
-                stripped = value.strip()
-                if stripped.startswith(("{", "[")) and stripped.endswith(
-                    ("}", "]")
-                ):
-                  try:
-                    json.loads(value)
-                    is_already_json = True
-                  except (ValueError, TypeError):
-                    pass
-
-              if not is_already_json:
-                try:
-                  value = json.dumps(value)
-                except (TypeError, ValueError):
-                  value = str(value)
-              # If is_already_json is True, we keep value as-is
-            else:
-              # For other types (int, float, bool), serialize to JSON equivalents
-              try:
-                value = json.dumps(value)
-              except (TypeError, ValueError):
-                value = str(value)
-        elif isinstance(value, (dict, list)) and not is_struct and not is_list:
-          if value is not None and not isinstance(value, (str, bytes)):
-            try:
-              value = json.dumps(value)
-            except (TypeError, ValueError):
-              value = str(value)
-        data[field.name].append(value)
-    return pa.RecordBatch.from_pydict(data, schema=self.arrow_schema)
+    return self._encoder.encode(rows)
+
+  def _serialize_rows(self, rows: list[dict[str, Any]]) -> bytes:
+    """Encodes and serializes rows to Arrow IPC bytes (CPU only, no I/O)."""
+    return self._prepare_arrow_batch(rows).serialize().to_pybytes()
+
+  async def _serialize_rows_off_loop(self, rows: list[dict[str, Any]]) -> bytes:
+    """Serializes a batch in a worker thread so the event loop keeps running."""
+    if len(rows) < _INLINE_SERIALIZE_MAX_ROWS:
+      return self._serialize_rows(rows)
+    try:
+      loop = asyncio.get_running_loop()
+      return await loop.run_in_executor(None, self._serialize_rows, rows)
+    except RuntimeError:
+      # Default executor unavailable (e.g. rescue flush during interpreter
+      # shutdown): serialize inline.
+      return self._serialize_rows(rows)
 
   async def _batch_writer(self) -> None:
     """Worker task that batches and writes rows to BigQuery."""
@@ -862,15 +894,15 @@ class BatchProcessor:
     delay = self.retry_config.initial_delay
 
     try:
-      arrow_batch = self._prepare_arrow_batch(rows)
-      serialized_schema = self.arrow_schema.serialize().to_pybytes()
-      serialized_batch = arrow_batch.serialize().to_pybytes()
+      serialized_batch = await self._serialize_rows_off_loop(rows)
 
       req = bq_storage_types.AppendRowsRequest(
           write_stream=self.write_stream,
           trace_id=f"google-adk-bq-logger/{__version__}",
       )
-      req.arrow_rows.writer_schema.serialized_schema = serialized_schema
+      req.arrow_rows.writer_schema.serialized_schema = (
+          self._encoder.serialized_schema
+      )
       req.arrow_rows.rows.serialized_record_batch = serialized_batch
     except Exception as e:
       logger.error(
@@ -14,15 +14,30 @@
 """Utility functions for session service."""
 from __future__ import annotations
 
+import copy
 from typing import Any
 from typing import Optional
+from typing import TYPE_CHECKING
 from typing import Type
 from typing import TypeVar
 
 from .state import State
 
+if TYPE_CHECKING:
+  from ..events.event import Event
+  from .base_session_service import GetSessionConfig
+
 M = TypeVar("M")
 
+_IMMUTABLE_STATE_TYPES = (str, int, float, bool, bytes, type(None))
+
+# Event type -> the content part field that marks it.
+PART_FIELD_BY_EVENT_TYPE = {
+    "text": "text",
+    "function_call": "function_call",
+    "function_response": "function_response",
+}
+
 
 def decode_model(
     data: Optional[dict[str, Any]], model_cls: Type[M]
@@ -47,3 +62,54 @@ def extract_state_delta(
       elif not key.startswith(State.TEMP_PREFIX):
         deltas["session"][key] = state[key]
   return deltas
+
+
+def copy_state(state: dict[str, Any]) -> dict[str, Any]:
+  """Returns a copy of `state` that is safe to hand to a caller.
+
+  Equivalent to `copy.deepcopy(state)`, but scalar values are shared rather
+  than copied; only mutable values (dicts, lists, objects) are deep-copied.
+  """
+  return {
+      key: (
+          value
+          if isinstance(value, _IMMUTABLE_STATE_TYPES)
+          else copy.deepcopy(value)
+      )
+      for key, value in state.items()
+  }
+
+
+def _has_event_type(event: Event, event_type: str) -> bool:
+  if event_type == "error":
+    return event.error_code is not None
+  field = PART_FIELD_BY_EVENT_TYPE[event_type]
+  parts = event.content.parts if event.content and event.content.parts else []
+  return any(getattr(part, field) is not None for part in parts)
+
+
+def filter_events(
+    events: list[Event], config: Optional[GetSessionConfig]
+) -> list[Event]:
+  """Returns the events matching the author, invocation and event type
+  filters of `config`, in their original order."""
+  if config is None or not (
+      config.authors or config.invocation_ids or config.event_types
+  ):
+    return events
+  return [
+      event
+      for event in events
+      if (not config.authors or event.author in config.authors)
+      and (
+          not config.invocation_ids
+          or event.invocation_id in config.invocation_ids
+      )
+      and (
+          not config.event_types
+          or any(
+              _has_event_type(event, event_type)
+              for event_type in config.event_types
+          )
+      )
+  ]
@@ -16,6 +16,7 @@ from __future__ import annotations
 
 import abc
 from typing import Any
+from typing import Literal
 from typing import Optional
 
 from pydantic import BaseModel
@@ -26,11 +27,47 @@ from .session import Session
 from .state import State
 
 
+EventType = Literal['text', 'function_call', 'function_response', 'error']
+"""Kinds of events `GetSessionConfig.event_types` can select: events with a
+text part, a function call, a function response, or an error code."""
+
+
 class GetSessionConfig(BaseModel):
-  """The configuration of getting a session."""
+  """The configuration of getting a session.
+
+  The author, invocation and event type filters are applied before
+  `num_recent_events`, so it counts matching events only.
+  """
 
   num_recent_events: Optional[int] = None
   after_timestamp: Optional[float] = None
+  authors: Optional[list[str]] = None
+  """Only events written by one of these authors."""
+  invocation_ids: Optional[list[str]] = None
+  """Only events of one of these invocations."""
+  event_types: Optional[list[EventType]] = None
+  """Only events with at least one of these kinds of content."""
+
+
+class EventMetadata(BaseModel):
+  """The metadata columns of a stored event, without its content."""
+
+  id: str
+  invocation_id: str
+  author: Optional[str] = None
+  timestamp: float
+
+
+class ListEventsResponse(BaseModel):
+  """One page of a session's events, newest first.
+
+  Either `events` or, for projection queries, `event_metadata` is set.
+  """
+
+  events: list[Event] = Field(default_factory=list)
+  event_metadata: list[EventMetadata] = Field(default_factory=list)
+  next_page_token: Optional[str] = None
+  """Pass back to get the next (older) page; None on the last page."""
 
 
 class ListSessionsResponse(BaseModel):
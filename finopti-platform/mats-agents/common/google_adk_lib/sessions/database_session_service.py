@@ -14,18 +14,24 @@
 from __future__ import annotations
 
 import asyncio
+import base64
 from contextlib import asynccontextmanager
-import copy
 from datetime import datetime
 from datetime import timezone
+import json
 import logging
 from typing import Any
 from typing import AsyncIterator
 from typing import Optional
 
+from sqlalchemy import and_
+from sqlalchemy import bindparam
 from sqlalchemy import delete
 from sqlalchemy import event
+from sqlalchemy import literal_column
+from sqlalchemy import or_
 from sqlalchemy import select
+from sqlalchemy import String
 from sqlalchemy import text
 from sqlalchemy.engine import make_url
 from sqlalchemy.exc import ArgumentError
@@ -41,7 +47,9 @@ from . import _session_util
 from ..errors.already_exists_error import AlreadyExistsError
 from ..events.event import Event
 from .base_session_service import BaseSessionService
+from .base_session_service import EventMetadata
 from .base_session_service import GetSessionConfig
+from .base_session_service import ListEventsResponse
 from .base_session_service import ListSessionsResponse
 from .migration import _schema_check_utils
 from .schemas.v0 import Base as BaseV0
@@ -73,7 +81,7 @@ def _merge_state(
     session_state: dict[str, Any],
 ) -> dict[str, Any]:
   """Merge app, user, and session states into a single state dictionary."""
-  merged_state = copy.deepcopy(session_state)
+  merged_state = _session_util.copy_state(session_state)
   for key in app_state.keys():
     merged_state[State.APP_PREFIX + key] = app_state[key]
   for key in user_state.keys():
@@ -81,6 +89,42 @@ def _merge_state(
   return merged_state
 
 
+# SQL for the JSON lookups behind the author / event type filters, per
+# dialect. Column, field and path names come from the fixed tables below,
+# never from user input.
+_JSON_FIELD_SQL = {
+    "sqlite": "json_extract(events.{column}, '$.{field}')",
+    "postgresql": "(events.{column} ->> '{field}')",
+    "mysql": "JSON_UNQUOTE(JSON_EXTRACT(events.{column}, '$.{field}'))",
+}
+_JSON_PATH_EXISTS_SQL = {
+    "sqlite": (
+        "EXISTS (SELECT 1 FROM json_each(events.{column}, '{array}')"
+        " WHERE json_type(value, '$.{field}') IS NOT NULL)"
+    ),
+    "postgresql": "jsonb_path_exists(events.{column}, '{array}[*].{field}')",
+    "mysql": "JSON_CONTAINS_PATH(events.{column}, 'one', '{array}[*].{field}')",
+}
+
+
+def _create_missing_indexes(connection: Any, model: Any) -> None:
+  for index in model.__table__.indexes:
+    index.create(connection, checkfirst=True)
+
+
+def _encode_page_token(timestamp: datetime, event_id: str) -> str:
+  payload = json.dumps([timestamp.isoformat(), event_id]).encode()
+  return base64.urlsafe_b64encode(payload).decode()
+
+
+def _decode_page_token(page_token: str) -> tuple[datetime, str]:
+  try:
+    timestamp, event_id = json.loads(base64.urlsafe_b64decode(page_token))
+    return datetime.fromisoformat(timestamp), event_id
+  except (ValueError, TypeError) as e:
+    raise ValueError(f"Invalid page token: {page_token!r}") from e
+
+
 class _SchemaClasses:
   """A helper class to hold schema classes based on version."""
 
@@ -160,6 +204,69 @@ class DatabaseSessionService(BaseSessionService):
   def _get_schema_classes(self) -> _SchemaClasses:
     return _SchemaClasses(self._db_schema_version)
 
+  def _json_sql(self, templates: dict[str, str], **names: str) -> str:
+    dialect = self.db_engine.dialect.name
+    if dialect not in templates:
+      raise ValueError(
+          "Filtering events by author or event type is not supported on"
+          f" {dialect} databases."
+      )
+    return templates[dialect].format(**names)
+
+  def _event_author(self, schema: _SchemaClasses) -> Any:
+    """The author of each event, as a SQL expression."""
+    if schema.StorageEvent is StorageEventV0:
+      return schema.StorageEvent.author
+    return literal_column(
+        self._json_sql(_JSON_FIELD_SQL, column="event_data", field="author"),
+        String,
+    )
+
+  def _event_filters(
+      self, schema: _SchemaClasses, config: Optional[GetSessionConfig]
+  ) -> list[Any]:
+    """SQL conditions for the author, invocation and event type filters."""
+    if config is None:
+      return []
+    filters = []
+    if config.authors:
+      filters.append(
+          self._event_author(schema).in_(
+              bindparam("event_authors", config.authors, expanding=True)
+          )
+      )
+    if config.invocation_ids:
+      filters.append(
+          schema.StorageEvent.invocation_id.in_(config.invocation_ids)
+      )
+    if config.event_types:
+      if schema.StorageEvent is StorageEventV0:
+        column, parts = "content", "$.parts"
+      else:
+        column, parts = "event_data", "$.content.parts"
+      matches = []
+      for event_type in config.event_types:
+        if event_type == "error" and schema.StorageEvent is StorageEventV0:
+          matches.append(schema.StorageEvent.error_code.is_not(None))
+        elif event_type == "error":
+          error_code = self._json_sql(
+              _JSON_FIELD_SQL, column=column, field="error_code"
+          )
+          matches.append(text(f"{error_code} IS NOT NULL"))
+        else:
+          matches.append(
+              text(
+                  self._json_sql(
+                      _JSON_PATH_EXISTS_SQL,
+                      column=column,
+                      array=parts,
+                      field=_session_util.PART_FIELD_BY_EVENT_TYPE[event_type],
+                  )
+              )
+          )
+      filters.append(or_(*matches))
+    return filters
+
   @asynccontextmanager
   async def _rollback_on_exception_session(
       self,
@@ -218,6 +325,9 @@ class DatabaseSessionService(BaseSessionService):
             # await conn.run_sync(BaseV1.metadata.drop_all)
             logger.debug("Using V1 schema tables...")
             await conn.run_sync(BaseV1.metadata.create_all)
+            # create_all skips existing tables along with their indexes, so
+            # add indexes introduced after a table was created.
+            await conn.run_sync(_create_missing_indexes, StorageEventV1)
           else:
             # await conn.run_sync(BaseV0.metadata.drop_all)
             logger.debug("Using V0 schema tables...")
@@ -346,6 +456,7 @@ class DatabaseSessionService(BaseSessionService):
           .filter(schema.StorageEvent.app_name == app_name)
           .filter(schema.StorageEvent.session_id == storage_session.id)
           .filter(schema.StorageEvent.user_id == user_id)
+          .filter(*self._event_filters(schema, config))
       )
 
       if config and config.after_timestamp:
@@ -383,6 +494,103 @@ class DatabaseSessionService(BaseSessionService):
       )
     return session
 
+  async def list_events(
+      self,
+      *,
+      app_name: str,
+      user_id: str,
+      session_id: str,
+      config: Optional[GetSessionConfig] = None,
+      page_size: int = 100,
+      page_token: Optional[str] = None,
+      metadata_only: bool = False,
+  ) -> ListEventsResponse:
+    """Lists a session's events newest first, one page at a time.
+
+    Pages are keyset-paginated on (timestamp, id), so later pages cost the
+    same as the first and are not shifted by events appended meanwhile.
+
+    Args:
+      app_name: The name of the app.
+      user_id: The ID of the user.
+      session_id: The ID of the session.
+      config: Event filters; `after_timestamp`, `authors`, `invocation_ids`
+        and `event_types` apply, `num_recent_events` is ignored.
+      page_size: The maximum number of events per page.
+      page_token: The `next_page_token` of the previous page.
+      metadata_only: Return only the id, invocation id, author and timestamp
+        of each event, in `event_metadata`, without loading event content.
+
+    Returns:
+      A ListEventsResponse with the page and the token for the next one.
+    """
+    if page_size < 1:
+      raise ValueError("page_size must be positive.")
+    await self._prepare_tables()
+    schema = self._get_schema_classes()
+    storage_event = schema.StorageEvent
+
+    if metadata_only:
+      stmt = select(
+          storage_event.id,
+          storage_event.invocation_id,
+          self._event_author(schema).label("author"),
+          storage_event.timestamp,
+      )
+    else:
+      stmt = select(storage_event)
+    stmt = (
+        stmt.filter(storage_event.app_name == app_name)
+        .filter(storage_event.session_id == session_id)
+        .filter(storage_event.user_id == user_id)
+        .filter(*self._event_filters(schema, config))
+    )
+    if config and config.after_timestamp:
+      after_dt = datetime.fromtimestamp(config.after_timestamp)
+      stmt = stmt.filter(storage_event.timestamp >= after_dt)
+    if page_token:
+      cursor_timestamp, cursor_id = _decode_page_token(page_token)
+      stmt = stmt.filter(
+          or_(
+              storage_event.timestamp < cursor_timestamp,
+              and_(
+                  storage_event.timestamp == cursor_timestamp,
+                  storage_event.id < cursor_id,
+              ),
+          )
+      )
+    # One extra row tells whether there is a next page.
+    stmt = stmt.order_by(
+        storage_event.timestamp.desc(), storage_event.id.desc()
+    ).limit(page_size + 1)
+
+    async with self._rollback_on_exception_session() as sql_session:
+      result = await sql_session.execute(stmt)
+      rows = result.all() if metadata_only else result.scalars().all()
+
+    next_page_token = None
+    if len(rows) > page_size:
+      rows = rows[:page_size]
+      next_page_token = _encode_page_token(rows[-1].timestamp, rows[-1].id)
+
+    if metadata_only:
+      return ListEventsResponse(
+          event_metadata=[
+              EventMetadata(
+                  id=row.id,
+                  invocation_id=row.invocation_id,
+                  author=row.author,
+                  timestamp=row.timestamp.timestamp(),
+              )
+              for row in rows
+          ],
+          next_page_token=next_page_token,
+      )
+    return ListEventsResponse(
+        events=[storage_event_row.to_event() for storage_event_row in rows],
+        next_page_token=next_page_token,
+    )
+
   @override
   async def list_sessions(
       self, *, app_name: str, user_id: Optional[str] = None
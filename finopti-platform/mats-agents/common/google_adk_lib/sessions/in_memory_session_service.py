@@ -13,7 +13,6 @@
 # limitations under the License.
 from __future__ import annotations
 
-import copy
 import logging
 import time
 from typing import Any
@@ -39,6 +38,11 @@ class InMemorySessionService(BaseSessionService):
 
   It is not suitable for multi-threaded production environments. Use it for
   testing and development only.
+
+  Sessions returned to callers are snapshots: their own Session object, event
+  list and state, so they can be modified freely. The Event objects
+  themselves are shared with storage rather than deep-copied (events are
+  never modified once appended), which keeps reads of long sessions cheap.
   """
 
   def __init__(self):
@@ -124,7 +128,7 @@ class InMemorySessionService(BaseSessionService):
       self.sessions[app_name][user_id] = {}
     self.sessions[app_name][user_id][session_id] = session
 
-    copied_session = copy.deepcopy(session)
+    copied_session = self._snapshot(session, events=[])
     return self._merge_state(app_name, user_id, copied_session)
 
   @override
@@ -175,25 +179,35 @@ class InMemorySessionService(BaseSessionService):
       return None
 
     session = self.sessions[app_name][user_id].get(session_id)
-    copied_session = copy.deepcopy(session)
+    events = session.events
 
     if config:
+      # Filters first, so that num_recent_events counts matching events.
+      events = _session_util.filter_events(events, config)
       if config.num_recent_events:
-        copied_session.events = copied_session.events[
-            -config.num_recent_events :
-        ]
+        events = events[-config.num_recent_events :]
       if config.after_timestamp:
-        i = len(copied_session.events) - 1
+        i = len(events) - 1
         while i >= 0:
-          if copied_session.events[i].timestamp < config.after_timestamp:
+          if events[i].timestamp < config.after_timestamp:
             break
           i -= 1
         if i >= 0:
-          copied_session.events = copied_session.events[i + 1 :]
+          events = events[i + 1 :]
+    copied_session = self._snapshot(session, events=list(events))
 
     # Return a copy of the session object with merged state.
     return self._merge_state(app_name, user_id, copied_session)
 
+  def _snapshot(self, session: Session, events: list[Event]) -> Session:
+    """Copies a stored session for a caller, sharing the given events."""
+    return session.model_copy(
+        update={
+            'state': _session_util.copy_state(session.state),
+            'events': events,
+        }
+    )
+
   def _merge_state(
       self, app_name: str, user_id: str, copied_session: Session
   ) -> Session:
@@ -245,14 +259,12 @@ class InMemorySessionService(BaseSessionService):
       for user_id in self.sessions[app_name]:
         for session_id in self.sessions[app_name][user_id]:
           session = self.sessions[app_name][user_id][session_id]
-          copied_session = copy.deepcopy(session)
-          copied_session.events = []
+          copied_session = self._snapshot(session, events=[])
           copied_session = self._merge_state(app_name, user_id, copied_session)
           sessions_without_events.append(copied_session)
     else:
       for session in self.sessions[app_name][user_id].values():
-        copied_session = copy.deepcopy(session)
-        copied_session.events = []
+        copied_session = self._snapshot(session, events=[])
         copied_session = self._merge_state(app_name, user_id, copied_session)
         sessions_without_events.append(copied_session)
     return ListSessionsResponse(sessions=sessions_without_events)
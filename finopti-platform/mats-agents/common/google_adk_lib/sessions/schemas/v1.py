@@ -30,6 +30,7 @@ import uuid
 
 from sqlalchemy import ForeignKeyConstraint
 from sqlalchemy import func
+from sqlalchemy import Index
 from sqlalchemy import inspect
 from sqlalchemy.ext.mutable import MutableDict
 from sqlalchemy.orm import DeclarativeBase
@@ -187,6 +188,23 @@ class StorageEvent(Base):
           ["sessions.app_name", "sessions.user_id", "sessions.id"],
           ondelete="CASCADE",
       ),
+      # Serve "latest N events" and keyset pages without a sort, and
+      # per-invocation lookups, within one session.
+      Index(
+          "ix_events_session_timestamp",
+          "app_name",
+          "user_id",
+          "session_id",
+          "timestamp",
+          "id",
+      ),
+      Index(
+          "ix_events_session_invocation",
+          "app_name",
+          "user_id",
+          "session_id",
+          "invocation_id",
+      ),
   )
 
   @classmethod
@@ -13,8 +13,8 @@
 # limitations under the License.
 from __future__ import annotations
 
+import asyncio
 from contextlib import asynccontextmanager
-import copy
 import json
 import logging
 import os
@@ -42,6 +42,13 @@ logger = logging.getLogger("google_adk." + __name__)
 
 PRAGMA_FOREIGN_KEYS = "PRAGMA foreign_keys = ON"
 
+CONNECTION_PRAGMAS = (
+    PRAGMA_FOREIGN_KEYS,
+    "PRAGMA journal_mode = WAL",
+    "PRAGMA synchronous = NORMAL",
+    "PRAGMA busy_timeout = 5000",
+)
+
 APP_STATES_TABLE_SCHEMA = """
 CREATE TABLE IF NOT EXISTS app_states (
     app_name TEXT PRIMARY KEY,
@@ -85,11 +92,17 @@ CREATE TABLE IF NOT EXISTS events (
     FOREIGN KEY (app_name, user_id, session_id) REFERENCES sessions(app_name, user_id, id) ON DELETE CASCADE
 );
 """
+
+EVENTS_TIMESTAMP_INDEX_SCHEMA = """
+CREATE INDEX IF NOT EXISTS events_session_timestamp
+    ON events (app_name, user_id, session_id, timestamp);
+"""
 CREATE_SCHEMA_SQL = "\n".join([
     APP_STATES_TABLE_SCHEMA,
     USER_STATES_TABLE_SCHEMA,
     SESSIONS_TABLE_SCHEMA,
     EVENTS_TABLE_SCHEMA,
+    EVENTS_TIMESTAMP_INDEX_SCHEMA,
 ])
 
 
@@ -129,18 +142,150 @@ def _parse_db_path(db_path: str) -> tuple[str, str, bool]:
   return normalized_path, normalized_path, False
 
 
+class _ConnectionPool:
+  """Persistent connections to one database, bound to one event loop.
+
+  A single writer task owns the write connection: it takes every write job
+  queued since its last commit, runs each one in its own savepoint (so a
+  failing job only rolls back itself) and commits them together. Reads use a
+  small set of reader connections, which WAL lets run alongside the writer.
+  """
+
+  def __init__(
+      self,
+      writer: aiosqlite.Connection,
+      readers: list[aiosqlite.Connection],
+      max_write_batch: int,
+  ):
+    self._writer = writer
+    self._readers = readers
+    self._idle_readers: asyncio.Queue[aiosqlite.Connection] = asyncio.Queue()
+    for reader in readers:
+      self._idle_readers.put_nowait(reader)
+    self._max_write_batch = max_write_batch
+    self._jobs: asyncio.Queue = asyncio.Queue()
+    self._writer_task = asyncio.get_running_loop().create_task(
+        self._run_writer()
+    )
+
+  async def write(self, job):
+    """Runs `job(db)` in the next group commit and returns its result."""
+    future = asyncio.get_running_loop().create_future()
+    self._jobs.put_nowait((job, future))
+    return await future
+
+  @asynccontextmanager
+  async def reader(self):
+    db = await self._idle_readers.get()
+    try:
+      yield db
+    finally:
+      self._idle_readers.put_nowait(db)
+
+  async def _run_writer(self) -> None:
+    db = self._writer
+    while True:
+      batch = [await self._jobs.get()]
+      while len(batch) < self._max_write_batch and not self._jobs.empty():
+        batch.append(self._jobs.get_nowait())
+      jobs = [item for item in batch if item is not None]
+      if jobs:
+        await self._commit_batch(db, jobs)
+      if len(jobs) < len(batch):  # close() was called
+        return
+
+  async def _commit_batch(self, db: aiosqlite.Connection, batch: list) -> None:
+    results = []
+    try:
+      await db.execute("BEGIN IMMEDIATE")
+      for job, future in batch:
+        await db.execute("SAVEPOINT write_job")
+        try:
+          results.append((future, await job(db), None))
+        except Exception as e:  # pylint: disable=broad-exception-caught
+          await db.execute("ROLLBACK TO write_job")
+          results.append((future, None, e))
+        await db.execute("RELEASE write_job")
+      await db.execute("COMMIT")
+    except Exception as e:  # pylint: disable=broad-exception-caught
+      logger.error("SQLite group commit of %d writes failed: %s", len(batch), e)
+      if db.in_transaction:
+        try:
+          await db.execute("ROLLBACK")
+        except sqlite3.Error:
+          logger.exception("Rollback after failed group commit failed")
+      results = [(future, None, e) for _, future in batch]
+    for future, result, error in results:
+      if future.done():
+        continue
+      if error is not None:
+        future.set_exception(error)
+      else:
+        future.set_result(result)
+
+  async def close(self) -> None:
+    """Commits the queued writes, then closes every connection."""
+    self._jobs.put_nowait(None)
+    await self._writer_task
+    for db in self._connections():
+      await db.close()
+
+  def abandon(self) -> None:
+    """Closes the connections of a pool whose event loop is closed.
+
+    Nothing can be awaited on that loop any more: writes still queued there
+    are dropped (their callers went with the loop) and an open transaction
+    is rolled back when its connection closes.
+    """
+    for db in self._connections():
+      db.stop()
+
+  def _connections(self) -> list[aiosqlite.Connection]:
+    return list({id(db): db for db in [self._writer, *self._readers]}.values())
+
+
 class SqliteSessionService(BaseSessionService):
   """A session service that uses an SQLite database for storage via aiosqlite.
 
   Event data is stored as JSON to allow for schema flexibility as event
   fields evolve.
+
+  Connections are opened once per event loop and kept: the database runs in
+  WAL mode, statements stay prepared in each connection's statement cache,
+  and writes from all sessions go through a single writer that commits
+  whatever is queued in one transaction. Call `close()` (or use the service
+  as an async context manager) to flush and release them; open connections
+  keep the interpreter from exiting.
   """
 
-  def __init__(self, db_path: str):
-    """Initializes the SQLite session service with a database path."""
+  def __init__(
+      self,
+      db_path: str,
+      *,
+      read_pool_size: int = 4,
+      max_write_batch: int = 64,
+      events_page_size: Optional[int] = None,
+  ):
+    """Initializes the SQLite session service with a database path.
+
+    Args:
+      db_path: The SQLite file path or `sqlite:///` URL.
+      read_pool_size: Number of reader connections kept per event loop.
+      max_write_batch: Most writes committed together in one transaction.
+      events_page_size: If set, `get_session` loads only the latest
+        `events_page_size` events (unless `num_recent_events` is given);
+        earlier ones are fetched on demand with `load_earlier_events`.
+    """
     self._db_path, self._db_connect_path, self._db_connect_uri = _parse_db_path(
         db_path
     )
+    self._read_pool_size = max(1, read_pool_size)
+    self._max_write_batch = max(1, max_write_batch)
+    self._events_page_size = events_page_size
+    # id(loop) -> (loop, task opening that loop's pool).
+    self._pools: dict[
+        int, tuple[asyncio.AbstractEventLoop, asyncio.Task[_ConnectionPool]]
+    ] = {}
 
     if self._is_migration_needed():
       raise RuntimeError(
@@ -168,7 +313,7 @@ class SqliteSessionService(BaseSessionService):
       session_id = str(uuid.uuid4())
     now = time.time()
 
-    async with self._get_db_connection() as db:
+    async def create(db: aiosqlite.Connection) -> Session:
       # Check if session_id already exists
       async with db.execute(
           "SELECT 1 FROM sessions WHERE app_name=? AND user_id=? AND id=?",
@@ -212,7 +357,6 @@ class SqliteSessionService(BaseSessionService):
               now,
           ),
       )
-      await db.commit()
 
       # Merge states for response
       merged_state = _merge_state(
@@ -227,6 +371,9 @@ class SqliteSessionService(BaseSessionService):
           last_update_time=now,
       )
 
+    pool = await self._get_pool()
+    return await pool.write(create)
+
   @override
   async def get_session(
       self,
@@ -236,7 +383,8 @@ class SqliteSessionService(BaseSessionService):
       session_id: str,
       config: Optional[GetSessionConfig] = None,
   ) -> Optional[Session]:
-    async with self._get_db_connection() as db:
+    pool = await self._get_pool()
+    async with pool.reader() as db:
       async with db.execute(
           "SELECT state, update_time FROM sessions WHERE app_name=? AND"
           " user_id=? AND id=?",
@@ -255,15 +403,24 @@ class SqliteSessionService(BaseSessionService):
       ]
       params: list[Any] = [app_name, user_id, session_id]
 
+      filters, filter_params = _event_filters(config)
+      query_parts += filters
+      params += filter_params
+
       if config and config.after_timestamp:
         query_parts.append("AND timestamp >= ?")
         params.append(config.after_timestamp)
 
-      query_parts.append("ORDER BY timestamp DESC")
+      query_parts.append("ORDER BY timestamp DESC, rowid DESC")
 
-      if config and config.num_recent_events:
+      limit = (
+          config.num_recent_events
+          if config and config.num_recent_events
+          else self._events_page_size
+      )
+      if limit:
         query_parts.append("LIMIT ?")
-        params.append(config.num_recent_events)
+        params.append(limit)
 
       event_rows = await db.execute_fetchall(" ".join(query_parts), params)
       storage_events_data = [row["event_data"] for row in event_rows]
@@ -272,30 +429,86 @@ class SqliteSessionService(BaseSessionService):
       app_state = await self._get_app_state(db, app_name)
       user_state = await self._get_user_state(db, app_name, user_id)
 
-      # Merge states
-      merged_state = _merge_state(app_state, user_state, session_state)
-
-      # Deserialize events and reverse to chronological order
-      events = [
-          Event.model_validate_json(event_data)
-          for event_data in reversed(storage_events_data)
-      ]
+    # Merge states
+    merged_state = _merge_state(app_state, user_state, session_state)
+
+    # Deserialize events and reverse to chronological order
+    events = [
+        Event.model_validate_json(event_data)
+        for event_data in reversed(storage_events_data)
+    ]
+
+    return Session(
+        app_name=app_name,
+        user_id=user_id,
+        id=session_id,
+        state=merged_state,
+        events=events,
+        last_update_time=last_update_time,
+    )
 
-      return Session(
-          app_name=app_name,
-          user_id=user_id,
-          id=session_id,
-          state=merged_state,
-          events=events,
-          last_update_time=last_update_time,
+  async def load_earlier_events(
+      self,
+      session: Session,
+      limit: Optional[int] = None,
+      config: Optional[GetSessionConfig] = None,
+  ) -> int:
+    """Prepends the events stored before `session.events[0]` to the session.
+
+    For sessions fetched with `events_page_size` or `num_recent_events`.
+
+    Args:
+      session: A session returned by this service.
+      limit: How many earlier events to load at most; defaults to
+        `events_page_size`, or all of them if that is not set.
+      config: The config the session was fetched with; its author,
+        invocation and event type filters apply to the earlier events too.
+
+    Returns:
+      The number of events loaded; 0 once the full history is loaded.
+    """
+    query_parts = [
+        "SELECT event_data FROM events",
+        "WHERE app_name=? AND user_id=? AND session_id=?",
+    ]
+    params: list[Any] = [session.app_name, session.user_id, session.id]
+    filters, filter_params = _event_filters(config)
+    query_parts += filters
+    params += filter_params
+    if session.events:
+      query_parts.append(
+          "AND (timestamp, rowid) < (SELECT timestamp, rowid FROM events"
+          " WHERE app_name=? AND user_id=? AND session_id=? AND id=?)"
       )
+      params += [
+          session.app_name,
+          session.user_id,
+          session.id,
+          session.events[0].id,
+      ]
+    query_parts.append("ORDER BY timestamp DESC, rowid DESC")
+    limit = limit or self._events_page_size
+    if limit:
+      query_parts.append("LIMIT ?")
+      params.append(limit)
+
+    pool = await self._get_pool()
+    async with pool.reader() as db:
+      event_rows = await db.execute_fetchall(" ".join(query_parts), params)
+    earlier = [
+        Event.model_validate_json(row["event_data"])
+        for row in reversed(event_rows)
+    ]
+    session.events[:0] = earlier
+    return len(earlier)
 
   @override
   async def list_sessions(
       self, *, app_name: str, user_id: Optional[str] = None
   ) -> ListSessionsResponse:
     sessions_list = []
-    async with self._get_db_connection() as db:
+    pool = await self._get_pool()
+    async with pool.reader() as db:
       # Fetch sessions
       if user_id:
         session_rows = await db.execute_fetchall(
@@ -327,34 +540,36 @@ class SqliteSessionService(BaseSessionService):
           async for row in cursor:
             user_states_map[row["user_id"]] = json.loads(row["state"])
 
-      # Build session list
-      for row in session_rows:
-        session_user_id = row["user_id"]
-        session_state = json.loads(row["state"])
-        user_state = user_states_map.get(session_user_id, {})
-        merged_state = _merge_state(app_state, user_state, session_state)
-        sessions_list.append(
-            Session(
-                app_name=app_name,
-                user_id=session_user_id,
-                id=row["id"],
-                state=merged_state,
-                events=[],
-                last_update_time=row["update_time"],
-            )
-        )
+    # Build session list
+    for row in session_rows:
+      session_user_id = row["user_id"]
+      session_state = json.loads(row["state"])
+      user_state = user_states_map.get(session_user_id, {})
+      merged_state = _merge_state(app_state, user_state, session_state)
+      sessions_list.append(
+          Session(
+              app_name=app_name,
+              user_id=session_user_id,
+              id=row["id"],
+              state=merged_state,
+              events=[],
+              last_update_time=row["update_time"],
+          )
+      )
     return ListSessionsResponse(sessions=sessions_list)
 
   @override
   async def delete_session(
       self, *, app_name: str, user_id: str, session_id: str
   ) -> None:
-    async with self._get_db_connection() as db:
+    async def delete(db: aiosqlite.Connection) -> None:
       await db.execute(
           "DELETE FROM sessions WHERE app_name=? AND user_id=? AND id=?",
           (app_name, user_id, session_id),
       )
-      await db.commit()
+
+    pool = await self._get_pool()
+    await pool.write(delete)
 
   @override
   async def append_event(self, session: Session, event: Event) -> Event:
@@ -365,7 +580,7 @@ class SqliteSessionService(BaseSessionService):
     event = self._trim_temp_delta_state(event)
     event_timestamp = event.timestamp
 
-    async with self._get_db_connection() as db:
+    async def append(db: aiosqlite.Connection) -> None:
       # Check for stale session
       async with db.execute(
           "SELECT update_time FROM sessions WHERE app_name=? AND user_id=? AND"
@@ -443,25 +658,91 @@ class SqliteSessionService(BaseSessionService):
                 session.id,
             ),
         )
-      await db.commit()
 
-      # Update timestamp based on event time
-      session.last_update_time = event_timestamp
+    # Returns once the group commit holding this event has committed.
+    pool = await self._get_pool()
+    await pool.write(append)
+
+    # Update timestamp based on event time
+    session.last_update_time = event_timestamp
 
     # Also update the in-memory session
     await super().append_event(session=session, event=event)
     return event
 
-  @asynccontextmanager
-  async def _get_db_connection(self):
-    """Connects to the db and performs initial setup."""
-    async with aiosqlite.connect(
-        self._db_connect_path, uri=self._db_connect_uri
-    ) as db:
-      db.row_factory = aiosqlite.Row
-      await db.execute(PRAGMA_FOREIGN_KEYS)
-      await db.executescript(CREATE_SCHEMA_SQL)
-      yield db
+  async def close(self) -> None:
+    """Commits queued writes and closes this loop's pooled connections.
+
+    Pools left on event loops that are closed by now are closed as well.
+    """
+    loop = asyncio.get_running_loop()
+    self._abandon_closed_loop_pools()
+    entry = self._pools.get(id(loop))
+    if entry is None or entry[0] is not loop:
+      return
+    del self._pools[id(loop)]
+    try:
+      pool = await entry[1]
+    except Exception:  # pylint: disable=broad-exception-caught
+      return
+    await pool.close()
+
+  async def __aenter__(self) -> SqliteSessionService:
+    return self
+
+  async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+    await self.close()
+
+  async def _get_pool(self) -> _ConnectionPool:
+    """Returns the connection pool of the running event loop."""
+    loop = asyncio.get_running_loop()
+    entry = self._pools.get(id(loop))
+    opening = entry[1] if entry is not None and entry[0] is loop else None
+    if opening is None or (
+        opening.done()
+        and (opening.cancelled() or opening.exception() is not None)
+    ):
+      self._abandon_closed_loop_pools()
+      opening = loop.create_task(self._open_pool())
+      self._pools[id(loop)] = (loop, opening)
+    return await asyncio.shield(opening)
+
+  def _abandon_closed_loop_pools(self) -> None:
+    """Drops the pools of event loops that are closed (e.g. ended
+    `asyncio.run` calls) and closes their connections."""
+    for loop_id, (loop, opening) in list(self._pools.items()):
+      if not loop.is_closed():
+        continue
+      del self._pools[loop_id]
+      if (
+          opening.done()
+          and not opening.cancelled()
+          and opening.exception() is None
+      ):
+        opening.result().abandon()
+
+  async def _open_pool(self) -> _ConnectionPool:
+    writer = await self._connect()
+    await writer.executescript(CREATE_SCHEMA_SQL)
+    if self._db_connect_path == ":memory:":
+      # Every connection would get its own empty database.
+      readers = [writer]
+    else:
+      readers = [
+          await self._connect() for _ in range(self._read_pool_size)
+      ]
+    return _ConnectionPool(writer, readers, self._max_write_batch)
+
+  async def _connect(self) -> aiosqlite.Connection:
+    """Opens a pooled connection in autocommit mode with the shared pragmas."""
+    db = aiosqlite.connect(
+        self._db_connect_path, uri=self._db_connect_uri, isolation_level=None
+    )
+    await db
+    db.row_factory = aiosqlite.Row
+    for pragma in CONNECTION_PRAGMAS:
+      await db.execute(pragma)
+    return db
 
   async def _get_state(
       self, db: aiosqlite.Connection, query: str, params: tuple
@@ -582,9 +863,45 @@ class SqliteSessionService(BaseSessionService):
       ) from e
 
 
+def _event_filters(
+    config: Optional[GetSessionConfig],
+) -> tuple[list[str], list[Any]]:
+  """SQL conditions and parameters for the author, invocation and event
+  type filters of `config`, read from the stored event JSON."""
+  if config is None:
+    return [], []
+  conditions, params = [], []
+  if config.authors:
+    conditions.append(
+        "AND json_extract(event_data, '$.author') IN"
+        f" ({', '.join('?' * len(config.authors))})"
+    )
+    params += config.authors
+  if config.invocation_ids:
+    conditions.append(
+        f"AND invocation_id IN ({', '.join('?' * len(config.invocation_ids))})"
+    )
+    params += config.invocation_ids
+  if config.event_types:
+    matches = []
+    for event_type in config.event_types:
+      if event_type == "error":
+        matches.append("json_extract(event_data, '$.error_code') IS NOT NULL")
+      else:
+        matches.append(
+            "EXISTS (SELECT 1 FROM json_each(event_data, '$.content.parts')"
+            " WHERE json_extract(value, ?) IS NOT NULL)"
+        )
+        params.append(
+            f"$.{_session_util.PART_FIELD_BY_EVENT_TYPE[event_type]}"
+        )
+    conditions.append(f"AND ({' OR '.join(matches)})")
+  return conditions, params
+
+
 def _merge_state(app_state, user_state, session_state):
   """Merges app, user, and session states into a single dictionary."""
-  merged_state = copy.deepcopy(session_state)
+  merged_state = _session_util.copy_state(session_state)
   for key, value in app_state.items():
     merged_state[State.APP_PREFIX + key] = value
   for key, value in user_state.items():
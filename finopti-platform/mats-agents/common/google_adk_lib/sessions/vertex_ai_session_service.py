@@ -193,6 +193,7 @@ class VertexAiSessionService(BaseSessionService):
         session.events.append(_from_api_event(event))
 
     if config:
+      session.events = _session_util.filter_events(session.events, config)
       # Filter events based on num_recent_events.
       if config.num_recent_events:
         session.events = session.events[-config.num_recent_events :]
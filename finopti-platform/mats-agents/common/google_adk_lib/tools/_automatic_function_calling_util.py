@@ -14,8 +14,11 @@
 
 from __future__ import annotations
 
+import collections
 import collections.abc
+from enum import Enum
 import inspect
+import threading
 from types import FunctionType
 import typing
 from typing import Any
@@ -23,6 +26,7 @@ from typing import Callable
 from typing import Dict
 from typing import get_args
 from typing import get_origin
+from typing import Hashable
 from typing import Optional
 from typing import Union
 
@@ -197,10 +201,143 @@ def _get_return_type(func: Callable) -> Any:
   )
 
 
+# Process-wide caches of function signatures and declarations. Agents (and
+# their tools) are often rebuilt per request, but the functions they wrap are
+# the same module-level objects, so the introspection and pydantic schema
+# building only need to happen once per function. Entries hold a strong
+# reference to the function; the LRU bound keeps per-request closures from
+# accumulating.
+_FUNC_CACHE_MAX_ENTRIES = 1024
+_func_cache_lock = threading.Lock()
+_signature_cache: collections.OrderedDict[Hashable, inspect.Signature] = (
+    collections.OrderedDict()
+)
+_declaration_cache: collections.OrderedDict[
+    Hashable, types.FunctionDeclaration
+] = collections.OrderedDict()
+_declaration_cache_counts = {'hits': 0, 'misses': 0}
+
+
+def _func_cache_key(func: Any) -> Optional[Hashable]:
+  """Identity of `func` in the caches, or None if it can't be cached."""
+  # Each attribute access creates a new bound method object; key those on
+  # the underlying function and instance instead.
+  key = (func.__func__, func.__self__) if inspect.ismethod(func) else func
+  try:
+    hash(key)
+  except TypeError:
+    return None
+  return key
+
+
+def _cache_get(cache: collections.OrderedDict, key: Hashable) -> Any:
+  with _func_cache_lock:
+    value = cache.get(key)
+    if value is not None:
+      cache.move_to_end(key)
+    return value
+
+
+def _cache_put(cache: collections.OrderedDict, key: Hashable, value: Any):
+  with _func_cache_lock:
+    cache[key] = value
+    if len(cache) > _FUNC_CACHE_MAX_ENTRIES:
+      cache.popitem(last=False)
+
+
+def _copy_model_tree(value: Any) -> Any:
+  """Deep-copies nested models, dicts and lists; shares immutable leaves.
+
+  Several times cheaper than `model_copy(deep=True)` for declarations, whose
+  schemas are mostly unset (None) fields.
+  """
+  if isinstance(value, BaseModel):
+    return value.model_copy(
+        update={
+            name: _copy_model_tree(field_value)
+            for name, field_value in value.__dict__.items()
+            if field_value is not None
+            and not isinstance(field_value, (str, int, float, bytes, Enum))
+        }
+    )
+  if isinstance(value, dict):
+    return {key: _copy_model_tree(item) for key, item in value.items()}
+  if isinstance(value, list):
+    return [_copy_model_tree(item) for item in value]
+  return value
+
+
+def get_signature(func: Callable) -> inspect.Signature:
+  """`inspect.signature(func)`, cached per function."""
+  key = _func_cache_key(func)
+  if key is None:
+    return inspect.signature(func)
+  signature = _cache_get(_signature_cache, key)
+  if signature is None:
+    signature = inspect.signature(func)
+    _cache_put(_signature_cache, key, signature)
+  return signature
+
+
+def invalidate_function_cache(func: Optional[Callable] = None) -> None:
+  """Drops cached signatures and declarations.
+
+  Call this after changing a function's signature, annotations or docstring
+  at runtime.
+
+  Args:
+    func: The function whose entries to drop; all entries if None.
+  """
+  with _func_cache_lock:
+    if func is None:
+      _signature_cache.clear()
+      _declaration_cache.clear()
+      return
+    key = _func_cache_key(func)
+    _signature_cache.pop(key, None)
+    for cache_key in [k for k in _declaration_cache if k[0] == key]:
+      del _declaration_cache[cache_key]
+
+
+def function_cache_stats() -> dict[str, int]:
+  """Hit / miss counts and size of the declaration cache."""
+  with _func_cache_lock:
+    return {**_declaration_cache_counts, 'size': len(_declaration_cache)}
+
+
 def build_function_declaration(
     func: Union[Callable, BaseModel],
     ignore_params: Optional[list[str]] = None,
     variant: GoogleLLMVariant = GoogleLLMVariant.GEMINI_API,
+) -> types.FunctionDeclaration:
+  """Builds the declaration of `func`, cached per function and API variant.
+
+  Returns a copy the caller may modify.
+  """
+  func_key = _func_cache_key(func)
+  if func_key is None:
+    return _build_function_declaration(func, ignore_params, variant)
+  key = (
+      func_key,
+      tuple(ignore_params or ()),
+      variant,
+      is_feature_enabled(FeatureName.JSON_SCHEMA_FOR_FUNC_DECL),
+  )
+  declaration = _cache_get(_declaration_cache, key)
+  with _func_cache_lock:
+    _declaration_cache_counts[
+        'hits' if declaration is not None else 'misses'
+    ] += 1
+  if declaration is None:
+    declaration = _build_function_declaration(func, ignore_params, variant)
+    _cache_put(_declaration_cache, key, declaration)
+  return _copy_model_tree(declaration)
+
+
+def _build_function_declaration(
+    func: Union[Callable, BaseModel],
+    ignore_params: Optional[list[str]] = None,
+    variant: GoogleLLMVariant = GoogleLLMVariant.GEMINI_API,
 ) -> types.FunctionDeclaration:
   # ========== Pydantic-based function tool declaration (new feature) ==========
   if is_feature_enabled(FeatureName.JSON_SCHEMA_FOR_FUNC_DECL):
@@ -29,6 +29,7 @@ from typing_extensions import override
 
 from ..utils.context_utils import Aclosing
 from ._automatic_function_calling_util import build_function_declaration
+from ._automatic_function_calling_util import get_signature
 from .base_tool import BaseTool
 from .tool_context import ToolContext
 
@@ -114,7 +115,7 @@ class FunctionTool(BaseTool):
     Returns:
       Processed arguments ready for function invocation
     """
-    signature = inspect.signature(self.func)
+    signature = get_signature(self.func)
     converted_args = args.copy()
 
     for param_name, param in signature.parameters.items():
@@ -160,7 +161,7 @@ class FunctionTool(BaseTool):
     # Preprocess arguments (includes Pydantic model conversion)
     args_to_call = self._preprocess_args(args)
 
-    signature = inspect.signature(self.func)
+    signature = get_signature(self.func)
     valid_params = {param for param in signature.parameters}
     if 'tool_context' in valid_params:
       args_to_call['tool_context'] = tool_context
@@ -243,7 +244,7 @@ You could retry calling this tool, but it is IMPORTANT for you to provide all th
       invocation_context,
   ) -> Any:
     args_to_call = args.copy()
-    signature = inspect.signature(self.func)
+    signature = get_signature(self.func)
     if (
         self.name in invocation_context.active_streaming_tools
         and invocation_context.active_streaming_tools[self.name].stream
@@ -267,7 +268,7 @@ You could retry calling this tool, but it is IMPORTANT for you to provide all th
     Returns:
       A list of strings, where each string is the name of a mandatory parameter.
     """
-    signature = inspect.signature(self.func)
+    signature = get_signature(self.func)
     mandatory_params = []
 
     for name, param in signature.parameters.items():
@@ -26,6 +26,7 @@ from typing import List
 from typing import Optional
 
 from google.adk.models.cache_metadata import CacheMetadata
+from google.adk.models.gemini_context_cache_manager import get_context_cache_counters
 from google.adk.sessions.base_session_service import BaseSessionService
 from google.adk.utils.feature_decorator import experimental
 
@@ -97,6 +98,8 @@ class CachePerformanceAnalyzer:
         - avg_cached_tokens_per_request: Average cached tokens per request
         - total_requests: Total number of requests processed
         - requests_with_cache_hits: Number of requests that had cache hits
+        - process_cache_counters: Cache operations of this process, see
+          `get_process_cache_counters()`
     """
     cache_history = await self._get_agent_cache_history(
         session_id, user_id, app_name, agent_name
@@ -165,4 +168,23 @@ class CachePerformanceAnalyzer:
         "avg_cached_tokens_per_request": avg_cached_tokens_per_request,
         "total_requests": total_requests,
         "requests_with_cache_hits": requests_with_cache_hits,
+        "process_cache_counters": self.get_process_cache_counters(),
     }
+
+  @staticmethod
+  def get_process_cache_counters() -> Dict[str, int]:
+    """Get context cache operation counts across all agents of this process.
+
+    Unlike the per-session analysis, these come from the cache manager itself
+    and include the requests whose events carry no cache metadata.
+
+    Returns:
+        Dictionary of operation counts:
+        - hits: Requests that reused an existing cache
+        - misses: Requests with no reusable cache
+        - creates: Caches created
+        - create_failures: Cache creations that failed
+        - cleanups: Invalid caches deleted
+        - cleanup_failures: Cache deletions that failed
+    """
+    return get_context_cache_counters()
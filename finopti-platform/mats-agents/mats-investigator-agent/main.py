@@ -1,6 +1,8 @@
 
 import os
+import time
 import logging
+import threading
 from flask import Flask, request, jsonify
 import asyncio
 from agent import process_request
@@ -10,6 +12,32 @@ logger = logging.getLogger("mats-investigator-main")
 
 app = Flask(__name__)
 
+# Runs the orchestrator may cancel (speculative recon it no longer needs):
+# run_id -> (event loop, task). Cancels that arrive before their run starts
+# are remembered for a while.
+_active_runs = {}
+_early_cancels = {}
+_runs_lock = threading.Lock()
+EARLY_CANCEL_TTL_SECONDS = 300
+
+
+async def _run_cancellable(run_id, coro):
+    task = asyncio.current_task()
+    with _runs_lock:
+        now = time.monotonic()
+        for rid, at in list(_early_cancels.items()):
+            if now - at > EARLY_CANCEL_TTL_SECONDS:
+                del _early_cancels[rid]
+        if _early_cancels.pop(run_id, None) is not None:
+            coro.close()
+            raise asyncio.CancelledError()
+        _active_runs[run_id] = (asyncio.get_running_loop(), task)
+    try:
+        return await coro
+    finally:
+        with _runs_lock:
+            _active_runs.pop(run_id, None)
+
 @app.route('/health', methods=['GET'])
 def health():
     return jsonify({"status": "healthy", "service": "mats-investigator-agent"}), 200
@@ -29,12 +57,39 @@ def chat():
     user_email = data.get('user_email')  # Extract user_email for Redis channel
     logger.info(f"Received request: {len(user_message)} chars. Session: {session_id}, User: {user_email}")
 
+    run_id = data.get('run_id')
     try:
-        response = asyncio.run(process_request(user_message, session_id=session_id, user_email=user_email))
+        work = process_request(user_message, session_id=session_id, user_email=user_email)
+        response = asyncio.run(_run_cancellable(run_id, work) if run_id else work)
         return jsonify({"response": response})
+    except asyncio.CancelledError:
+        logger.info(f"Run {run_id} cancelled by the orchestrator")
+        return jsonify({"error": "cancelled", "run_id": run_id}), 409
     except Exception as e:
         logger.error(f"Error processing request: {e}")
         return jsonify({"error": str(e)}), 500
 
+@app.route('/cancel', methods=['POST'])
+def cancel():
+    """
+    Stop a run started with a ``run_id`` in /chat.
+    Payload: {"run_id": "..."}
+    """
+    data = request.json or {}
+    run_id = data.get('run_id')
+    if not run_id:
+        return jsonify({"error": "run_id is required"}), 400
+
+    with _runs_lock:
+        active = _active_runs.get(run_id)
+        if active is None:
+            _early_cancels[run_id] = time.monotonic()
+    if active is None:
+        return jsonify({"run_id": run_id, "status": "CANCEL_PENDING"}), 202
+    loop, task = active
+    loop.call_soon_threadsafe(task.cancel)
+    logger.info(f"Cancelling run {run_id}")
+    return jsonify({"run_id": run_id, "status": "CANCELLING"}), 202
+
 if __name__ == "__main__":
     app.run(host="0.0.0.0", port=8082)
@@ -12,6 +12,7 @@ import os
 import sys
 import asyncio
 import json
+import uuid
 import logging
 from typing import Dict, Any
 
@@ -47,6 +48,16 @@ from mcp_client import SequentialThinkingClient
 from planner import generate_plan, load_agent_registry, classify_issue
 from routing import match_operational_route, handle_operational_request
 from response_builder import format_investigation_response, safe_confidence
+from phase_executor import PhaseExecutor
+
+# Speculative code recon: how long it waits for first SRE observations, how
+# many rounds it may run (each extra round is a full Investigator run, started
+# only if newer SRE observations arrived), and how long the evidence-driven
+# Investigator pass waits for it. The join is kept short: recon must not gate
+# the critical path, and an unfinished recon is dropped.
+RECON_EVIDENCE_WAIT_SECONDS = float(os.getenv("MATS_RECON_EVIDENCE_WAIT_SECONDS", "20"))
+RECON_MAX_ROUNDS = int(os.getenv("MATS_RECON_MAX_ROUNDS", "1"))
+RECON_JOIN_TIMEOUT_SECONDS = float(os.getenv("MATS_RECON_JOIN_TIMEOUT_SECONDS", "5"))
 
 # --- SETUP ---
 logging.basicConfig(
@@ -127,6 +138,39 @@ def create_app():
 
 
 # --- EXECUTION LOGIC ---
+async def _early_sre_evidence(job_id: str, wait_seconds: float, limit: int = 5) -> list:
+    """SRE observations posted to the job so far, waiting briefly for the first one."""
+    if not job_id:
+        return []
+    try:
+        from job_manager import JobManager
+    except ImportError:
+        return []
+
+    deadline = asyncio.get_running_loop().time() + wait_seconds
+    while True:
+        job = await asyncio.to_thread(JobManager.get_job, job_id) or {}
+        observations = [
+            e.get("message", "")[:500] for e in job.get("events", [])
+            if e.get("source") == "mats-sre-agent" and e.get("type") in ("OBSERVATION", "TOOL_USE")
+        ]
+        if observations or asyncio.get_running_loop().time() >= deadline:
+            return observations[-limit:]
+        await asyncio.sleep(2)
+
+
+def _recon_context(recon: Dict[str, Any]) -> str:
+    """Render speculative recon findings for the evidence-driven Investigator pass."""
+    if not recon or (recon.get("status") == "INSUFFICIENT_DATA" and not recon.get("dependency_chain")):
+        return ""
+    suspects = "\n".join(f"- {f}" for f in recon.get("dependency_chain", []))
+    return (
+        "\n\nREPOSITORY RECON (already done while SRE was triaging - do not repeat, start from these):\n"
+        f"{recon.get('hypothesis') or ''}\n"
+        f"Suspect files:\n{suspects or '- none identified'}"
+    )
+
+
 @trace_span("investigation_run", kind="CHAIN")
 async def run_investigation_async(
     user_request: str,
@@ -150,7 +194,10 @@ async def run_investigation_async(
         delegate_to_sre, 
         delegate_to_investigator, 
         delegate_to_architect,
+        delegate_code_recon,
+        cancel_investigator_run,
     )
+    from planner import CLOUD_ISSUE_TAXONOMY
     from quality_gates import (
         gate_planning_to_triage,
         gate_triage_to_analysis,
@@ -232,10 +279,8 @@ async def run_investigation_async(
                                      
                                      rca_text = await asyncio.to_thread(_fetch)
                                  else:
-                                     import aiohttp
-                                     async with aiohttp.ClientSession() as http_client:
-                                         async with http_client.get(url, timeout=10) as resp:
-                                             rca_text = await resp.text()
+                                     from common.http_client import get as http_get
+                                     rca_text = (await http_get(url, timeout=10)).text
                                  
                                  # Parse and validate
                                  rca_data = json.loads(rca_text)
@@ -293,6 +338,7 @@ async def run_investigation_async(
     # Initialize Sequential Thinking MCP
     seq_client = SequentialThinkingClient()
     token_reset = _sequential_thinking_ctx.set(seq_client)
+    phases = PhaseExecutor(session_id)
     
     try:
         await seq_client.connect()
@@ -313,7 +359,7 @@ async def run_investigation_async(
                 await _report_progress(plan_summary, event_type="THOUGHT", icon="🧠")
                 
                 if job_id and JobManager:
-                    JobManager.add_event(job_id, "PLAN", plan_summary, "orchestrator")
+                    await asyncio.to_thread(JobManager.add_event, job_id, "PLAN", plan_summary, "orchestrator")
             except Exception as e:
                 await _report_progress(f"Planning failed: {e}", event_type="ERROR", icon="❌", display_type="alert")
                 raise e
@@ -331,7 +377,7 @@ async def run_investigation_async(
         else:
             logger.info(f"[{session_id}] Resuming job {resume_job_id}. Skipping Planning.")
             if JobManager:
-                prev_job = JobManager.get_job(resume_job_id)
+                prev_job = await asyncio.to_thread(JobManager.get_job, resume_job_id)
                 if prev_job and prev_job.get("result"):
                     session.sre_findings = prev_job["result"].get("sre_findings")
 
@@ -346,7 +392,7 @@ async def run_investigation_async(
             # RESUME SRE
             logger.info(f"[{session_id}] Resuming SRE with user input: {user_request}")
             if JobManager:
-                JobManager.add_event(job_id, "SYSTEM", "Resuming SRE Analysis...", "orchestrator")
+                await asyncio.to_thread(JobManager.add_event, job_id, "SYSTEM", "Resuming SRE Analysis...", "orchestrator")
             
             # Extract Project ID from user input (Heuristic)
             patterns = [
@@ -384,23 +430,61 @@ async def run_investigation_async(
              GOAL: Finish the investigation or declared "ROOT_CAUSE_NOT_FOUND".
              """
              
-            sre_result = await delegate_to_sre(
+            phases.add("sre", lambda deps: delegate_to_sre(
                 sre_resume_prompt,
                 project_id,
                 session_id,
                 job_id=job_id,
                 user_email=user_email
-            )
+            ))
         else:
             # FRESH SRE CALL
-            sre_result = await delegate_to_sre(
+            phases.add("sre", lambda deps: delegate_to_sre(
                 f"{user_request}\n\nFocus on finding error signatures and stack traces.",
                 project_id,
                 session_id,
                 job_id=job_id,
                 user_email=user_email,
                 issue_type=issue_type
-            )
+            ))
+
+        # Speculative code recon runs alongside SRE triage and is cancelled if
+        # the triage outcome means the Investigator is not needed.
+        recon_rounds = []
+        if repo_url:
+            recon_issue_type = issue_type if issue_type in CLOUD_ISSUE_TAXONOMY else classify_issue(user_request)[0]
+
+            recon_run_ids = []
+
+            async def _code_recon(deps):
+                # Each round sees the SRE observations posted so far; while SRE
+                # is still triaging, newer ones start a refining round.
+                evidence = await _early_sre_evidence(job_id, RECON_EVIDENCE_WAIT_SECONDS)
+                recon = None
+                for round_no in range(RECON_MAX_ROUNDS):
+                    recon_run_ids.append(f"{session_id}-recon-{round_no}-{uuid.uuid4().hex[:8]}")
+                    recon = await delegate_code_recon(
+                        user_request, repo_url, recon_issue_type, evidence, session_id, user_email=user_email,
+                        previous=recon, run_id=recon_run_ids[-1]
+                    )
+                    recon_rounds.append(recon)
+                    if phases.done("sre"):
+                        break
+                    latest = await _early_sre_evidence(job_id, 0)
+                    if not [e for e in latest if e not in evidence]:
+                        break
+                    evidence = latest
+                return recon
+
+            async def _cancel_recon_runs():
+                # The local task is gone; stop the Investigator working on it too
+                if recon_run_ids:
+                    await cancel_investigator_run(recon_run_ids[-1], session_id)
+
+            phases.add("code_recon", _code_recon, speculative=True, on_cancel=_cancel_recon_runs)
+            phases.start("code_recon")
+
+        sre_result = await phases.result("sre")
             
         session.sre_findings = sre_result
         session.confidence_scores['sre'] = safe_confidence(sre_result.get('confidence'))
@@ -409,6 +493,7 @@ async def run_investigation_async(
         
         # Handle Interactive SRE Pause
         if sre_result.get("status") == "WAITING_FOR_APPROVAL":
+            phases.cancel_speculative("SRE paused for approval")
             pending_steps = sre_result.get("pending_steps", [])
             steps_list = "\n".join([f"- {s}" for s in pending_steps])
             response_msg = (
@@ -428,6 +513,7 @@ async def run_investigation_async(
             }
 
         if gate_result == GateDecision.FAIL:
+            phases.cancel_speculative(f"triage gate failed: {reason}")
             # Check if failure is an infra blocker (authentication, permission, etc.)
             blockers = sre_result.get("blockers", [])
             infra_keywords = ["authentication", "permission", "access", "role", "limit", "quota", "iam", "policy", "forbidden", "403"]
@@ -445,7 +531,9 @@ async def run_investigation_async(
                     "evidence": json.dumps(sre_result.get('evidence', {}))
                 }
                 
-                arch_result = await delegate_to_architect(sre_result, inv_result_skipped, session_id, user_request=user_request)
+                arch_result = await phases.run("architect", lambda deps: delegate_to_architect(
+                    sre_result, inv_result_skipped, session_id, user_request=user_request
+                ), deps=("sre",))
                 return format_investigation_response(session, arch_result, sre_result, session_id)
 
             # Genuine Failure / Inconclusive Triage
@@ -461,12 +549,15 @@ async def run_investigation_async(
                 "evidence": json.dumps(sre_result.get('evidence', {}))
             }
 
-            arch_result = await delegate_to_architect(sre_result, inv_result_skipped, session_id, user_request=user_request)
+            arch_result = await phases.run("architect", lambda deps: delegate_to_architect(
+                sre_result, inv_result_skipped, session_id, user_request=user_request
+            ), deps=("sre",))
             return format_investigation_response(session, arch_result, sre_result, session_id)
         
         # --- SHORTCUT: SRE found root cause, skip Investigator ---
         if sre_result.get("root_cause_found"):
             logger.info(f"[{session_id}] SRE identified root cause. Skipping Investigator phase.")
+            phases.cancel_speculative("SRE identified root cause")
             session.workflow.transition_to(WorkflowPhase.SYNTHESIS, "Generating RCA (Infra Root Cause)")
             
             inv_result_skipped = {
@@ -477,19 +568,25 @@ async def run_investigation_async(
                 "evidence": "See SRE Report"
             }
             
-            arch_result = await delegate_to_architect(sre_result, inv_result_skipped, session_id)
+            arch_result = await phases.run("architect", lambda deps: delegate_to_architect(
+                sre_result, inv_result_skipped, session_id
+            ), deps=("sre",))
             return format_investigation_response(session, arch_result, sre_result, session_id)
 
         # --- PHASE 3: CODE ANALYSIS (Investigator) ---
         await _report_progress("Analyzing code repositories (Investigator)...", event_type="STATUS_UPDATE", icon="💻", display_type="step_progress")
         session.workflow.transition_to(WorkflowPhase.CODE_ANALYSIS, "Investigating code")
-        sre_context = json.dumps(sre_result.get('evidence', {}), indent=2)
-        inv_result = await delegate_to_investigator(
+        recon = await phases.result_within("code_recon", RECON_JOIN_TIMEOUT_SECONDS)
+        if recon is None and recon_rounds:
+            # A refining round was still running; use the last finished one
+            recon = recon_rounds[-1]
+        sre_context = json.dumps(sre_result.get('evidence', {}), indent=2) + _recon_context(recon)
+        inv_result = await phases.run("investigate", lambda deps: delegate_to_investigator(
             f"{user_request}\n\nAnalyze the code based on the following evidence.",
             sre_context,
             repo_url,
             session_id
-        )
+        ), deps=("sre",))
         session.investigator_findings = inv_result
         session.confidence_scores['investigator'] = safe_confidence(inv_result.get('confidence'))
         
@@ -513,7 +610,11 @@ async def run_investigation_async(
         # --- PHASE 4: SYNTHESIS (Architect) ---
         await _report_progress("Synthesizing Root Cause Analysis (Architect)...", event_type="STATUS_UPDATE", icon="🏗️", display_type="step_progress")
         session.workflow.transition_to(WorkflowPhase.SYNTHESIS, "Generating RCA")
-        arch_result = await delegate_to_architect(sre_result, inv_result, session_id, user_request=user_request)
+        arch_result = await phases.run(
+            "architect",
+            lambda deps: delegate_to_architect(sre_result, inv_result, session_id, user_request=user_request),
+            deps=("sre", "investigate"),
+        )
         
         return format_investigation_response(session, arch_result, sre_result, session_id)
         
@@ -528,7 +629,11 @@ async def run_investigation_async(
         }
         
     finally:
+        await phases.aclose()
         if 'session' in locals():
+            session.phase_timings = phases.timings()
+            if session.phase_timings["overlap_seconds"]:
+                logger.info(f"[{session_id}] Phase timings: {session.phase_timings}")
             await update_session(session)
         await seq_client.close()
         _sequential_thinking_ctx.reset(token_reset)
@@ -4,13 +4,14 @@ MATS Orchestrator - Delegation Tools
 HTTP-based delegation to Team Lead agents (SRE, Investigator, Architect).
 """
 import asyncio
-import aiohttp
 import os
 import logging
 from utils.tracing import trace_span
 from typing import Dict, Any
 from pydantic import ValidationError
 
+from common.http_client import post_json
+
 from schemas import SREOutput, InvestigatorOutput, ArchitectOutput
 from retry import retry_async, NonRetryableError
 from error_codes import ErrorCode, execute_recovery
@@ -33,26 +34,22 @@ async def _http_post(url: str, data: Dict[str, Any], timeout: int = 900) -> Dict
         NonRetryableError: For 4xx HTTP errors
         RetryableError: For 5xx HTTP errors
     """
-    async with aiohttp.ClientSession() as session:
-        try:
-            async with session.post(
-                f"{url}/chat",
-                json=data,
-                timeout=aiohttp.ClientTimeout(total=timeout)
-            ) as resp:
-                if resp.status >= 500:
-                    text = await resp.text()
-                    raise Exception(f"HTTP {resp.status}: {text}")
-                    
-                elif resp.status >= 400:
-                    text = await resp.text()
-                    raise NonRetryableError(f"HTTP {resp.status}: {text}")
-                    
-                result = await resp.json()
-                return result
-                
-        except asyncio.TimeoutError:
-            raise Exception(f"Request to {url} timed out after {timeout}s")
+    return await _post(f"{url}/chat", data, timeout)
+
+
+async def _post(endpoint: str, data: Dict[str, Any], timeout: int) -> Dict[str, Any]:
+    """POST over the shared keep-alive pool (common/http_client.py)."""
+    try:
+        resp = await post_json(endpoint, data, timeout=timeout)
+    except asyncio.TimeoutError:
+        raise Exception(f"Request to {endpoint} timed out after {timeout}s")
+
+    if resp.status >= 500:
+        raise Exception(f"HTTP {resp.status}: {resp.text}")
+    elif resp.status >= 400:
+        raise NonRetryableError(f"HTTP {resp.status}: {resp.text}")
+
+    return resp.json()
 
 
 @trace_span("delegate_sre", kind="AGENT")
@@ -201,7 +198,8 @@ async def delegate_to_investigator(
     repo_url: str,
     session_id: str = "unknown",
     job_id: str = None,
-    user_email: str = None
+    user_email: str = None,
+    run_id: str = None
 ) -> Dict[str, Any]:
     """
     Delegate task to Investigator Agent.
@@ -212,6 +210,7 @@ async def delegate_to_investigator(
         repo_url: GitHub repository URL
         session_id: Investigation session ID
         job_id: Async Job ID
+        run_id: Optional ID for this run, so it can be stopped with cancel_investigator_run
         
     Returns:
         InvestigatorOutput schema dict
@@ -245,6 +244,8 @@ Please investigate the code and return findings in this JSON format:
     async def _call():
         logger.info(f"[{session_id}] Delegating to Investigator")
         payload = {"message": prompt, "session_id": session_id, "user_email": user_email}  # Pass session_id and user_email
+        if run_id:
+            payload["run_id"] = run_id
         if job_id:
             payload["job_id"] = job_id
             payload["orchestrator_url"] = "http://mats-orchestrator:8084" 
@@ -295,6 +296,73 @@ Please investigate the code and return findings in this JSON format:
     )
 
 
+@trace_span("delegate_code_recon", kind="AGENT")
+async def delegate_code_recon(
+    user_request: str,
+    repo_url: str,
+    issue_type: str,
+    early_evidence: list,
+    session_id: str = "unknown",
+    user_email: str = None,
+    previous: Dict[str, Any] = None,
+    run_id: str = None
+) -> Dict[str, Any]:
+    """
+    Speculative repository recon, run by the Investigator while SRE triage is
+    still in progress. Maps the code paths relevant to the issue type so the
+    evidence-driven Investigator pass can start from a shortlist.
+
+    Args:
+        user_request: The reported problem
+        repo_url: GitHub repository URL
+        issue_type: Classified issue type (key of CLOUD_ISSUE_TAXONOMY)
+        early_evidence: SRE observations posted so far (may be empty)
+        session_id: Investigation session ID
+        user_email: User's email for context
+        previous: Result of the previous recon round, refined with newer evidence
+        run_id: Investigator run ID (see cancel_investigator_run)
+
+    Returns:
+        InvestigatorOutput schema dict (suspect files in dependency_chain)
+    """
+    taxonomy = CLOUD_ISSUE_TAXONOMY.get(issue_type, CLOUD_ISSUE_TAXONOMY["compute"])
+    signals = ", ".join(taxonomy.get("keywords", [])[:12])
+    evidence = "\n".join(f"- {e}" for e in early_evidence) or "None yet - SRE triage is still running."
+
+    task = f"""SPECULATIVE REPOSITORY RECON (SRE triage is running in parallel).
+Reported problem: {user_request}
+Issue type: {issue_type} (typical signals: {signals})
+
+Do NOT conclude a root cause yet. Instead:
+1. Map the service entry points and the dependency chain relevant to a {issue_type} issue
+2. Note recent commits or changes touching those paths
+3. List the files most likely implicated, one line each with the reason
+
+Put the suspect files in "dependency_chain" and a short summary of the code layout in "hypothesis"."""
+    if previous:
+        suspects = "\n".join(f"- {f}" for f in previous.get("dependency_chain", [])) or "- none identified"
+        task += f"""
+
+An earlier recon round (before the newest SRE evidence) found:
+{previous.get("hypothesis") or ""}
+Suspect files:
+{suspects}
+Refine this with the new evidence instead of starting over."""
+
+    return await delegate_to_investigator(task, evidence, repo_url, session_id, user_email=user_email, run_id=run_id)
+
+
+async def cancel_investigator_run(run_id: str, session_id: str = "unknown") -> bool:
+    """Ask the Investigator to stop a run it is still working on (best effort)."""
+    try:
+        await _post(f"{INVESTIGATOR_AGENT_URL}/cancel", {"run_id": run_id}, timeout=10)
+        logger.info(f"[{session_id}] Cancelled Investigator run {run_id}")
+        return True
+    except Exception as e:
+        logger.warning(f"[{session_id}] Could not cancel Investigator run {run_id}: {e}")
+        return False
+
+
 @trace_span("delegate_architect", kind="AGENT")
 async def delegate_to_architect(
     sre_findings: Dict[str, Any],
@@ -458,7 +526,7 @@ async def delegate_to_operational_agent(
             # Some agents might check headers directly, others via payload
             # For standard Flask wrapper in gcloud_agent, headers are propagated via request context
             # But we can't easily set headers in _http_post helper without modifying it.
-            # However, _http_post uses aiohttp.ClientSession(). It doesn't take custom headers arg.
+            # However, _http_post goes through common.http_client and doesn't take a custom headers arg.
             # We will rely on payload propagation if supported, or modify _http_post if needed.
             # GCloud agent's main.py checks X-Request-ID, but not W3C traceparent essentially?
             # Actually, `send_message` in agent.py uses InMemoryRunner which creates a new trace?
@@ -467,27 +535,8 @@ async def delegate_to_operational_agent(
         except ImportError:
             pass
 
-        # Operational agents use /execute endpoint
-        # We need to manually construct the URL since _http_post appends /chat
-        # So we can't use _http_post directly. We'll duplicate logic briefly or refactor.
-        # Let's assume we use _http_post but we need to change the endpoint.
-        # Refactor time: Let's just use aiohttp directly here to avoid breaking _http_post
-        
-        async with aiohttp.ClientSession() as session:
-            async with session.post(
-                f"{agent_url}/execute",
-                json=payload,
-                timeout=aiohttp.ClientTimeout(total=600)
-            ) as resp:
-                if resp.status >= 500:
-                    text = await resp.text()
-                    raise Exception(f"HTTP {resp.status}: {text}")
-                elif resp.status >= 400:
-                    text = await resp.text()
-                    raise NonRetryableError(f"HTTP {resp.status}: {text}")
-                    
-                result = await resp.json()
-                return result
+        # Operational agents use /execute endpoint (_http_post appends /chat)
+        return await _post(f"{agent_url}/execute", payload, timeout=600)
 
     return await retry_async(
         _call,
@@ -556,19 +605,11 @@ async def delegate_to_remediation(
         except ImportError:
             pass
 
-        # Direct AIOHTTP call to /execute
-        async with aiohttp.ClientSession() as client:
-            # We can pass headers here
-            async with client.post(
-                f"{REMEDIATION_AGENT_URL}/execute",
-                json=payload,
-                timeout=aiohttp.ClientTimeout(total=600)
-            ) as resp:
-                if resp.status >= 400:
-                    text = await resp.text()
-                    raise Exception(f"Remediation Agent Error {resp.status}: {text}")
-                
-                return await resp.json()
+        resp = await post_json(f"{REMEDIATION_AGENT_URL}/execute", payload, timeout=600)
+        if resp.status >= 400:
+            raise Exception(f"Remediation Agent Error {resp.status}: {resp.text}")
+
+        return resp.json()
 
     return await retry_async(
         _call,
@@ -1,74 +1,376 @@
-
-import asyncio
+import abc
+import os
+import json
 import uuid
 import time
+import logging
+import threading
 from typing import Dict, List, Any, Optional
 from datetime import datetime
 
+logger = logging.getLogger(__name__)
+
+# Store selection: "memory" (single replica) or "redis" (shared by N replicas)
+JOB_STORE_BACKEND = os.getenv("MATS_JOB_STORE", "memory").lower()
+# Finished jobs are kept this long, then dropped
+JOB_TTL_SECONDS = int(os.getenv("MATS_JOB_TTL_SECONDS", str(7 * 24 * 3600)))
+# Safety net for jobs whose replica died before they finished
+ACTIVE_JOB_TTL_SECONDS = int(os.getenv("MATS_ACTIVE_JOB_TTL_SECONDS", str(24 * 3600)))
+MAX_JOB_EVENTS = 200
+
+ACTIVE_STATUSES = ("RUNNING", "WAITING_FOR_USER")
+
+
+def _new_event(event_type: str, message: str, source: str) -> Dict[str, Any]:
+    return {
+        "timestamp": datetime.utcnow().isoformat(),
+        "type": event_type,
+        "message": message,
+        "source": source
+    }
+
+
+class JobStore(abc.ABC):
+    """Storage backend interface for JobManager."""
+
+    @abc.abstractmethod
+    def create(self, job: Dict[str, Any]):
+        ...
+
+    @abc.abstractmethod
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        ...
+
+    @abc.abstractmethod
+    def exists(self, job_id: str) -> bool:
+        ...
+
+    @abc.abstractmethod
+    def update(self, job_id: str, fields: Dict[str, Any]):
+        """Set fields; a "status" change wakes wait_for_status_change callers."""
+
+    @abc.abstractmethod
+    def add_event(self, job_id: str, event: Dict[str, Any]):
+        ...
+
+    @abc.abstractmethod
+    def active_job_for_user(self, user_email: str) -> Optional[str]:
+        ...
+
+    @abc.abstractmethod
+    def wait_for_status_change(self, job_id: str, from_status: str, timeout: float) -> Optional[Dict[str, Any]]:
+        ...
+
+
+class InMemoryJobStore(JobStore):
+    """
+    Process-local store. Finished jobs are evicted after JOB_TTL_SECONDS and
+    active jobs are indexed by user, so memory stays flat over long uptimes.
+    """
+
+    def __init__(self):
+        self._jobs: Dict[str, Dict[str, Any]] = {}
+        self._finished_at: Dict[str, float] = {}
+        self._active_by_user: Dict[str, str] = {}
+        self._status_changed = threading.Condition()
+
+    def _evict_expired(self):
+        cutoff = time.time() - JOB_TTL_SECONDS
+        for job_id in [j for j, t in self._finished_at.items() if t < cutoff]:
+            self._jobs.pop(job_id, None)
+            self._finished_at.pop(job_id, None)
+
+    def create(self, job: Dict[str, Any]):
+        with self._status_changed:
+            self._evict_expired()
+            self._jobs[job["id"]] = job
+            self._active_by_user[job.get("user_email")] = job["id"]
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        return self._jobs.get(job_id)
+
+    def exists(self, job_id: str) -> bool:
+        return job_id in self._jobs
+
+    def update(self, job_id: str, fields: Dict[str, Any]):
+        with self._status_changed:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return
+            job.update(fields)
+            if "status" not in fields:
+                return
+            user_email = job.get("user_email")
+            if fields["status"] in ACTIVE_STATUSES:
+                self._finished_at.pop(job_id, None)
+                self._active_by_user[user_email] = job_id
+            else:
+                self._finished_at[job_id] = time.time()
+                if self._active_by_user.get(user_email) == job_id:
+                    del self._active_by_user[user_email]
+            self._status_changed.notify_all()
+
+    def add_event(self, job_id: str, event: Dict[str, Any]):
+        job = self._jobs.get(job_id)
+        if job is None:
+            return
+        job["events"].append(event)
+        # Keep log size manageable
+        if len(job["events"]) > MAX_JOB_EVENTS:
+            job["events"] = job["events"][-MAX_JOB_EVENTS:]
+
+    def active_job_for_user(self, user_email: str) -> Optional[str]:
+        job_id = self._active_by_user.get(user_email)
+        job = self._jobs.get(job_id) if job_id else None
+        if job and job.get("status") in ACTIVE_STATUSES:
+            return job_id
+        return None
+
+    def wait_for_status_change(self, job_id: str, from_status: str, timeout: float) -> Optional[Dict[str, Any]]:
+        deadline = time.monotonic() + timeout
+        with self._status_changed:
+            while True:
+                job = self._jobs.get(job_id)
+                if job is None or job.get("status") != from_status:
+                    return job
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return job
+                self._status_changed.wait(remaining)
+
+
+class RedisJobStore(JobStore):
+    """
+    Redis store shared by all orchestrator replicas.
+
+    Keys:
+        mats:job:{id}                 HASH   job fields (result JSON-encoded)
+        mats:job:{id}:events          STREAM capped with XADD MAXLEN ~
+        mats:job:{id}:status          PUBSUB status-change notifications
+        mats:jobs:active_user:{email} STRING active job id for that user
+
+    Finished jobs expire after JOB_TTL_SECONDS; active ones are refreshed with
+    ACTIVE_JOB_TTL_SECONDS so a crashed replica can't leak them forever.
+    """
+
+    JSON_FIELDS = ("result",)
+
+    def __init__(self, client=None):
+        if client is None:
+            import redis
+            client = redis.Redis(
+                host=os.getenv("REDIS_HOST", "redis_session_store"),
+                port=int(os.getenv("REDIS_PORT", "6379")),
+                db=int(os.getenv("REDIS_DB", "0")),
+                decode_responses=True,
+            )
+        self._redis = client
+
+    @staticmethod
+    def _key(job_id: str) -> str:
+        return f"mats:job:{job_id}"
+
+    @staticmethod
+    def _user_key(user_email: str) -> str:
+        return f"mats:jobs:active_user:{user_email}"
+
+    def _encode(self, fields: Dict[str, Any]) -> Dict[str, str]:
+        encoded = {}
+        for k, v in fields.items():
+            if k in self.JSON_FIELDS:
+                encoded[k] = json.dumps(v, default=str)
+            elif v is None:
+                encoded[k] = ""
+            else:
+                encoded[k] = str(v)
+        return encoded
+
+    def _decode(self, raw: Dict[str, str]) -> Dict[str, Any]:
+        job: Dict[str, Any] = {}
+        for k, v in raw.items():
+            if k in self.JSON_FIELDS:
+                job[k] = json.loads(v) if v else None
+            elif k == "created_at":
+                job[k] = float(v)
+            else:
+                job[k] = v if v != "" else None
+        return job
+
+    def _get_status(self, job_id: str) -> Optional[str]:
+        return self._redis.hget(self._key(job_id), "status")
+
+    @staticmethod
+    def _encode_event(event: Dict[str, Any]) -> Dict[str, str]:
+        return {k: "" if v is None else str(v) for k, v in event.items()}
+
+    def create(self, job: Dict[str, Any]):
+        fields = {k: v for k, v in job.items() if k != "events"}
+        key = self._key(job["id"])
+        pipe = self._redis.pipeline()
+        pipe.hset(key, mapping=self._encode(fields))
+        pipe.expire(key, ACTIVE_JOB_TTL_SECONDS)
+        # Seed the stream here so it can get its TTL in the same round trip
+        for event in job.get("events", []):
+            pipe.xadd(f"{key}:events", self._encode_event(event), maxlen=MAX_JOB_EVENTS, approximate=True)
+        if job.get("events"):
+            pipe.expire(f"{key}:events", ACTIVE_JOB_TTL_SECONDS)
+        pipe.set(self._user_key(job.get("user_email")), job["id"], ex=ACTIVE_JOB_TTL_SECONDS)
+        pipe.execute()
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        pipe = self._redis.pipeline()
+        pipe.hgetall(self._key(job_id))
+        pipe.xrange(f"{self._key(job_id)}:events")
+        raw, entries = pipe.execute()
+        if not raw:
+            return None
+        job = self._decode(raw)
+        job["events"] = [fields for _, fields in entries]
+        return job
+
+    def exists(self, job_id: str) -> bool:
+        return bool(self._redis.exists(self._key(job_id)))
+
+    def update(self, job_id: str, fields: Dict[str, Any]):
+        key = self._key(job_id)
+        if not self._redis.exists(key):
+            return
+        status = fields.get("status")
+        user_email = self._redis.hget(key, "user_email") if status else None
+
+        pipe = self._redis.pipeline()
+        pipe.hset(key, mapping=self._encode(fields))
+        if status in ACTIVE_STATUSES:
+            pipe.expire(key, ACTIVE_JOB_TTL_SECONDS)
+            pipe.expire(f"{key}:events", ACTIVE_JOB_TTL_SECONDS)
+            pipe.set(self._user_key(user_email), job_id, ex=ACTIVE_JOB_TTL_SECONDS)
+        elif status:
+            pipe.expire(key, JOB_TTL_SECONDS)
+            pipe.expire(f"{key}:events", JOB_TTL_SECONDS)
+        pipe.execute()
+
+        if status:
+            if status not in ACTIVE_STATUSES:
+                self._clear_active(user_email, job_id)
+            self._redis.publish(f"{key}:status", status)
+
+    def _clear_active(self, user_email: str, job_id: str):
+        user_key = self._user_key(user_email)
+        # Only drop the index if it still points at this job
+        with self._redis.pipeline() as pipe:
+            try:
+                pipe.watch(user_key)
+                if pipe.get(user_key) == job_id:
+                    pipe.multi()
+                    pipe.delete(user_key)
+                    pipe.execute()
+            except Exception as e:
+                logger.debug(f"Active job index for {user_email} changed concurrently: {e}")
+
+    def add_event(self, job_id: str, event: Dict[str, Any]):
+        key = self._key(job_id)
+        if not self._redis.exists(key):
+            return
+        self._redis.xadd(f"{key}:events", self._encode_event(event), maxlen=MAX_JOB_EVENTS, approximate=True)
+
+    def active_job_for_user(self, user_email: str) -> Optional[str]:
+        job_id = self._redis.get(self._user_key(user_email))
+        if job_id and self._get_status(job_id) in ACTIVE_STATUSES:
+            return job_id
+        return None
+
+    def wait_for_status_change(self, job_id: str, from_status: str, timeout: float) -> Optional[Dict[str, Any]]:
+        deadline = time.monotonic() + timeout
+        pubsub = self._redis.pubsub(ignore_subscribe_messages=True)
+        try:
+            # Subscribe before the first read so a change in between isn't missed
+            pubsub.subscribe(f"{self._key(job_id)}:status")
+            while True:
+                status = self._get_status(job_id)
+                if status is None or status != from_status:
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                pubsub.get_message(timeout=min(remaining, 5.0))
+        finally:
+            pubsub.close()
+        return self.get(job_id)
+
+
+def _create_store() -> JobStore:
+    if JOB_STORE_BACKEND == "redis":
+        logger.info("JobManager using Redis job store")
+        return RedisJobStore()
+    return InMemoryJobStore()
+
+
 class JobManager:
     """
-    Simple In-Memory Job Manager.
+    Job Manager facade over a pluggable JobStore (MATS_JOB_STORE=memory|redis).
     Stores job status, results, and an event log for UI polling.
+    Status changes wake long-poll waiters (see wait_for_status_change).
     """
-    _jobs: Dict[str, Dict[str, Any]] = {}
-    
+    _store: JobStore = _create_store()
+
+    @classmethod
+    def use_store(cls, store: JobStore):
+        cls._store = store
+
     @classmethod
     def update_result(cls, job_id: str, result: Any, status: str = "COMPLETED"):
-        if job_id in cls._jobs:
-            cls._jobs[job_id]["result"] = result
-            cls._jobs[job_id]["status"] = status
+        if cls._store.exists(job_id):
             cls.add_event(job_id, "SYSTEM", f"Job {status}", "orchestrator")
+            cls._store.update(job_id, {"result": result, "status": status})
+
+    @classmethod
+    def update_job(cls, job_id: str, fields: Dict[str, Any]):
+        cls._store.update(job_id, fields)
 
     @classmethod
     def fail_job(cls, job_id: str, error: str):
-        if job_id in cls._jobs:
-            cls._jobs[job_id]["error"] = error
-            cls._jobs[job_id]["status"] = "FAILED"
+        if cls._store.exists(job_id):
             cls.add_event(job_id, "ERROR", error, "orchestrator")
+            cls._store.update(job_id, {"error": error, "status": "FAILED"})
+
+    @classmethod
+    def resume_job(cls, job_id: str):
+        """Put a WAITING_FOR_USER job back to RUNNING so waiters don't return on the old status"""
+        # Keep "result": the resumed run reads the previous SRE findings from it.
+        cls._store.update(job_id, {"status": "RUNNING"})
+
+    @classmethod
+    def wait_for_status_change(cls, job_id: str, from_status: str = "RUNNING", timeout: float = 25.0) -> Optional[Dict[str, Any]]:
+        """
+        Block until the job's status differs from ``from_status`` or ``timeout`` expires.
+        Returns the job (possibly unchanged), or None if it does not exist.
+        """
+        return cls._store.wait_for_status_change(job_id, from_status, timeout)
 
     @classmethod
     def get_job(cls, job_id: str) -> Optional[Dict[str, Any]]:
-        return cls._jobs.get(job_id)
+        return cls._store.get(job_id)
 
     @classmethod
     def get_active_job_for_user(cls, user_email: str) -> Optional[str]:
         """Find a running or waiting job for a user"""
-        # Linear search is fine for in-memory POC
-        for job in cls._jobs.values():
-            # Check if job belongs to user (heuristic via user_request or metadata if we had it)
-            # For now, we only have user_request. Real impl would store user_email in job.
-            # We'll rely on the caller to handle email matching if not stored, 
-            # BUT we should store it. Let's assume we store it in create_job or update it.
-            if job.get("user_email") == user_email and job.get("status") in ["RUNNING", "WAITING_FOR_USER"]:
-                return job["id"]
-        return None
+        return cls._store.active_job_for_user(user_email)
 
     @classmethod
     def create_job(cls, user_request: str, user_email: str = "unknown") -> str:
         job_id = str(uuid.uuid4())
-        cls._jobs[job_id] = {
+        cls._store.create({
             "id": job_id,
             "status": "RUNNING",
             "created_at": time.time(),
             "user_request": user_request,
             "user_email": user_email,
-            "events": [], 
+            "events": [_new_event("SYSTEM", "Job started", "orchestrator")],
             "result": None,
             "error": None
-        }
-        cls.add_event(job_id, "SYSTEM", "Job started", "orchestrator")
+        })
         return job_id
 
     @classmethod
     def add_event(cls, job_id: str, event_type: str, message: str, source: str = "orchestrator"):
-        if job_id in cls._jobs:
-            event = {
-                "timestamp": datetime.utcnow().isoformat(),
-                "type": event_type,
-                "message": message,
-                "source": source
-            }
-            cls._jobs[job_id]["events"].append(event)
-            # Keep log size manageable
-            if len(cls._jobs[job_id]["events"]) > 200:
-                cls._jobs[job_id]["events"] = cls._jobs[job_id]["events"][-200:]
+        cls._store.add_event(job_id, _new_event(event_type, message, source))
@@ -1,10 +1,17 @@
 
 import os
+import sys
+import atexit
+import signal
+import asyncio
 import logging
+import threading
 from flask import Flask, request, jsonify
-import asyncio
 from agent import run_investigation_async
 from job_manager import JobManager
+from routing import match_operational_route
+from scheduler import JobScheduler, SchedulerBusy, PRIORITY_NEW, PRIORITY_RESUME, PRIORITY_REMEDIATION
+from common.http_client import http_stats
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
@@ -20,9 +27,34 @@ logging.getLogger().addHandler(fh) # Root logger
 
 app = Flask(__name__)
 
+# All jobs run on one long-lived loop with bounded concurrency
+scheduler = JobScheduler()
+
+# GET /jobs/<id>?wait=N long-polls hold a server thread each. Waits above
+# MATS_MAX_JOB_WAIT_SECONDS (the UI asks for 25) are rejected, and at most
+# MATS_MAX_LONG_POLLS are held at once; beyond that the job is returned
+# immediately and the client falls back to short polling. Under gunicorn,
+# give the service at least MATS_MAX_LONG_POLLS + 4 threads so job
+# submissions and agent progress posts are never starved by pollers.
+MAX_JOB_WAIT_SECONDS = float(os.getenv("MATS_MAX_JOB_WAIT_SECONDS", "25"))
+MAX_LONG_POLLS = int(os.getenv("MATS_MAX_LONG_POLLS", "16"))
+_long_poll_slots = threading.BoundedSemaphore(MAX_LONG_POLLS)
+
 @app.route('/health', methods=['GET'])
 def health():
-    return jsonify({"status": "healthy", "service": "mats-orchestrator"}), 200
+    return jsonify({
+        "status": "healthy",
+        "service": "mats-orchestrator",
+        "http_pool": http_stats(),
+        "jobs": scheduler.stats(),
+    }), 200
+
+
+def _job_priority(user_request: str, resuming: bool) -> int:
+    matched, _, agent_name = match_operational_route(user_request)
+    if matched and agent_name == "Remediation Agent":
+        return PRIORITY_REMEDIATION
+    return PRIORITY_RESUME if resuming else PRIORITY_NEW
 
 # -------------------------------------------------------------------------
 # ASYNC JOB ENDPOINTS (NEW)
@@ -60,6 +92,7 @@ def start_job():
         job_id = existing_job_id
         logger.info(f"Resuming Job {job_id} for user {user_email}")
         JobManager.add_event(job_id, "SYSTEM", f"Resuming job with user input: {user_request[:50]}...", "orchestrator")
+        JobManager.resume_job(job_id)
         
         # Fire async resume
         async def background_task_resume():
@@ -74,15 +107,18 @@ def start_job():
                     trace_context=trace_context,
                     provided_session_id=provided_session_id  # Pass UI session ID
                 )
-                JobManager.update_result(job_id, result, result.get("status", "COMPLETED"))
+                await asyncio.to_thread(JobManager.update_result, job_id, result, result.get("status", "COMPLETED"))
             except Exception as e:
                 logger.error(f"Job {job_id} failed on resume: {e}", exc_info=True)
-                JobManager.fail_job(job_id, str(e))
+                await asyncio.to_thread(JobManager.fail_job, job_id, str(e))
                 
-        import threading
-        def run_resume_in_thread():
-            asyncio.run(background_task_resume())
-        threading.Thread(target=run_resume_in_thread).start()
+        try:
+            ahead = scheduler.submit(job_id, user_email, background_task_resume, _job_priority(user_request, resuming=True))
+        except SchedulerBusy as e:
+            JobManager.update_job(job_id, {"status": "WAITING_FOR_USER"})
+            return jsonify({"error": str(e)}), 503
+        if ahead:
+            JobManager.add_event(job_id, "SYSTEM", f"Queued behind {ahead} job(s)", "orchestrator")
         
         return jsonify({"job_id": job_id, "status": "RESUMED"}), 202
 
@@ -106,18 +142,21 @@ def start_job():
             # Update status based on result (WAITING_FOR_USER vs COMPLETED)
             final_status = result.get("status", "COMPLETED")
             if final_status == "WAITING_FOR_USER":
-                JobManager.update_result(job_id, result, "WAITING_FOR_USER")
+                await asyncio.to_thread(JobManager.update_result, job_id, result, "WAITING_FOR_USER")
             else:
-                JobManager.update_result(job_id, result, "COMPLETED")
+                await asyncio.to_thread(JobManager.update_result, job_id, result, "COMPLETED")
 
         except Exception as e:
             logger.error(f"Job {job_id} failed: {e}", exc_info=True)
-            JobManager.fail_job(job_id, str(e))
+            await asyncio.to_thread(JobManager.fail_job, job_id, str(e))
 
-    import threading
-    def run_new_in_thread():
-        asyncio.run(background_task_new())
-    threading.Thread(target=run_new_in_thread).start()
+    try:
+        ahead = scheduler.submit(job_id, user_email, background_task_new, _job_priority(user_request, resuming=False))
+    except SchedulerBusy as e:
+        JobManager.fail_job(job_id, str(e))
+        return jsonify({"job_id": job_id, "error": str(e)}), 503
+    if ahead:
+        JobManager.add_event(job_id, "SYSTEM", f"Queued behind {ahead} job(s)", "orchestrator")
 
     return jsonify({"job_id": job_id, "status": "RUNNING"}), 202
 
@@ -125,8 +164,24 @@ def start_job():
 def get_job_status(job_id):
     """
     Get job status and event log.
+
+    Long-poll: ``?wait=<seconds>`` holds the request until the status moves
+    away from ``?since=<status>`` (default RUNNING) or the wait expires, so
+    callers wake as soon as the job finishes instead of polling. Waits above
+    MATS_MAX_JOB_WAIT_SECONDS get a 400; when MATS_MAX_LONG_POLLS are already
+    held, the job is returned without waiting.
     """
-    job = JobManager.get_job(job_id)
+    wait = request.args.get('wait', default=0.0, type=float)
+    if wait > MAX_JOB_WAIT_SECONDS:
+        return jsonify({"error": f"wait must be at most {MAX_JOB_WAIT_SECONDS:g} seconds"}), 400
+    if wait > 0 and _long_poll_slots.acquire(blocking=False):
+        try:
+            since = request.args.get('since', 'RUNNING')
+            job = JobManager.wait_for_status_change(job_id, since, wait)
+        finally:
+            _long_poll_slots.release()
+    else:
+        job = JobManager.get_job(job_id)
     if not job:
         return jsonify({"error": "Job not found"}), 404
     return jsonify(job)
@@ -167,7 +222,24 @@ def chat():
     """Legacy chat endpoint"""
     return start_job()
 
+def _abandon_job(job_id: str):
+    JobManager.fail_job(job_id, "Orchestrator shut down before the job finished")
+
+
+def _shutdown():
+    scheduler.drain(on_abandoned=_abandon_job)
+
+atexit.register(_shutdown)
+
+
+def _on_sigterm(signum, frame):
+    logger.info("SIGTERM received, draining jobs")
+    _shutdown()
+    sys.exit(0)
+
+
 if __name__ == "__main__":
+    signal.signal(signal.SIGTERM, _on_sigterm)
     port = int(os.environ.get("PORT", 8080))
     logger.info(f"Starting MATS Orchestrator on port {port}")
     app.run(host="0.0.0.0", port=port)
@@ -23,6 +23,9 @@ tracer_provider = None
 tracer = None
 
 TRACE_ENDPOINT = os.getenv("PHOENIX_COLLECTOR_ENDPOINT", "http://phoenix:6006/v1/traces")
+# Phoenix only ingests traces; metrics (e.g. common/http_client.py pool stats)
+# are exported only when an OTLP metrics collector is configured.
+METRICS_ENDPOINT = os.getenv("OTEL_EXPORTER_OTLP_METRICS_ENDPOINT")
 
 
 def setup_observability() -> tuple:
@@ -49,6 +52,8 @@ def setup_observability() -> tuple:
     # Instrument ADK
     GoogleADKInstrumentor().instrument(tracer_provider=tracer_provider)
     
+    setup_metrics()
+
     # Get tracer for creating spans
     tracer = trace.get_tracer(__name__)
     
@@ -60,6 +65,27 @@ def setup_observability() -> tuple:
     return tracer_provider, tracer
 
 
+def setup_metrics():
+    """Install a global MeterProvider exporting to METRICS_ENDPOINT, if set."""
+    if not METRICS_ENDPOINT:
+        return
+    try:
+        from opentelemetry import metrics
+        from opentelemetry.sdk.metrics import MeterProvider
+        from opentelemetry.sdk.metrics.export import PeriodicExportingMetricReader
+        from opentelemetry.sdk.resources import Resource
+        from opentelemetry.exporter.otlp.proto.http.metric_exporter import OTLPMetricExporter
+
+        reader = PeriodicExportingMetricReader(OTLPMetricExporter(endpoint=METRICS_ENDPOINT))
+        metrics.set_meter_provider(MeterProvider(
+            resource=Resource.create({"service.name": "mats-orchestrator"}),
+            metric_readers=[reader],
+        ))
+        logger.info(f"OTel metrics exporting to {METRICS_ENDPOINT}")
+    except Exception as e:
+        logger.warning(f"OTel metrics setup failed: {e}")
+
+
 def ensure_api_key_env():
     """Ensure API Key is in environment ONLY if not using Vertex AI.
     
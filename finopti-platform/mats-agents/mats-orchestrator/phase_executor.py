@@ -0,0 +1,243 @@
+"""
+MATS Orchestrator - Phase Executor
+
+Small DAG runner for investigation phases. Each phase is an async callable
+that receives the results of its dependencies; phases with no dependency
+between them run concurrently on the current event loop.
+
+- ``start(name)`` launches a phase (and, transitively, its dependencies).
+- ``result(name)`` starts it if needed and awaits its result.
+- Speculative phases are work started before we know it will be needed;
+  ``cancel_speculative()`` drops them when a quality gate says otherwise.
+  A phase's ``on_cancel`` hook runs then, to stop remote work the local
+  task had started (e.g. an Investigator run on another service).
+- Per-phase wall-clock timings are kept so the overlap (time saved versus
+  running the same phases back to back) is visible on the session and in
+  OTel metrics.
+"""
+import time
+import asyncio
+import logging
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Optional, Sequence, Set
+
+logger = logging.getLogger(__name__)
+
+PhaseFn = Callable[[Dict[str, Any]], Awaitable[Any]]
+CancelHook = Callable[[], Awaitable[Any]]
+
+_duration_histogram = None
+_cancelled_counter = None
+
+
+def _init_metrics():
+    global _duration_histogram, _cancelled_counter
+    if _duration_histogram is not None:
+        return
+    try:
+        from opentelemetry import metrics
+    except ImportError:
+        return
+    meter = metrics.get_meter("mats.phases")
+    _duration_histogram = meter.create_histogram(
+        "mats.phase.duration", unit="s", description="Wall-clock time per investigation phase"
+    )
+    _cancelled_counter = meter.create_counter(
+        "mats.phase.cancelled", description="Speculative phases cancelled before completion"
+    )
+
+
+@dataclass
+class Phase:
+    name: str
+    run: PhaseFn
+    deps: Sequence[str] = ()
+    speculative: bool = False
+    on_cancel: Optional[CancelHook] = None
+    task: Optional[asyncio.Task] = None
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    status: str = "PENDING"
+
+
+class PhaseCancelled(Exception):
+    """A phase was cancelled (speculation dropped) before producing a result."""
+
+
+class PhaseExecutor:
+    """Runs a DAG of named async phases with speculative cancellation."""
+
+    def __init__(self, session_id: str = "unknown"):
+        self.session_id = session_id
+        self._phases: Dict[str, Phase] = {}
+        self._created_at = time.monotonic()
+        self._cancel_hooks: Set[asyncio.Task] = set()
+        _init_metrics()
+
+    def add(self, name: str, run: PhaseFn, deps: Sequence[str] = (), speculative: bool = False,
+            on_cancel: Optional[CancelHook] = None) -> "PhaseExecutor":
+        """Register a phase. ``run`` is called with ``{dep_name: dep_result}``.
+
+        ``on_cancel`` is awaited in the background if the phase is cancelled
+        before finishing.
+        """
+        if name in self._phases:
+            raise ValueError(f"Phase '{name}' already registered")
+        for dep in deps:
+            if dep not in self._phases:
+                raise ValueError(f"Phase '{name}' depends on unknown phase '{dep}'")
+        self._phases[name] = Phase(name, run, tuple(deps), speculative, on_cancel)
+        return self
+
+    def has(self, name: str) -> bool:
+        return name in self._phases
+
+    def start(self, name: str) -> asyncio.Task:
+        """Launch a phase (idempotent). Dependencies are launched too."""
+        phase = self._phases[name]
+        if phase.task is None:
+            for dep in phase.deps:
+                self.start(dep)
+            phase.task = asyncio.get_running_loop().create_task(self._execute(phase), name=f"phase:{name}")
+        return phase.task
+
+    async def result(self, name: str) -> Any:
+        """Await a phase's result, starting it if necessary.
+
+        Raises:
+            PhaseCancelled: The phase was cancelled before finishing.
+        """
+        task = self.start(name)
+        try:
+            return await asyncio.shield(task)
+        except asyncio.CancelledError:
+            if task.cancelled():
+                raise PhaseCancelled(name)
+            raise
+
+    async def run(self, name: str, run: PhaseFn, deps: Sequence[str] = ()) -> Any:
+        """Register a phase and await its result in one step."""
+        self.add(name, run, deps)
+        return await self.result(name)
+
+    async def result_within(self, name: str, timeout: float) -> Optional[Any]:
+        """Join a speculative phase without letting it gate the critical path.
+
+        Returns None if the phase is missing, failed, was cancelled, or did not
+        finish within ``timeout`` (in which case it is cancelled).
+        """
+        if name not in self._phases:
+            return None
+        task = self.start(name)
+        done, _ = await asyncio.wait({task}, timeout=timeout)
+        if not done:
+            self.cancel(name, f"not finished within {timeout:.0f}s of being needed")
+            return None
+        if task.cancelled():
+            return None
+        if task.exception() is not None:
+            logger.warning(f"[{self.session_id}] Phase '{name}' failed: {task.exception()}")
+            return None
+        return task.result()
+
+    def done(self, name: str) -> bool:
+        phase = self._phases.get(name)
+        return bool(phase and phase.task and phase.task.done())
+
+    async def _execute(self, phase: Phase) -> Any:
+        dep_results = {}
+        for dep in phase.deps:
+            dep_results[dep] = await self._phases[dep].task
+        phase.started_at = time.monotonic()
+        phase.status = "RUNNING"
+        try:
+            result = await phase.run(dep_results)
+            phase.status = "DONE"
+            return result
+        except asyncio.CancelledError:
+            phase.status = "CANCELLED"
+            raise
+        except Exception:
+            phase.status = "FAILED"
+            raise
+        finally:
+            phase.finished_at = time.monotonic()
+            if _duration_histogram is not None:
+                _duration_histogram.record(
+                    phase.finished_at - phase.started_at,
+                    {"phase": phase.name, "status": phase.status, "speculative": phase.speculative},
+                )
+
+    # ---------------------------------------------------------------------
+    # Cancellation
+    # ---------------------------------------------------------------------
+    def cancel(self, name: str, reason: str = "") -> bool:
+        """Cancel a phase that has not finished. Returns True if it was running/pending."""
+        phase = self._phases.get(name)
+        if not phase or phase.task is None or phase.task.done():
+            if phase and phase.task is None:
+                phase.status = "SKIPPED"
+            return False
+        phase.task.cancel()
+        if phase.started_at is None:
+            phase.status = "CANCELLED"
+        if phase.speculative and _cancelled_counter is not None:
+            _cancelled_counter.add(1, {"phase": name})
+        if phase.on_cancel is not None:
+            hook = asyncio.get_running_loop().create_task(self._run_cancel_hook(phase), name=f"cancel:{name}")
+            self._cancel_hooks.add(hook)
+            hook.add_done_callback(self._cancel_hooks.discard)
+        logger.info(f"[{self.session_id}] Cancelled phase '{name}'{': ' + reason if reason else ''}")
+        return True
+
+    async def _run_cancel_hook(self, phase: Phase):
+        try:
+            await phase.on_cancel()
+        except Exception as e:
+            logger.warning(f"[{self.session_id}] Cancel hook for phase '{phase.name}' failed: {e}")
+
+    def cancel_speculative(self, reason: str = "") -> int:
+        """Cancel every unfinished speculative phase. Returns how many were cancelled."""
+        return sum(self.cancel(p.name, reason) for p in self._phases.values() if p.speculative)
+
+    async def aclose(self):
+        """Cancel anything still running and wait for it to unwind."""
+        pending = [p.task for p in self._phases.values() if p.task and not p.task.done()]
+        for p in list(self._phases.values()):
+            if p.task and not p.task.done():
+                self.cancel(p.name, "investigation finished")
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+        if self._cancel_hooks:
+            await asyncio.gather(*list(self._cancel_hooks), return_exceptions=True)
+
+    # ---------------------------------------------------------------------
+    # Timings
+    # ---------------------------------------------------------------------
+    def timings(self) -> Dict[str, Any]:
+        """Per-phase offsets/durations plus the overlap gained from concurrency.
+
+        ``sequential_seconds`` is the sum of durations of phases that ran to
+        completion (what running them back to back would have taken);
+        ``wall_seconds`` is first start to last finish.
+        """
+        phases = {}
+        starts, ends, total = [], [], 0.0
+        for p in self._phases.values():
+            entry = {"status": p.status, "speculative": p.speculative}
+            if p.started_at is not None:
+                end = p.finished_at if p.finished_at is not None else time.monotonic()
+                entry["start_offset_seconds"] = round(p.started_at - self._created_at, 3)
+                entry["seconds"] = round(end - p.started_at, 3)
+                starts.append(p.started_at)
+                ends.append(end)
+                if p.status in ("DONE", "FAILED"):
+                    total += end - p.started_at
+            phases[p.name] = entry
+        wall = (max(ends) - min(starts)) if starts else 0.0
+        return {
+            "phases": phases,
+            "wall_seconds": round(wall, 3),
+            "sequential_seconds": round(total, 3),
+            "overlap_seconds": round(max(total - wall, 0.0), 3),
+        }
@@ -6,6 +6,7 @@ Handles detection and delegation of simple operational requests (e.g. "list VMs"
 that bypass the full investigation workflow.
 """
 import re
+import asyncio
 import logging
 from typing import Dict, Any, Optional, Tuple
 
@@ -38,6 +39,12 @@ OPERATIONAL_ROUTES = [
     (r'\bgcloud\s+', 'gcloud', "GCloud Agent"),
 ]
 
+# Compiled once at import. One combined search rejects the common case
+# (investigation requests) in a single pass; on a hit the routes are checked
+# in order, so the first matching route still wins.
+_COMPILED_ROUTES = [(re.compile(pattern), url_key, name) for pattern, url_key, name in OPERATIONAL_ROUTES]
+_ANY_ROUTE_RE = re.compile('|'.join(f'(?:{pattern})' for pattern, _, _ in OPERATIONAL_ROUTES))
+
 # URL resolution map
 _URL_MAP = {
     'gcloud': lambda: GCLOUD_AGENT_URL,
@@ -55,15 +62,17 @@ def match_operational_route(user_request: str) -> Tuple[bool, Optional[str], Opt
         Tuple of (matched: bool, agent_url: str or None, agent_name: str or None)
     """
     request_lower = user_request.lower()
+    if not _ANY_ROUTE_RE.search(request_lower):
+        return False, None, None
     
-    for pattern, url_key, name in OPERATIONAL_ROUTES:
-        if re.search(pattern, request_lower):
+    for pattern, url_key, name in _COMPILED_ROUTES:
+        if pattern.search(request_lower):
             # Resolve URL at match time
             url_resolver = _URL_MAP.get(url_key)
             agent_url = url_resolver() if url_resolver else None
             
             if agent_url:
-                logger.info(f"Request matched operational route: {name} (Pattern: {pattern})")
+                logger.info(f"Request matched operational route: {name} (Pattern: {pattern.pattern})")
                 return True, agent_url, name
             else:
                 logger.warning(f"Route matched {name} but URL not available for key '{url_key}'")
@@ -124,7 +133,7 @@ async def handle_operational_request(
         if job_id:
             try:
                 from job_manager import JobManager
-                JobManager.update_job(job_id, {"status": "COMPLETED", "result": op_result})
+                await asyncio.to_thread(JobManager.update_job, job_id, {"status": "COMPLETED", "result": op_result})
             except ImportError:
                 pass
         
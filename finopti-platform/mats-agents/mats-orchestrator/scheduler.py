@@ -0,0 +1,221 @@
+"""
+MATS Orchestrator - Job Scheduler
+
+Runs troubleshooting jobs on one long-lived event loop thread instead of a
+new thread + ``asyncio.run`` per job.
+
+- At most MATS_MAX_CONCURRENT_JOBS jobs run at once; the rest queue.
+- Lower priority number runs first (remediation before resumes before new
+  investigations).
+- Within a priority, the user with the fewest running jobs goes next, and no
+  user holds more than MATS_MAX_JOBS_PER_USER slots.
+- Queue depth, running count and queue wait are exported via OTel metrics
+  and ``stats()``.
+- ``drain()`` stops intake and lets queued/running jobs finish on shutdown.
+"""
+import os
+import time
+import asyncio
+import logging
+import threading
+import itertools
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+MAX_CONCURRENT_JOBS = int(os.getenv("MATS_MAX_CONCURRENT_JOBS", "8"))
+MAX_JOBS_PER_USER = int(os.getenv("MATS_MAX_JOBS_PER_USER", "2"))
+MAX_QUEUED_JOBS = int(os.getenv("MATS_MAX_QUEUED_JOBS", "200"))
+DRAIN_TIMEOUT_SECONDS = float(os.getenv("MATS_DRAIN_TIMEOUT_SECONDS", "600"))
+
+# Job priorities (lower runs first)
+PRIORITY_REMEDIATION = 0
+PRIORITY_RESUME = 1
+PRIORITY_NEW = 2
+
+
+class SchedulerBusy(RuntimeError):
+    """The queue is full or the scheduler is draining."""
+
+
+@dataclass
+class QueuedJob:
+    job_id: str
+    user_email: str
+    priority: int
+    run: Callable[[], Awaitable[Any]]
+    seq: int
+    enqueued_at: float = field(default_factory=time.monotonic)
+
+
+class JobScheduler:
+    """Bounded, priority- and user-fair job runner on a dedicated event loop."""
+
+    def __init__(
+        self,
+        max_concurrency: int = MAX_CONCURRENT_JOBS,
+        max_per_user: int = MAX_JOBS_PER_USER,
+        max_queued: int = MAX_QUEUED_JOBS,
+    ):
+        self.max_concurrency = max_concurrency
+        self.max_per_user = max_per_user
+        self.max_queued = max_queued
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._queue: List[QueuedJob] = []
+        self._running: Dict[str, asyncio.Task] = {}
+        self._running_by_user: Counter = Counter()
+        self._seq = itertools.count()
+        self._draining = False
+        self.counts = {"submitted": 0, "started": 0, "finished": 0, "failed": 0, "rejected": 0}
+        self._wait_total = 0.0
+        self._wait_histogram = None
+        self._init_metrics()
+
+    # ---------------------------------------------------------------------
+    # Metrics
+    # ---------------------------------------------------------------------
+    def _init_metrics(self):
+        try:
+            from opentelemetry import metrics
+            from opentelemetry.metrics import Observation
+        except ImportError:
+            return
+        meter = metrics.get_meter("mats.scheduler")
+        self._wait_histogram = meter.create_histogram(
+            "mats.jobs.queue_wait", unit="s", description="Time a job spent queued before starting"
+        )
+        meter.create_observable_gauge(
+            "mats.jobs.queue_depth", callbacks=[lambda options: [Observation(len(self._queue))]],
+            description="Jobs waiting for a slot"
+        )
+        meter.create_observable_gauge(
+            "mats.jobs.running", callbacks=[lambda options: [Observation(len(self._running))]],
+            description="Jobs currently running"
+        )
+
+    def stats(self) -> Dict[str, Any]:
+        started = self.counts["started"]
+        return {
+            **self.counts,
+            "queued": len(self._queue),
+            "running": len(self._running),
+            "max_concurrency": self.max_concurrency,
+            "avg_queue_wait_seconds": round(self._wait_total / started, 3) if started else 0.0,
+            "draining": self._draining,
+        }
+
+    # ---------------------------------------------------------------------
+    # Loop thread
+    # ---------------------------------------------------------------------
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._loop = asyncio.new_event_loop()
+                self._thread = threading.Thread(target=self._loop.run_forever, name="mats-jobs", daemon=True)
+                self._thread.start()
+            return self._loop
+
+    def submit(self, job_id: str, user_email: str, run: Callable[[], Awaitable[Any]], priority: int = PRIORITY_NEW) -> int:
+        """
+        Queue ``run()`` (a coroutine factory) for execution.
+
+        Returns:
+            Number of jobs ahead of this one when it was queued.
+
+        Raises:
+            SchedulerBusy: Draining, or MATS_MAX_QUEUED_JOBS already waiting.
+        """
+        loop = self._ensure_loop()
+        with self._lock:
+            if self._draining or len(self._queue) >= self.max_queued:
+                self.counts["rejected"] += 1
+                raise SchedulerBusy("Orchestrator is draining" if self._draining else "Job queue is full")
+            item = QueuedJob(job_id, user_email, priority, run, next(self._seq))
+            ahead = len(self._queue)
+            self._queue.append(item)
+            self.counts["submitted"] += 1
+        loop.call_soon_threadsafe(self._dispatch)
+        return ahead
+
+    def _pick(self) -> Optional[QueuedJob]:
+        """Highest priority first; then the least-served user; then FIFO."""
+        best = None
+        for item in self._queue:
+            if self._running_by_user[item.user_email] >= self.max_per_user:
+                continue
+            key = (item.priority, self._running_by_user[item.user_email], item.seq)
+            if best is None or key < best[0]:
+                best = (key, item)
+        return best[1] if best else None
+
+    def _dispatch(self):
+        """Start queued jobs while slots are free. Runs on the scheduler loop."""
+        with self._lock:
+            while len(self._running) < self.max_concurrency:
+                item = self._pick()
+                if item is None:
+                    return
+                self._queue.remove(item)
+                self._running_by_user[item.user_email] += 1
+                self._running[item.job_id] = self._loop.create_task(self._run(item))
+
+    async def _run(self, item: QueuedJob):
+        waited = time.monotonic() - item.enqueued_at
+        self.counts["started"] += 1
+        self._wait_total += waited
+        if self._wait_histogram is not None:
+            self._wait_histogram.record(waited, {"priority": item.priority})
+        if waited > 1:
+            logger.info(f"Job {item.job_id} started after {waited:.1f}s in queue")
+        try:
+            await item.run()
+            self.counts["finished"] += 1
+        except Exception as e:
+            # run() is expected to record its own failure on the job
+            self.counts["failed"] += 1
+            logger.error(f"Job {item.job_id} raised in scheduler: {e}", exc_info=True)
+        finally:
+            with self._lock:
+                self._running.pop(item.job_id, None)
+                self._running_by_user[item.user_email] -= 1
+                if self._running_by_user[item.user_email] <= 0:
+                    del self._running_by_user[item.user_email]
+            self._dispatch()
+
+    # ---------------------------------------------------------------------
+    # Shutdown
+    # ---------------------------------------------------------------------
+    def drain(self, timeout: float = DRAIN_TIMEOUT_SECONDS, on_abandoned: Callable[[str], None] = None):
+        """Stop accepting jobs and wait for queued and running ones to finish.
+
+        Jobs still queued at the deadline are dropped and reported through
+        ``on_abandoned(job_id)``; running ones are cancelled.
+        """
+        with self._lock:
+            if self._draining:
+                return
+            self._draining = True
+            loop = self._loop
+        if loop is None or not self._thread.is_alive():
+            return
+
+        logger.info(f"Draining job scheduler: {len(self._running)} running, {len(self._queue)} queued")
+        deadline = time.monotonic() + timeout
+        while (self._queue or self._running) and time.monotonic() < deadline:
+            time.sleep(0.5)
+
+        with self._lock:
+            abandoned = [item.job_id for item in self._queue]
+            self._queue.clear()
+            running = dict(self._running)
+        for task in running.values():
+            loop.call_soon_threadsafe(task.cancel)
+        for job_id in abandoned + list(running):
+            logger.warning(f"Job {job_id} abandoned during shutdown")
+            if on_abandoned:
+                on_abandoned(job_id)
+        loop.call_soon_threadsafe(loop.stop)
@@ -1,11 +1,15 @@
 import os
 import json
+import zlib
+import base64
 import logging
 import asyncio
-from dataclasses import dataclass, field, asdict
+import weakref
+import threading
+from dataclasses import dataclass, field, fields, asdict
 from enum import Enum
 from datetime import datetime
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
 from uuid import uuid4
 import redis.asyncio as redis
 
@@ -15,12 +19,48 @@ logger = logging.getLogger(__name__)
 REDIS_HOST = os.getenv("REDIS_HOST", "redis_session_store")
 REDIS_PORT = int(os.getenv("REDIS_PORT", "6379"))
 REDIS_DB = int(os.getenv("REDIS_DB", "0"))
+REDIS_MAX_CONNECTIONS = int(os.getenv("REDIS_MAX_CONNECTIONS", "20"))
+
+# Findings fields larger than this are zlib-compressed in Redis (0 disables)
+SESSION_COMPRESS_MIN_BYTES = int(os.getenv("MATS_SESSION_COMPRESS_MIN_BYTES", "4096"))
+COMPRESSIBLE_FIELDS = ("sre_findings", "investigator_findings", "architect_output")
+_COMPRESSED_PREFIX = "z:"
+
+# One client (and connection pool) per event loop: redis.asyncio connections
+# are bound to the loop that opened them.
+_clients: Dict[int, Tuple[weakref.ref, redis.Redis]] = {}
+_clients_lock = threading.Lock()
+
 
 def get_redis_client():
-    # Remove global caching to avoid Event Loop issues across threads
-    # redis-py's ConnectionPool handles the actual connection management efficiently
-    logger.info(f"Creating Redis Client: host={REDIS_HOST}, port={REDIS_PORT}, db={REDIS_DB}")
-    return redis.Redis(host=REDIS_HOST, port=REDIS_PORT, db=REDIS_DB, decode_responses=True)
+    """Return the cached Redis client for the running event loop."""
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        return redis.Redis(host=REDIS_HOST, port=REDIS_PORT, db=REDIS_DB, decode_responses=True)
+
+    with _clients_lock:
+        entry = _clients.get(id(loop))
+        if entry and entry[0]() is loop:
+            return entry[1]
+
+        # Forget clients whose loops are gone (their connections died with them)
+        for key, (loop_ref, _) in list(_clients.items()):
+            old_loop = loop_ref()
+            if old_loop is None or old_loop.is_closed():
+                del _clients[key]
+
+        logger.info(f"Creating Redis Client: host={REDIS_HOST}, port={REDIS_PORT}, db={REDIS_DB}")
+        pool = redis.ConnectionPool(
+            host=REDIS_HOST,
+            port=REDIS_PORT,
+            db=REDIS_DB,
+            max_connections=REDIS_MAX_CONNECTIONS,
+            decode_responses=True,
+        )
+        client = redis.Redis(connection_pool=pool)
+        _clients[id(loop)] = (weakref.ref(loop), client)
+        return client
 
 class WorkflowPhase(Enum):
     """Investigation workflow phases"""
@@ -117,6 +157,7 @@ class InvestigationSession:
     failed_calls: int = 0
     retry_attempts: Dict[str, int] = field(default_factory=dict)
     confidence_scores: Dict[str, float] = field(default_factory=dict)
+    phase_timings: Dict[str, Any] = field(default_factory=dict)
     
     # Error tracking
     blockers: List[str] = field(default_factory=list)
@@ -233,11 +274,51 @@ async def create_session(user_id: str, project_id: str, repo_url: str, provided_
     return session
 
 
+def _session_key(session_id: str) -> str:
+    return f"mats:session:{session_id}"
+
+
+def _encode_field(name: str, value: Any) -> str:
+    if isinstance(value, WorkflowState):
+        value = value.to_dict()
+    elif isinstance(value, datetime):
+        value = value.isoformat()
+    encoded = json.dumps(value, default=str)
+    if SESSION_COMPRESS_MIN_BYTES and name in COMPRESSIBLE_FIELDS and len(encoded) >= SESSION_COMPRESS_MIN_BYTES:
+        encoded = _COMPRESSED_PREFIX + base64.b64encode(zlib.compress(encoded.encode())).decode()
+    return encoded
+
+
+def _decode_field(raw: str) -> Any:
+    if raw.startswith(_COMPRESSED_PREFIX):
+        raw = zlib.decompress(base64.b64decode(raw[len(_COMPRESSED_PREFIX):])).decode()
+    return json.loads(raw)
+
+
+def _changed_fields(session: InvestigationSession) -> Dict[str, str]:
+    """Encode the session, returning only fields that differ from the last save/load."""
+    saved = session.__dict__.setdefault("_saved_digests", {})
+    changed = {}
+    for f in fields(session):
+        encoded = _encode_field(f.name, getattr(session, f.name))
+        digest = hash(encoded)
+        if saved.get(f.name) != digest:
+            changed[f.name] = encoded
+            saved[f.name] = digest
+    return changed
+
+
 async def get_session(session_id: str) -> Optional[InvestigationSession]:
     """Retrieve a session by ID (Try Redis, then Memory)"""
     # Try Redis
     try:
          client = get_redis_client()
+         raw = await client.hgetall(_session_key(session_id))
+         if raw:
+             session = InvestigationSession.from_dict({k: _decode_field(v) for k, v in raw.items()})
+             session.__dict__["_saved_digests"] = {k: hash(v) for k, v in raw.items()}
+             return session
+         # Sessions saved before the HASH layout
          val = await client.get(f"session:{session_id}")
          if val:
              return InvestigationSession.from_dict(json.loads(val))
@@ -248,18 +329,24 @@ async def get_session(session_id: str) -> Optional[InvestigationSession]:
 
 
 async def update_session(session: InvestigationSession):
-    """Update a session in storage"""
+    """Update a session in storage.
+
+    Stored as a Redis HASH with one JSON field per attribute; only fields that
+    changed since the last save/load are written, so a phase transition
+    rewrites ``workflow`` rather than the whole session.
+    """
     # Update Memory
     _sessions[session.session_id] = session
     
     # Update Redis
+    changed = _changed_fields(session)
+    if not changed:
+        return
     try:
-        logger.info(f"Attempting to save session {session.session_id} to Redis...")
         client = get_redis_client()
-        logger.info(f"Redis client created: {client}")
-        data = json.dumps(session.to_dict())
-        logger.info(f"Session data to save: {len(data)} bytes")
-        await client.set(f"session:{session.session_id}", data)
-        logger.info(f"Successfully saved session {session.session_id} to Redis")
+        await client.hset(_session_key(session.session_id), mapping=changed)
+        logger.debug(f"Saved session {session.session_id}: {sorted(changed)} ({sum(map(len, changed.values()))} bytes)")
     except Exception as e:
+        # Force a full write next time
+        session.__dict__["_saved_digests"] = {}
         logger.error(f"Redis set failed completely: {e}", exc_info=True)
@@ -1,10 +1,11 @@
 
 import os
 import logging
-import aiohttp
 import asyncio
 from typing import Dict, Any
 
+from common.http_client import post_json
+
 logger = logging.getLogger("mats-workflow")
 
 SRE_URL = os.getenv("SRE_AGENT_URL", "http://mats-sre-agent:8081")
@@ -12,17 +13,15 @@ INVESTIGATOR_URL = os.getenv("INVESTIGATOR_AGENT_URL", "http://mats-investigator
 ARCHITECT_URL = os.getenv("ARCHITECT_AGENT_URL", "http://mats-architect-agent:8083")
 
 async def call_agent(url: str, message: str) -> str:
-    async with aiohttp.ClientSession() as session:
-        try:
-            async with session.post(f"{url}/chat", json={"message": message}, timeout=300) as resp:
-                if resp.status != 200:
-                    text = await resp.text()
-                    raise RuntimeError(f"Agent at {url} failed: {resp.status} - {text}")
-                data = await resp.json()
-                return data.get("response", "")
-        except Exception as e:
-            logger.error(f"Failed to call agent {url}: {e}")
-            raise
+    try:
+        resp = await post_json(f"{url}/chat", {"message": message}, timeout=300)
+        if resp.status != 200:
+            raise RuntimeError(f"Agent at {url} failed: {resp.status} - {resp.text}")
+        data = resp.json()
+        return data.get("response", "")
+    except Exception as e:
+        logger.error(f"Failed to call agent {url}: {e}")
+        raise
 
 async def run_troubleshooting_workflow(
     project_id: str, 
@@ -3,11 +3,11 @@ Delegation Tools for MATS Remediation Agent
 Pattern B: Native Tools (Delegating via HTTP)
 """
 import os
-import aiohttp
 import asyncio
 import logging
 from typing import Dict, Any, Optional
 from common.observability import FinOptiObservability
+from common.http_client import post_json
 from context import _session_id_ctx, _user_email_ctx, _auth_token_ctx
 
 logger = logging.getLogger(__name__)
@@ -51,35 +51,32 @@ async def _delegate(
 
     logger.info(f"Delegating to {agent_name} at {url}{endpoint}...")
     
-    async with aiohttp.ClientSession() as session:
+    try:
+        resp = await post_json(
+            f"{url}{endpoint}",
+            payload,
+            timeout=timeout,
+            headers=headers, # Standard HTTP propagation
+        )
+        if resp.status >= 500:
+            raise Exception(f"{agent_name} Error {resp.status}: {resp.text}")
+
+        # Check for 400s but try to parse JSON error first
         try:
-            async with session.post(
-                f"{url}{endpoint}",
-                json=payload,
-                headers=headers, # Standard HTTP propagation
-                timeout=aiohttp.ClientTimeout(total=timeout)
-            ) as resp:
-                if resp.status >= 500:
-                    text = await resp.text()
-                    raise Exception(f"{agent_name} Error {resp.status}: {text}")
-                
-                # Check for 400s but try to parse JSON error first
-                try:
-                    result = await resp.json()
-                except:
-                    text = await resp.text()
-                    if resp.status >= 400:
-                        raise Exception(f"{agent_name} Error {resp.status}: {text}")
-                    return {"response": text}
-                
-                if resp.status >= 400:
-                    raise Exception(f"{agent_name} Error: {result.get('error', result)}")
-                    
-                return result
-        except asyncio.TimeoutError:
-             raise Exception(f"Timeout waiting for {agent_name}")
-        except Exception as e:
-             raise Exception(f"Delegation failed: {e}")
+            result = resp.json()
+        except:
+            if resp.status >= 400:
+                raise Exception(f"{agent_name} Error {resp.status}: {resp.text}")
+            return {"response": resp.text}
+
+        if resp.status >= 400:
+            raise Exception(f"{agent_name} Error: {result.get('error', result)}")
+
+        return result
+    except asyncio.TimeoutError:
+         raise Exception(f"Timeout waiting for {agent_name}")
+    except Exception as e:
+         raise Exception(f"Delegation failed: {e}")
 
 async def run_puppeteer_test(scenario: str, url: str) -> Dict[str, Any]:
     """Delegates browser testing to Puppeteer Agent."""
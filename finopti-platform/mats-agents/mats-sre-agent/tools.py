@@ -14,9 +14,40 @@ from context import _report_progress
 
 logger = logging.getLogger(__name__)
 
+LOG_SCAN_MAX_ENTRIES = 1_000_000
+LOG_SCAN_DEADLINE_SECONDS = 90
+LOG_SCAN_MAX_CLUSTERS = 15
+
+
+def _trace_headers() -> Dict[str, str]:
+    headers = {}
+    try:
+        from common.observability import FinOptiObservability
+        FinOptiObservability.inject_trace_to_headers(headers)
+    except ImportError:
+        pass
+    return headers
+
+
+def _format_log_clusters(data: Dict[str, Any], max_lines: int = 5) -> str:
+    """Progress text for the largest log clusters."""
+    lines = [f"{data.get('total_entries', 0)} entries scanned in {data.get('pages', 0)} page(s), "
+             f"{data.get('cluster_count', 0)} message template(s)"]
+    for cluster in data.get("clusters", [])[:max_lines]:
+        resources = ", ".join(list(cluster.get("resources", {}))[:3])
+        where = f" [{resources}]" if resources else ""
+        lines.append(f"  {cluster['count']}x {cluster.get('template', '')[:120]}{where} "
+                     f"({cluster.get('first_seen')} .. {cluster.get('last_seen')})")
+    return "\n".join(lines)
+
+
 async def read_logs(project_id: str, filter_str: str, hours_ago: int = 48) -> Dict[str, Any]:
     """
-    Fetch logs by delegating to the Monitoring Agent via APISIX.
+    Scan logs through the Monitoring Agent's streaming log-scan API via APISIX.
+    
+    Every entry in the window is scanned and clustered into message templates,
+    each with a count, first/last seen timestamps, a histogram over the window,
+    the affected resources and sample entries.
     
     Args:
         project_id: GCP Project ID
@@ -25,7 +56,6 @@ async def read_logs(project_id: str, filter_str: str, hours_ago: int = 48) -> Di
     """
     from config import config
     import requests
-    import asyncio
     
     # Enforce Environment Project ID to prevent hallucinations
     env_project_id = os.environ.get("GCP_PROJECT_ID")
@@ -35,8 +65,66 @@ async def read_logs(project_id: str, filter_str: str, hours_ago: int = 48) -> Di
         override_warning = f" [WARNING: Project '{project_id}' does not exist or is restricted. Query was executed against '{env_project_id}' instead.]"
         project_id = env_project_id
 
-    await _report_progress(f"Delegating log query for {project_id} to Monitoring Agent...\nFilter: {filter_str}\nHours Ago: {hours_ago}", "TOOL_USE")
+    await _report_progress(f"Scanning logs for {project_id} via Monitoring Agent...\nFilter: {filter_str}\nHours Ago: {hours_ago}", "TOOL_USE")
+    
+    url = f"{config.APISIX_URL}/agent/monitoring/logs/scan"
+    hours = max(1, min(hours_ago, 168))
+    payload = {
+        "project_id": project_id,
+        "filter": filter_str,
+        "minutes_ago": hours * 60,
+        "max_entries": LOG_SCAN_MAX_ENTRIES,
+        "deadline_seconds": LOG_SCAN_DEADLINE_SECONDS,
+        "histogram_buckets": min(hours, 48),
+        "max_clusters": LOG_SCAN_MAX_CLUSTERS,
+    }
     
+    logger.info(f"Calling Monitoring Agent log scan at {url}")
+    
+    try:
+        loop = asyncio.get_running_loop()
+        headers = _trace_headers()
+        response = await loop.run_in_executor(
+            None, lambda: requests.post(url, json=payload, headers=headers, timeout=LOG_SCAN_DEADLINE_SECONDS + 30)
+        )
+        
+        if response.status_code in (404, 405):
+            # Monitoring Agent without the scan endpoint (older deployment)
+            logger.warning("Monitoring Agent has no /logs/scan endpoint, falling back to prompt delegation")
+            return await _read_logs_via_prompt(project_id, filter_str, hours_ago, override_warning)
+        if response.status_code != 200:
+            return {"error": f"Monitoring Agent log scan failed: {response.status_code} - {response.text}"}
+            
+        data = response.json()
+        await _report_progress(f"Monitoring Agent returned results:\n{_format_log_clusters(data)}", "OBSERVATION")
+        
+        result = {
+            "total_entries": data.get("total_entries", 0),
+            "window": data.get("window"),
+            "histogram_bucket_seconds": data.get("histogram_bucket_seconds"),
+            "cluster_count": data.get("cluster_count", 0),
+            "log_clusters": data.get("clusters", []),
+            "omitted_clusters": data.get("omitted_clusters", 0),
+            "note": "Logs scanned via Monitoring Agent and clustered by message template." + override_warning,
+        }
+        if not data.get("scan_complete", True):
+            result["note"] += (f" Scan stopped early ({data.get('stopped_reason')}); entries between "
+                               f"{data.get('unscanned_from')} and {data.get('unscanned_until')} were not scanned.")
+        if data.get("evicted_entries"):
+            result["note"] += f" {data['evicted_entries']} entries from rare messages are not in any cluster."
+        return result
+
+    except Exception as e:
+        logger.error(f"Failed to call Monitoring Agent: {e}")
+        await _report_progress(f"Monitoring Agent call failed: {e}", "ERROR")
+        return {"error": f"Delegation failed: {str(e)}"}
+
+
+async def _read_logs_via_prompt(project_id: str, filter_str: str, hours_ago: int, override_warning: str = "") -> Dict[str, Any]:
+    """Previous path: a natural-language request through the Monitoring Agent's LLM loop."""
+    from config import config
+    import requests
+
     url = f"{config.APISIX_URL}/agent/monitoring/execute"
     
     # Construct robust prompt for Monitoring Agent
@@ -52,47 +140,31 @@ async def read_logs(project_id: str, filter_str: str, hours_ago: int = 48) -> Di
     payload = {
         "prompt": prompt,
         "user_email": "mats-sre@system.local",
-        "project_id": project_id
+        "project_id": project_id,
+        "headers": _trace_headers(),
     }
-    
-    # Inject Trace Headers
-    try:
-        from common.observability import FinOptiObservability
-        headers = {}
-        FinOptiObservability.inject_trace_to_headers(headers)
-        payload["headers"] = headers
-    except ImportError:
-        pass
         
-    logger.info(f"Calling Monitoring Agent at {url}")
+    loop = asyncio.get_running_loop()
     
-    try:
-        loop = asyncio.get_running_loop()
-        
-        def _call_svc():
-            resp = requests.post(url, json=payload, timeout=120) # 2 min timeout for monitoring agent
-            return resp
-            
-        response = await loop.run_in_executor(None, _call_svc)
-        
-        if response.status_code != 200:
-            return {"error": f"Monitoring Agent failed: {response.status_code} - {response.text}"}
-            
-        data = response.json()
-        
-        # monitoring agent returns {"response": "..."} usually
-        agent_response = data.get("response", str(data))
+    def _call_svc():
+        resp = requests.post(url, json=payload, timeout=120) # 2 min timeout for monitoring agent
+        return resp
         
-        summary_text = agent_response[:1000] + "..." if len(agent_response) > 1000 else agent_response
-        await _report_progress(f"Monitoring Agent returned results:\n{summary_text}", "OBSERVATION")
+    response = await loop.run_in_executor(None, _call_svc)
+    
+    if response.status_code != 200:
+        return {"error": f"Monitoring Agent failed: {response.status_code} - {response.text}"}
         
-        return {
-            "summary": agent_response, 
-            "note": "Logs fetched via Monitoring Agent." + override_warning,
-            "raw_data": data
-        }
-
-    except Exception as e:
-        logger.error(f"Failed to call Monitoring Agent: {e}")
-        await _report_progress(f"Monitoring Agent call failed: {e}", "ERROR")
-        return {"error": f"Delegation failed: {str(e)}"}
+    data = response.json()
+    
+    # monitoring agent returns {"response": "..."} usually
+    agent_response = data.get("response", str(data))
+    
+    summary_text = agent_response[:1000] + "..." if len(agent_response) > 1000 else agent_response
+    await _report_progress(f"Monitoring Agent returned results:\n{summary_text}", "OBSERVATION")
+    
+    return {
+        "summary": agent_response, 
+        "note": "Logs fetched via Monitoring Agent." + override_warning,
+        "raw_data": data
+    }
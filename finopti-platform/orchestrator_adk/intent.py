@@ -1,112 +1,202 @@
 """
 Orchestrator ADK - Intent Detection Logic
+
+Registry keywords are compiled once per registry load into an ``IntentRouter``:
+the short (word-bounded) and long (substring) keywords each become one
+prefix-factored regex inside a zero-width lookahead, so a single ``finditer``
+pass reports the longest keyword starting at every position of the prompt.
+Shorter keywords contained in a found one are implied (precomputed), and each
+keyword carries its points per agent, so all agents are scored in one pass
+with the same results as checking every keyword separately. The router is
+rebuilt when the registry file changes (registry.py hot reload).
 """
 import re
 import os
 import logging
-from typing import Dict
-from registry import load_registry
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from registry import load_registry, registry_version
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_AGENT = "gcloud_infrastructure_specialist"
+
+# Simple CRUD operations (highest priority - bypass MATS)
+SIMPLE_OPERATIONS = [
+    r'\blist\s+(all|my|the)?\s*',
+    r'\bshow\s+(all|my|the)?\s*',
+    r'\bget\s+(all|my|the)?\s*',
+    r'\bcreate\s+a?\s*',
+    r'\bdelete\s+a?\s*',
+    r'\bupdate\s+a?\s*',
+    r'\bdescribe\s+',
+    r'\bfind\s+',
+]
+
+# MATS triggers - require clear troubleshooting intent with multi-word phrases
+MATS_TRIGGERS = [
+    "troubleshoot",
+    "root cause",
+    "rca",
+    "why is",
+    "why did",
+    "why does",
+    "what caused",
+    "find the bug",
+    "find the issue",
+    "investigate the failure",
+    "investigate the error",
+    "investigate the crash",
+    "investigate the issue",
+    "investigate the problem",
+    "diagnose the",
+    "debug the",
+    "fix the issue",
+    "fix the bug",
+    "fix the problem",
+    "apply the fix",
+    "remediate",
+    "apply solution"
+]
+
+_SIMPLE_OPERATION_RE = re.compile('|'.join(f'(?:{p})' for p in SIMPLE_OPERATIONS))
+_MATS_TRIGGER_RE = re.compile('|'.join(re.escape(t) for t in MATS_TRIGGERS))
+
+
+def _trie_pattern(words: Iterable[str]) -> str:
+    """Alternation of ``words`` factored by common prefix, preferring the longest match."""
+    trie: Dict[str, dict] = {}
+    for word in words:
+        node = trie
+        for ch in word:
+            node = node.setdefault(ch, {})
+        node[''] = {}
+
+    def build(node: Dict[str, dict]) -> str:
+        branches = [re.escape(ch) + build(child) for ch, child in sorted(node.items()) if ch]
+        if not branches:
+            return ''
+        body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+        # Greedy optional: try the longer keywords first, fall back to this one
+        return f'(?:{body})?' if '' in node else body
+
+    return build(trie)
+
+
+def _is_word(ch: str) -> bool:
+    return ch.isalnum() or ch == '_'
+
+
+class IntentRouter:
+    """Keyword scoring for every registry agent in one pass over the prompt."""
+
+    def __init__(self, registry: List[Dict]):
+        self.agent_ids = [agent['agent_id'] for agent in registry]
+        # keyword -> [(agent index, points)]; a keyword listed twice counts twice
+        self._points: Dict[str, List[Tuple[int, int]]] = {}
+        totals: Dict[Tuple[str, int], int] = {}
+        short: Set[str] = set()
+        long: Set[str] = set()
+        for index, agent in enumerate(registry):
+            for k in agent.get('keywords', []):
+                k_lower = k.lower()
+                if not k_lower:
+                    continue
+                if len(k_lower) <= 3:
+                    # Short keywords need exact word match
+                    short.add(k_lower)
+                    points = 2
+                else:
+                    # Longer keywords can match as substring, bonus for multi-word concepts
+                    long.add(k_lower)
+                    points = 3 if ' ' in k_lower else 1
+                totals[(k_lower, index)] = totals.get((k_lower, index), 0) + points
+        for (k_lower, index), points in totals.items():
+            self._points.setdefault(k_lower, []).append((index, points))
+
+        self._short_re = re.compile(r'(?=\b(' + _trie_pattern(short) + r')\b)') if short else None
+        self._long_re = re.compile('(?=(' + _trie_pattern(long) + '))') if long else None
+        # Only the longest keyword per position is reported: a long keyword
+        # implies every long keyword inside it, a short one the short keywords
+        # it starts with that also end on a word boundary.
+        self._implied: Dict[str, List[str]] = {k: [j for j in long if j != k and j in k] for k in long}
+        for k in short:
+            self._implied[k] = [
+                j for j in short
+                if j != k and k.startswith(j) and _is_word(k[len(j) - 1]) != _is_word(k[len(j)])
+            ]
+
+    def matched_keywords(self, prompt_lower: str) -> Set[str]:
+        found: Set[str] = set()
+        for pattern in (self._short_re, self._long_re):
+            if pattern is None:
+                continue
+            for m in pattern.finditer(prompt_lower):
+                k = m.group(1)
+                if k not in found:
+                    found.add(k)
+                    found.update(self._implied[k])
+        return found
+
+    def scores(self, prompt_lower: str) -> Dict[str, int]:
+        totals = [0] * len(self.agent_ids)
+        for k in self.matched_keywords(prompt_lower):
+            for index, points in self._points[k]:
+                totals[index] += points
+        # Registry order is kept, so max() ties still go to the first agent
+        return dict(zip(self.agent_ids, totals))
+
+
+_ROUTER: Optional[IntentRouter] = None
+_ROUTER_VERSION = None
+
+
+def get_router() -> IntentRouter:
+    """The router for the current registry, rebuilt when the registry reloads."""
+    global _ROUTER, _ROUTER_VERSION
+    registry = load_registry()
+    version = registry_version()
+    if _ROUTER is None or version != _ROUTER_VERSION:
+        _ROUTER = IntentRouter(registry)
+        _ROUTER_VERSION = version
+        logger.info(f"Intent router compiled for {len(_ROUTER.agent_ids)} agents (registry v{version})")
+    return _ROUTER
+
+
 def detect_intent(prompt: str) -> str:
     """
     Dynamic intent detection based on Master Agent Registry keywords.
-    
+
     Priority:
     1. Simple CRUD operations → route to appropriate agent (bypass MATS)
     2. Troubleshooting requests → route to MATS
     3. Keyword-based scoring → find best matching agent
     4. Default fallback → gcloud
     """
-    registry = load_registry()
+    router = get_router()
     prompt_lower = prompt.lower()
-    
-    # 0. Detect simple CRUD operations (highest priority - bypass MATS)
-    simple_operations = [
-        r'\blist\s+(all|my|the)?\s*',
-        r'\bshow\s+(all|my|the)?\s*',
-        r'\bget\s+(all|my|the)?\s*',
-        r'\bcreate\s+a?\s*',
-        r'\bdelete\s+a?\s*',
-        r'\bupdate\s+a?\s*',
-        r'\bdescribe\s+',
-        r'\bfind\s+',
-    ]
-    
-    is_simple_operation = any(re.search(pattern, prompt_lower) for pattern in simple_operations)
-    
+
     # 1. Check for explicit MATS triggers (only if NOT a simple operation)
-    if not is_simple_operation:
-        # MATS triggers - require clear troubleshooting intent with multi-word phrases
-        mats_triggers = [
-            "troubleshoot",
-            "root cause",
-            "rca",
-            "why is",
-            "why did",
-            "why does",
-            "what caused",
-            "find the bug",
-            "find the issue",
-            "investigate the failure",
-            "investigate the error",
-            "investigate the crash",
-            "investigate the issue",
-            "investigate the problem",
-            "diagnose the",
-            "debug the",
-            "fix the issue",
-            "fix the bug",
-            "fix the problem",
-            "apply the fix",
-            "remediate",
-            "apply solution"
-        ]
-        
-        # Check for MATS triggers
-        for trigger in mats_triggers:
-            if trigger in prompt_lower:
-                logger.info(f"Routing to MATS: matched trigger '{trigger}'")
-                return "mats-orchestrator"
-    
+    if not _SIMPLE_OPERATION_RE.search(prompt_lower):
+        trigger = _MATS_TRIGGER_RE.search(prompt_lower)
+        if trigger:
+            logger.info(f"Routing to MATS: matched trigger '{trigger.group(0)}'")
+            return "mats-orchestrator"
+
     # 2. Score based on keywords in registry
-    scores = {}
-    
-    for agent in registry:
-        agent_id = agent['agent_id']
-        keywords = agent.get('keywords', [])
-        score = 0
-        
-        for k in keywords:
-            k_lower = k.lower()
-            # Use word boundary matching for better accuracy
-            if len(k_lower) <= 3:
-                # Short keywords need exact word match
-                if re.search(r'\b' + re.escape(k_lower) + r'\b', prompt_lower):
-                    score += 2
-            else:
-                # Longer keywords can match as substring
-                if k_lower in prompt_lower:
-                    score += 1
-                    # Bonus for multi-word concepts ("cloud run", "google cloud")
-                    if ' ' in k_lower:
-                        score += 2
-                        
-        scores[agent_id] = score
-    
+    scores = router.scores(prompt_lower)
+
     # Debug logging if enabled
     if os.getenv("DEBUG_ROUTING", "false").lower() == "true":
         sorted_scores = sorted(scores.items(), key=lambda x: x[1], reverse=True)[:3]
         logger.info(f"Routing scores for '{prompt[:50]}...': {sorted_scores}")
-    
+
     # Find winner - require minimum score
     if scores:
         best_agent_id = max(scores, key=scores.get)
         if scores[best_agent_id] >= 1:  # At least 1 keyword match required
             logger.info(f"Routing to {best_agent_id} (score: {scores[best_agent_id]})")
             return best_agent_id
-    
+
     # Default fallback
-    logger.info(f"Routing to default: gcloud_infrastructure_specialist")
-    return "gcloud_infrastructure_specialist"
+    logger.info(f"Routing to default: {DEFAULT_AGENT}")
+    return DEFAULT_AGENT
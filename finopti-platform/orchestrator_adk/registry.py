@@ -1,36 +1,68 @@
 """
 Orchestrator ADK - Agent Registry Management
+
+The registry is cached in memory and reloaded when master_agent_registry.json
+changes on disk (mtime checked at most every REGISTRY_RELOAD_INTERVAL_SECONDS),
+so keyword edits take effect without a restart. ``registry_version()`` goes up
+on every reload; derived structures (the intent router) rebuild when it does.
 """
+import os
 import json
+import time
 import logging
+import threading
 from pathlib import Path
 from typing import List, Dict, Any, Optional
 
 logger = logging.getLogger(__name__)
 
+REGISTRY_RELOAD_INTERVAL = float(os.getenv("REGISTRY_RELOAD_INTERVAL_SECONDS", "5"))
+
 # Global Registry Cache
 _AGENT_REGISTRY = None
+_AGENTS_BY_ID: Dict[str, Dict[str, Any]] = {}
+_REGISTRY_MTIME = None
+_REGISTRY_VERSION = 0
+_LAST_CHECK = 0.0
+_RELOAD_LOCK = threading.Lock()
+
 
 def load_registry(registry_path: str = "master_agent_registry.json") -> List[Dict[str, Any]]:
-    """Load the master agent registry, caching it in memory."""
-    global _AGENT_REGISTRY
-    if _AGENT_REGISTRY:
+    """Load the master agent registry, caching it in memory until the file changes."""
+    global _AGENT_REGISTRY, _AGENTS_BY_ID, _REGISTRY_MTIME, _REGISTRY_VERSION, _LAST_CHECK
+    if _AGENT_REGISTRY is not None and time.monotonic() - _LAST_CHECK < REGISTRY_RELOAD_INTERVAL:
         return _AGENT_REGISTRY
-        
-    try:
-        current_dir = Path(__file__).parent
-        with open(current_dir / registry_path, 'r') as f:
-            _AGENT_REGISTRY = json.load(f)
+
+    with _RELOAD_LOCK:
+        _LAST_CHECK = time.monotonic()
+        path = Path(__file__).parent / registry_path
+        try:
+            mtime = path.stat().st_mtime_ns
+            if _AGENT_REGISTRY is not None and mtime == _REGISTRY_MTIME:
+                return _AGENT_REGISTRY
+            with open(path, 'r') as f:
+                registry = json.load(f)
+        except Exception as e:
+            # Keep serving the last good registry (e.g. file mid-write);
+            # fallback to empty if there never was one (should not happen in prod)
+            logger.error(f"Error loading registry: {e}")
+            return _AGENT_REGISTRY if _AGENT_REGISTRY is not None else []
+
+        if _AGENT_REGISTRY is not None:
+            logger.info(f"Registry changed on disk, reloaded {len(registry)} agents")
+        _AGENT_REGISTRY = registry
+        _AGENTS_BY_ID = {agent['agent_id']: agent for agent in reversed(registry)}  # first one wins
+        _REGISTRY_MTIME = mtime
+        _REGISTRY_VERSION += 1
         return _AGENT_REGISTRY
-    except Exception as e:
-        # Fallback to empty if missing (should not happen in prod)
-        logger.error(f"Error loading registry: {e}")
-        return []
+
+
+def registry_version() -> int:
+    """Incremented on every (re)load of the registry file."""
+    return _REGISTRY_VERSION
+
 
 def get_agent_by_id(agent_id: str) -> Optional[Dict[str, Any]]:
     """Retrieve agent definition by ID."""
-    registry = load_registry()
-    for agent in registry:
-        if agent['agent_id'] == agent_id:
-            return agent
-    return None
+    load_registry()
+    return _AGENTS_BY_ID.get(agent_id)
@@ -1,13 +1,15 @@
 """
 Orchestrator ADK - Routing and Execution Logic
 """
-import requests
+import re
 import json
+import asyncio
 import logging
 import time
 from typing import Dict, Any, Optional
 
 from config import config
+from common.http_client import post_json, get as http_get
 from structured_logging import propagate_request_id
 from registry import get_agent_by_id
 from context import _redis_publisher_ctx, _report_progress
@@ -83,71 +85,64 @@ async def route_to_agent(target_agent: str, prompt: str, user_email: str, projec
         base_delay = 2  # Base delay in seconds
         timeout = 1800
         
-        # Retry loop with exponential backoff
+        # Retry loop with exponential backoff (non-blocking: other requests keep running)
+        response = None
         for attempt in range(max_retries + 1):
             try:
-                response = requests.post(endpoint, json=payload, headers=headers, timeout=timeout)
+                response = await post_json(endpoint, payload, timeout=timeout, headers=headers)
                 
                 # If we get a 429, extract retry delay and implement backoff
-                if response.status_code == 429:
-                    if attempt < max_retries:
-                        # Try to extract retry delay from error response
-                        retry_delay = base_delay * (2 ** attempt)  # Exponential: 2s, 4s, 8s
-                        
-                        try:
-                            error_data = response.json()
-                            error_message = error_data.get('error', {}).get('message', '')
-                            
-                            # Extract "Please retry in X.XXs" from error message
-                            import re
-                            match = re.search(r'Please retry in ([\d.]+)s', error_message)
-                            if match:
-                                retry_delay = float(match.group(1))
-                                print(f"[Retry {attempt + 1}/{max_retries}] 429 Rate Limit - Waiting {retry_delay:.2f}s as suggested by API...")
-                            else:
-                                print(f"[Retry {attempt + 1}/{max_retries}] 429 Rate Limit - Using exponential backoff: {retry_delay}s")
-                        except:
-                            print(f"[Retry {attempt + 1}/{max_retries}] 429 Rate Limit - Using exponential backoff: {retry_delay}s")
+                if response.status == 429 and attempt < max_retries:
+                    # Try to extract retry delay from error response
+                    retry_delay = base_delay * (2 ** attempt)  # Exponential: 2s, 4s, 8s
+                    
+                    try:
+                        error_data = response.json()
+                        error_message = error_data.get('error', {}).get('message', '')
                         
-                        import time
-                        time.sleep(retry_delay)
-                        continue  # Retry the request
-                    else:
-                        # Max retries reached, raise the error
-                        response.raise_for_status()
-                else:
-                    # Success or non-429 error, break out of retry loop
-                    break
+                        # Extract "Please retry in X.XXs" from error message
+                        match = re.search(r'Please retry in ([\d.]+)s', error_message)
+                        if match:
+                            retry_delay = float(match.group(1))
+                            logger.warning(f"[Retry {attempt + 1}/{max_retries}] 429 Rate Limit - Waiting {retry_delay:.2f}s as suggested by API...")
+                        else:
+                            logger.warning(f"[Retry {attempt + 1}/{max_retries}] 429 Rate Limit - Using exponential backoff: {retry_delay}s")
+                    except Exception:
+                        logger.warning(f"[Retry {attempt + 1}/{max_retries}] 429 Rate Limit - Using exponential backoff: {retry_delay}s")
+                    
+                    await asyncio.sleep(retry_delay)
+                    continue  # Retry the request
+
+                # Success or non-429 error, break out of retry loop
+                break
                     
-            except requests.exceptions.Timeout:
+            except asyncio.TimeoutError:
                 if attempt < max_retries:
                     retry_delay = base_delay * (2 ** attempt)
-                    print(f"[Retry {attempt + 1}/{max_retries}] Timeout - Retrying in {retry_delay}s...")
-                    import time
-                    time.sleep(retry_delay)
+                    logger.warning(f"[Retry {attempt + 1}/{max_retries}] Timeout - Retrying in {retry_delay}s...")
+                    await asyncio.sleep(retry_delay)
                     continue
                 else:
                     raise
         
-        
-        try:
-            response.raise_for_status()
-            data = response.json()
-        except requests.exceptions.HTTPError as e:
+        if response.status >= 400:
             # Handle HTTP errors (4xx, 5xx)
             try:
                 error_data = response.json()
                 return {
                     "success": False,
-                    "error": error_data.get("message", str(e)),
+                    "error": error_data.get("message", f"HTTP {response.status}"),
                     "agent": target_agent
                 }
             except ValueError:
                  return {
                     "success": False,
-                    "error": f"Agent request failed: {str(e)}. Response: {response.text[:200]}",
+                    "error": f"Agent request failed: HTTP {response.status}. Response: {response.text[:200]}",
                     "agent": target_agent
                 }
+
+        try:
+            data = response.json()
         except ValueError:
             # Handle valid 200 OK but invalid JSON
              return {
@@ -158,54 +153,7 @@ async def route_to_agent(target_agent: str, prompt: str, user_email: str, projec
 
         # Special handling for MATS async job responses
         if target_agent == "mats-orchestrator" and "job_id" in data:
-            import time
-            job_id = data["job_id"]
-            poll_endpoint = f"http://mats-orchestrator:8084/jobs/{job_id}"
-            
-            # Poll for completion (max 30 minutes)
-            max_polls = 360  # 360 * 5s = 30 minutes
-            poll_count = 0
-            
-            while poll_count < max_polls:
-                time.sleep(5)  # Poll every 5 seconds
-                poll_count += 1
-                
-                try:
-                    poll_response = requests.get(poll_endpoint, headers=headers, timeout=10)
-                    poll_response.raise_for_status()
-                    poll_data = poll_response.json()
-                    
-                    status = poll_data.get("status", "UNKNOWN")
-                    
-                    if status in ["COMPLETED", "FAILED", "PARTIAL"]:
-                        # Job finished - return final result
-                        result = poll_data.get("result", {})
-                        
-                        if status == "COMPLETED":
-                            return {
-                                "success": True,
-                                "data": result,
-                                "agent": target_agent
-                            }
-                        else:
-                            error_msg = result.get("error", f"MATS job failed with status: {status}")
-                            return {
-                                "success": False,
-                                "error": error_msg,
-                                "agent": target_agent
-                            }
-                    
-                except Exception as poll_error:
-                    # Polling error - continue trying
-                    logger.warning(f"MATS job polling error: {str(poll_error)}")
-                    continue
-            
-            # Timeout after max polls
-            return {
-                "success": False,
-                "error": f"MATS job timed out after {max_polls * 5} seconds",
-                "agent": target_agent
-            }
+            return await _wait_for_mats_job(data["job_id"], headers, target_agent)
 
         return {
             "success": True,
@@ -220,6 +168,65 @@ async def route_to_agent(target_agent: str, prompt: str, user_email: str, projec
             "agent": target_agent
         }
 
+async def _wait_for_mats_job(job_id: str, headers: Dict[str, str], target_agent: str) -> Dict[str, Any]:
+    """Wait for a MATS async job to finish without blocking the event loop.
+
+    Uses the orchestrator's long-poll (``?wait=``), so the job result is
+    picked up as soon as the status changes rather than on the next tick.
+    """
+    poll_endpoint = f"http://mats-orchestrator:8084/jobs/{job_id}"
+    long_poll_seconds = 25
+    
+    # Wait for completion (max 30 minutes)
+    deadline = time.monotonic() + 1800
+    
+    while time.monotonic() < deadline:
+        started = time.monotonic()
+        try:
+            poll_response = await http_get(
+                f"{poll_endpoint}?wait={long_poll_seconds}",
+                headers=headers,
+                timeout=long_poll_seconds + 10
+            )
+            if poll_response.status >= 400:
+                raise RuntimeError(f"HTTP {poll_response.status}: {poll_response.text[:200]}")
+            poll_data = poll_response.json()
+            
+            status = poll_data.get("status", "UNKNOWN")
+            
+            if status in ["COMPLETED", "FAILED", "PARTIAL", "WAITING_FOR_USER"]:
+                # Job finished (or paused for user input) - return final result
+                result = poll_data.get("result") or {}
+                
+                if status in ["COMPLETED", "WAITING_FOR_USER"]:
+                    return {
+                        "success": True,
+                        "data": result,
+                        "agent": target_agent
+                    }
+                else:
+                    error_msg = poll_data.get("error") or result.get("error", f"MATS job failed with status: {status}")
+                    return {
+                        "success": False,
+                        "error": error_msg,
+                        "agent": target_agent
+                    }
+            
+        except Exception as poll_error:
+            # Polling error - continue trying
+            logger.warning(f"MATS job polling error: {str(poll_error)}")
+        
+        # Answered early without a state change (or errored): don't spin.
+        if time.monotonic() - started < 1:
+            await asyncio.sleep(5)
+    
+    # Timeout
+    return {
+        "success": False,
+        "error": "MATS job timed out after 1800 seconds",
+        "agent": target_agent
+    }
+
 async def chain_screenshot_upload(
     agent_response: Dict[str, Any],
     user_email: str,
@@ -244,7 +251,6 @@ async def chain_screenshot_upload(
     # Check for screenshot trigger
     if "File Name:" in str(text_response):
         try:
-            import re
             filename_match = re.search(r"File Name:\s*([a-zA-Z0-9_.-]+\.png)", str(text_response))
             if filename_match:
                 filename = filename_match.group(1)
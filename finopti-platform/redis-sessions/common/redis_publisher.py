@@ -1,7 +1,10 @@
 import os
-import json
+import time
+import atexit
 import logging
-import redis
+import threading
+from collections import deque
+from contextvars import ContextVar
 import redis
 try:
     from event_schema import AgentEvent, EventHeader, EventPayload, UIRendering
@@ -10,34 +13,176 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
+# Queue/flush tuning
+QUEUE_SIZE = int(os.getenv("REDIS_PUBLISH_QUEUE_SIZE", "1000"))
+BATCH_SIZE = int(os.getenv("REDIS_PUBLISH_BATCH_SIZE", "100"))
+FLUSH_INTERVAL_SECONDS = float(os.getenv("REDIS_PUBLISH_FLUSH_INTERVAL_MS", "10")) / 1000.0
+
+# Progress chatter that may be dropped when the queue is full. Everything else
+# (status, artifacts, errors, lifecycle) evicts queued low-priority events first.
+LOW_PRIORITY_TYPES = {"THOUGHT", "OBSERVATION", "TOOL_CALL", "ACTION"}
+
+
+class _EventQueue:
+    """
+    Process-wide bounded queue drained by one background flusher thread.
+
+    ``put()`` never touches the network, so publishing from inside an event
+    loop costs a dict append. The flusher sends up to BATCH_SIZE PUBLISH
+    commands per round-trip using a non-transactional pipeline.
+    """
+
+    def __init__(self, redis_url: str, maxsize: int = QUEUE_SIZE):
+        self.redis_url = redis_url
+        self.maxsize = maxsize
+        self._items = deque()
+        self._cond = threading.Condition()
+        self._client = None
+        self._thread = None
+        self._closed = False
+        self.counts = {"queued": 0, "published": 0, "dropped": 0, "failed": 0, "batches": 0}
+
+    def put(self, channel: str, payload: str, low_priority: bool):
+        with self._cond:
+            if self._closed:
+                return
+            if len(self._items) >= self.maxsize:
+                if low_priority or not self._evict_low_priority():
+                    self.counts["dropped"] += 1
+                    if self.counts["dropped"] % 100 == 1:
+                        logger.warning(f"Redis event queue full; dropped {self.counts['dropped']} events so far")
+                    return
+            self._items.append((channel, payload, low_priority))
+            self.counts["queued"] += 1
+            self._ensure_thread()
+            self._cond.notify()
+
+    def _evict_low_priority(self) -> bool:
+        """Drop the oldest queued low-priority event to make room. Caller holds the lock."""
+        for i, item in enumerate(self._items):
+            if item[2]:
+                del self._items[i]
+                self.counts["dropped"] += 1
+                return True
+        return False
+
+    def _ensure_thread(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name="redis-publisher", daemon=True)
+            self._thread.start()
+
+    def _take_batch(self):
+        with self._cond:
+            while not self._items and not self._closed:
+                self._cond.wait()
+            batch = []
+            while self._items and len(batch) < BATCH_SIZE:
+                batch.append(self._items.popleft())
+            return batch
+
+    def _run(self):
+        while True:
+            batch = self._take_batch()
+            if not batch:
+                return  # closed and drained
+            self._send(batch)
+            # Let bursts accumulate into the next pipeline instead of one PUBLISH per event
+            if len(batch) < BATCH_SIZE and FLUSH_INTERVAL_SECONDS > 0:
+                time.sleep(FLUSH_INTERVAL_SECONDS)
+
+    def _send(self, batch):
+        try:
+            if self._client is None:
+                self._client = redis.from_url(self.redis_url, decode_responses=True)
+            pipe = self._client.pipeline(transaction=False)
+            for channel, payload, _ in batch:
+                pipe.publish(channel, payload)
+            pipe.execute()
+            self.counts["published"] += len(batch)
+            self.counts["batches"] += 1
+        except Exception as e:
+            self.counts["failed"] += len(batch)
+            self._client = None
+            logger.error(f"Failed to publish {len(batch)} events to Redis: {e}")
+
+    def stats(self) -> dict:
+        return {**self.counts, "pending": len(self._items), "maxsize": self.maxsize}
+
+    def close(self, timeout: float = 2.0):
+        """Stop intake and give the flusher a moment to drain."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+
+_queues = {}
+_queues_lock = threading.Lock()
+
+# Optional per-request tap (e.g. a streaming HTTP response) that also receives
+# every event published from the current context.
+_event_listener: ContextVar = ContextVar("redis_event_listener", default=None)
+
+
+def listen_events(callback):
+    """Send events published in this context to ``callback(channel, payload_json)``.
+
+    Returns a token for ``stop_listening``.
+    """
+    return _event_listener.set(callback)
+
+
+def stop_listening(token):
+    _event_listener.reset(token)
+
+
+def _get_queue(redis_url: str) -> _EventQueue:
+    with _queues_lock:
+        queue = _queues.get(redis_url)
+        if queue is None:
+            queue = _queues[redis_url] = _EventQueue(redis_url)
+        return queue
+
+
+def publisher_stats() -> dict:
+    """Per-Redis-URL queue counters (queued/published/dropped/failed/pending)."""
+    return {url: q.stats() for url, q in _queues.items()}
+
+
+@atexit.register
+def _flush_on_exit():
+    for queue in list(_queues.values()):
+        queue.close()
+
+
 class RedisEventPublisher:
+    """
+    Publishes AgentEvents to the session channel.
+
+    Instances are cheap: they share one queue and Redis connection per URL,
+    and ``publish_event`` only enqueues, so it is safe to call from async code.
+    """
+
     def __init__(self, agent_name: str, agent_role: str, redis_url: str = None):
         self.agent_name = agent_name
         self.agent_role = agent_role
         self.redis_url = redis_url or os.getenv("REDIS_URL", "redis://redis_session_store:6379")
-        try:
-            self.redis_client = redis.from_url(self.redis_url, decode_responses=True)
-            logger.info(f"RedisEventPublisher connected to {self.redis_url}")
-        except Exception as e:
-            logger.error(f"Failed to connect to Redis: {e}")
-            self.redis_client = None
+        self._queue = _get_queue(self.redis_url)
 
-    def publish_event(self, 
-                      session_id: str, 
+    def publish_event(self,
+                      session_id: str,
                       user_id: str,
                       trace_id: str,
-                      msg_type: str, 
-                      message: str, 
+                      msg_type: str,
+                      message: str,
                       severity: str = "INFO",
                       display_type: str = "markdown",
                       icon: str = "🤖",
                       metadata: dict = None):
         """
-        Publishes a structured event to the session channel.
+        Queues a structured event for the session channel.
         """
-        if not self.redis_client:
-            return
-
         try:
             event = AgentEvent(
                 header=EventHeader(
@@ -59,17 +204,22 @@ class RedisEventPublisher:
 
             # Construct channel name (must match Gateway logic)
             # channel:user_{user_id}:session_{session_id}
-            # Fallback for user_id if not present?
             # ADK might not strictly pass user_id in all events, so we might need it passed in.
-            
             safe_user = user_id if user_id else "anonymous"
             channel_name = f"channel:user_{safe_user}:session_{session_id}"
 
-            subscribers = self.redis_client.publish(channel_name, event.model_dump_json())
-            logger.info(f"Published to {channel_name}: {subscribers} subscribers")
-            
+            payload = event.model_dump_json()
+            self._queue.put(channel_name, payload, msg_type in LOW_PRIORITY_TYPES)
+
+            listener = _event_listener.get()
+            if listener is not None:
+                listener(channel_name, payload)
+
         except Exception as e:
-            logger.error(f"Failed to publish event to {channel_name if 'channel_name' in locals() else 'unknown'}: {e}")
+            logger.error(f"Failed to publish event for session {session_id}: {e}")
+
+    def stats(self) -> dict:
+        return self._queue.stats()
 
     def process_adk_event(self, event, session_id: str, user_id: str, trace_id: str = "system"):
         """
@@ -81,7 +231,7 @@ class RedisEventPublisher:
                 text_content = ""
                 for part in event.content.parts:
                      if part.text: text_content += part.text
-                
+
                 if text_content:
                     self.publish_event(
                         session_id=session_id, user_id=user_id, trace_id=trace_id,
@@ -95,7 +245,7 @@ class RedisEventPublisher:
             # ADK structure varies widely. We look for 'tool_calls' or similar.
             # Usually event is ModelResponse or ToolRequest.
             # Let's inspect the object type or specific attributes.
-            
+
             # Simple heuristic:
             # If it's a Tool Request (Client side in ADK terms)
             if hasattr(event, 'function_calls') and event.function_calls:
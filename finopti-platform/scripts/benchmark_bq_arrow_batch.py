@@ -0,0 +1,155 @@
+"""
+Benchmark: BigQuery analytics Arrow batch construction
+------------------------------------------------------
+Compares the previous row-by-row ``BatchProcessor._prepare_arrow_batch``
+(per-cell schema lookups and type checks, writer schema serialized per
+batch) with the column-wise encoder, on synthetic rows shaped like the
+ones ``BigQueryAgentAnalyticsPlugin._log_event`` produces. Both outputs are
+checked to be identical before timing.
+
+Needs pyarrow, google-cloud-bigquery and the vendored ADK installed as
+``google.adk`` (as in the MATS images). Run from finopti-platform/:
+
+    python scripts/benchmark_bq_arrow_batch.py --rows 20000 --batch-size 100
+"""
+import sys
+import json
+import time
+import argparse
+from datetime import datetime, timezone
+
+import pyarrow as pa
+
+from google.adk.plugins import bigquery_agent_analytics_plugin as bq_analytics
+
+
+def make_rows(n: int):
+    rows = []
+    for i in range(n):
+        rows.append({
+            "timestamp": datetime.now(timezone.utc),
+            "event_type": ("LLM_REQUEST", "LLM_RESPONSE", "TOOL_STARTING", "TOOL_COMPLETED")[i % 4],
+            "agent": "gcloud_specialist",
+            "user_id": f"user{i % 7}@example.com",
+            "session_id": f"session-{i // 50}",
+            "invocation_id": f"e-{i // 10}",
+            "trace_id": f"{i:032x}",
+            "span_id": f"{i:016x}",
+            "parent_span_id": None,
+            "content": {"text_summary": "gcloud compute instances list --format=json " * 4, "args": {"i": i}},
+            "content_parts": [
+                {"part_index": 0, "mime_type": "text/plain", "uri": None, "object_ref": None,
+                 "text": "Listing instances in us-central1", "part_attributes": "{}", "storage_mode": "INLINE"},
+            ],
+            "attributes": json.dumps({"root_agent_name": "gcloud", "model": "gemini-2.5-flash"}),
+            "latency_ms": {"total_ms": 120 + i % 50} if i % 2 else None,
+            "status": "OK",
+            "error_message": None,
+            "is_truncated": False,
+        })
+    return rows
+
+
+def legacy_prepare(arrow_schema: pa.Schema, rows) -> pa.RecordBatch:
+    """The previous row-by-row implementation, kept here as the baseline."""
+    data = {field.name: [] for field in arrow_schema}
+    for row in rows:
+        for field in arrow_schema:
+            value = row.get(field.name)
+            field_metadata = arrow_schema.field(field.name).metadata
+            is_json = False
+            if field_metadata and b"ARROW:extension:name" in field_metadata:
+                if field_metadata[b"ARROW:extension:name"] == b"google:sqlType:json":
+                    is_json = True
+            arrow_field_type = arrow_schema.field(field.name).type
+            is_struct = pa.types.is_struct(arrow_field_type)
+            is_list = pa.types.is_list(arrow_field_type)
+            if is_json:
+                if value is not None:
+                    if isinstance(value, (dict, list)):
+                        try:
+                            value = json.dumps(value)
+                        except (TypeError, ValueError):
+                            value = str(value)
+                    elif isinstance(value, (str, bytes)):
+                        if isinstance(value, bytes):
+                            try:
+                                value = value.decode("utf-8")
+                            except UnicodeDecodeError:
+                                value = str(value)
+                        is_already_json = False
+                        if isinstance(value, str):
+                            stripped = value.strip()
+                            if stripped.startswith(("{", "[")) and stripped.endswith(("}", "]")):
+                                try:
+                                    json.loads(value)
+                                    is_already_json = True
+                                except (ValueError, TypeError):
+                                    pass
+                        if not is_already_json:
+                            try:
+                                value = json.dumps(value)
+                            except (TypeError, ValueError):
+                                value = str(value)
+                    else:
+                        try:
+                            value = json.dumps(value)
+                        except (TypeError, ValueError):
+                            value = str(value)
+            elif isinstance(value, (dict, list)) and not is_struct and not is_list:
+                try:
+                    value = json.dumps(value)
+                except (TypeError, ValueError):
+                    value = str(value)
+            data[field.name].append(value)
+    return pa.RecordBatch.from_pydict(data, schema=arrow_schema)
+
+
+def run_legacy(arrow_schema, batches):
+    for batch in batches:
+        arrow_schema.serialize().to_pybytes()
+        legacy_prepare(arrow_schema, batch).serialize().to_pybytes()
+
+
+def run_encoder(encoder, batches):
+    for batch in batches:
+        encoder.encode(batch).serialize().to_pybytes()
+
+
+def timed(fn, *args, repeat: int):
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn(*args)
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=20000)
+    parser.add_argument("--batch-size", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    arrow_schema = bq_analytics.to_arrow_schema(bq_analytics._get_events_schema())
+    encoder = bq_analytics._ArrowBatchEncoder(arrow_schema)
+    rows = make_rows(args.rows)
+    batches = [rows[i:i + args.batch_size] for i in range(0, len(rows), args.batch_size)]
+
+    if not legacy_prepare(arrow_schema, batches[0]).equals(encoder.encode(batches[0])):
+        print("ERROR: encoder output differs from the row-wise baseline", file=sys.stderr)
+        sys.exit(1)
+
+    legacy = timed(run_legacy, arrow_schema, batches, repeat=args.repeat)
+    vectorized = timed(run_encoder, encoder, batches, repeat=args.repeat)
+
+    print(f"{args.rows} rows in batches of {args.batch_size} (best of {args.repeat})")
+    print(f"{'path':<12} {'seconds':>9} {'rows/sec':>12}")
+    for name, seconds in (("row-wise", legacy), ("column-wise", vectorized)):
+        print(f"{name:<12} {seconds:>9.3f} {args.rows / seconds:>12,.0f}")
+    print(f"speedup: {legacy / vectorized:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
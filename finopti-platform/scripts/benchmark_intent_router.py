@@ -0,0 +1,198 @@
+"""
+Benchmark: orchestrator intent routing
+--------------------------------------
+Compares the previous ``detect_intent`` (8 regex searches, 22 trigger
+substring checks, then one ``re.search`` or substring scan per registry
+keyword per agent) with the compiled ``IntentRouter`` (orchestrator_adk/
+intent.py), and the MATS ``match_operational_route`` pattern loop with the
+precompiled one (mats-agents/mats-orchestrator/routing.py).
+
+Routing decisions and per-agent scores are checked to be identical on the
+sample prompts and on generated ones that pack registry keywords together
+(overlaps, shared prefixes, word boundaries) before timing. Also checks that
+a change to master_agent_registry.json is picked up without a restart (only
+the file mtime is touched). Standard library only; run from finopti-platform/:
+
+    python scripts/benchmark_intent_router.py --calls 20000
+"""
+import os
+import re
+import sys
+import time
+import random
+import logging
+import argparse
+from pathlib import Path
+from typing import Callable, Dict, List
+
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT / "orchestrator_adk"))
+
+os.environ["REGISTRY_RELOAD_INTERVAL_SECONDS"] = "0"
+logging.disable(logging.CRITICAL)
+
+import registry  # noqa: E402
+import intent  # noqa: E402
+
+SAMPLE_PROMPTS = [
+    "list all my VMs in project prod",
+    "Why is my Cloud Run service returning 500s?",
+    "show the cost breakdown for BigQuery last month",
+    "create a bucket named finopti-reports in us-central1",
+    "open a PR on github for the fix in repo auth_micro_agents",
+    "what is the CPU utilization of the api service",
+    "query the sql database for the top 10 customers",
+    "search the web for the latest GA4 release notes",
+    "investigate the crash in checkout-service after the last deploy",
+    "ls the gcs bucket and cat the latest log file",
+    "summarize google analytics traffic from last week",
+    "hello there",
+    "",
+]
+
+
+# --- Previous implementations (baseline) ---
+
+def legacy_scores(registry_list: List[Dict], prompt_lower: str) -> Dict[str, int]:
+    scores = {}
+    for agent in registry_list:
+        score = 0
+        for k in agent.get('keywords', []):
+            k_lower = k.lower()
+            if len(k_lower) <= 3:
+                if re.search(r'\b' + re.escape(k_lower) + r'\b', prompt_lower):
+                    score += 2
+            else:
+                if k_lower in prompt_lower:
+                    score += 1
+                    if ' ' in k_lower:
+                        score += 2
+        scores[agent['agent_id']] = score
+    return scores
+
+
+def legacy_detect_intent(prompt: str) -> str:
+    registry_list = registry.load_registry()
+    prompt_lower = prompt.lower()
+    is_simple_operation = any(re.search(pattern, prompt_lower) for pattern in intent.SIMPLE_OPERATIONS)
+    if not is_simple_operation:
+        for trigger in intent.MATS_TRIGGERS:
+            if trigger in prompt_lower:
+                return "mats-orchestrator"
+    scores = legacy_scores(registry_list, prompt_lower)
+    if os.getenv("DEBUG_ROUTING", "false").lower() == "true":
+        sorted(scores.items(), key=lambda x: x[1], reverse=True)[:3]
+    if scores:
+        best_agent_id = max(scores, key=scores.get)
+        if scores[best_agent_id] >= 1:
+            return best_agent_id
+    return "gcloud_infrastructure_specialist"
+
+
+def legacy_match_operational_route(routes, user_request: str):
+    request_lower = user_request.lower()
+    for pattern, url_key, name in routes:
+        if re.search(pattern, request_lower):
+            return True, url_key, name
+    return False, None, None
+
+
+def load_mats_routing():
+    """mats-orchestrator/routing.py, with every route resolvable (no delegation module here)."""
+    sys.path.insert(0, str(ROOT / "mats-agents" / "mats-orchestrator"))
+    import routing
+    routing._URL_MAP = {key: (lambda key=key: key) for key in ("gcloud", "remediation")}
+    return routing
+
+
+# --- Prompts ---
+
+def generated_prompts(registry_list: List[Dict], n: int, seed: int = 7) -> List[str]:
+    rng = random.Random(seed)
+    keywords = sorted({k for agent in registry_list for k in agent.get('keywords', [])})
+    filler = ["please", "the", "my", "in", "for", "a", "project", "prod", "and", "with", "_", "-", "/", "."]
+    prompts = []
+    for _ in range(n):
+        parts = []
+        for _ in range(rng.randint(1, 12)):
+            word = rng.choice(keywords) if rng.random() < 0.5 else rng.choice(filler)
+            if rng.random() < 0.2:
+                word = word.upper()
+            parts.append(word)
+        # Mix of separators, including none, to exercise substrings and word boundaries
+        prompts.append("".join(p + rng.choice([" ", " ", "", "-", "s ", "_"]) for p in parts))
+    return prompts
+
+
+# --- Checks and timing ---
+
+def bench(fn: Callable[[str], object], prompts: List[str], calls: int) -> float:
+    started = time.perf_counter()
+    for i in range(calls):
+        fn(prompts[i % len(prompts)])
+    return (time.perf_counter() - started) / calls
+
+
+def check_equivalence(prompts: List[str], routing) -> None:
+    registry_list = registry.load_registry()
+    router = intent.get_router()
+    for prompt in prompts:
+        lower = prompt.lower()
+        assert router.scores(lower) == legacy_scores(registry_list, lower), prompt
+        assert intent.detect_intent(prompt) == legacy_detect_intent(prompt), prompt
+        assert routing.match_operational_route(prompt) == \
+            legacy_match_operational_route(routing.OPERATIONAL_ROUTES, prompt), prompt
+    print(f"✅ identical scores and routes on {len(prompts)} prompts")
+
+
+def check_hot_reload() -> None:
+    path = ROOT / "orchestrator_adk" / "master_agent_registry.json"
+    router = intent.get_router()
+    version = registry.registry_version()
+    stat = path.stat()
+    try:
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        assert intent.get_router() is not router and registry.registry_version() == version + 1
+        rebuilt = intent.get_router()
+        assert intent.get_router() is rebuilt  # unchanged file: no rebuild
+    finally:
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    print("✅ registry file change reloads the registry and rebuilds the router")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--calls", type=int, default=20000)
+    parser.add_argument("--generated", type=int, default=5000, help="generated prompts for the equivalence check")
+    args = parser.parse_args()
+
+    registry_list = registry.load_registry()
+    routing = load_mats_routing()
+    prompts = SAMPLE_PROMPTS + generated_prompts(registry_list, args.generated)
+    check_equivalence(prompts, routing)
+    check_hot_reload()
+
+    # Production reload check interval for the timings
+    registry.REGISTRY_RELOAD_INTERVAL = 5.0
+    registry_list = registry.load_registry()
+    keywords = sum(len(agent.get('keywords', [])) for agent in registry_list)
+    started = time.perf_counter()
+    intent.IntentRouter(registry_list)
+    compile_ms = (time.perf_counter() - started) * 1000
+    print(f"\nRegistry: {len(registry_list)} agents, {keywords} keywords; router compiles in {compile_ms:.2f} ms")
+
+    timed = SAMPLE_PROMPTS[:-1]
+    rows = [
+        ("detect_intent", legacy_detect_intent, intent.detect_intent),
+        ("match_operational_route",
+         lambda p: legacy_match_operational_route(routing.OPERATIONAL_ROUTES, p), routing.match_operational_route),
+    ]
+    print(f"{'':26}{'before':>12}{'after':>12}{'speedup':>10}")
+    for label, before_fn, after_fn in rows:
+        before = bench(before_fn, timed, args.calls)
+        after = bench(after_fn, timed, args.calls)
+        print(f"{label:26}{before * 1e6:>9.1f} µs{after * 1e6:>9.1f} µs{before / after:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
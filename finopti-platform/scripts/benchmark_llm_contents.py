@@ -0,0 +1,74 @@
+"""
+Benchmark: LLM content assembly over long sessions
+--------------------------------------------------
+Times ``flows/llm_flows/contents._get_contents`` the way an agent run calls
+it: once per LLM call, each time after a tool call + response were appended
+to the session. The full path re-filters and deep-copies the whole history
+on every call; with a ``cache_key`` only the newly appended events are
+processed.
+
+Sessions are synthetic MATS-like histories (user turns, tool calls with
+~2KB tool outputs, model text). Needs the vendored ADK installed as
+``google.adk`` (as in the MATS images). Run from finopti-platform/:
+
+    python scripts/benchmark_llm_contents.py --events 1000 10000 --calls 20
+"""
+import time
+import argparse
+
+from google.genai import types
+from google.adk.events.event import Event
+from google.adk.flows.llm_flows import contents as llm_contents
+
+TOOL_OUTPUT = {"logs": [f"2026-01-01T00:00:{i:02d}Z ERROR upstream timeout pod=api-{i}" for i in range(40)]}
+
+
+def make_events(start: int, n: int):
+    events = []
+    for i in range(start, start + n):
+        kind = i % 4
+        inv = f"inv-{i // 40}"
+        if kind == 0:
+            content = types.Content(role="user", parts=[types.Part(text=f"Investigate incident step {i}")])
+            events.append(Event(author="user", invocation_id=inv, content=content))
+        elif kind == 1:
+            call = types.FunctionCall(id=f"adk-{i}", name="read_logs", args={"filter": f"severity>=ERROR step={i}"})
+            events.append(Event(author="sre_agent", invocation_id=inv, content=types.Content(role="model", parts=[types.Part(function_call=call)])))
+        elif kind == 2:
+            resp = types.FunctionResponse(id=f"adk-{i - 1}", name="read_logs", response=TOOL_OUTPUT)
+            events.append(Event(author="sre_agent", invocation_id=inv, content=types.Content(role="user", parts=[types.Part(function_response=resp)])))
+        else:
+            content = types.Content(role="model", parts=[types.Part(text=f"Found {i % 7} matching errors; continuing.")])
+            events.append(Event(author="sre_agent", invocation_id=inv, content=content))
+    return events
+
+
+def bench(n_events: int, calls: int, cached: bool) -> float:
+    """Average seconds per _get_contents call over `calls` tool rounds."""
+    events = make_events(0, n_events)
+    key = ("bench", "user", f"session-{n_events}", None, "sre_agent") if cached else None
+    llm_contents._get_contents(None, events, "sre_agent", cache_key=key)  # warm the prefix
+    total = 0.0
+    for c in range(calls):
+        events.extend(make_events(n_events + 4 * c, 4))
+        started = time.perf_counter()
+        llm_contents._get_contents(None, events, "sre_agent", cache_key=key)
+        total += time.perf_counter() - started
+    return total / calls
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--events", type=int, nargs="+", default=[1000, 10000])
+    parser.add_argument("--calls", type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"{'events':>8} {'full ms/call':>14} {'incremental ms/call':>20} {'speedup':>9}")
+    for n in args.events:
+        full = bench(n, args.calls, cached=False)
+        incremental = bench(n, args.calls, cached=True)
+        print(f"{n:>8} {full * 1000:>14.2f} {incremental * 1000:>20.2f} {full / incremental:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
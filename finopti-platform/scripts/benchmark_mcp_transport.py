@@ -0,0 +1,110 @@
+"""
+Benchmark: MCP stdio transport throughput vs. concurrency
+--------------------------------------------------------
+Drives one MCPProcess (common/mcp_pool.py) with N concurrent ``tools/call``
+requests against a fake stdio MCP server that answers after a fixed delay.
+Concurrency 1 is what the old write-then-readline clients achieved; higher
+levels exercise the id-multiplexed reader.
+
+No Docker needed. Run from finopti-platform/:
+
+    python scripts/benchmark_mcp_transport.py --calls 400 --latency-ms 20
+"""
+import os
+import sys
+import time
+import asyncio
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from common.mcp_pool import MCPProcess, MCPServerSpec, MCPCallTimeout  # noqa: E402
+
+# Minimal MCP server: answers every tools/call concurrently after `delay` seconds.
+FAKE_SERVER = r'''
+import sys, json, asyncio
+
+async def main():
+    loop = asyncio.get_running_loop()
+    reader = asyncio.StreamReader(limit=10 * 1024 * 1024)
+    await loop.connect_read_pipe(lambda: asyncio.StreamReaderProtocol(reader), sys.stdin)
+    lock = asyncio.Lock()
+
+    async def reply(msg):
+        async with lock:
+            sys.stdout.write(json.dumps(msg) + "\n")
+            sys.stdout.flush()
+
+    async def handle(req):
+        method = req.get("method")
+        if method == "initialize":
+            await reply({"jsonrpc": "2.0", "id": req["id"], "result": {"serverInfo": {"name": "fake"}}})
+        elif method == "tools/call":
+            args = req["params"]["arguments"]
+            await asyncio.sleep(args.get("delay", 0))
+            await reply({"jsonrpc": "2.0", "id": req["id"],
+                         "result": {"content": [{"type": "text", "text": json.dumps(args)}]}})
+        elif "id" in req:
+            await reply({"jsonrpc": "2.0", "id": req["id"], "error": {"code": -32601, "message": "not found"}})
+
+    while True:
+        line = await reader.readline()
+        if not line:
+            return
+        asyncio.ensure_future(handle(json.loads(line)))
+
+asyncio.run(main())
+'''
+
+
+async def run_level(proc: MCPProcess, concurrency: int, calls: int, delay: float) -> float:
+    sem = asyncio.Semaphore(concurrency)
+
+    async def one(i):
+        async with sem:
+            await proc.call_tool("echo", {"i": i, "delay": delay})
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(calls)))
+    return time.perf_counter() - started
+
+
+async def main(args):
+    with tempfile.NamedTemporaryFile("w", suffix="_fake_mcp.py", delete=False) as f:
+        f.write(FAKE_SERVER)
+        server_path = f.name
+
+    spec = MCPServerSpec(name="bench", command=(sys.executable, server_path), client_name="benchmark")
+    proc = MCPProcess(spec)
+    await proc.start()
+    delay = args.latency_ms / 1000.0
+    try:
+        print(f"{args.calls} calls, {args.latency_ms} ms simulated tool latency, 1 MCP process")
+        print(f"{'concurrency':>12} {'seconds':>9} {'calls/s':>9} {'speedup':>8}")
+        base = None
+        for level in args.levels:
+            elapsed = await run_level(proc, level, args.calls, delay)
+            rate = args.calls / elapsed
+            base = base or rate
+            print(f"{level:>12} {elapsed:>9.2f} {rate:>9.1f} {rate / base:>7.1f}x")
+
+        # Per-call timeout on one slow call must not disturb the others.
+        slow = proc.call_tool("echo", {"delay": 1.0}, timeout=0.1)
+        fast = [proc.call_tool("echo", {"i": i, "delay": delay}) for i in range(8)]
+        results = await asyncio.gather(slow, *fast, return_exceptions=True)
+        ok = sum(1 for r in results[1:] if not isinstance(r, Exception))
+        print(f"\ntimeout isolation: slow call -> {type(results[0]).__name__}, "
+              f"{ok}/8 concurrent calls ok, process alive={proc.alive}")
+        assert isinstance(results[0], MCPCallTimeout) and ok == 8 and proc.alive
+    finally:
+        await proc.close()
+        os.unlink(server_path)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--calls", type=int, default=400)
+    parser.add_argument("--latency-ms", type=float, default=20.0)
+    parser.add_argument("--levels", type=int, nargs="+", default=[1, 2, 4, 8, 16, 32, 64])
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,112 @@
+"""
+Benchmark: MATS phase overlap (time to RCA)
+-------------------------------------------
+Replays the orchestrator's investigation DAG on the real ``PhaseExecutor``
+(mats-agents/mats-orchestrator/phase_executor.py) with simulated agent
+latencies, and compares time to RCA when the phases run back to back (before)
+with speculative code recon running alongside SRE triage (after).
+
+Scenarios:
+
+- code bug: SRE triage passes, the Investigator runs with the recon context
+  and skips its own repo mapping (``--repo-mapping`` seconds of its budget).
+- SRE root cause: triage finds the cause while recon is still running; recon
+  is cancelled and its ``on_cancel`` hook fires (checked), so the remote
+  Investigator run is stopped and nothing is saved or lost.
+- slow recon: recon is still running when the Investigator needs it and is
+  dropped after the join timeout (the worst case: the Investigator starts
+  up to ``--join-timeout`` later than it would have).
+
+Latencies are in simulated seconds, scaled by ``--scale`` real seconds each.
+In production the same numbers come from ``session.phase_timings`` and the
+``mats.phase.duration`` / ``mats.phase.cancelled`` OTel metrics; this script
+is the lab version of that measurement. Standard library only; run from
+finopti-platform/:
+
+    python scripts/benchmark_phase_overlap.py --sre 90 --recon 60 --investigate 150
+"""
+import sys
+import time
+import asyncio
+import logging
+import argparse
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT / "mats-agents" / "mats-orchestrator"))
+
+logging.disable(logging.CRITICAL)
+
+from phase_executor import PhaseExecutor  # noqa: E402
+
+
+async def _agent(seconds: float, scale: float, result=None):
+    await asyncio.sleep(seconds * scale)
+    return result
+
+
+async def time_to_rca(args, speculative: bool, root_cause_found: bool, recon_seconds: float) -> dict:
+    """One investigation; returns simulated seconds to RCA and what happened to recon."""
+    s = args.scale
+    phases = PhaseExecutor("bench")
+    cancel_hooks = []
+
+    async def cancel_hook():
+        cancel_hooks.append(time.perf_counter())
+
+    started = time.perf_counter()
+    phases.add("sre", lambda deps: _agent(args.sre, s, {"root_cause_found": root_cause_found}))
+    if speculative:
+        phases.add("code_recon", lambda deps: _agent(recon_seconds, s, "recon"),
+                   speculative=True, on_cancel=cancel_hook)
+        phases.start("code_recon")
+
+    sre_result = await phases.result("sre")
+    if sre_result["root_cause_found"]:
+        phases.cancel_speculative("SRE identified root cause")
+    else:
+        recon = None
+        if speculative:
+            recon = await phases.result_within("code_recon", args.join_timeout * s)
+        # Without recon the Investigator maps the repository itself
+        investigate = args.investigate - (args.repo_mapping if recon else 0)
+        await phases.run("investigate", lambda deps: _agent(investigate, s), deps=("sre",))
+    await phases.run("architect", lambda deps: _agent(args.architect, s), deps=("sre",))
+    elapsed = (time.perf_counter() - started) / s
+
+    await phases.aclose()
+    status = phases.timings()["phases"].get("code_recon", {}).get("status", "-")
+    return {"seconds": elapsed, "recon": status, "cancel_hooks": len(cancel_hooks)}
+
+
+async def run(args):
+    scenarios = [
+        ("code bug", False, args.recon),
+        ("SRE root cause", True, args.sre + args.recon),
+        ("slow recon", False, args.sre + args.join_timeout + args.recon),
+    ]
+    print(f"{'':16}{'before':>10}{'after':>10}{'saved':>10}   recon")
+    for label, root_cause_found, recon_seconds in scenarios:
+        before = await time_to_rca(args, False, root_cause_found, recon_seconds)
+        after = await time_to_rca(args, True, root_cause_found, recon_seconds)
+        if after["recon"] == "CANCELLED":
+            # The remote run must be told to stop as well
+            assert after["cancel_hooks"] == 1, after
+        saved = before["seconds"] - after["seconds"]
+        print(f"{label:16}{before['seconds']:>9.1f}s{after['seconds']:>9.1f}s{saved:>9.1f}s   {after['recon']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sre", type=float, default=90, help="SRE triage")
+    parser.add_argument("--recon", type=float, default=60, help="speculative code recon")
+    parser.add_argument("--investigate", type=float, default=150, help="Investigator without recon")
+    parser.add_argument("--repo-mapping", type=float, default=60, help="Investigator time saved by recon")
+    parser.add_argument("--architect", type=float, default=30, help="Architect synthesis")
+    parser.add_argument("--join-timeout", type=float, default=5, help="MATS_RECON_JOIN_TIMEOUT_SECONDS")
+    parser.add_argument("--scale", type=float, default=0.002, help="real seconds per simulated second")
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
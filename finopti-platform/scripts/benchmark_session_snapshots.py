@@ -0,0 +1,91 @@
+"""
+Benchmark: InMemorySessionService reads on long sessions
+--------------------------------------------------------
+Compares the previous ``get_session`` (``copy.deepcopy`` of the whole stored
+Session, every event included) with the snapshot read that shares the
+immutable Event objects and copies only the session's own list and state.
+
+Reports time per read and the memory each outstanding read holds on top of
+the stored session (tracemalloc), on synthetic MATS-like sessions with
+~2KB tool outputs. Needs the vendored ADK installed as ``google.adk`` (as in
+the MATS images). Run from finopti-platform/:
+
+    python scripts/benchmark_session_snapshots.py --events 10000 --reads 20
+"""
+import copy
+import time
+import asyncio
+import argparse
+import tracemalloc
+
+from google.genai import types
+from google.adk.events.event import Event
+from google.adk.events.event_actions import EventActions
+from google.adk.sessions import InMemorySessionService
+
+APP, USER, SESSION = "bench", "user", "session"
+TOOL_OUTPUT = {"logs": [f"2026-01-01T00:00:{i:02d}Z ERROR upstream timeout pod=api-{i}" for i in range(40)]}
+
+
+class DeepCopySessionService(InMemorySessionService):
+    """The previous read path, kept here as the baseline."""
+
+    def _snapshot(self, session, events):
+        copied = copy.deepcopy(session)
+        copied.events = list(copied.events) if events else []
+        return copied
+
+
+def make_event(i: int) -> Event:
+    inv = f"inv-{i // 40}"
+    if i % 2:
+        resp = types.FunctionResponse(id=f"adk-{i}", name="read_logs", response=TOOL_OUTPUT)
+        content = types.Content(role="user", parts=[types.Part(function_response=resp)])
+    else:
+        content = types.Content(role="model", parts=[types.Part(text=f"Checked step {i}; continuing.")])
+    actions = EventActions(state_delta={"last_step": i, "findings": {"errors": i % 7}}) if i % 100 == 0 else EventActions()
+    return Event(author="sre_agent", invocation_id=inv, content=content, actions=actions)
+
+
+async def build(service_cls, n_events: int):
+    service = service_cls()
+    session = await service.create_session(app_name=APP, user_id=USER, session_id=SESSION,
+                                           state={"incident": {"id": "INC-1", "services": ["api", "db"]}})
+    for i in range(n_events):
+        await service.append_event(session, make_event(i))
+    return service
+
+
+async def measure(service, reads: int):
+    """Seconds per get_session and bytes held per outstanding snapshot."""
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    started = time.perf_counter()
+    held = [await service.get_session(app_name=APP, user_id=USER, session_id=SESSION) for _ in range(reads)]
+    elapsed = time.perf_counter() - started
+    per_read = (tracemalloc.get_traced_memory()[0] - baseline) / reads
+    tracemalloc.stop()
+    assert all(len(s.events) == len(held[0].events) for s in held)
+    return elapsed / reads, per_read
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--events", type=int, nargs="+", default=[1000, 10000])
+    parser.add_argument("--reads", type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"{'events':>8} {'path':<10} {'ms/read':>10} {'MB held/read':>14}")
+    for n in args.events:
+        results = {}
+        for name, cls in (("deepcopy", DeepCopySessionService), ("snapshot", InMemorySessionService)):
+            service = await build(cls, n)
+            results[name] = await measure(service, args.reads)
+            seconds, held = results[name]
+            print(f"{n:>8} {name:<10} {seconds * 1000:>10.2f} {held / 1e6:>14.2f}")
+        (old_s, old_m), (new_s, new_m) = results["deepcopy"], results["snapshot"]
+        print(f"{'':>8} {'':<10} {old_s / new_s:>9.1f}x {old_m / max(new_m, 1):>13.1f}x")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,103 @@
+"""
+Benchmark: per-LLM-call tool preparation overhead
+-------------------------------------------------
+Sub-agents rebuild their Agent (and its FunctionTools) per request, and every
+LLM call asks each tool for its FunctionDeclaration; every tool call then
+inspects the wrapped function's signature again. This times that work for a
+catalog of MATS-like tool functions with the process-wide signature /
+declaration cache cold (cleared before every call, i.e. the previous
+behavior) and warm.
+
+Needs the vendored ADK installed as ``google.adk`` (as in the MATS images).
+Run from finopti-platform/:
+
+    python scripts/benchmark_tool_declarations.py --tools 20 --calls 200
+"""
+import time
+import asyncio
+import argparse
+from typing import Dict, List, Optional
+
+from pydantic import BaseModel
+
+from google.adk.tools.function_tool import FunctionTool
+from google.adk.tools.tool_context import ToolContext
+from google.adk.tools import _automatic_function_calling_util as declarations
+
+
+class LogFilter(BaseModel):
+    severity: str = "ERROR"
+    resource_type: Optional[str] = None
+    labels: Dict[str, str] = {}
+
+
+def make_tool_function(i: int):
+    """A fresh module-level-style tool function (one per catalog entry)."""
+
+    def read_logs(project_id: str, log_filter: LogFilter, hours_ago: int = 1,
+                  limit: Optional[int] = 100, fields: Optional[List[str]] = None,
+                  tool_context: ToolContext = None) -> dict:
+        """Reads Cloud Logging entries.
+
+        Args:
+            project_id: GCP project to read from.
+            log_filter: Which entries to return.
+            hours_ago: How far back to look.
+            limit: Maximum entries.
+            fields: Entry fields to keep.
+        """
+        return {"entries": [], "project_id": project_id}
+
+    read_logs.__name__ = f"read_logs_{i}"
+    return read_logs
+
+
+def prepare_call(tools: List[FunctionTool]):
+    """What one LLM call + one tool call per tool costs in introspection."""
+    for tool in tools:
+        tool._get_declaration()
+        tool._preprocess_args({"project_id": "p", "log_filter": {"severity": "WARNING"}})
+        tool._get_mandatory_args()
+
+
+def bench(tools: List[FunctionTool], calls: int, cached: bool) -> float:
+    prepare_call(tools)
+    started = time.perf_counter()
+    for _ in range(calls):
+        if not cached:
+            declarations.invalidate_function_cache()
+        prepare_call(tools)
+    return (time.perf_counter() - started) / calls
+
+
+async def check_run(tool: FunctionTool):
+    """A cached tool still runs and validates arguments as before."""
+    result = await tool.run_async(args={"project_id": "p", "log_filter": {}}, tool_context=None)
+    assert result["project_id"] == "p", result
+    missing = await tool.run_async(args={}, tool_context=None)
+    assert "mandatory input parameters" in missing["error"], missing
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tools", type=int, default=20)
+    parser.add_argument("--calls", type=int, default=200)
+    args = parser.parse_args()
+
+    functions = [make_tool_function(i) for i in range(args.tools)]
+    # Agents are rebuilt per request: new FunctionTool objects, same functions.
+    tools = [FunctionTool(func) for func in functions]
+
+    cold = bench(tools, args.calls, cached=False)
+    warm = bench(tools, args.calls, cached=True)
+    asyncio.run(check_run(tools[0]))
+
+    print(f"{args.tools} tools, {args.calls} LLM calls")
+    print(f"{'cache':<6} {'ms per call':>12}")
+    print(f"{'cold':<6} {cold * 1000:>12.2f}")
+    print(f"{'warm':<6} {warm * 1000:>12.2f}")
+    print(f"speedup: {cold / warm:.1f}x   cache: {declarations.function_cache_stats()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -15,10 +15,8 @@ from google.adk.agents import Agent
 from google.adk.apps import App
 from google.adk.plugins import ReflectAndRetryToolPlugin
 from google.adk.plugins.bigquery_agent_analytics_plugin import (
-    BigQueryAgentAnalyticsPlugin,
     BigQueryLoggerConfig
 )
-from google.adk.runners import InMemoryRunner
 from google.genai import types
 from opentelemetry import trace
 from openinference.semconv.trace import SpanAttributes
@@ -53,6 +51,8 @@ setup_observability()
 # IMPORT COMMON UTILS
 # -------------------------------------------------------------------------
 from common.model_resilience import run_with_model_fallback
+from common.runner_cache import leased_runner, run_on_agent_loop
+from common.analytics_sink import SharedBigQueryAnalyticsPlugin
 
 # -------------------------------------------------------------------------
 # AGENT DEFINITION
@@ -86,7 +86,7 @@ def create_app(model_name: str = None):
         root_agent=agent_instance,
         plugins=[
             ReflectAndRetryToolPlugin(max_retries=3),
-            BigQueryAgentAnalyticsPlugin(
+            SharedBigQueryAnalyticsPlugin(
                 project_id=config.GCP_PROJECT_ID,
                 dataset_id=os.getenv("BQ_ANALYTICS_DATASET", "agent_analytics"),
                 table_id=config.BQ_ANALYTICS_TABLE,
@@ -130,7 +130,7 @@ async def send_message_async(prompt: str, user_email: str = None, token: str = N
 
         async def _run_once(app_instance):
             response_text = ""
-            async with InMemoryRunner(app=app_instance) as runner:
+            async with leased_runner(app_instance) as runner:
                 sid = session_id
                 uid = user_email or "default"
                 
@@ -155,7 +155,7 @@ async def send_message_async(prompt: str, user_email: str = None, token: str = N
         _mcp_ctx.reset(token_reset)
 
 def send_message(prompt: str, user_email: str = None, token: str = None, session_id: str = "default") -> str:
-    return asyncio.run(send_message_async(prompt, user_email, token, session_id))
+    return run_on_agent_loop(send_message_async(prompt, user_email, token, session_id))
 
 if __name__ == "__main__":
     if len(sys.argv) > 1:
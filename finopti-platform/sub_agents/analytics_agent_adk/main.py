@@ -1,81 +1,61 @@
 """
-Analytics ADK Agent - Flask HTTP Wrapper
+Analytics ADK Agent - HTTP Wrapper
+
+Serves the agent through the shared ASGI layer (common/agent_server.py).
 """
 
 import sys
+import logging
 from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
-from flask import Flask, request, jsonify
-from agent import send_message
+from agent import send_message_async
 from config import config
+from common.agent_server import create_agent_server, serve
 
-# Import structured logging
+# Structured logging (the agent server sets the request ID per request)
 try:
     sys.path.insert(0, str(Path(__file__).parent.parent.parent / 'orchestrator'))
-    from structured_logging import (
-        StructuredLogger,
-        set_request_id,
-        add_request_id_to_response
-    )
+    from structured_logging import StructuredLogger
     STRUCTURED_LOGGING_AVAILABLE = True
 except ImportError:
     STRUCTURED_LOGGING_AVAILABLE = False
-    import logging
     logging.basicConfig(level=logging.INFO)
 
-app = Flask(__name__)
-
 if STRUCTURED_LOGGING_AVAILABLE:
     logger = StructuredLogger('analytics_agent_adk', level=config.LOG_LEVEL)
-    app.after_request(add_request_id_to_response)
 else:
     logger = logging.getLogger(__name__)
 
-@app.route('/health', methods=['GET'])
-def health():
-    return jsonify({
-        "status": "healthy",
-        "service": "analytics_agent_adk"
-    }), 200
-
-@app.route('/execute', methods=['POST'])
-def execute():
-    try:
-        if STRUCTURED_LOGGING_AVAILABLE:
-            set_request_id(request.headers.get('X-Request-ID'))
-        
-        data = request.get_json()
-        if not data or 'prompt' not in data:
-            return jsonify({"error": True, "message": "Missing 'prompt'"}), 400
-        
-        prompt = data['prompt']
-        user_email = data.get('user_email', 'unknown')
-        
-        # Extract Auth Token
-        auth_header = request.headers.get('Authorization')
-        token = None
-        if auth_header and auth_header.startswith('Bearer '):
-            token = auth_header.split(' ')[1]
-        
-        if STRUCTURED_LOGGING_AVAILABLE:
-            logger.info("Received execution request", user_email=user_email)
-        
-        response_text = send_message(prompt, user_email, token)
-        
-        return jsonify({
-            "success": True,
-            "response": response_text,
-            "agent": "analytics_adk"
-        }), 200
+async def execute(data, headers):
+    if 'prompt' not in data:
+        return {"error": True, "message": "Missing 'prompt'"}, 400
+    
+    prompt = data['prompt']
+    user_email = data.get('user_email', 'unknown')
+    
+    # Extract Auth Token
+    auth_header = headers.get('authorization')
+    token = None
+    if auth_header and auth_header.startswith('Bearer '):
+        token = auth_header.split(' ')[1]
     
-    except Exception as e:
-        if STRUCTURED_LOGGING_AVAILABLE:
-            logger.error("Error processing request", error=str(e), exc_info=True)
-        return jsonify({"error": True, "message": str(e)}), 500
+    logger.info(f"Received execution request from {user_email}")
+    
+    response_text = await send_message_async(prompt, user_email, token)
+    
+    return {
+        "success": True,
+        "response": response_text,
+        "agent": "analytics_adk"
+    }, 200
+
+
+app = create_agent_server("analytics_agent_adk", execute)
+
 
 if __name__ == '__main__':
     if not config.validate():
         sys.exit(1)
     
-    app.run(host='0.0.0.0', port=5008, debug=config.DEV_MODE)
+    serve(app, port=5008)
@@ -1,111 +1,63 @@
 """
 Brave Search MCP Client Wrapper
 """
-import os
-import json
 import logging
 import asyncio
 from typing import Dict, Any
 from contextvars import ContextVar
 from google.cloud import secretmanager
 from config import config
+from common.mcp_pool import PooledMCPClient, MCPToolError, docker_stdio_spec, result_text
 
 logger = logging.getLogger(__name__)
 
-class BraveMCPClient:
+_brave_api_key = None
+
+def _get_api_key() -> str:
+    """Fetch BRAVE_API_KEY from Secret Manager once per process"""
+    global _brave_api_key
+    if _brave_api_key:
+        return _brave_api_key
+    try:
+        client = secretmanager.SecretManagerServiceClient()
+        name = f"projects/{config.GCP_PROJECT_ID}/secrets/BRAVE_API_KEY/versions/latest"
+        response = client.access_secret_version(request={"name": name})
+        _brave_api_key = response.payload.data.decode("UTF-8")
+        return _brave_api_key
+    except Exception as e:
+        logging.error(f"Failed to fetch BRAVE_API_KEY: {e}")
+        raise
+
+
+class BraveMCPClient(PooledMCPClient):
+    """Client for the Brave Search MCP server, leased from the shared process pool"""
+
     def __init__(self):
         self.image = "finopti-brave-search"
-        self.process = None
-        self.request_id = 0
+        # Spec is resolved lazily in connect() because it needs the API key
+        super().__init__(None)
     
-    async def _get_api_key(self):
-        # Fetch from Secret Manager
-        try:
-            client = secretmanager.SecretManagerServiceClient()
-            name = f"projects/{config.GCP_PROJECT_ID}/secrets/BRAVE_API_KEY/versions/latest"
-            response = client.access_secret_version(request={"name": name})
-            return response.payload.data.decode("UTF-8")
-        except Exception as e:
-            logging.error(f"Failed to fetch BRAVE_API_KEY: {e}")
-            raise
-
     async def connect(self):
-        if self.process:
+        if self.connected:
             return
 
-        api_key = await self._get_api_key()
-        
-        cmd = [
-            "docker", "run", "-i", "--rm",
-            "-e", f"BRAVE_API_KEY={api_key}",
-            self.image
-        ]
-        
-        logging.info(f"Starting Brave MCP: {' '.join(cmd)}")
-        self.process = await asyncio.create_subprocess_exec(
-            *cmd,
-            stdin=asyncio.subprocess.PIPE,
-            stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE
-        )
-        
-        await self._handshake()
-
-    async def _handshake(self):
-        # Initialize
-        await self._send_json({
-            "jsonrpc": "2.0", "method": "initialize", "id": 0,
-            "params": {"protocolVersion": "2024-11-05", "capabilities": {}, "clientInfo": {"name": "brave-agent", "version": "1.0"}}
-        })
-        
-        # Wait for response
-        while True:
-            line = await self.process.stdout.readline()
-            if not line: break
-            msg = json.loads(line)
-            if msg.get("id") == 0: break
-            
-        # Initialized notification
-        await self._send_json({
-            "jsonrpc": "2.0", "method": "notifications/initialized", "params": {}
-        })
-
-    async def _send_json(self, payload):
-        self.process.stdin.write((json.dumps(payload) + "\n").encode())
-        await self.process.stdin.drain()
+        if self.spec is None:
+            api_key = await asyncio.to_thread(_get_api_key)
+            self.spec = docker_stdio_spec(
+                "brave-search",
+                self.image,
+                env={"BRAVE_API_KEY": api_key},
+                client_name="brave-agent",
+            )
+        await super().connect()
 
     async def call_tool(self, tool_name: str, arguments: dict) -> Dict[str, Any]:
-        if not self.process:
-            await self.connect()
-
-        self.request_id += 1
-        payload = {
-            "jsonrpc": "2.0",
-            "method": "tools/call",
-            "params": {"name": tool_name, "arguments": arguments},
-            "id": self.request_id
-        }
-        await self._send_json(payload)
-        
-        while True:
-            line = await self.process.stdout.readline()
-            if not line: raise RuntimeError("MCP closed")
-            msg = json.loads(line)
-            if msg.get("id") == self.request_id:
-                if "error" in msg: return {"error": msg["error"]}
-                result = msg.get("result", {})
-                # Extract text content
-                content = result.get("content", [])
-                text = "".join([c["text"] for c in content if c["type"] == "text"])
-                return {"result": text}
-
-    async def close(self):
-        if self.process:
-            try:
-                self.process.terminate()
-                await self.process.wait()
-            except: pass
-        self.process = None
+        try:
+            result = await self.call_tool_raw(tool_name, arguments)
+        except MCPToolError as e:
+            return {"error": e.error}
+        # Extract text content
+        return {"result": result_text(result)}
 
 # ContextVar for isolation
 _mcp_ctx: ContextVar["BraveMCPClient"] = ContextVar("mcp_client", default=None)
@@ -15,10 +15,8 @@ from google.adk.agents import Agent
 from google.adk.apps import App
 from google.adk.plugins import ReflectAndRetryToolPlugin
 from google.adk.plugins.bigquery_agent_analytics_plugin import (
-    BigQueryAgentAnalyticsPlugin,
     BigQueryLoggerConfig
 )
-from google.adk.runners import InMemoryRunner
 from google.genai import types
 from opentelemetry import trace
 from openinference.semconv.trace import SpanAttributes
@@ -49,6 +47,8 @@ setup_observability()
 # IMPORT COMMON UTILS
 # -------------------------------------------------------------------------
 from common.model_resilience import run_with_model_fallback
+from common.runner_cache import leased_runner, run_on_agent_loop
+from common.analytics_sink import SharedBigQueryAnalyticsPlugin
 
 # -------------------------------------------------------------------------
 # AGENT DEFINITION
@@ -76,7 +76,7 @@ def create_bq_plugin():
         enabled=os.getenv("BQ_ANALYTICS_ENABLED", "true").lower() == "true",
     )
     
-    return BigQueryAgentAnalyticsPlugin(
+    return SharedBigQueryAnalyticsPlugin(
         project_id=config.GCP_PROJECT_ID,
         dataset_id=os.getenv("BQ_ANALYTICS_DATASET", "agent_analytics"),
         table_id=config.BQ_ANALYTICS_TABLE,
@@ -132,36 +132,21 @@ async def send_message_async(prompt: str, user_email: str = None, session_id: st
             await mcp.connect()
             
             async def _run_once(app_instance):
-                bq_plugin = None
-                for p in app_instance.plugins:
-                    if isinstance(p, BigQueryAgentAnalyticsPlugin):
-                        bq_plugin = p
-                        break
-                
-                try:
-                    async with InMemoryRunner(app=app_instance) as runner:
-                        sid = session_id
-                        uid = user_email or "default"
-                        await runner.session_service.create_session(session_id=sid, user_id=uid, app_name="finopti_cloud_run_agent")
-                        message = types.Content(parts=[types.Part(text=prompt)])
-
-                        response_text = ""
-                        async for event in runner.run_async(session_id=sid, user_id=uid, new_message=message):
-                            if publisher:
-                                publisher.process_adk_event(event, session_id=sid, user_id=uid)
-                            if hasattr(event, 'content') and event.content:
-                                for part in event.content.parts:
-                                    if part.text: response_text += part.text
-                        return response_text
-                finally:
-                    # Clean up BQ Plugin
-                    if bq_plugin:
-                        try:
-                            if hasattr(bq_plugin, 'client') and hasattr(bq_plugin.client, 'close'):
-                                bq_plugin.client.close()
-                            elif hasattr(bq_plugin, '_client') and hasattr(bq_plugin._client, 'close'):
-                                bq_plugin._client.close()
-                        except: pass
+                # Plugins are closed with the runner (or kept warm by runner_cache)
+                async with leased_runner(app_instance) as runner:
+                    sid = session_id
+                    uid = user_email or "default"
+                    await runner.session_service.create_session(session_id=sid, user_id=uid, app_name="finopti_cloud_run_agent")
+                    message = types.Content(parts=[types.Part(text=prompt)])
+
+                    response_text = ""
+                    async for event in runner.run_async(session_id=sid, user_id=uid, new_message=message):
+                        if publisher:
+                            publisher.process_adk_event(event, session_id=sid, user_id=uid)
+                        if hasattr(event, 'content') and event.content:
+                            for part in event.content.parts:
+                                if part.text: response_text += part.text
+                    return response_text
 
             return await run_with_model_fallback(
                 create_app_func=create_app,
@@ -173,7 +158,7 @@ async def send_message_async(prompt: str, user_email: str = None, session_id: st
             _mcp_ctx.reset(token_reset)
 
 def send_message(prompt: str, user_email: str = None, session_id: str = "default") -> str:
-    return asyncio.run(send_message_async(prompt, user_email, session_id))
+    return run_on_agent_loop(send_message_async(prompt, user_email, session_id))
 
 if __name__ == "__main__":
     if len(sys.argv) > 1:
@@ -1,4 +1,3 @@
-from flask import Flask, request, jsonify
 import os
 import logging
 import sys
@@ -7,7 +6,8 @@ from pathlib import Path
 # Add parent directory to path to allow importing config
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
-from agent import send_message
+from agent import send_message_async
+from common.agent_server import create_agent_server, serve
 
 # Configure logging
 logging.basicConfig(
@@ -16,38 +16,27 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-app = Flask(__name__)
-
-@app.route('/health', methods=['GET'])
-def health_check():
-    return jsonify({"status": "healthy", "service": "cloud_run_agent"}), 200
-
-@app.route('/execute', methods=['POST'])
-def chat():
-    try:
-        data = request.json
-        if not data:
-            return jsonify({"error": "No JSON data provided"}), 400
-            
-        prompt = data.get('prompt')
-        user_email = data.get('user_email')
-        
-        if not prompt:
-            return jsonify({"error": "No prompt provided"}), 400
-            
-        logger.info(f"Received request from {user_email}: {prompt}")
-        
-        response = send_message(prompt, user_email)
-        
-        return jsonify({
-            "response": response,
-            "status": "success"
-        })
+
+async def chat(data, headers):
+    prompt = data.get('prompt')
+    user_email = data.get('user_email')
+    session_id = data.get('session_id', 'default')
+    
+    if not prompt:
+        return {"error": "No prompt provided"}, 400
         
-    except Exception as e:
-        logger.error(f"Error processing request: {e}")
-        return jsonify({"error": str(e)}), 500
+    logger.info(f"Received request from {user_email}: {prompt}")
+    
+    response = await send_message_async(prompt, user_email, session_id=session_id)
+    
+    return {
+        "response": response,
+        "status": "success"
+    }, 200
+
+
+app = create_agent_server("cloud_run_agent", chat)
 
 if __name__ == '__main__':
     port = int(os.getenv('PORT', 5006))
-    app.run(host='0.0.0.0', port=port)
+    serve(app, port=port)
@@ -2,87 +2,38 @@
 Cloud Run MCP Client Wrapper
 """
 import os
-import asyncio
-import json
 import logging
 from typing import Dict, Any, List
 from contextvars import ContextVar
 
-logger = logging.getLogger(__name__)
+from common.mcp_pool import PooledMCPClient, MCPToolError, docker_stdio_spec, result_text
 
-class CloudRunMCPClient:
-    """Client for connecting to Cloud Run MCP server via Docker Stdio"""
-    
-    def __init__(self):
-        self.image = os.getenv("CLOUD_RUN_MCP_DOCKER_IMAGE", "mcp/cloud-run-mcp:latest")
-        self.process = None
-        self.request_id = 0
-        # Mount gcloud credentials from host (passed to agent container)
-        # The agent container runs with ~/.config/gcloud mounted.
-        # We need to pass that to the inner MCP container.
-        self.mount_path = os.getenv('GCLOUD_MOUNT_PATH', f"{os.path.expanduser('~')}/.config/gcloud:/root/.config/gcloud")
+logger = logging.getLogger(__name__)
 
-    async def connect(self):
-        cmd = [
-            "docker", "run", 
-            "-i", "--rm",
-            "-v", self.mount_path,
-            # Pass auth env var if used instead of file mount
-            # "-e", "GOOGLE_APPLICATION_CREDENTIALS=...", 
-            self.image
-        ]
-        
-        logger.info(f"Starting Cloud Run MCP: {' '.join(cmd)}")
-        self.process = await asyncio.create_subprocess_exec(
-            *cmd,
-            stdin=asyncio.subprocess.PIPE,
-            stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE
-        )
-        await self._handshake()
+# Shared warm pool of Cloud Run MCP containers (see common/mcp_pool.py)
+# Mount gcloud credentials from host (passed to agent container)
+# The agent container runs with ~/.config/gcloud mounted.
+# We need to pass that to the inner MCP container.
+CLOUD_RUN_MCP_SPEC = docker_stdio_spec(
+    "cloud-run",
+    os.getenv("CLOUD_RUN_MCP_DOCKER_IMAGE", "mcp/cloud-run-mcp:latest"),
+    volumes=[os.getenv('GCLOUD_MOUNT_PATH', f"{os.path.expanduser('~')}/.config/gcloud:/root/.config/gcloud")],
+    client_name="cloud-run-agent",
+)
 
-    async def _handshake(self):
-        await self._send_json({
-            "jsonrpc": "2.0", "method": "initialize", "id": 0,
-            "params": {"protocolVersion": "2024-11-05", "capabilities": {}, "clientInfo": {"name": "cloud-run-agent", "version": "1.0"}}
-        })
-        while True:
-            line = await self.process.stdout.readline()
-            if not line: break
-            msg = json.loads(line)
-            if msg.get("id") == 0: break
-        await self._send_json({"jsonrpc": "2.0", "method": "notifications/initialized", "params": {}})
 
-    async def _send_json(self, payload):
-        self.process.stdin.write((json.dumps(payload) + "\n").encode())
-        await self.process.stdin.drain()
+class CloudRunMCPClient(PooledMCPClient):
+    """Client for the Cloud Run MCP server, leased from the shared process pool"""
+    
+    def __init__(self):
+        super().__init__(CLOUD_RUN_MCP_SPEC)
 
     async def call_tool(self, tool_name: str, arguments: dict) -> Dict[str, Any]:
-        self.request_id += 1
-        payload = {
-            "jsonrpc": "2.0", "method": "tools/call",
-            "params": {"name": tool_name, "arguments": arguments},
-            "id": self.request_id
-        }
-        await self._send_json(payload)
-        
-        while True:
-            line = await self.process.stdout.readline()
-            if not line: raise RuntimeError("MCP closed")
-            msg = json.loads(line)
-            if msg.get("id") == self.request_id:
-                if "error" in msg: return {"error": msg["error"]}
-                result = msg.get("result", {})
-                content = result.get("content", [])
-                text = "".join([c["text"] for c in content if c["type"] == "text"])
-                return {"result": text}
-
-    async def close(self):
-        if self.process:
-            try:
-                self.process.terminate()
-                await self.process.wait()
-            except: pass
+        try:
+            result = await self.call_tool_raw(tool_name, arguments)
+        except MCPToolError as e:
+            return {"error": e.error}
+        return {"result": result_text(result)}
 
 # ContextVar to store the MCP client for the current request
 _mcp_ctx: ContextVar["CloudRunMCPClient"] = ContextVar("mcp_client", default=None)
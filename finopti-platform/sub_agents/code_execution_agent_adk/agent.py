@@ -17,7 +17,6 @@ sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
 from google.adk.agents import LlmAgent
 from google.adk.apps import App
-from google.adk.runners import InMemoryRunner
 from google.adk.sessions import InMemorySessionService
 from google.adk.code_executors import BuiltInCodeExecutor
 from google.genai import types
@@ -55,6 +54,7 @@ setup_observability()
 # IMPORT COMMON UTILS
 # -------------------------------------------------------------------------
 from common.model_resilience import run_with_model_fallback
+from common.runner_cache import leased_runner, run_on_agent_loop
 
 # -------------------------------------------------------------------------
 # AGENT DEFINITION
@@ -120,7 +120,7 @@ async def send_message_async(prompt: str, user_email: str = None, session_id: st
     try:
         async def _run_once(app_instance):
             final_response_text = ""
-            async with InMemoryRunner(app=app_instance) as runner:
+            async with leased_runner(app_instance) as runner:
                 sid = session_id
                 uid = user_email or "default"
                 await runner.session_service.create_session(session_id=sid, user_id=uid, app_name="finopti_code_execution_agent")
@@ -155,7 +155,7 @@ async def send_message_async(prompt: str, user_email: str = None, session_id: st
         pass
 
 def send_message(prompt: str, user_email: str = None, session_id: str = "default") -> str:
-    return asyncio.run(send_message_async(prompt, user_email, session_id))
+    return run_on_agent_loop(send_message_async(prompt, user_email, session_id))
 
 def process_request(prompt: str, user_email: str = None, session_id: str = "default") -> str:
     """Synchronous wrapper for run_agent."""
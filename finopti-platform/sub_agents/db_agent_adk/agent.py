@@ -20,10 +20,8 @@ from google.adk.agents import Agent
 from google.adk.apps import App
 from google.adk.plugins import ReflectAndRetryToolPlugin
 from google.adk.plugins.bigquery_agent_analytics_plugin import (
-    BigQueryAgentAnalyticsPlugin,
     BigQueryLoggerConfig
 )
-from google.adk.runners import InMemoryRunner
 from google.genai import types
 from opentelemetry import trace
 from openinference.semconv.trace import SpanAttributes
@@ -57,6 +55,8 @@ setup_observability()
 # IMPORT COMMON UTILS
 # -------------------------------------------------------------------------
 from common.model_resilience import run_with_model_fallback
+from common.runner_cache import leased_runner, run_on_agent_loop
+from common.analytics_sink import SharedBigQueryAnalyticsPlugin
 
 # -------------------------------------------------------------------------
 # AGENT DEFINITION
@@ -86,13 +86,12 @@ def create_app(model_name: str = None):
 
     agent_instance = create_db_agent(model_name)
     
-    bq_plugin = BigQueryAgentAnalyticsPlugin(
+    bq_plugin = SharedBigQueryAnalyticsPlugin(
         project_id=config.GCP_PROJECT_ID,
         dataset_id=os.getenv("BQ_ANALYTICS_DATASET", "agent_analytics"),
         table_id=config.BQ_ANALYTICS_TABLE,
         config=BigQueryLoggerConfig(
-            enabled=os.getenv("BQ_ANALYTICS_ENABLED", "true").lower() == "true",
-            batch_size=1
+            enabled=os.getenv("BQ_ANALYTICS_ENABLED", "true").lower() == "true"
         ),
         location="US"
     )
@@ -141,7 +140,7 @@ async def send_message_async(prompt: str, user_email: str = None, project_id: st
         
         async def _run_once(app_instance):
             response_text = ""
-            async with InMemoryRunner(app=app_instance) as runner:
+            async with leased_runner(app_instance) as runner:
                 sid = session_id
                 uid = user_email or "default"
                 await runner.session_service.create_session(session_id=sid, user_id=uid, app_name="finopti_db_agent")
@@ -168,7 +167,7 @@ async def send_message_async(prompt: str, user_email: str = None, project_id: st
         _mcp_ctx.reset(token_reset)
 
 def send_message(prompt: str, user_email: str = None, project_id: str = None, session_id: str = "default") -> str:
-    return asyncio.run(send_message_async(prompt, user_email, project_id, session_id))
+    return run_on_agent_loop(send_message_async(prompt, user_email, project_id, session_id))
 
 if __name__ == "__main__":
     if len(sys.argv) > 1:
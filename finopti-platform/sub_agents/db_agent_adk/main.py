@@ -1,68 +1,52 @@
 """
-Database ADK Agent - Flask HTTP Wrapper
+Database ADK Agent - HTTP Wrapper
+
+Serves the agent through the shared ASGI layer (common/agent_server.py).
 """
 
 import sys
+import logging
 from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
-from flask import Flask, request, jsonify
-from agent import send_message
+from agent import send_message_async
 from config import config
-import os
+from common.agent_server import create_agent_server, serve
 
-# Import structured logging
+# Structured logging (the agent server sets the request ID per request)
 try:
     sys.path.insert(0, str(Path(__file__).parent.parent.parent / 'orchestrator'))
-    from structured_logging import (
-        StructuredLogger,
-        set_request_id,
-        add_request_id_to_response
-    )
+    from structured_logging import StructuredLogger
     STRUCTURED_LOGGING_AVAILABLE = True
 except ImportError:
     STRUCTURED_LOGGING_AVAILABLE = False
-    import logging
     logging.basicConfig(level=logging.INFO)
 
-app = Flask(__name__)
-
 if STRUCTURED_LOGGING_AVAILABLE:
     logger = StructuredLogger('db_agent_adk', level=config.LOG_LEVEL)
-    app.after_request(add_request_id_to_response)
 else:
     logger = logging.getLogger(__name__)
 
-@app.route('/health', methods=['GET'])
-def health():
-    return jsonify({"status": "healthy", "service": "db_agent_adk"}), 200
-
-@app.route('/execute', methods=['POST'])
-def execute():
-    try:
-        if STRUCTURED_LOGGING_AVAILABLE:
-            set_request_id(request.headers.get('X-Request-ID'))
-        
-        data = request.get_json()
-        prompt = data.get('prompt')
-        user_email = data.get('user_email', 'unknown')
-        
-        if not prompt:
-            return jsonify({"error": True, "message": "Missing prompt"}), 400
-            
-        logger.info(f"Processing DB request for {user_email}")
-        response = send_message(prompt, user_email)
+async def execute(data, headers):
+    prompt = data.get('prompt')
+    user_email = data.get('user_email', 'unknown')
+    
+    if not prompt:
+        return {"error": True, "message": "Missing prompt"}, 400
         
-        return jsonify({
-            "success": True,
-            "response": response,
-            "agent": "db_agent"
-        }), 200
-        
-    except Exception as e:
-        logger.error(f"Error: {e}", exc_info=True)
-        return jsonify({"error": True, "message": str(e)}), 500
+    logger.info(f"Processing DB request for {user_email}")
+    response = await send_message_async(prompt, user_email)
+    
+    return {
+        "success": True,
+        "response": response,
+        "agent": "db_agent"
+    }, 200
+
+
+app = create_agent_server("db_agent_adk", execute)
+
 
 if __name__ == '__main__':
     logger.info("Starting Database ADK Agent on port 5005")
-    app.run(host='0.0.0.0', port=5005, debug=config.DEV_MODE)
+    serve(app, port=5005)
@@ -2,6 +2,7 @@
 DB Agent Tools
 """
 import os
+import asyncio
 import logging
 from typing import Dict, Any, List
 from google.cloud import bigquery
@@ -10,17 +11,14 @@ from mcp_client import ensure_mcp
 
 logger = logging.getLogger(__name__)
 
-async def query_agent_analytics(limit: int = 10, days_back: int = 7) -> Dict[str, Any]:
-    """
-    ADK Tool: Query the Agent Analytics (BigQuery) for recent operations.
-    Use this to see what agents have been doing.
-    """
+def _query_agent_analytics(limit: int, days_back: int) -> List[Dict[str, Any]]:
+    """Blocking BigQuery client work; run in a worker thread."""
+    client = bigquery.Client(project=config.GCP_PROJECT_ID)
     try:
-        client = bigquery.Client(project=config.GCP_PROJECT_ID)
         dataset_id = os.getenv("BQ_ANALYTICS_DATASET", "agent_analytics")
         table_id = config.BQ_ANALYTICS_TABLE
         full_table_id = f"{config.GCP_PROJECT_ID}.{dataset_id}.{table_id}"
-        
+
         query = f"""
             SELECT timestamp, event_type, agent, prompt, model
             FROM `{full_table_id}`
@@ -28,12 +26,20 @@ async def query_agent_analytics(limit: int = 10, days_back: int = 7) -> Dict[str
             ORDER BY timestamp DESC
             LIMIT {limit}
         """
-        
+
         query_job = client.query(query)
-        results = []
-        for row in query_job:
-            results.append(dict(row))
-            
+        return [dict(row) for row in query_job]
+    finally:
+        client.close()
+
+async def query_agent_analytics(limit: int = 10, days_back: int = 7) -> Dict[str, Any]:
+    """
+    ADK Tool: Query the Agent Analytics (BigQuery) for recent operations.
+    Use this to see what agents have been doing.
+    """
+    try:
+        # Off the shared agent loop: a slow query must not stall other requests
+        results = await asyncio.to_thread(_query_agent_analytics, int(limit), int(days_back))
         return {"success": True, "output": results}
     except Exception as e:
         logger.error(f"BigQuery query failed: {e}")
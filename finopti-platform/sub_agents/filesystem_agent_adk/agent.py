@@ -16,7 +16,6 @@ sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
 from google.adk.agents import Agent
 from google.adk.apps import App
-from google.adk.runners import InMemoryRunner
 from google.adk.plugins import ReflectAndRetryToolPlugin
 from google.genai import types
 from opentelemetry import trace
@@ -52,6 +51,7 @@ setup_observability()
 # IMPORT COMMON UTILS
 # -------------------------------------------------------------------------
 from common.model_resilience import run_with_model_fallback
+from common.runner_cache import leased_runner, run_on_agent_loop
 
 # -------------------------------------------------------------------------
 # AGENT DEFINITION
@@ -123,7 +123,7 @@ async def send_message_async(prompt: str, user_email: str = None, project_id: st
 
         async def _run_once(app_instance):
             response_text = ""
-            async with InMemoryRunner(app=app_instance) as runner:
+            async with leased_runner(app_instance) as runner:
                 sid = session_id
                 uid = user_email or "default"
                 await runner.session_service.create_session(session_id=sid, user_id=uid, app_name="finopti_filesystem_agent")
@@ -147,7 +147,7 @@ async def send_message_async(prompt: str, user_email: str = None, project_id: st
         _mcp_ctx.reset(token_reset)
 
 def send_message(prompt: str, user_email: str = None, project_id: str = None, session_id: str = "default") -> str:
-    return asyncio.run(send_message_async(prompt, user_email, project_id, session_id))
+    return run_on_agent_loop(send_message_async(prompt, user_email, project_id, session_id))
 
 if __name__ == "__main__":
     if len(sys.argv) > 1:
@@ -19,10 +19,8 @@ from google.adk.agents import Agent
 from google.adk.apps import App
 from google.adk.plugins import ReflectAndRetryToolPlugin
 from google.adk.plugins.bigquery_agent_analytics_plugin import (
-    BigQueryAgentAnalyticsPlugin,
     BigQueryLoggerConfig
 )
-from google.adk.runners import InMemoryRunner
 from google.genai import types
 from opentelemetry import trace, propagate
 from openinference.semconv.trace import SpanAttributes
@@ -54,6 +52,8 @@ setup_observability()
 # AGENT DEFINITION
 # -------------------------------------------------------------------------
 from common.model_resilience import run_with_model_fallback
+from common.runner_cache import leased_runner, run_on_agent_loop
+from common.analytics_sink import SharedBigQueryAnalyticsPlugin
 
 def create_gcloud_agent(model_name: str = None) -> Agent:
     model_to_use = model_name or config.FINOPTIAGENTS_LLM
@@ -74,13 +74,12 @@ def create_app(model_name: str = None) -> App:
     gcloud_agent = create_gcloud_agent(model_name)
 
     # Configure Analytics
-    bq_plugin = BigQueryAgentAnalyticsPlugin(
+    bq_plugin = SharedBigQueryAnalyticsPlugin(
         project_id=config.GCP_PROJECT_ID,
         dataset_id=os.getenv("BQ_ANALYTICS_DATASET", "agent_analytics"),
         table_id=config.BQ_ANALYTICS_TABLE,
         config=BigQueryLoggerConfig(
-            enabled=os.getenv("BQ_ANALYTICS_ENABLED", "true").lower() == "true",
-            batch_size=1
+            enabled=os.getenv("BQ_ANALYTICS_ENABLED", "true").lower() == "true"
         ),
         location="US"
     )
@@ -128,7 +127,7 @@ async def send_message_async(prompt: str, user_email: str = None, session_id: st
 
         # Define run_once
         async def _run_once(app_instance):
-            async with InMemoryRunner(app=app_instance) as runner:
+            async with leased_runner(app_instance) as runner:
                 sid = session_id 
                 uid = user_email or "default"
                 
@@ -159,7 +158,7 @@ async def send_message_async(prompt: str, user_email: str = None, session_id: st
 
 
 def send_message(prompt: str, user_email: str = None, session_id: str = "default") -> str:
-    return asyncio.run(send_message_async(prompt, user_email, session_id))
+    return run_on_agent_loop(send_message_async(prompt, user_email, session_id))
 
 if __name__ == "__main__":
     import sys
@@ -1,59 +1,35 @@
 """
-GCloud ADK Agent - Flask HTTP Wrapper
+GCloud ADK Agent - HTTP Wrapper
 
-Provides HTTP API endpoint for the GCloud ADK agent.
-Integrates with structured logging and request ID propagation.
+Provides HTTP API endpoint for the GCloud ADK agent, served through the
+shared ASGI layer (common/agent_server.py) with request ID propagation.
 """
 
 import sys
+import logging
 from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
-from flask import Flask, request, jsonify
-import asyncio
-from agent import send_message
+from agent import send_message_async
 from config import config
+from common.agent_server import create_agent_server, serve
 
-# Import structured logging from parent orchestrator
+# Structured logging (the agent server sets the request ID per request)
 try:
     sys.path.insert(0, str(Path(__file__).parent.parent.parent / 'orchestrator'))
-    from structured_logging import (
-        StructuredLogger,
-        set_request_id,
-        get_request_id,
-        propagate_request_id,
-        add_request_id_to_response
-    )
+    from structured_logging import StructuredLogger
     STRUCTURED_LOGGING_AVAILABLE = True
 except ImportError:
-    print("Warning: Structured logging not available, using basic logging")
     STRUCTURED_LOGGING_AVAILABLE = False
-    import logging
     logging.basicConfig(level=logging.INFO)
 
-
-app = Flask(__name__)
-
-# Configure logging
 if STRUCTURED_LOGGING_AVAILABLE:
     logger = StructuredLogger('gcloud_agent_adk', level=config.LOG_LEVEL)
-    app.after_request(add_request_id_to_response)
 else:
     logger = logging.getLogger(__name__)
 
 
-@app.route('/health', methods=['GET'])
-def health():
-    """Health check endpoint"""
-    return jsonify({
-        "status": "healthy",
-        "service": "gcloud_agent_adk",
-        "model": config.FINOPTIAGENTS_LLM
-    }), 200
-
-
-@app.route('/execute', methods=['POST'])
-def execute():
+async def execute(data, headers):
     """
     Execute a GCloud operation via ADK agent
     
@@ -64,85 +40,43 @@ def execute():
     }
     
     Returns:
-        JSON response with agent output
+        (JSON body, status) with agent output
     """
-    try:
-        # Set request ID for tracing
-        if STRUCTURED_LOGGING_AVAILABLE:
-            set_request_id(request.headers.get('X-Request-ID'))
-        
-        # Extract request data
-        data = request.get_json()
-        if not data or 'prompt' not in data:
-            if STRUCTURED_LOGGING_AVAILABLE:
-                logger.warning("Missing prompt in request body")
-            return jsonify({
-                "error": True,
-                "message": "Missing 'prompt' in request body"
-            }), 400
-        
-        prompt = data['prompt']
-        user_email = data.get('user_email', 'unknown')
-        session_id = data.get('session_id', 'default') # Extract session_id
-        
-        # Log request
-        if STRUCTURED_LOGGING_AVAILABLE:
-            logger.info(
-                "Received execution request",
-                user_email=user_email,
-                session_id=session_id,
-                prompt=prompt[:100] if len(prompt) > 100 else prompt
-            )
-        else:
-            logger.info(f"Received request from {user_email} (session: {session_id}): {prompt[:100]}")
-        
-        # Process with ADK agent
-        response_text = send_message(prompt, user_email, session_id=session_id)
-        
-        # Check if response_text contains an error message from ADK agent.py catch block
-        is_error = "Error processing request:" in str(response_text)
-        
-        # Log status
-        if STRUCTURED_LOGGING_AVAILABLE:
-            logger.info(
-                "Request processed",
-                user_email=user_email,
-                success=not is_error,
-                response_length=len(str(response_text))
-            )
-        else:
-            logger.info(f"Request processed for {user_email}. Success: {not is_error}")
-        
-        return jsonify({
-            "success": not is_error,
-            "error": is_error,
-            "response": response_text,
-            "message": response_text if is_error else None,
-            "agent": "gcloud_adk",
-            "model": config.FINOPTIAGENTS_LLM
-        }), 200 if not is_error else 500
-    
-    except Exception as e:
-        # Log error
-        if STRUCTURED_LOGGING_AVAILABLE:
-            logger.error(
-                "Error processing request",
-                error=str(e),
-                exc_info=True
-            )
-        else:
-            logger.error(f"Error: {str(e)}", exc_info=True)
-        
-        return jsonify({
+    if 'prompt' not in data:
+        logger.warning("Missing prompt in request body")
+        return {
             "error": True,
-            "message": f"Error processing request: {str(e)}"
-        }), 500
+            "message": "Missing 'prompt' in request body"
+        }, 400
+    
+    prompt = data['prompt']
+    user_email = data.get('user_email', 'unknown')
+    session_id = data.get('session_id', 'default') # Extract session_id
+    
+    logger.info(f"Received request from {user_email} (session: {session_id}): {prompt[:100]}")
+    
+    # Process with ADK agent
+    response_text = await send_message_async(prompt, user_email, session_id=session_id)
+    
+    # Check if response_text contains an error message from ADK agent.py catch block
+    is_error = "Error processing request:" in str(response_text)
+    logger.info(f"Request processed for {user_email}. Success: {not is_error}")
+    
+    return {
+        "success": not is_error,
+        "error": is_error,
+        "response": response_text,
+        "message": response_text if is_error else None,
+        "agent": "gcloud_adk",
+        "model": config.FINOPTIAGENTS_LLM
+    }, 200 if not is_error else 500
 
 
-@app.route('/info', methods=['GET'])
-def info():
-    """Get agent information"""
-    return jsonify({
+app = create_agent_server(
+    "gcloud_agent_adk",
+    execute,
+    health={"model": config.FINOPTIAGENTS_LLM},
+    info={
         "name": "gcloud_agent_adk",
         "description": "Google Cloud Platform infrastructure management specialist using ADK",
         "model": config.FINOPTIAGENTS_LLM,
@@ -154,7 +88,8 @@ def info():
             "Cost optimization recommendations"
         ],
         "mcp_server": config.GCLOUD_MCP_DOCKER_IMAGE
-    }), 200
+    },
+)
 
 
 if __name__ == '__main__':
@@ -164,14 +99,5 @@ if __name__ == '__main__':
         print("Please check your .env file or environment variables")
         sys.exit(1)
     
-    if STRUCTURED_LOGGING_AVAILABLE:
-        logger.info(
-            "Starting GCloud ADK Agent",
-            port=5001,
-            model=config.FINOPTIAGENTS_LLM,
-            mcp_image=config.GCLOUD_MCP_DOCKER_IMAGE
-        )
-    else:
-        logger.info(f"Starting GCloud ADK Agent on port 5001")
-    
-    app.run(host='0.0.0.0', port=5001, debug=config.DEV_MODE)
+    logger.info(f"Starting GCloud ADK Agent on port 5001")
+    serve(app, port=5001)
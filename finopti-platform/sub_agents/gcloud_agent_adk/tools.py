@@ -5,9 +5,13 @@ import logging
 from typing import Dict, Any, List
 
 from mcp_client import get_mcp_client
+from common.tool_cache import cached_tool, is_read_only_gcloud
 
 logger = logging.getLogger(__name__)
 
+# Only list/describe-style commands are cached; mutating commands always run.
+@cached_tool("execute_gcloud_command", ttl_seconds=120,
+             cacheable=lambda arguments: is_read_only_gcloud(arguments["args"]))
 async def execute_gcloud_command(args: List[str]) -> Dict[str, Any]:
     """
     ADK tool: Execute gcloud command
@@ -18,10 +18,8 @@ from google.adk.agents import Agent
 from google.adk.apps import App
 from google.adk.plugins import ReflectAndRetryToolPlugin
 from google.adk.plugins.bigquery_agent_analytics_plugin import (
-    BigQueryAgentAnalyticsPlugin,
     BigQueryLoggerConfig
 )
-from google.adk.runners import InMemoryRunner
 from google.genai import types
 from opentelemetry import trace
 from openinference.semconv.trace import SpanAttributes
@@ -57,6 +55,8 @@ setup_observability()
 # AGENT DEFINITION
 # -------------------------------------------------------------------------
 from common.model_resilience import run_with_model_fallback
+from common.runner_cache import leased_runner, run_on_agent_loop
+from common.analytics_sink import SharedBigQueryAnalyticsPlugin
 
 def create_github_agent(model_name: str = None) -> Agent:
     model_to_use = model_name or config.FINOPTIAGENTS_LLM
@@ -89,7 +89,7 @@ def create_app(model_name: str = None) -> App:
         root_agent=agent,
         plugins=[
             ReflectAndRetryToolPlugin(max_retries=3),
-            BigQueryAgentAnalyticsPlugin(
+            SharedBigQueryAnalyticsPlugin(
                 project_id=config.GCP_PROJECT_ID,
                 dataset_id=os.getenv("BQ_ANALYTICS_DATASET", "agent_analytics"),
                 table_id=config.BQ_ANALYTICS_TABLE,
@@ -126,7 +126,7 @@ async def send_message_async(prompt: str, user_email: str = None, session_id: st
 
         # Define run_once
         async def _run_once(app_instance):
-            async with InMemoryRunner(app=app_instance) as runner:
+            async with leased_runner(app_instance) as runner:
                 sid = session_id 
                 uid = user_email or "default"
                 
@@ -153,7 +153,7 @@ async def send_message_async(prompt: str, user_email: str = None, session_id: st
         return f"Error: {str(e)}"
 
 def send_message(prompt: str, user_email: str = None, session_id: str = "default") -> str:
-    return asyncio.run(send_message_async(prompt, user_email, session_id))
+    return run_on_agent_loop(send_message_async(prompt, user_email, session_id))
 
 if __name__ == "__main__":
     import sys
@@ -1,76 +1,56 @@
 """
-GitHub ADK Agent - Flask HTTP Wrapper
+GitHub ADK Agent - HTTP Wrapper
+
+Serves the agent through the shared ASGI layer (common/agent_server.py).
 """
 
 import sys
+import logging
 from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
-from flask import Flask, request, jsonify
-from agent import send_message
+from agent import send_message_async
 from config import config
-import os
+from common.agent_server import create_agent_server, serve
 
-# Import structured logging
+# Structured logging (the agent server sets the request ID per request)
 try:
     sys.path.insert(0, str(Path(__file__).parent.parent.parent / 'orchestrator'))
-    from structured_logging import (
-        StructuredLogger,
-        set_request_id,
-        add_request_id_to_response
-    )
+    from structured_logging import StructuredLogger
     STRUCTURED_LOGGING_AVAILABLE = True
 except ImportError:
     STRUCTURED_LOGGING_AVAILABLE = False
-    import logging
     logging.basicConfig(level=logging.INFO)
 
-app = Flask(__name__)
-
 if STRUCTURED_LOGGING_AVAILABLE:
     logger = StructuredLogger('github_agent_adk', level=config.LOG_LEVEL)
-    app.after_request(add_request_id_to_response)
 else:
     logger = logging.getLogger(__name__)
 
-@app.route('/health', methods=['GET'])
-def health():
-    return jsonify({"status": "healthy", "service": "github_agent_adk"}), 200
-
-@app.route('/execute', methods=['POST'])
-def execute():
-    try:
-        if STRUCTURED_LOGGING_AVAILABLE:
-            set_request_id(request.headers.get('X-Request-ID'))
-        
-        data = request.get_json()
-        prompt = data.get('prompt')
-        user_email = data.get('user_email', 'unknown')
-        
-        if not prompt:
-            return jsonify({"error": True, "message": "Missing prompt"}), 400
-            
-        print(f"DEBUG: Processing GitHub request for {user_email}", flush=True)  # Force output
-        logger.info(f"Processing GitHub request for {user_email}")
-        
-        response = send_message(prompt, user_email)
-        print(f"DEBUG: Response received: {len(str(response))} chars", flush=True)
+async def execute(data, headers):
+    prompt = data.get('prompt')
+    user_email = data.get('user_email', 'unknown')
+    
+    if not prompt:
+        return {"error": True, "message": "Missing prompt"}, 400
         
-        is_error = "Error processing request:" in str(response)
-        
-        return jsonify({
-            "success": not is_error,
-            "error": is_error,
-            "response": response,
-            "message": response if is_error else None,
-            "agent": "github_agent"
-        }), 200 if not is_error else 500
-        
-    except Exception as e:
-        print(f"DEBUG: Exception: {e}", flush=True)
-        logger.error(f"Error: {e}", exc_info=True)
-        return jsonify({"error": True, "message": str(e)}), 500
+    logger.info(f"Processing GitHub request for {user_email}")
+    response = await send_message_async(prompt, user_email)
+    
+    is_error = "Error processing request:" in str(response)
+    
+    return {
+        "success": not is_error,
+        "error": is_error,
+        "response": response,
+        "message": response if is_error else None,
+        "agent": "github_agent"
+    }, 200 if not is_error else 500
+
+
+app = create_agent_server("github_agent_adk", execute)
+
 
 if __name__ == '__main__':
     logger.info("Starting GitHub ADK Agent on port 5003")
-    app.run(host='0.0.0.0', port=5003, debug=config.DEV_MODE)
+    serve(app, port=5003)
@@ -16,11 +16,9 @@ sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
 from google.adk.agents import Agent
 from google.adk.apps import App
-from google.adk.runners import InMemoryRunner
 from google.adk.plugins import ReflectAndRetryToolPlugin
 from google.adk.tools import google_search
 from google.adk.plugins.bigquery_agent_analytics_plugin import (
-    BigQueryAgentAnalyticsPlugin,
     BigQueryLoggerConfig
 )
 from google.genai import types
@@ -52,6 +50,8 @@ setup_observability()
 # IMPORT COMMON UTILS
 # -------------------------------------------------------------------------
 from common.model_resilience import run_with_model_fallback
+from common.runner_cache import leased_runner, run_on_agent_loop
+from common.analytics_sink import SharedBigQueryAnalyticsPlugin
 
 # -------------------------------------------------------------------------
 # AGENT DEFINITION
@@ -71,8 +71,10 @@ def create_app(model_name: str = None):
     # Ensure API Key
     if hasattr(config, "GOOGLE_API_KEY") and config.GOOGLE_API_KEY:
         os.environ["GOOGLE_API_KEY"] = config.GOOGLE_API_KEY
-    elif os.getenv("GCP_PROJECT_ID"):
-        # Fallback to Secret Manager if not in config/env
+    elif not os.getenv("GOOGLE_API_KEY") and os.getenv("GCP_PROJECT_ID"):
+        # Fallback to Secret Manager if not in config/env. Fetched once per
+        # process: create_app runs on the shared agent loop for every new
+        # pooled runner, and this is a blocking call.
         try:
              client = secretmanager.SecretManagerServiceClient()
              name = f"projects/{os.getenv('GCP_PROJECT_ID')}/secrets/google-api-key/versions/latest"
@@ -88,7 +90,7 @@ def create_app(model_name: str = None):
         root_agent=agent_instance,
         plugins=[
             ReflectAndRetryToolPlugin(max_retries=3),
-            BigQueryAgentAnalyticsPlugin(
+            SharedBigQueryAnalyticsPlugin(
                 project_id=config.GCP_PROJECT_ID,
                 dataset_id=os.getenv("BQ_ANALYTICS_DATASET", "agent_analytics"),
                 table_id=config.BQ_ANALYTICS_TABLE,
@@ -127,7 +129,7 @@ async def send_message_async(prompt: str, user_email: str = None, project_id: st
 
         async def _run_once(app_instance):
             response_text = ""
-            async with InMemoryRunner(app=app_instance) as runner:
+            async with leased_runner(app_instance) as runner:
                 sid = session_id
                 uid = user_email or "default"
                 await runner.session_service.create_session(session_id=sid, user_id=uid, app_name="finopti_googlesearch_agent")
@@ -153,7 +155,7 @@ async def send_message_async(prompt: str, user_email: str = None, project_id: st
         pass # No MCP cleanup needed
 
 def send_message(prompt: str, user_email: str = None, project_id: str = None, session_id: str = "default") -> str:
-    return asyncio.run(send_message_async(prompt, user_email, project_id, session_id))
+    return run_on_agent_loop(send_message_async(prompt, user_email, project_id, session_id))
 
 if __name__ == "__main__":
     if len(sys.argv) > 1:
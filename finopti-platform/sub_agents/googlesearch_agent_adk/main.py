@@ -1,49 +1,37 @@
-from flask import Flask, request, jsonify
 import logging
 import os
 import sys
 
+from agent import send_message_async
+from common.agent_server import create_agent_server, serve
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-app = Flask(__name__)
-
-@app.route('/health', methods=['GET'])
-def health():
-    return jsonify({"status": "healthy", "service": "googlesearch_agent"}), 200
 
-@app.route('/execute', methods=['POST'])
-def execute():
-    try:
-        data = request.get_json()
-        if not data or 'prompt' not in data:
-            return jsonify({"error": "Missing 'prompt' in request body"}), 400
-            
-        prompt = data['prompt']
-        user_email = data.get('user_email', 'unknown')
-        
-        logger.info(f"Received request from {user_email}: {prompt[:100]}")
-        
-        # Import here to avoid circular dependencies if any
-        from agent import process_request
+async def execute(data, headers):
+    if 'prompt' not in data:
+        return {"error": "Missing 'prompt' in request body"}, 400
         
-        response = process_request(prompt)
-        
-        return jsonify({
-            "success": True,
-            "data": {
-                "response": response
-            }
-        })
-        
-    except Exception as e:
-        logger.error(f"Error processing request: {str(e)}", exc_info=True)
-        return jsonify({
-            "success": False,
-            "error": str(e)
-        }), 500
+    prompt = data['prompt']
+    user_email = data.get('user_email', 'unknown')
+    session_id = data.get('session_id', 'default')
+    
+    logger.info(f"Received request from {user_email}: {prompt[:100]}")
+    
+    response = await send_message_async(prompt, user_email, session_id=session_id)
+    
+    return {
+        "success": True,
+        "data": {
+            "response": response
+        }
+    }, 200
+
+
+app = create_agent_server("googlesearch_agent", execute)
 
 if __name__ == '__main__':
     port = int(os.environ.get('PORT', 5011))
-    app.run(host='0.0.0.0', port=port)
+    serve(app, port=port)
@@ -10,6 +10,8 @@ import sys
 import asyncio
 import logging
 from pathlib import Path
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Sequence
 
 # Ensure parent path
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
@@ -18,10 +20,8 @@ from google.adk.agents import Agent
 from google.adk.apps import App
 from google.adk.plugins import ReflectAndRetryToolPlugin
 from google.adk.plugins.bigquery_agent_analytics_plugin import (
-    BigQueryAgentAnalyticsPlugin,
     BigQueryLoggerConfig
 )
-from google.adk.runners import InMemoryRunner
 from google.genai import types
 from opentelemetry import trace
 from openinference.semconv.trace import SpanAttributes
@@ -40,6 +40,8 @@ from context import (
 from instructions import AGENT_INSTRUCTIONS, AGENT_DESCRIPTION, AGENT_NAME
 from tools import query_logs, list_metrics, query_time_series
 from mcp_client import MonitoringMCPClient, _mcp_ctx
+from log_aggregation import aggregate_logs, extract_entries
+from log_stream import scan_logs
 
 # Configure Logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
@@ -52,6 +54,8 @@ setup_observability()
 # AGENT DEFINITION
 # -------------------------------------------------------------------------
 from common.model_resilience import run_with_model_fallback
+from common.runner_cache import leased_runner, run_on_agent_loop
+from common.analytics_sink import SharedBigQueryAnalyticsPlugin
 
 def create_monitoring_agent(model_name: str = None) -> Agent:
     model_to_use = model_name or config.FINOPTIAGENTS_LLM
@@ -76,7 +80,7 @@ def create_app(model_name: str = None):
         shutdown_timeout=5.0
     )
 
-    bq_plugin = BigQueryAgentAnalyticsPlugin(
+    bq_plugin = SharedBigQueryAnalyticsPlugin(
         project_id=config.GCP_PROJECT_ID,
         dataset_id=os.getenv("BQ_ANALYTICS_DATASET", "agent_analytics"),
         table_id=config.BQ_ANALYTICS_TABLE,
@@ -136,7 +140,7 @@ async def send_message_async(prompt: str, user_email: str = None, project_id: st
             # Define run_once for fallback logic
             async def _run_once(app_instance):
                 response_text = ""
-                async with InMemoryRunner(app=app_instance) as runner:
+                async with leased_runner(app_instance) as runner:
                     uid = user_email or "default"
                     sid = session_id
                     
@@ -165,8 +169,72 @@ async def send_message_async(prompt: str, user_email: str = None, project_id: st
     except Exception as e:
         return f"Error: {str(e)}"
 
+async def query_logs_aggregated(project_id: str, filter: str = "", minutes_ago: int = 60, limit: int = 500,
+                                group_by: Sequence[str] = ("signature",), samples_per_group: int = 2,
+                                max_groups: int = 20) -> Dict[str, Any]:
+    """
+    Structured log query: runs `query_logs` directly (no LLM loop) and returns
+    the entries grouped by error signature / resource with counts, first/last
+    seen and sample entries (see log_aggregation.py).
+    """
+    # The MCP process is only leased if the tool cache misses.
+    mcp = MonitoringMCPClient()
+    token_reset = _mcp_ctx.set(mcp)
+    try:
+        result = await query_logs(project_id, filter=filter, limit=limit, minutes_ago=minutes_ago)
+    finally:
+        await mcp.close()
+        _mcp_ctx.reset(token_reset)
+
+    if isinstance(result, dict) and "error" in result:
+        return {"error": result["error"], "project_id": project_id, "filter": filter}
+
+    response = {
+        "project_id": project_id,
+        "filter": filter,
+        "minutes_ago": min(minutes_ago, 10080),
+        "limit": limit,
+        **aggregate_logs(extract_entries(result), group_by, samples_per_group, max_groups),
+    }
+    if isinstance(result, dict) and "cache_info" in result:
+        response["cache_info"] = result["cache_info"]
+    return response
+
+async def scan_logs_digest(project_id: str, filter: str = "", minutes_ago: int = 1440, page_size: int = 1000,
+                           max_entries: int = 1_000_000, deadline_seconds: float = 60.0,
+                           histogram_buckets: int = 24, max_clusters: int = 20) -> Dict[str, Any]:
+    """
+    Streaming log scan: pages through every entry in the window via `query_logs`
+    and returns a bounded digest of message-template clusters with counts,
+    first/last seen, time histograms and samples (see log_stream.py).
+    """
+    end = datetime.now(timezone.utc)
+    start = end - timedelta(minutes=min(minutes_ago, 10080))
+
+    # Pages bypass the tool result cache: each is read once, and caching them
+    # would hold the whole scan in memory.
+    fetch_page = getattr(query_logs, "__wrapped__", query_logs)
+
+    async def fetch(page_filter: str, limit: int, page_minutes_ago: int):
+        return await fetch_page(project_id, filter=page_filter, limit=limit, minutes_ago=page_minutes_ago)
+
+    mcp = MonitoringMCPClient()
+    token_reset = _mcp_ctx.set(mcp)
+    try:
+        digest = await scan_logs(
+            fetch, filter, start, end,
+            page_size=page_size, max_entries=max_entries, deadline_seconds=deadline_seconds,
+            histogram_buckets=histogram_buckets, max_output_clusters=max_clusters,
+        )
+    except RuntimeError as e:
+        return {"error": str(e), "project_id": project_id, "filter": filter}
+    finally:
+        await mcp.close()
+        _mcp_ctx.reset(token_reset)
+    return {"project_id": project_id, **digest}
+
 def send_message(prompt: str, user_email: str = None, project_id: str = None, session_id: str = "default") -> str:
-    return asyncio.run(send_message_async(prompt, user_email, project_id, session_id))
+    return run_on_agent_loop(send_message_async(prompt, user_email, project_id, session_id))
 
 if __name__ == "__main__":
     import sys
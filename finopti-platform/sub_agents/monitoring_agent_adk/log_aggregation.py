@@ -0,0 +1,361 @@
+"""
+Monitoring Agent Log Aggregation
+
+Groups Cloud Logging entries by error signature and/or resource so callers
+get counts, first/last seen and a few sample entries instead of the raw
+entries (or an LLM's prose summary of them).
+
+A signature is the entry's first message line with the variable parts masked
+(numbers, hex ids, UUIDs, IPs, quoted values), so "timeout after 3021ms on
+10.0.0.7" and "timeout after 118ms on 10.0.0.9" fall into one group.
+
+``SignatureClusterer`` goes one step further for streamed scans (see
+log_stream.py): signatures with the same shape are merged into templates
+with ``<*>`` wildcards, and memory stays bounded however many entries pass
+through.
+"""
+import re
+import json
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+GROUP_BY_FIELDS = ("signature", "resource", "severity", "log_name")
+SIGNATURE_MAX_CHARS = 200
+SAMPLE_MESSAGE_MAX_CHARS = 1000
+
+_MASKS: Sequence[Tuple[re.Pattern, str]] = (
+    (re.compile(r"\b[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}\b", re.I), "<uuid>"),
+    (re.compile(r"\b\d{1,3}(?:\.\d{1,3}){3}(?::\d+)?\b"), "<ip>"),
+    (re.compile(r"\b\d{4}-\d{2}-\d{2}[T ][\d:.]+(?:Z|[+-]\d{2}:?\d{2})?"), "<ts>"),
+    (re.compile(r"\b0x[0-9a-f]+\b|\b(?=[0-9a-f]*\d)[0-9a-f]{8,}\b", re.I), "<hex>"),
+    (re.compile(r"\"[^\"]{0,200}\"|'[^']{0,200}'"), "<str>"),
+    (re.compile(r"(?<![A-Za-z_])\d+(?:\.\d+)?"), "<n>"),
+)
+
+
+def error_signature(message: str) -> str:
+    """Masked first line of a log message."""
+    line = message.strip().splitlines()[0] if message and message.strip() else ""
+    for pattern, placeholder in _MASKS:
+        line = pattern.sub(placeholder, line)
+    return re.sub(r"\s+", " ", line)[:SIGNATURE_MAX_CHARS] or "<empty>"
+
+
+def entry_message(entry: Dict[str, Any]) -> str:
+    """Best human-readable message of a LogEntry (text, JSON or audit payload)."""
+    if entry.get("textPayload"):
+        return str(entry["textPayload"])
+    payload = entry.get("jsonPayload")
+    if isinstance(payload, dict):
+        for key in ("message", "msg", "error", "textPayload"):
+            if payload.get(key):
+                return str(payload[key])
+        return json.dumps(payload, sort_keys=True, default=str)
+    proto = entry.get("protoPayload")
+    if isinstance(proto, dict):
+        status = proto.get("status") or {}
+        parts = [proto.get("methodName"), status.get("message")]
+        return " ".join(str(p) for p in parts if p) or json.dumps(proto, sort_keys=True, default=str)
+    if entry.get("message"):
+        return str(entry["message"])
+    return ""
+
+
+def entry_resource(entry: Dict[str, Any]) -> str:
+    """``type/name`` of the monitored resource (service, instance, ...)."""
+    resource = entry.get("resource")
+    if not isinstance(resource, dict):
+        return str(resource or "unknown")
+    labels = resource.get("labels") or {}
+    name = next((labels[k] for k in ("service_name", "function_name", "instance_id", "cluster_name",
+                                     "database_id", "job_id", "bucket_name") if labels.get(k)), "")
+    return f"{resource.get('type', 'unknown')}/{name}" if name else str(resource.get("type", "unknown"))
+
+
+def extract_entries(result: Any) -> List[Dict[str, Any]]:
+    """Log entries out of a ``query_logs`` MCP result, whatever envelope it came in."""
+    if isinstance(result, list):
+        return [e if isinstance(e, dict) else {"textPayload": str(e)} for e in result]
+    if not isinstance(result, dict):
+        return []
+    for key in ("entries", "logs", "log_entries", "items", "results"):
+        if isinstance(result.get(key), list):
+            return extract_entries(result[key])
+    output = result.get("output")
+    if isinstance(output, str):
+        try:
+            return extract_entries(json.loads(output))
+        except ValueError:
+            entries = []
+            for line in output.splitlines():
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    parsed = json.loads(line)
+                except ValueError:
+                    parsed = None
+                entries.append(parsed if isinstance(parsed, dict) else {"textPayload": line})
+            return entries
+    return []
+
+
+def compact_entry(entry: Dict[str, Any]) -> Dict[str, Any]:
+    """The fields an investigation needs from one entry, message truncated."""
+    message = entry_message(entry)
+    compact = {
+        "timestamp": entry.get("timestamp") or entry.get("receiveTimestamp"),
+        "severity": entry.get("severity", "DEFAULT"),
+        "resource": entry_resource(entry),
+        "message": message[:SAMPLE_MESSAGE_MAX_CHARS] + ("..." if len(message) > SAMPLE_MESSAGE_MAX_CHARS else ""),
+    }
+    resource = entry.get("resource")
+    if isinstance(resource, dict) and resource.get("labels"):
+        compact["resource_labels"] = resource["labels"]
+    if entry.get("labels"):
+        compact["labels"] = entry["labels"]
+    if entry.get("trace"):
+        compact["trace"] = entry["trace"]
+    return compact
+
+
+class LogAggregator:
+    """
+    Incremental group-by over log entries.
+
+    Args:
+        group_by: Fields from ``GROUP_BY_FIELDS`` that make up a group key.
+        samples_per_group: Sample entries kept per group (the first ones seen).
+        max_groups: Groups returned by ``result()``, largest first.
+    """
+
+    def __init__(self, group_by: Sequence[str] = ("signature",), samples_per_group: int = 2, max_groups: int = 20):
+        unknown = [f for f in group_by if f not in GROUP_BY_FIELDS]
+        if unknown or not group_by:
+            raise ValueError(f"group_by must be a non-empty subset of {GROUP_BY_FIELDS}, got {list(group_by)}")
+        self.group_by = tuple(group_by)
+        self.samples_per_group = samples_per_group
+        self.max_groups = max_groups
+        self.total = 0
+        self._groups: Dict[Tuple[str, ...], Dict[str, Any]] = {}
+
+    def _key(self, entry: Dict[str, Any], message: str) -> Tuple[str, ...]:
+        values = {
+            "signature": lambda: error_signature(message),
+            "resource": lambda: entry_resource(entry),
+            "severity": lambda: str(entry.get("severity", "DEFAULT")),
+            "log_name": lambda: str(entry.get("logName", "")).rsplit("/", 1)[-1],
+        }
+        return tuple(values[f]() for f in self.group_by)
+
+    def add(self, entry: Dict[str, Any]):
+        self.total += 1
+        key = self._key(entry, entry_message(entry))
+        timestamp = entry.get("timestamp") or entry.get("receiveTimestamp")
+        group = self._groups.get(key)
+        if group is None:
+            group = self._groups[key] = {
+                **dict(zip(self.group_by, key)),
+                "count": 0, "first_seen": timestamp, "last_seen": timestamp,
+                "severities": {}, "samples": [],
+            }
+        group["count"] += 1
+        severity = str(entry.get("severity", "DEFAULT"))
+        group["severities"][severity] = group["severities"].get(severity, 0) + 1
+        # RFC 3339 timestamps in UTC compare correctly as strings.
+        if timestamp:
+            if not group["first_seen"] or timestamp < group["first_seen"]:
+                group["first_seen"] = timestamp
+            if not group["last_seen"] or timestamp > group["last_seen"]:
+                group["last_seen"] = timestamp
+        if len(group["samples"]) < self.samples_per_group:
+            group["samples"].append(compact_entry(entry))
+
+    def extend(self, entries: Iterable[Dict[str, Any]]):
+        for entry in entries:
+            self.add(entry)
+
+    def result(self) -> Dict[str, Any]:
+        groups = sorted(self._groups.values(), key=lambda g: (-g["count"], g["first_seen"] or ""))
+        return {
+            "total_entries": self.total,
+            "group_by": list(self.group_by),
+            "group_count": len(groups),
+            "groups": groups[:self.max_groups],
+            "omitted_groups": max(0, len(groups) - self.max_groups),
+        }
+
+
+def aggregate_logs(entries: Iterable[Dict[str, Any]], group_by: Sequence[str] = ("signature",),
+                   samples_per_group: int = 2, max_groups: int = 20) -> Dict[str, Any]:
+    aggregator = LogAggregator(group_by, samples_per_group, max_groups)
+    aggregator.extend(entries)
+    return aggregator.result()
+
+
+def parse_timestamp(value: Any) -> Optional[datetime]:
+    """RFC 3339 timestamp (nanoseconds are truncated) as an aware datetime."""
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(str(value))
+    except ValueError:
+        return None
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+class _Cluster:
+    __slots__ = ("template", "count", "first_seen", "last_seen", "severities", "resources", "histogram", "samples",
+                 "alive")
+
+    def __init__(self, template: List[str], buckets: int):
+        self.template = template
+        self.count = 0
+        self.first_seen: Optional[datetime] = None
+        self.last_seen: Optional[datetime] = None
+        self.severities: Dict[str, int] = {}
+        self.resources: Dict[str, int] = {}
+        self.histogram = [0] * buckets
+        self.samples: List[Dict[str, Any]] = []
+        self.alive = True
+
+
+class SignatureClusterer:
+    """
+    Bounded, incremental clustering of log entries into message templates.
+
+    Each entry's masked signature is matched against the templates of the same
+    length and first token; if enough tokens agree (``similarity``) it joins
+    that cluster and the differing positions become ``<*>``, otherwise it
+    starts a new cluster. Per cluster: count, first/last seen, severity and
+    resource counts, a time histogram over ``[start, end)`` and a few samples.
+
+    Memory is bounded by ``max_clusters``: when full, the smallest quarter of
+    the clusters is folded into ``evicted_entries``, so heavy hitters are kept
+    exactly and the long tail is reported as a total.
+
+    Args:
+        start, end: Scan window, for the histograms.
+        histogram_buckets: Buckets per histogram.
+        max_clusters: Clusters kept in memory.
+        similarity: Fraction of equal tokens needed to join a cluster.
+        samples_per_cluster: Sample entries kept per cluster (the first ones seen).
+    """
+
+    MAX_RESOURCES_PER_CLUSTER = 10
+
+    def __init__(self, start: datetime, end: datetime, histogram_buckets: int = 24, max_clusters: int = 500,
+                 similarity: float = 0.6, samples_per_cluster: int = 2):
+        self.start = start
+        self.end = end
+        self.buckets = max(1, histogram_buckets)
+        self.bucket_seconds = max((end - start).total_seconds() / self.buckets, 1e-6)
+        self.max_clusters = max(4, max_clusters)
+        self.similarity = similarity
+        self.samples_per_cluster = samples_per_cluster
+        self.total = 0
+        self.evicted_entries = 0
+        self.evicted_clusters = 0
+        self._clusters: List[_Cluster] = []
+        self._by_shape: Dict[Tuple[int, str], List[_Cluster]] = {}
+        # Exact signature -> cluster, so repeats skip the similarity scan.
+        self._by_signature: "OrderedDict[str, _Cluster]" = OrderedDict()
+
+    def _match(self, tokens: List[str]) -> Optional[_Cluster]:
+        best, best_score = None, -1.0
+        for cluster in self._by_shape.get((len(tokens), tokens[0]), ()):
+            same = sum(1 for a, b in zip(cluster.template, tokens) if a == b or a == "<*>")
+            score = same / len(tokens)
+            if score > best_score:
+                best, best_score = cluster, score
+        return best if best is not None and best_score >= self.similarity else None
+
+    def _cluster_for(self, signature: str) -> _Cluster:
+        cluster = self._by_signature.get(signature)
+        if cluster is not None and cluster.alive:
+            self._by_signature.move_to_end(signature)
+            return cluster
+        tokens = signature.split(" ")
+        cluster = self._match(tokens)
+        if cluster is None:
+            if len(self._clusters) >= self.max_clusters:
+                self._evict()
+            cluster = _Cluster(tokens, self.buckets)
+            self._clusters.append(cluster)
+            self._by_shape.setdefault((len(tokens), tokens[0]), []).append(cluster)
+        else:
+            cluster.template = [a if a == b else "<*>" for a, b in zip(cluster.template, tokens)]
+        self._by_signature[signature] = cluster
+        if len(self._by_signature) > 4 * self.max_clusters:
+            self._by_signature.popitem(last=False)
+        return cluster
+
+    def _evict(self):
+        self._clusters.sort(key=lambda c: c.count, reverse=True)
+        keep = self.max_clusters - max(1, self.max_clusters // 4)
+        for cluster in self._clusters[keep:]:
+            cluster.alive = False
+            self.evicted_entries += cluster.count
+            self.evicted_clusters += 1
+        self._clusters = self._clusters[:keep]
+        for shape, clusters in list(self._by_shape.items()):
+            alive = [c for c in clusters if c.alive]
+            if alive:
+                self._by_shape[shape] = alive
+            else:
+                del self._by_shape[shape]
+
+    def add(self, entry: Dict[str, Any]):
+        self.total += 1
+        cluster = self._cluster_for(error_signature(entry_message(entry)))
+        cluster.count += 1
+        severity = str(entry.get("severity", "DEFAULT"))
+        cluster.severities[severity] = cluster.severities.get(severity, 0) + 1
+        resource = entry_resource(entry)
+        if resource in cluster.resources or len(cluster.resources) < self.MAX_RESOURCES_PER_CLUSTER:
+            cluster.resources[resource] = cluster.resources.get(resource, 0) + 1
+        else:
+            cluster.resources["<other>"] = cluster.resources.get("<other>", 0) + 1
+        timestamp = parse_timestamp(entry.get("timestamp") or entry.get("receiveTimestamp"))
+        if timestamp is not None:
+            if cluster.first_seen is None or timestamp < cluster.first_seen:
+                cluster.first_seen = timestamp
+            if cluster.last_seen is None or timestamp > cluster.last_seen:
+                cluster.last_seen = timestamp
+            bucket = int((timestamp - self.start).total_seconds() // self.bucket_seconds)
+            cluster.histogram[min(max(bucket, 0), self.buckets - 1)] += 1
+        if len(cluster.samples) < self.samples_per_cluster:
+            cluster.samples.append(compact_entry(entry))
+
+    def extend(self, entries: Iterable[Dict[str, Any]]):
+        for entry in entries:
+            self.add(entry)
+
+    def digest(self, max_clusters: int = 20) -> Dict[str, Any]:
+        """The largest clusters, JSON-ready."""
+        clusters = sorted(self._clusters, key=lambda c: (-c.count, c.first_seen or self.end))
+        return {
+            "total_entries": self.total,
+            "cluster_count": len(clusters),
+            "histogram_start": self.start.isoformat(),
+            "histogram_bucket_seconds": self.bucket_seconds,
+            "clusters": [
+                {
+                    "template": " ".join(c.template),
+                    "count": c.count,
+                    "first_seen": c.first_seen.isoformat() if c.first_seen else None,
+                    "last_seen": c.last_seen.isoformat() if c.last_seen else None,
+                    "severities": c.severities,
+                    "resources": dict(sorted(c.resources.items(), key=lambda kv: -kv[1])),
+                    "histogram": c.histogram,
+                    "samples": c.samples,
+                }
+                for c in clusters[:max_clusters]
+            ],
+            "omitted_clusters": max(0, len(clusters) - max_clusters),
+            "omitted_entries": sum(c.count for c in clusters[max_clusters:]),
+            # Entries of long-tail clusters dropped to keep memory bounded.
+            "evicted_entries": self.evicted_entries,
+            "evicted_clusters": self.evicted_clusters,
+        }
@@ -0,0 +1,182 @@
+"""
+Monitoring Agent Streaming Log Scan
+
+Pages through every Cloud Logging entry matching a filter in a time window
+and feeds them to a ``SignatureClusterer`` (log_aggregation.py), so a
+multi-day window with millions of entries becomes a bounded digest instead
+of one capped ``query_logs`` call.
+
+The ``query_logs`` MCP tool has no page tokens, so pages are keyset-based on
+the entry timestamp: each page narrows the filter with ``timestamp>=`` /
+``timestamp<`` bounds, the order of the returned entries (ascending or
+descending) says which end of the window it covered, and entries on the
+boundary timestamp are de-duplicated by ``insertId`` on the next page. Pages
+are expected in timestamp order (either direction), as Cloud Logging returns
+them. Only one page is held at a time.
+
+A scan stops early at ``max_entries`` or after ``deadline_seconds`` and says
+so (``scan_complete``, ``stopped_reason`` and the unscanned part of the
+window). ``page_size`` must not exceed what ``query_logs`` returns per call:
+a short page is taken as the end of the window.
+
+The fetch function is injected, so tests can page through a local fake::
+
+    async def fetch(filter: str, limit: int, minutes_ago: int) -> Any: ...
+
+    digest = await scan_logs(fetch, 'severity>=ERROR', start, end)
+"""
+import json
+import time
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Set
+
+from log_aggregation import SignatureClusterer, extract_entries, parse_timestamp
+
+logger = logging.getLogger(__name__)
+
+FetchLogs = Callable[[str, int, int], Awaitable[Any]]
+
+TICK = timedelta(microseconds=1)
+
+
+def format_timestamp(value: datetime) -> str:
+    return value.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.%fZ")
+
+
+def window_filter(filter: str, start: datetime, end: datetime) -> str:
+    bounds = f'timestamp>="{format_timestamp(start)}" AND timestamp<"{format_timestamp(end)}"'
+    return f"({filter}) AND {bounds}" if filter and filter.strip() else bounds
+
+
+def _entry_id(entry: Dict[str, Any]) -> str:
+    return entry.get("insertId") or json.dumps(entry, sort_keys=True, default=str)
+
+
+class LogPager:
+    """
+    Keyset pagination over ``[start, end)`` through a limit-only fetch function.
+
+    Iterate ``pages()`` for lists of entries; ``[low, high)`` is the part of
+    the window not scanned yet.
+    """
+
+    def __init__(self, fetch: FetchLogs, filter: str, start: datetime, end: datetime, page_size: int = 1000,
+                 now: Optional[datetime] = None):
+        self.fetch = fetch
+        self.filter = filter
+        self.start = start
+        self.end = end
+        self.page_size = page_size
+        self.now = now or datetime.now(timezone.utc)
+        self.pages_fetched = 0
+        self.entries = 0
+        # The window still left to scan is [low, high); ids of entries already
+        # yielded on a bound timestamp are skipped when the bound is refetched.
+        self.low = start
+        self.high = end
+        self._seen_low: Set[str] = set()
+        self._seen_high: Set[str] = set()
+        self.saturated_timestamps = 0
+
+    @property
+    def done(self) -> bool:
+        return self.low >= self.high
+
+    async def _fetch_page(self) -> List[Dict[str, Any]]:
+        # query_logs also applies its own "last N minutes" bound; keep it wide enough.
+        minutes_ago = int((self.now - self.low).total_seconds() // 60) + 2
+        result = await self.fetch(window_filter(self.filter, self.low, self.high), self.page_size, minutes_ago)
+        if isinstance(result, dict) and "error" in result:
+            raise RuntimeError(f"query_logs failed: {result['error']}")
+        self.pages_fetched += 1
+        return extract_entries(result)
+
+    async def pages(self) -> AsyncIterator[List[Dict[str, Any]]]:
+        while not self.done:
+            raw = await self._fetch_page()
+            entries = [e for e in raw if _entry_id(e) not in self._seen_low and _entry_id(e) not in self._seen_high]
+            if len(raw) < self.page_size:
+                # The rest of the window fit in one page.
+                self.low = self.high
+                self.entries += len(entries)
+                if entries:
+                    yield entries
+                return
+
+            stamps = [parse_timestamp(e.get("timestamp")) for e in raw]
+            known = [t for t in stamps if t is not None]
+            if not known:
+                raise RuntimeError("query_logs entries have no timestamps; cannot page")
+            ascending = known[0] <= known[-1]
+            edge = max(known) if ascending else min(known)
+
+            if max(known) == min(known):
+                # A whole page on one timestamp: take it and step past it.
+                self.saturated_timestamps += 1
+                if ascending:
+                    self.low, self._seen_low = edge + TICK, set()
+                else:
+                    self.high, self._seen_high = edge, set()
+                self.entries += len(entries)
+                if entries:
+                    yield entries
+                continue
+
+            # Entries on the edge timestamp may continue on the next page:
+            # keep the bound inclusive there and skip the ones already seen.
+            # The edge always moves past the previous one here, so older ids can go.
+            edge_ids = {_entry_id(e) for e, t in zip(raw, stamps) if t == edge}
+            if ascending:
+                self.low, self._seen_low = edge, edge_ids
+            else:
+                self.high, self._seen_high = edge + TICK, edge_ids
+            self.entries += len(entries)
+            if entries:
+                yield entries
+
+
+async def scan_logs(fetch: FetchLogs, filter: str, start: datetime, end: datetime, *, page_size: int = 1000,
+                    max_entries: int = 1_000_000, deadline_seconds: float = 60.0, histogram_buckets: int = 24,
+                    max_clusters: int = 500, max_output_clusters: int = 20,
+                    samples_per_cluster: int = 2) -> Dict[str, Any]:
+    """
+    Scan ``[start, end)`` page by page and return the clustered digest.
+
+    Returns:
+        The ``SignatureClusterer.digest()`` plus ``window``, ``pages``,
+        ``scan_complete``, ``stopped_reason`` and the part of the window
+        left unscanned (``unscanned_from`` / ``unscanned_until``) if stopped early.
+    """
+    pager = LogPager(fetch, filter, start, end, page_size=page_size)
+    clusterer = SignatureClusterer(start, end, histogram_buckets=histogram_buckets, max_clusters=max_clusters,
+                                   samples_per_cluster=samples_per_cluster)
+    started = time.monotonic()
+    stopped_reason = None
+    async for page in pager.pages():
+        clusterer.extend(page)
+        if clusterer.total >= max_entries:
+            stopped_reason = "max_entries"
+            break
+        if time.monotonic() - started > deadline_seconds:
+            stopped_reason = "deadline"
+            break
+
+    digest = {
+        "window": {"start": format_timestamp(start), "end": format_timestamp(end)},
+        "filter": filter,
+        "pages": pager.pages_fetched,
+        "scan_complete": pager.done,
+        "stopped_reason": stopped_reason,
+        "scan_seconds": round(time.monotonic() - started, 3),
+        **clusterer.digest(max_output_clusters),
+    }
+    if not pager.done:
+        digest["unscanned_from"] = format_timestamp(pager.low)
+        digest["unscanned_until"] = format_timestamp(pager.high)
+    if pager.saturated_timestamps:
+        # More than page_size entries on a single timestamp; some may be missing.
+        digest["saturated_timestamps"] = pager.saturated_timestamps
+    logger.info(f"Log scan: {clusterer.total} entries, {pager.pages_fetched} pages, "
+                f"{digest['cluster_count']} clusters in {digest['scan_seconds']}s")
+    return digest
@@ -1,59 +1,35 @@
 """
-Monitoring ADK Agent - Flask HTTP Wrapper
+Monitoring ADK Agent - HTTP Wrapper
 
-Provides HTTP API endpoint for the Monitoring ADK agent.
-Integrates with structured logging and request ID propagation.
+Provides HTTP API endpoint for the Monitoring ADK agent, served through the
+shared ASGI layer (common/agent_server.py) with request ID propagation.
 """
 
 import sys
+import logging
 from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
-from flask import Flask, request, jsonify
-import asyncio
-# from agent import send_message_async # Deprecated in main
+from agent import send_message_async, query_logs_aggregated, scan_logs_digest
 from config import config
+from common.agent_server import create_agent_server, serve
 
-# Import structured logging
+# Structured logging (the agent server sets the request ID per request)
 try:
     sys.path.insert(0, str(Path(__file__).parent.parent.parent / 'orchestrator'))
-    from structured_logging import (
-        StructuredLogger,
-        set_request_id,
-        get_request_id,
-        propagate_request_id,
-        add_request_id_to_response
-    )
+    from structured_logging import StructuredLogger
     STRUCTURED_LOGGING_AVAILABLE = True
 except ImportError:
-    print("Warning: Structured logging not available, using basic logging")
     STRUCTURED_LOGGING_AVAILABLE = False
-    import logging
     logging.basicConfig(level=logging.INFO)
 
-
-app = Flask(__name__)
-
-# Configure logging
 if STRUCTURED_LOGGING_AVAILABLE:
     logger = StructuredLogger('monitoring_agent_adk', level=config.LOG_LEVEL)
-    app.after_request(add_request_id_to_response)
 else:
     logger = logging.getLogger(__name__)
 
 
-@app.route('/health', methods=['GET'])
-def health():
-    """Health check endpoint"""
-    return jsonify({
-        "status": "healthy",
-        "service": "monitoring_agent_adk",
-        "model": config.FINOPTIAGENTS_LLM
-    }), 200
-
-
-@app.route('/execute', methods=['POST'])
-def execute():
+async def execute(data, headers):
     """
     Execute a Monitoring operation via ADK agent
     
@@ -65,94 +41,146 @@ def execute():
     }
     
     Returns:
-        JSON response with agent output
+        (JSON body, status) with agent output
     """
+    if 'prompt' not in data:
+        logger.warning("Missing prompt in request body")
+        return {
+            "error": True,
+            "message": "Missing 'prompt' in request body"
+        }, 400
+    
+    prompt = data['prompt']
+    user_email = data.get('user_email', 'unknown')
+    project_id = data.get('project_id', config.GCP_PROJECT_ID)
+    session_id = data.get('session_id', 'default')
+    
+    logger.info(f"Received request from {user_email} (session: {session_id}): {prompt[:100]}")
+    
+    # Process with ADK agent
+    response_text = await send_message_async(prompt, user_email, project_id, session_id=session_id)
+    logger.info(f"Request processed for {user_email}")
+    
+    return {
+        "success": True,
+        "response": response_text,
+        "agent": "monitoring_adk",
+        "model": config.FINOPTIAGENTS_LLM
+    }, 200
+
+
+MAX_QUERY_LIMIT = 1000
+
+
+def _bounded_int(data, key, default, low, high):
     try:
-        # Set request ID for tracing
-        if STRUCTURED_LOGGING_AVAILABLE:
-            set_request_id(request.headers.get('X-Request-ID'))
-        
-        # Extract request data
-        data = request.get_json()
-        if not data or 'prompt' not in data:
-            if STRUCTURED_LOGGING_AVAILABLE:
-                logger.warning("Missing prompt in request body")
-            return jsonify({
-                "error": True,
-                "message": "Missing 'prompt' in request body"
-            }), 400
-        
-        prompt = data['prompt']
-        user_email = data.get('user_email', 'unknown')
-        project_id = data.get('project_id', config.GCP_PROJECT_ID)
-        
-        session_id = data.get('session_id', 'default')
-        
-        # Log request
-        if STRUCTURED_LOGGING_AVAILABLE:
-            logger.info(
-                "Received monitoring request",
-                user_email=user_email,
-                session_id=session_id,
-                prompt=prompt[:100] if len(prompt) > 100 else prompt,
-                project_id=project_id
-            )
-        else:
-            logger.info(f"Received request from {user_email} (session: {session_id}): {prompt[:100]}")
-        
-        # Process with ADK agent
-        from agent import send_message
-        response_text = send_message(prompt, user_email, project_id, session_id=session_id)
-        
-        # Log success
-        if STRUCTURED_LOGGING_AVAILABLE:
-            logger.info(
-                "Request processed successfully",
-                user_email=user_email,
-                response_length=len(response_text)
-            )
-        else:
-            logger.info(f"Request processed for {user_email}")
-        
-        return jsonify({
-            "success": True,
-            "response": response_text,
-            "agent": "monitoring_adk",
-            "model": config.FINOPTIAGENTS_LLM
-        }), 200
+        return max(low, min(high, int(data.get(key, default))))
+    except (TypeError, ValueError):
+        raise ValueError(f"'{key}' must be an integer")
+
+
+async def query_logs_api(data, headers):
+    """
+    Structured log query (no LLM): entries grouped by signature / resource
     
-    except Exception as e:
-        # Log error
-        if STRUCTURED_LOGGING_AVAILABLE:
-            logger.error(
-                "Error processing monitoring request",
-                error=str(e),
-                exc_info=True
-            )
-        else:
-            logger.error(f"Error: {str(e)}", exc_info=True)
-        
-        return jsonify({
-            "error": True,
-            "message": f"Error processing request: {str(e)}"
-        }), 500
+    Expected JSON body:
+    {
+        "project_id": "gcp-project-id" (optional),
+        "filter": "Cloud Logging filter" (optional),
+        "minutes_ago": 60 (optional, max 10080),
+        "limit": 500 (optional, entries fetched, max 1000),
+        "group_by": ["signature", "resource"] (optional, default ["signature"]),
+        "samples_per_group": 2 (optional),
+        "max_groups": 20 (optional)
+    }
+    
+    Returns:
+        (JSON body, status) with total_entries, group_count and groups
+        [{signature, resource, count, first_seen, last_seen, severities, samples}]
+    """
+    group_by = data.get('group_by', ['signature'])
+    if isinstance(group_by, str):
+        group_by = [g.strip() for g in group_by.split(',') if g.strip()]
+    try:
+        params = {
+            "minutes_ago": _bounded_int(data, 'minutes_ago', 60, 1, 10080),
+            "limit": _bounded_int(data, 'limit', 500, 1, MAX_QUERY_LIMIT),
+            "samples_per_group": _bounded_int(data, 'samples_per_group', 2, 0, 10),
+            "max_groups": _bounded_int(data, 'max_groups', 20, 1, 100),
+        }
+        result = await query_logs_aggregated(
+            data.get('project_id') or config.GCP_PROJECT_ID,
+            filter=data.get('filter', ''),
+            group_by=group_by,
+            **params,
+        )
+    except ValueError as e:
+        return {"error": True, "message": str(e)}, 400
+
+    if "error" in result:
+        return {"error": True, "message": str(result["error"])}, 502
+    return {"success": True, "agent": "monitoring_adk", **result}, 200
 
 
-@app.route('/info', methods=['GET'])
-def info():
-    """Get agent information"""
-    return jsonify({
+async def scan_logs_api(data, headers):
+    """
+    Streaming log scan (no LLM): pages through the whole window and returns
+    message-template clusters
+    
+    Expected JSON body:
+    {
+        "project_id": "gcp-project-id" (optional),
+        "filter": "Cloud Logging filter" (optional),
+        "minutes_ago": 1440 (optional, max 10080),
+        "max_entries": 1000000 (optional, entries scanned),
+        "deadline_seconds": 60 (optional, max 300),
+        "histogram_buckets": 24 (optional),
+        "max_clusters": 20 (optional, clusters returned)
+    }
+    
+    Returns:
+        (JSON body, status) with total_entries, scan_complete, cluster_count and
+        clusters [{template, count, first_seen, last_seen, severities, resources,
+        histogram, samples}]
+    """
+    try:
+        result = await scan_logs_digest(
+            data.get('project_id') or config.GCP_PROJECT_ID,
+            filter=data.get('filter', ''),
+            minutes_ago=_bounded_int(data, 'minutes_ago', 1440, 1, 10080),
+            max_entries=_bounded_int(data, 'max_entries', 1_000_000, 1, 10_000_000),
+            deadline_seconds=_bounded_int(data, 'deadline_seconds', 60, 1, 300),
+            histogram_buckets=_bounded_int(data, 'histogram_buckets', 24, 1, 168),
+            max_clusters=_bounded_int(data, 'max_clusters', 20, 1, 100),
+        )
+    except ValueError as e:
+        return {"error": True, "message": str(e)}, 400
+
+    if "error" in result:
+        return {"error": True, "message": str(result["error"])}, 502
+    return {"success": True, "agent": "monitoring_adk", **result}, 200
+
+
+app = create_agent_server(
+    "monitoring_agent_adk",
+    execute,
+    health={"model": config.FINOPTIAGENTS_LLM},
+    routes={"/logs/query": query_logs_api, "/logs/scan": scan_logs_api},
+    info={
         "name": "monitoring_agent_adk",
         "description": "Google Cloud monitoring and logging specialist using ADK",
         "model": config.FINOPTIAGENTS_LLM,
         "capabilities": [
             "Query time-series metrics (CPU, memory, disk, network)",
             "Search and retrieve log entries",
+            "Structured log queries grouped by error signature (POST /logs/query)",
+            "Full-window log scans clustered into message templates (POST /logs/scan)",
             "List available metrics",
             "Analyze system health and performance"
         ],
         "mcp_server_url": config.MONITORING_MCP_URL
-    }), 200
+    },
+)
 
 
 if __name__ == '__main__':
@@ -162,14 +190,5 @@ if __name__ == '__main__':
         print("Please check your .env file or environment variables")
         sys.exit(1)
     
-    if STRUCTURED_LOGGING_AVAILABLE:
-        logger.info(
-            "Starting Monitoring ADK Agent",
-            port=5002,
-            model=config.FINOPTIAGENTS_LLM,
-            mcp_url=config.MONITORING_MCP_URL
-        )
-    else:
-        logger.info(f"Starting Monitoring ADK Agent on port 5002")
-    
-    app.run(host='0.0.0.0', port=5002, debug=config.DEV_MODE)
+    logger.info(f"Starting Monitoring ADK Agent on port 5002")
+    serve(app, port=5002)
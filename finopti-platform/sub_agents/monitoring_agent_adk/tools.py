@@ -4,9 +4,12 @@ Monitoring Agent Tools
 import logging
 from typing import Dict, Any, List
 from mcp_client import ensure_mcp
+from common.tool_cache import cached_tool
 
 logger = logging.getLogger(__name__)
 
+# Results are cached per minute bucket of the relative query window (see common/tool_cache.py).
+@cached_tool("query_logs", ttl_seconds=60, bucket_seconds=60)
 async def query_logs(project_id: str, filter: str = "", limit: int = 10, minutes_ago: int = 2) -> Dict[str, Any]:
     # HARD CAP: Force max 7 days (10080m) to allow finding older errors while preventing 30-day queries.
     # Buffer fix (10MB) handles the volume.
@@ -23,10 +26,12 @@ async def query_logs(project_id: str, filter: str = "", limit: int = 10, minutes
         "minutes_ago": minutes_ago
     })
 
+@cached_tool("list_metrics", ttl_seconds=3600)
 async def list_metrics(project_id: str, filter: str = "") -> Dict[str, Any]:
     client = await ensure_mcp()
     return await client.call_tool("list_metrics", {"project_id": project_id, "filter": filter})
 
+@cached_tool("query_time_series", ttl_seconds=60, bucket_seconds=60)
 async def query_time_series(project_id: str, metric_type: str, resource_filter: str = "", minutes_ago: int = 60) -> Dict[str, Any]:
     # HARD CAP: Force max 60 minutes
     if minutes_ago > 60:
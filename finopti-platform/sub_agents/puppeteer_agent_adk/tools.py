@@ -1,6 +1,7 @@
 """
 Puppeteer Agent Tools
 """
+import asyncio
 import logging
 import base64
 from pathlib import Path
@@ -14,6 +15,11 @@ async def puppeteer_navigate(url: str) -> Dict[str, Any]:
     client = await ensure_mcp()
     return await client.call_tool("puppeteer_navigate", {"url": url})
 
+def _save_screenshot(save_path: Path, image_b64: str):
+    save_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(save_path, "wb") as f:
+        f.write(base64.b64decode(image_b64))
+
 async def puppeteer_screenshot(name: str = "screenshot", width: int = 1200, height: int = 800, filename: str = None) -> Dict[str, Any]:
     client = await ensure_mcp()
     result = await client.call_tool("puppeteer_screenshot", {"name": name, "width": width, "height": height})
@@ -32,12 +38,9 @@ async def puppeteer_screenshot(name: str = "screenshot", width: int = 1200, heig
             # Define path in shared volume (Rule: always use session_id folder)
             session_id = _session_id_ctx.get() or "default"
             save_path = Path("/projects") / session_id / filename
-            save_path.parent.mkdir(parents=True, exist_ok=True)
-            
-            # Decode and write
-            image_bytes = base64.b64decode(result["image"])
-            with open(save_path, "wb") as f:
-                f.write(image_bytes)
+
+            # Decode and write off the shared agent loop (screenshots are MBs)
+            await asyncio.to_thread(_save_screenshot, save_path, result["image"])
                 
             logger.info(f"Saved screenshot to {save_path}")
             result["result"] += f"\n\n[System] Screenshot saved to shared volume at: {save_path}"
@@ -0,0 +1,236 @@
+"""
+Verify the MATS job scheduler (mats-agents/mats-orchestrator/scheduler.py) and
+job stores (job_manager.py): priority order, the per-user cap, SchedulerBusy
+when the queue is full or draining, drain() finishing or abandoning jobs, and
+for each store the finished-job TTL, the active-job-per-user index and status
+long-polls.
+
+RedisJobStore checks run against REDIS_HOST/REDIS_PORT (default localhost:6379)
+and are skipped if no server answers; use a scratch db, keys are mats:job:*.
+
+    python tests/verify_job_scheduler.py
+    REDIS_HOST=localhost REDIS_DB=15 python tests/verify_job_scheduler.py
+"""
+import os
+import sys
+import time
+import asyncio
+import argparse
+import threading
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "mats-agents" / "mats-orchestrator"))
+
+import job_manager
+from job_manager import InMemoryJobStore, JobManager, RedisJobStore
+from scheduler import (
+    JobScheduler, SchedulerBusy, PRIORITY_NEW, PRIORITY_REMEDIATION, PRIORITY_RESUME,
+)
+
+
+def wait_until(predicate, timeout: float = 5.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.01)
+
+
+def gated_job(started: list, job_id: str, gate: threading.Event):
+    """Coroutine factory that records its start and holds its slot until ``gate`` is set."""
+    async def run():
+        started.append(job_id)
+        await asyncio.to_thread(gate.wait)
+    return run
+
+
+# --- Scheduler ---
+
+def check_priority_order():
+    scheduler = JobScheduler(max_concurrency=1, max_per_user=1)
+    started, gate, release = [], threading.Event(), threading.Event()
+    scheduler.submit("blocker", "a@x", gated_job(started, "blocker", gate))
+    wait_until(lambda: started == ["blocker"])
+
+    # Queued behind the blocker in the worst order; one user each so the cap doesn't interfere
+    release.set()
+    scheduler.submit("new-1", "b@x", gated_job(started, "new-1", release), PRIORITY_NEW)
+    scheduler.submit("resume", "c@x", gated_job(started, "resume", release), PRIORITY_RESUME)
+    scheduler.submit("new-2", "d@x", gated_job(started, "new-2", release), PRIORITY_NEW)
+    scheduler.submit("fix", "e@x", gated_job(started, "fix", release), PRIORITY_REMEDIATION)
+    gate.set()
+    wait_until(lambda: scheduler.stats()["finished"] == 5)
+    assert started == ["blocker", "fix", "resume", "new-1", "new-2"], started
+    scheduler.drain(timeout=1)
+    print("✅ remediation, then resumes, then new investigations (FIFO within a priority)")
+
+
+def check_per_user_cap():
+    scheduler = JobScheduler(max_concurrency=4, max_per_user=2)
+    started, gate = [], threading.Event()
+    for i in range(3):
+        scheduler.submit(f"a-{i}", "a@x", gated_job(started, f"a-{i}", gate))
+    scheduler.submit("b-0", "b@x", gated_job(started, "b-0", gate))
+    wait_until(lambda: len(started) == 3)
+    time.sleep(0.1)
+    stats = scheduler.stats()
+    assert sorted(started) == ["a-0", "a-1", "b-0"], started
+    assert (stats["running"], stats["queued"]) == (3, 1), stats
+
+    gate.set()
+    wait_until(lambda: scheduler.stats()["finished"] == 4)
+    assert started[-1] == "a-2", started
+    scheduler.drain(timeout=1)
+
+    # A free slot goes to the least-served user, even if they queued later
+    scheduler = JobScheduler(max_concurrency=2, max_per_user=2)
+    started, gate_a, gate_b, rest = [], threading.Event(), threading.Event(), threading.Event()
+    scheduler.submit("a-0", "a@x", gated_job(started, "a-0", gate_a))
+    scheduler.submit("b-0", "b@x", gated_job(started, "b-0", gate_b))
+    wait_until(lambda: len(started) == 2)
+    scheduler.submit("a-1", "a@x", gated_job(started, "a-1", rest))
+    scheduler.submit("c-0", "c@x", gated_job(started, "c-0", rest))
+    gate_b.set()
+    wait_until(lambda: len(started) == 3)
+    assert started[-1] == "c-0", started
+    gate_a.set()
+    rest.set()
+    scheduler.drain(timeout=5)
+    print("✅ no user holds more than max_per_user slots; least-served user goes next")
+
+
+def check_queue_full():
+    scheduler = JobScheduler(max_concurrency=1, max_queued=2)
+    started, gate = [], threading.Event()
+    scheduler.submit("running", "a@x", gated_job(started, "running", gate))
+    wait_until(lambda: started == ["running"])
+    assert scheduler.submit("q-1", "b@x", gated_job(started, "q-1", gate)) == 0
+    assert scheduler.submit("q-2", "c@x", gated_job(started, "q-2", gate)) == 1
+    try:
+        scheduler.submit("q-3", "d@x", gated_job(started, "q-3", gate))
+        raise AssertionError("expected SchedulerBusy")
+    except SchedulerBusy:
+        pass
+    assert scheduler.stats()["rejected"] == 1
+    gate.set()
+    scheduler.drain(timeout=5)
+    assert started == ["running", "q-1", "q-2"], started
+    print("✅ SchedulerBusy once max_queued jobs are waiting")
+
+
+def check_drain():
+    # Everything finishes within the timeout; intake is closed
+    scheduler = JobScheduler(max_concurrency=1)
+    started, gate = [], threading.Event()
+    for i in range(3):
+        scheduler.submit(f"j-{i}", f"{i}@x", gated_job(started, f"j-{i}", gate))
+    threading.Timer(0.2, gate.set).start()
+    abandoned = []
+    scheduler.drain(timeout=10, on_abandoned=abandoned.append)
+    stats = scheduler.stats()
+    assert stats["finished"] == 3 and not abandoned and stats["draining"], stats
+    try:
+        scheduler.submit("late", "x@x", gated_job(started, "late", gate))
+        raise AssertionError("expected SchedulerBusy")
+    except SchedulerBusy:
+        pass
+
+    # Deadline: the running job is cancelled and the queued one dropped, both reported
+    scheduler = JobScheduler(max_concurrency=1)
+    started, never = [], threading.Event()
+    scheduler.submit("stuck", "a@x", gated_job(started, "stuck", never))
+    scheduler.submit("queued", "b@x", gated_job(started, "queued", never))
+    wait_until(lambda: started == ["stuck"])
+    abandoned = []
+    scheduler.drain(timeout=0.5, on_abandoned=abandoned.append)
+    never.set()
+    assert sorted(abandoned) == ["queued", "stuck"], abandoned
+    print("✅ drain() finishes queued and running jobs, then abandons what is left at the deadline")
+
+
+# --- Stores ---
+
+def check_store(store, label: str):
+    JobManager.use_store(store)
+    user = f"user-{time.time_ns()}@x"
+
+    first = JobManager.create_job("why is checkout failing", user)
+    assert JobManager.get_active_job_for_user(user) == first
+    JobManager.update_job(first, {"status": "WAITING_FOR_USER"})
+    assert JobManager.get_active_job_for_user(user) == first
+
+    # A newer job takes the index; finishing the older one must not clear it
+    second = JobManager.create_job("and the api?", user)
+    JobManager.update_result(first, {"ok": True})
+    assert JobManager.get_active_job_for_user(user) == second
+    JobManager.fail_job(second, "boom")
+    assert JobManager.get_active_job_for_user(user) is None
+
+    job = JobManager.get_job(first)
+    assert job["status"] == "COMPLETED" and job["result"] == {"ok": True}, job
+    assert [e["message"] for e in job["events"]] == ["Job started", "Job COMPLETED"], job["events"]
+
+    # Long-poll wakes on a status change from another thread
+    third = JobManager.create_job("again", user)
+    threading.Timer(0.2, JobManager.update_result, (third, "done")).start()
+    started = time.monotonic()
+    job = JobManager.wait_for_status_change(third, "RUNNING", timeout=10)
+    assert job["status"] == "COMPLETED" and time.monotonic() - started < 5, job
+    print(f"✅ {label}: active-job index follows status changes; long-poll wakes on change")
+    return first, third
+
+
+def check_memory_store():
+    store = InMemoryJobStore()
+    finished, _ = check_store(store, "InMemoryJobStore")
+
+    saved = job_manager.JOB_TTL_SECONDS
+    job_manager.JOB_TTL_SECONDS = 0
+    try:
+        running = JobManager.create_job("still running", "ttl@x")
+        time.sleep(0.01)
+        JobManager.create_job("triggers eviction", "other@x")
+        assert JobManager.get_job(finished) is None
+        assert JobManager.get_job(running)["status"] == "RUNNING"
+        assert JobManager.get_active_job_for_user("ttl@x") == running
+    finally:
+        job_manager.JOB_TTL_SECONDS = saved
+    print("✅ InMemoryJobStore: finished jobs are evicted after the TTL, active ones are kept")
+
+
+def check_redis_store():
+    try:
+        store = RedisJobStore()
+        store._redis.ping()
+    except Exception as e:
+        print(f"⏭️  RedisJobStore skipped (no server at {os.getenv('REDIS_HOST', 'localhost')}: {e})")
+        return
+    redis = store._redis
+    finished, _ = check_store(store, "RedisJobStore")
+
+    running = JobManager.create_job("still running", "ttl@x")
+    key = f"mats:job:{running}"
+    assert 0 < redis.ttl(key) <= job_manager.ACTIVE_JOB_TTL_SECONDS
+    assert 0 < redis.ttl("mats:jobs:active_user:ttl@x") <= job_manager.ACTIVE_JOB_TTL_SECONDS
+    assert 0 < redis.ttl(f"mats:job:{finished}") <= job_manager.JOB_TTL_SECONDS
+    assert 0 < redis.ttl(f"mats:job:{finished}:events") <= job_manager.JOB_TTL_SECONDS
+    JobManager.update_result(running, "done")
+    assert 0 < redis.ttl(key) <= job_manager.JOB_TTL_SECONDS
+    assert not redis.exists("mats:jobs:active_user:ttl@x")
+    print("✅ RedisJobStore: finished jobs get JOB_TTL_SECONDS, active ones ACTIVE_JOB_TTL_SECONDS")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.parse_args()
+    os.environ.setdefault("REDIS_HOST", "localhost")
+
+    check_priority_order()
+    check_per_user_cap()
+    check_queue_full()
+    check_drain()
+    check_memory_store()
+    check_redis_store()
+
+
+if __name__ == "__main__":
+    main()
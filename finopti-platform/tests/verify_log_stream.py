@@ -0,0 +1,144 @@
+"""
+Verify the streaming log scan (sub_agents/monitoring_agent_adk/log_stream.py)
+against a local fake of the query_logs tool: exact counts across pages in both
+result orders, boundary de-duplication, clustering, early stops and bounded
+memory.
+
+    python tests/verify_log_stream.py --entries 200000
+"""
+import re
+import sys
+import time
+import asyncio
+import argparse
+import tracemalloc
+from pathlib import Path
+from datetime import datetime, timedelta, timezone
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "sub_agents" / "monitoring_agent_adk"))
+
+from log_stream import scan_logs, format_timestamp
+from log_aggregation import parse_timestamp
+
+START = datetime(2026, 1, 1, tzinfo=timezone.utc)
+BOUNDS = re.compile(r'timestamp>="([^"]+)" AND timestamp<"([^"]+)"')
+
+TEMPLATES = [
+    lambda i: f"upstream request timeout after {100 + i % 900}ms to 10.0.{i % 7}.{i % 5}:443",
+    lambda i: f"Permission denied on resource project 'proj-{i % 3}' for sa-{i % 11}@example.com",
+    lambda i: f"db pool exhausted: {i % 50} of 50 connections busy",
+    lambda i: f"OOMKilled container api-{i:08x} in pod api-{i % 13}",
+]
+
+
+class FakeLogs:
+    """Entries i = 0..n-1, `per_timestamp` sharing each timestamp one second apart."""
+
+    def __init__(self, n: int, per_timestamp: int = 1, descending: bool = False, unique_every: int = 0):
+        self.n = n
+        self.per_timestamp = per_timestamp
+        self.descending = descending
+        self.unique_every = unique_every
+        self.calls = 0
+
+    def timestamp(self, i: int) -> datetime:
+        return START + timedelta(seconds=i // self.per_timestamp)
+
+    def entry(self, i: int) -> dict:
+        if self.unique_every and i % self.unique_every == 0:
+            # A first word of its own puts every one-off message in a new cluster.
+            word = "".join("abcdefghijklmnopqrstuvwxyz"[(i // 26 ** k) % 26] for k in range(4))
+            message = f"{word} failed unexpectedly"
+        else:
+            message = TEMPLATES[i % len(TEMPLATES)](i)
+        return {
+            "insertId": f"id-{i}",
+            "timestamp": format_timestamp(self.timestamp(i)),
+            "severity": "ERROR" if i % 4 != 1 else "WARNING",
+            "resource": {"type": "cloud_run_revision", "labels": {"service_name": f"svc-{i % 3}"}},
+            "textPayload": message,
+        }
+
+    def _index(self, ts: datetime) -> int:
+        seconds = (ts - START).total_seconds()
+        whole = int(seconds) + (0 if seconds == int(seconds) else 1)
+        return max(0, min(self.n, whole * self.per_timestamp))
+
+    async def fetch(self, filter: str, limit: int, minutes_ago: int):
+        self.calls += 1
+        low, high = (parse_timestamp(v) for v in BOUNDS.search(filter).groups())
+        lo, hi = self._index(low), self._index(high)
+        if self.descending:
+            return {"entries": [self.entry(i) for i in range(hi - 1, max(lo, hi - limit) - 1, -1)]}
+        return {"entries": [self.entry(i) for i in range(lo, min(hi, lo + limit))]}
+
+
+def window(fake: FakeLogs):
+    return START, fake.timestamp(fake.n - 1) + timedelta(seconds=1)
+
+
+async def check_exact_counts():
+    for descending in (False, True):
+        for per_timestamp in (1, 7, 999):
+            fake = FakeLogs(25_000, per_timestamp=per_timestamp, descending=descending)
+            digest = await scan_logs(fake.fetch, "severity>=WARNING", *window(fake), page_size=1000)
+            assert digest["scan_complete"], digest
+            assert digest["total_entries"] == fake.n, (descending, per_timestamp, digest["total_entries"])
+            assert sum(c["count"] for c in digest["clusters"]) == fake.n
+            assert digest["cluster_count"] == len(TEMPLATES), [c["template"] for c in digest["clusters"]]
+            assert sum(digest["clusters"][0]["histogram"]) == digest["clusters"][0]["count"]
+    print(f"✅ exact counts across pages (asc/desc, 1/7/999 entries per timestamp)")
+    for c in digest["clusters"]:
+        print(f"   {c['count']:>6}  {c['template']}")
+
+
+async def check_saturated_timestamp():
+    fake = FakeLogs(3_000, per_timestamp=1_500)
+    digest = await scan_logs(fake.fetch, "", *window(fake), page_size=1000)
+    assert digest["scan_complete"]
+    assert digest["saturated_timestamps"] == 2, digest.get("saturated_timestamps")
+    assert digest["total_entries"] == 2_000  # 1000 of each 1500-entry timestamp
+    print("✅ timestamps with more entries than a page are reported as saturated")
+
+
+async def check_early_stop():
+    fake = FakeLogs(50_000)
+    digest = await scan_logs(fake.fetch, "", *window(fake), page_size=1000, max_entries=10_000)
+    assert not digest["scan_complete"] and digest["stopped_reason"] == "max_entries"
+    # Checked once per page; the last timestamp seen is refetched (inclusive bound).
+    assert 10_000 <= digest["total_entries"] < 11_000, digest["total_entries"]
+    assert digest["unscanned_from"] == format_timestamp(fake.timestamp(digest["total_entries"] - 1)), digest["unscanned_from"]
+    print("✅ max_entries stops the scan and reports the unscanned window")
+
+
+async def check_bounded_memory(n: int):
+    peaks = []
+    for size in (n // 10, n):
+        fake = FakeLogs(size, per_timestamp=3, unique_every=5)
+        tracemalloc.start()
+        started = time.perf_counter()
+        digest = await scan_logs(fake.fetch, "", *window(fake), page_size=1000, max_clusters=200)
+        elapsed = time.perf_counter() - started
+        peaks.append(tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+        assert digest["total_entries"] == size
+        assert digest["cluster_count"] <= 200
+        print(f"   {size:>9} entries: {elapsed:6.1f}s ({size / elapsed:,.0f}/s), peak {peaks[-1] / 1e6:.1f} MB, "
+              f"{digest['cluster_count']} clusters, {digest['evicted_entries']} entries evicted")
+    assert peaks[1] < peaks[0] * 2, peaks
+    print("✅ memory stays bounded as the scan grows")
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--entries", type=int, default=200_000)
+    args = parser.parse_args()
+
+    await check_exact_counts()
+    await check_saturated_timestamp()
+    await check_early_stop()
+    await check_bounded_memory(args.entries)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -20,14 +20,32 @@ sys.path.append("/Users/robinkv/dev_workplace/all_codebase/auth_micro_agents/fin
 from tools import read_logs
 
 async def test_read_logs():
-    print("Testing read_logs delegation...")
+    print("Testing read_logs log scan...")
     
     with patch("requests.post") as mock_post:
         # Mock Response
         mock_response = MagicMock()
         mock_response.status_code = 200
         mock_response.json.return_value = {
-            "response": "Found 5 error logs related to IAM permission denied."
+            "success": True,
+            "window": {"start": "2025-12-30T00:00:00.000000Z", "end": "2026-01-01T00:00:00.000000Z"},
+            "pages": 1,
+            "scan_complete": True,
+            "total_entries": 5,
+            "cluster_count": 1,
+            "histogram_bucket_seconds": 3600.0,
+            "clusters": [{
+                "template": "Permission denied on resource project <str>",
+                "count": 5,
+                "first_seen": "2026-01-01T00:00:00+00:00",
+                "last_seen": "2026-01-01T00:05:00+00:00",
+                "severities": {"ERROR": 5},
+                "resources": {"cloud_run_revision/api": 5},
+                "histogram": [0] * 47 + [5],
+                "samples": [{"message": "Permission denied on resource project 'p'"}],
+            }],
+            "omitted_clusters": 0,
+            "evicted_entries": 0,
         }
         mock_post.return_value = mock_response
         
@@ -35,17 +53,46 @@ async def test_read_logs():
         result = await read_logs("test-project", "severity=ERROR")
         
         # Assertions
+        print(f"Result: {result}")
+        assert result["total_entries"] == 5
+        assert result["log_clusters"][0]["count"] == 5
+        assert "Permission denied" in result["log_clusters"][0]["template"]
+        
+        # Verify Call
+        args, kwargs = mock_post.call_args
+        assert args[0] == "http://mock-apisix/agent/monitoring/logs/scan"
+        assert kwargs["json"]["project_id"] == "test-project"
+        assert kwargs["json"]["filter"] == "severity=ERROR"
+        assert kwargs["json"]["minutes_ago"] == 48 * 60
+        
+        print("✅ read_logs Verification Passed")
+
+async def test_read_logs_fallback():
+    print("Testing read_logs fallback to prompt delegation...")
+    
+    with patch("requests.post") as mock_post:
+        not_found = MagicMock()
+        not_found.status_code = 404
+        delegated = MagicMock()
+        delegated.status_code = 200
+        delegated.json.return_value = {
+            "response": "Found 5 error logs related to IAM permission denied."
+        }
+        mock_post.side_effect = [not_found, delegated]
+        
+        result = await read_logs("test-project", "severity=ERROR")
+        
         print(f"Result: {result}")
         assert "summary" in result
         assert "Found 5 error logs" in result["summary"]
         
-        # Verify Call
         args, kwargs = mock_post.call_args
         assert args[0] == "http://mock-apisix/agent/monitoring/execute"
         assert kwargs["json"]["project_id"] == "test-project"
         assert "severity=ERROR" in kwargs["json"]["prompt"]
         
-        print("✅ read_logs Verification Passed")
+        print("✅ read_logs fallback Verification Passed")
 
 if __name__ == "__main__":
     asyncio.run(test_read_logs())
+    asyncio.run(test_read_logs_fallback())
@@ -0,0 +1,167 @@
+"""
+Verify the tool result cache (common/tool_cache.py): which gcloud commands are
+treated as read-only, time bucketing of cache keys, and that failed tool calls
+(``error``, ``success: False``, MCP ``isError``) are never replayed.
+
+With ``--redis-url`` the shared Redis tier is checked too (use a scratch db).
+
+    python tests/verify_tool_cache.py
+    python tests/verify_tool_cache.py --redis-url redis://localhost:6379/15
+"""
+import sys
+import uuid
+import asyncio
+import argparse
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from common.tool_cache import ToolResultCache, cached_tool, is_read_only_gcloud, make_cache_key
+
+READ_ONLY = [
+    "compute instances list",
+    "compute instances describe vm-1 --zone us-central1-a",
+    "beta compute instances list --filter=status:RUNNING",
+    "run services list",  # "run" is the group, not the verb
+    "deploy releases list",
+    "logging read severity>=ERROR --limit 10",
+    "projects get-iam-policy my-project",
+    "container clusters describe prod",
+    "secrets versions list my-secret",
+]
+NOT_READ_ONLY = [
+    # mutating
+    "compute instances delete vm-1",
+    "compute instances delete list",  # a mutating verb before a read-only word
+    "compute instances add-tags vm-1 --tags web",
+    "run deploy api --image gcr.io/p/api",
+    "storage rm gs://bucket/object",
+    "pubsub subscriptions pull my-sub --auto-ack",  # pulling consumes messages
+    # no read-only verb, or output that must not be replayed
+    "compute ssh vm-1",
+    "container clusters get-credentials prod",  # writes kubeconfig
+    "secrets versions access latest --secret db-password",  # secret material
+    "logging tail",
+    # credential / client-state groups
+    "auth print-access-token",
+    "auth list",
+    "config list",
+    "config get-value project",
+    "",
+]
+
+
+def check_gcloud_classification():
+    for command in READ_ONLY:
+        assert is_read_only_gcloud(command.split()), command
+    for command in NOT_READ_ONLY:
+        assert not is_read_only_gcloud(command.split()), command
+    print(f"✅ {len(READ_ONLY)} read-only and {len(NOT_READ_ONLY)} other gcloud commands classified")
+
+
+def check_key_bucketing():
+    args = {"project_id": "p", "filter": "severity>=ERROR", "minutes_ago": 2}
+    key = make_cache_key("query_logs", args, bucket_seconds=60, now=120.0)
+    assert make_cache_key("query_logs", args, bucket_seconds=60, now=179.9) == key
+    assert make_cache_key("query_logs", args, bucket_seconds=60, now=180.0) != key
+    assert make_cache_key("query_logs", args, bucket_seconds=60, now=119.9) != key
+
+    # Without a bucket the key does not depend on time
+    assert make_cache_key("list_metrics", args, now=0) == make_cache_key("list_metrics", args, now=1e9)
+
+    # Argument order, surrounding whitespace and tool-name case do not matter; values do
+    reordered = {"minutes_ago": 2, "filter": "  severity>=ERROR ", "project_id": "p"}
+    assert make_cache_key(" Query_Logs", reordered, bucket_seconds=60, now=150.0) == key
+    assert make_cache_key("query_logs", {**args, "minutes_ago": 3}, bucket_seconds=60, now=150.0) != key
+    assert make_cache_key("query_time_series", args, bucket_seconds=60, now=150.0) != key
+    print("✅ keys match within a time bucket and differ across buckets, arguments and tools")
+
+
+async def check_errors_not_cached(cache: ToolResultCache, label: str):
+    results = {
+        "error": {"error": "403 Permission denied"},
+        "success_false": {"success": False, "output": "ERROR: (gcloud) ..."},
+        "is_error": {"output": "ERROR: (gcloud.compute) quota exceeded", "isError": True},
+        "none": None,
+        "ok": {"success": True, "output": "vm-1 RUNNING"},
+    }
+    calls = {name: 0 for name in results}
+
+    @cached_tool("verify_failures", ttl_seconds=60, cache=cache)
+    async def tool(case: str):
+        calls[case] += 1
+        return results[case]
+
+    for _ in range(3):
+        for case in results:
+            await tool(case)
+    assert calls == {"error": 3, "success_false": 3, "is_error": 3, "none": 3, "ok": 1}, calls
+
+    cached = await tool("ok")
+    assert cached["cache_info"]["cached"] and cached["output"] == "vm-1 RUNNING", cached
+    print(f"✅ {label}: failed results always run again, successful ones are replayed")
+
+
+async def check_mutating_not_cached(cache: ToolResultCache):
+    calls = []
+
+    @cached_tool("verify_gcloud", ttl_seconds=60, cache=cache,
+                 cacheable=lambda arguments: is_read_only_gcloud(arguments["args"]))
+    async def execute_gcloud_command(args):
+        calls.append(" ".join(args))
+        return {"success": True, "output": "ok"}
+
+    for _ in range(2):
+        await execute_gcloud_command(["compute", "instances", "list"])
+        await execute_gcloud_command(["pubsub", "subscriptions", "pull", "my-sub"])
+        await execute_gcloud_command(["secrets", "versions", "access", "latest"])
+    assert calls.count("compute instances list") == 1, calls
+    assert calls.count("pubsub subscriptions pull my-sub") == 2, calls
+    assert calls.count("secrets versions access latest") == 2, calls
+    assert cache.counts["uncacheable"] >= 4, cache.counts
+    print("✅ commands rejected by the cacheable predicate always run")
+
+
+async def check_redis_tier(redis_url: str):
+    import redis
+    try:
+        redis.from_url(redis_url, socket_connect_timeout=1.0).ping()
+    except Exception as e:
+        print(f"⏭️  Redis tier skipped ({e})")
+        return
+    # A prefix per run, so entries left by an earlier run are not hits
+    prefix = f"verify_tool_cache:{uuid.uuid4().hex[:8]}:"
+    writer = ToolResultCache(redis_url=redis_url, redis_prefix=prefix)
+    await check_errors_not_cached(writer, "Redis tier")
+    assert not writer.counts["redis_errors"], writer.counts
+
+    # A second replica finds the successful result in Redis, and only that one
+    reader = ToolResultCache(redis_url=redis_url, redis_prefix=prefix)
+    hits = []
+
+    @cached_tool("verify_failures", ttl_seconds=60, cache=reader)
+    async def tool(case: str):
+        hits.append(case)
+        return {"error": "x"} if case == "error" else {"success": True, "output": "vm-1 RUNNING"}
+
+    assert (await tool("ok"))["cache_info"]["source"] == "redis"
+    await tool("error")
+    assert hits == ["error"], hits
+    print("✅ Redis tier: a second replica replays successes and never errors")
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--redis-url", default="", help="also check the shared Redis tier")
+    args = parser.parse_args()
+
+    check_gcloud_classification()
+    check_key_bucketing()
+    await check_errors_not_cached(ToolResultCache(redis_url=""), "memory tier")
+    await check_mutating_not_cached(ToolResultCache(redis_url=""))
+    if args.redis_url:
+        await check_redis_tier(args.redis_url)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
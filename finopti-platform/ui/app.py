@@ -146,8 +146,15 @@ def start_job(prompt: str, user_email: str, trace_id: str = None, session_id: st
     except Exception as e:
         return {"error": str(e)}
 
-def poll_job(job_id: str, trace_id: str = None) -> dict:
-    """Poll job status with consistent trace context"""
+# Long-poll window per GET /jobs/<id>?wait= request (server caps it)
+JOB_LONG_POLL_SECONDS = 25
+
+def poll_job(job_id: str, trace_id: str = None, wait: float = 0) -> dict:
+    """Poll job status with consistent trace context.
+
+    With ``wait`` > 0 the orchestrator holds the request until the job leaves
+    RUNNING (or the wait expires), so completion is seen immediately.
+    """
     try:
         headers = oauth_helper.get_auth_headers()
         
@@ -159,8 +166,9 @@ def poll_job(job_id: str, trace_id: str = None) -> dict:
 
         response = requests.get(
             f"{ORCHESTRATOR_JOBS}/{job_id}",
+            params={"wait": wait} if wait else None,
             headers=headers,
-            timeout=5
+            timeout=5 + wait
         )
         if response.status_code == 200:
             return response.json()
@@ -169,21 +177,25 @@ def poll_job(job_id: str, trace_id: str = None) -> dict:
         return {"error": "Poll error"}
 
 def poll_until_complete(job_id: str, trace_id: str = None) -> dict:
-    """Poll job status until terminal state"""
+    """Long-poll job status until terminal state"""
     # Max poll time: 30 minutes
     end_time = time.time() + 1800
     while time.time() < end_time:
-        result = poll_job(job_id, trace_id)
+        started = time.time()
+        result = poll_job(job_id, trace_id, wait=JOB_LONG_POLL_SECONDS)
         status = result.get("status")
         
-        if status in ["COMPLETED", "SUCCESS", "FAILURE", "MISROUTED", "WAITING_FOR_USER", "SKIPPED", "PARTIAL"]:
+        if status in ["COMPLETED", "SUCCESS", "FAILED", "FAILURE", "MISROUTED", "WAITING_FOR_USER", "SKIPPED", "PARTIAL"]:
             return result
         
         if "error" in result and "Job not found" not in result["error"]:
              # If error interacting with API, return it
              return result
              
-        time.sleep(2)
+        # Server answered early without a terminal state (e.g. no long-poll
+        # support or job not yet registered): back off like the old poller.
+        if time.time() - started < 2:
+            time.sleep(2)
         
     return {"error": "Polling timed out"}
 